@@ -4,6 +4,10 @@ import logging
 
 import requests
 
+from allele.models import Allele
+from common.metadata import register_metadata_lookup
+from common.upstream_cache import fetch_cached
+
 CAR_URL = "https://reg.genome.network/allele/hla/desc"
 
 logger = logging.getLogger(__name__)
@@ -20,8 +24,7 @@ def fetch_allele_data(name: str, timeout: int = 5) -> list[dict] | None:
         The API endpoint's JSON or None if there was an error.
     """
     try:
-        response = requests.get(f"{CAR_URL}/{name}", timeout=timeout)
-        response.raise_for_status()
+        response = fetch_cached("car", f"{CAR_URL}/{name}", timeout=timeout)
     except (
         requests.exceptions.ConnectionError,
         requests.exceptions.HTTPError,
@@ -52,3 +55,17 @@ def get_car_id(data: list[dict] | None) -> str | None:
     if car_id is None:
         logger.warning("Unable to get name from OLS data; returning None")
     return car_id
+
+
+@register_metadata_lookup(Allele)
+def look_up_allele(allele: Allele) -> bool:
+    """Fills in an allele's CAR ID from the ClinGen Allele Registry.
+
+    Returns:
+        Whether the CAR answered.
+    """
+    allele_data = fetch_allele_data(allele.name)
+    if not allele_data:
+        return False
+    allele.car_id = get_car_id(allele_data)
+    return True
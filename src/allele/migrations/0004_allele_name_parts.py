@@ -0,0 +1,138 @@
+# Generated by Django 6.0.6 on 2026-10-18 02:24
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+# A copy of `allele.nomenclature` as it was when this migration was written, so later
+# changes to the parser don't change what it does.
+MAX_FIELDS = 4
+
+NAME_RE = re.compile(
+    r"^(?:HLA-)?(?P<gene>[A-Z0-9]+)\*(?P<fields>\d+(?::\d+){0,3})(?P<suffix>[A-Z]?)$",
+    re.IGNORECASE,
+)
+
+
+def backfill_name_parts(apps, schema_editor):
+    Allele = apps.get_model("allele", "Allele")
+    alleles = list(Allele.objects.only("pk", "name"))
+    for allele in alleles:
+        match = NAME_RE.match(allele.name.strip())
+        if match is None:
+            continue
+        fields = match["fields"].split(":")
+        allele.gene = match["gene"].upper()
+        for i, value in enumerate(fields, start=1):
+            setattr(allele, f"field_{i}", int(value))
+        allele.suffix = match["suffix"].upper()
+        allele.num_fields = len(fields)
+    fields = [f"field_{i}" for i in range(1, MAX_FIELDS + 1)]
+    Allele.objects.bulk_update(
+        alleles, ["gene", *fields, "suffix", "num_fields"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("allele", "0003_historicalallele"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="allele",
+            name="field_1",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                editable=False,
+                help_text="The allele group parsed from the name, e.g., 15.",
+                null=True,
+                verbose_name="Field 1",
+            ),
+        ),
+        migrations.AddField(
+            model_name="allele",
+            name="field_2",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                editable=False,
+                help_text="The specific HLA protein parsed from the name, if any.",
+                null=True,
+                verbose_name="Field 2",
+            ),
+        ),
+        migrations.AddField(
+            model_name="allele",
+            name="field_3",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                editable=False,
+                help_text="The synonymous DNA substitution field parsed from the name, if any.",
+                null=True,
+                verbose_name="Field 3",
+            ),
+        ),
+        migrations.AddField(
+            model_name="allele",
+            name="field_4",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                editable=False,
+                help_text="The non-coding difference field parsed from the name, if any.",
+                null=True,
+                verbose_name="Field 4",
+            ),
+        ),
+        migrations.AddField(
+            model_name="allele",
+            name="gene",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="The gene parsed from the name, e.g., DRB1.",
+                max_length=10,
+                verbose_name="Gene",
+            ),
+        ),
+        migrations.AddField(
+            model_name="allele",
+            name="num_fields",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                editable=False,
+                help_text="How many fields the name has, or empty if it couldn't be parsed.",
+                null=True,
+                verbose_name="Resolution",
+            ),
+        ),
+        migrations.AddField(
+            model_name="allele",
+            name="suffix",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="The expression suffix parsed from the name, if any, e.g., N.",
+                max_length=1,
+                verbose_name="Suffix",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="allele",
+            index=models.Index(
+                fields=["gene", "field_1", "field_2", "field_3", "field_4"],
+                name="allele_name_parts_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="allele",
+            index=models.Index(
+                fields=["gene", "num_fields"], name="allele_resolution_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_name_parts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.6 on 2026-10-18 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("allele", "0004_allele_name_parts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="allele",
+            name="metadata_status",
+            field=models.CharField(
+                choices=[("PEN", "Pending"), ("FAI", "Failed"), ("DON", "Done")],
+                default="DON",
+                editable=False,
+                help_text="Whether the allele's details have been fetched.",
+                max_length=3,
+                verbose_name="Metadata Status",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.6 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+def backfill_slugs(apps, schema_editor):
+    # Existing slugs are kept; only objects whose second save never happened lack one.
+    Allele = apps.get_model("allele", "Allele")
+    objs = list(Allele.objects.filter(slug="").only("pk"))
+    for obj in objs:
+        obj.slug = f"A{obj.pk:06d}"
+    Allele.objects.bulk_update(objs, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("allele", "0005_allele_metadata_status"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="allele",
+            name="slug",
+            field=models.SlugField(
+                default="",
+                help_text="The human-readable ID for the object.",
+                max_length=7,
+                unique=True,
+                verbose_name="Human-Readable ID",
+            ),
+        ),
+    ]
@@ -1,14 +1,87 @@
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
+from django.db.models import F
 from django.http import HttpResponseBase
 from django.urls import reverse
-from simple_history.models import HistoricalRecords
 
+from allele.nomenclature import (
+    MAX_FIELDS,
+    AlleleName,
+    is_complete_prefix,
+    parse_allele_name,
+    parse_allele_name_prefix,
+)
+from common.constants.models import METADATA_STATUS_CHOICES, MetadataStatus
+from common.history import ChangedHistoricalRecords
+from common.models import SearchDocument
+from common.slugs import SlugMixin
+
+# The fields parsed from the allele's name, which are kept out of its history.
+NAME_PART_FIELDS = [
+    "gene",
+    *(f"field_{i}" for i in range(1, MAX_FIELDS + 1)),
+    "suffix",
+    "num_fields",
+]
+
+
+class AlleleQuerySet(models.QuerySet):
+    def of_gene(self, gene: str) -> "AlleleQuerySet":
+        """Returns the alleles of a gene, e.g., DRB1."""
+        return self.filter(gene=gene.upper())
+
+    def with_name_prefix(self, prefix: str | AlleleName) -> "AlleleQuerySet":
+        """Returns the alleles whose names start with the gene and fields of a prefix.
+
+        Fields are compared whole, so "DRB1*15" matches DRB1*15:01 but not DRB1*150:01.
+        A last field that's still being typed, like the "0" of "DRB1*15:0", is matched
+        as the start of the name instead, so the results narrow as the name is typed. A
+        prefix that isn't the start of an allele name matches nothing.
+
+        Returns:
+            The filtered queryset.
+        """
+        text = ""
+        if isinstance(prefix, str):
+            text = prefix.strip().upper().removeprefix("HLA-")
+            parsed = parse_allele_name_prefix(text)
+            if parsed is None:
+                return self.none()
+            prefix = parsed
+        fields = prefix.fields
+        queryset = self
+        if text and not is_complete_prefix(prefix):
+            fields = fields[:-1]
+            queryset = queryset.filter(name__istartswith=text)
+        filters = {f"field_{i}": int(value) for i, value in enumerate(fields, start=1)}
+        return queryset.filter(gene=prefix.gene, **filters)
+
+    def with_resolution(self, num_fields: int) -> "AlleleQuerySet":
+        """Returns the alleles with a number of fields, e.g., the 2-field alleles."""
+        return self.filter(num_fields=num_fields)
+
+    def in_name_order(self) -> "AlleleQuerySet":
+        """Orders the alleles by gene, then by each field, shorter names first.
+
+        Returns:
+            The ordered queryset.
+        """
+        return self.order_by(
+            "gene",
+            *(F(f"field_{i}").asc(nulls_first=True) for i in range(1, MAX_FIELDS + 1)),
+            "name",
+        )
+
+
+class Allele(SlugMixin, models.Model):
+    slug_prefix = "A"
+    search_fields = ["slug", "name", "car_id"]
 
-class Allele(models.Model):
     slug = models.SlugField(
         default="",
         max_length=7,
+        unique=True,
         verbose_name="Human-Readable ID",
         help_text="The human-readable ID for the object.",
     )
@@ -50,22 +123,118 @@ class Allele(models.Model):
         verbose_name="Updated At",
         help_text="When the allele was last updated.",
     )
-    history = HistoricalRecords()
+    gene = models.CharField(
+        blank=True,
+        default="",
+        editable=False,
+        max_length=10,
+        verbose_name="Gene",
+        help_text="The gene parsed from the name, e.g., DRB1.",
+    )
+    field_1 = models.PositiveSmallIntegerField(
+        blank=True,
+        editable=False,
+        null=True,
+        verbose_name="Field 1",
+        help_text="The allele group parsed from the name, e.g., 15.",
+    )
+    field_2 = models.PositiveSmallIntegerField(
+        blank=True,
+        editable=False,
+        null=True,
+        verbose_name="Field 2",
+        help_text="The specific HLA protein parsed from the name, if any.",
+    )
+    field_3 = models.PositiveSmallIntegerField(
+        blank=True,
+        editable=False,
+        null=True,
+        verbose_name="Field 3",
+        help_text="The synonymous DNA substitution field parsed from the name, if any.",
+    )
+    field_4 = models.PositiveSmallIntegerField(
+        blank=True,
+        editable=False,
+        null=True,
+        verbose_name="Field 4",
+        help_text="The non-coding difference field parsed from the name, if any.",
+    )
+    suffix = models.CharField(
+        blank=True,
+        default="",
+        editable=False,
+        max_length=1,
+        verbose_name="Suffix",
+        help_text="The expression suffix parsed from the name, if any, e.g., N.",
+    )
+    num_fields = models.PositiveSmallIntegerField(
+        blank=True,
+        editable=False,
+        null=True,
+        verbose_name="Resolution",
+        help_text="How many fields the name has, or empty if it couldn't be parsed.",
+    )
+    metadata_status = models.CharField(
+        choices=METADATA_STATUS_CHOICES,
+        default=MetadataStatus.DONE,
+        editable=False,
+        max_length=3,
+        verbose_name="Metadata Status",
+        help_text="Whether the allele's details have been fetched.",
+    )
+    search_documents = GenericRelation(SearchDocument)
+    history = ChangedHistoricalRecords(
+        excluded_fields=[*NAME_PART_FIELDS, "metadata_status"]
+    )
+
+    objects = AlleleQuerySet.as_manager()
 
     class Meta:
         db_table = "allele"
         verbose_name = "Allele"
         verbose_name_plural = "Alleles"
+        indexes = [
+            models.Index(
+                fields=["gene", "field_1", "field_2", "field_3", "field_4"],
+                name="allele_name_parts_idx",
+            ),
+            models.Index(fields=["gene", "num_fields"], name="allele_resolution_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
     def save(self, *args, **kwargs) -> None:
-        """Adds a human-readable ID."""
+        """Parses the name."""
+        self.set_name_parts()
+        if (
+            kwargs.get("update_fields") is not None
+            and "name" in kwargs["update_fields"]
+        ):
+            kwargs["update_fields"] = {*kwargs["update_fields"], *NAME_PART_FIELDS}
         super().save(*args, **kwargs)
-        if not self.slug:
-            self.slug = f"A{self.pk:06d}"
-            self.save(update_fields=["slug"])
 
     def get_absolute_url(self) -> HttpResponseBase | str | None:
         return reverse("allele-detail", kwargs={"slug": self.slug})
+
+    @property
+    def resolution(self) -> int:
+        """Returns how many fields the name has, counting colons if it isn't parsed."""
+        if self.num_fields is not None:
+            return self.num_fields
+        return self.name.count(":") + 1
+
+    def set_name_parts(self) -> None:
+        """Sets the gene, fields, suffix, and resolution from the name.
+
+        `save` calls this, but code that bulk creates alleles has to call it itself.
+        """
+        parsed = parse_allele_name(self.name)
+        fields = parsed.fields if parsed else ()
+        self.gene = parsed.gene if parsed else ""
+        for i in range(1, MAX_FIELDS + 1):
+            setattr(
+                self, f"field_{i}", int(fields[i - 1]) if i <= len(fields) else None
+            )
+        self.suffix = parsed.suffix if parsed else ""
+        self.num_fields = parsed.num_fields if parsed else None
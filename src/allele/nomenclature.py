@@ -0,0 +1,85 @@
+"""Houses code for parsing HLA allele names into their parts.
+
+An allele name is a gene, an asterisk, up to four colon-separated fields of digits, and
+an optional expression suffix, e.g., DRB1*15:01:01:02N. The first field is the allele
+group, and the number of fields is the allele's resolution.
+See https://hla.alleles.org/pages/nomenclature/naming_alleles/.
+"""
+
+import re
+from dataclasses import dataclass
+
+MAX_FIELDS = 4
+
+# Fields are written with at least this many digits, e.g., the "01" of A*01:01, so a
+# shorter last field in a prefix is one that's still being typed.
+MIN_FIELD_DIGITS = 2
+
+NAME_RE = re.compile(
+    r"^(?:HLA-)?(?P<gene>[A-Z0-9]+)\*(?P<fields>\d+(?::\d+){0,3})(?P<suffix>[A-Z]?)$",
+    re.IGNORECASE,
+)
+
+# A name cut short after the asterisk or after any complete field, e.g., "DRB1*" or
+# "DRB1*15:", for matching every allele that starts with it.
+PREFIX_RE = re.compile(
+    r"^(?:HLA-)?(?P<gene>[A-Z0-9]+)\*(?:(?P<fields>\d+(?::\d+){0,3}):?)?$",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class AlleleName:
+    """The parts of an HLA allele name."""
+
+    gene: str
+    fields: tuple[str, ...]
+    suffix: str = ""
+
+    @property
+    def num_fields(self) -> int:
+        """Returns the resolution of the name, i.e., how many fields it has."""
+        return len(self.fields)
+
+
+def parse_allele_name(name: str) -> AlleleName | None:
+    """Splits an allele name into its gene, fields, and suffix.
+
+    Returns:
+        The parts of the name, or None if it isn't an HLA allele name.
+    """
+    match = NAME_RE.match(name.strip())
+    if match is None:
+        return None
+    return AlleleName(
+        gene=match["gene"].upper(),
+        fields=tuple(match["fields"].split(":")),
+        suffix=match["suffix"].upper(),
+    )
+
+
+def parse_allele_name_prefix(prefix: str) -> AlleleName | None:
+    """Splits the start of an allele name into its gene and complete fields.
+
+    For example, "drb1*15" is gene DRB1 with first field 15, and "A*" is gene A.
+
+    Returns:
+        The parts of the prefix, or None if it isn't the start of an HLA allele name.
+    """
+    match = PREFIX_RE.match(prefix.strip())
+    if match is None:
+        return None
+    fields = match["fields"]
+    return AlleleName(
+        gene=match["gene"].upper(),
+        fields=tuple(fields.split(":")) if fields else (),
+    )
+
+
+def is_complete_prefix(prefix: AlleleName) -> bool:
+    """Returns whether a name prefix ends after a complete field or the asterisk.
+
+    For example, "DRB1*15" does, but "DRB1*15:0", typed on the way to "DRB1*15:01",
+    doesn't.
+    """
+    return not prefix.fields or len(prefix.fields[-1]) >= MIN_FIELD_DIGITS
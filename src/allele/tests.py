@@ -1,13 +1,25 @@
 from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from allele.models import Allele
+from allele.nomenclature import (
+    AlleleName,
+    is_complete_prefix,
+    parse_allele_name,
+    parse_allele_name_prefix,
+)
+from common.constants.models import MetadataStatus
+from common.metadata import request_metadata
 from common.tests import ProtectedViewTestMixin
 from haplotype.models import Haplotype
+from job.constants.models import JobStatus
+from job.models import Job
+from job.worker import run_worker
 
 
+@override_settings(JOBS_RUN_INLINE=True)
 class AlleleCreateTest(ProtectedViewTestMixin, TestCase):
     url = reverse("allele-create")
     template = "allele/create.html"
@@ -26,7 +38,7 @@ class AlleleCreateTest(ProtectedViewTestMixin, TestCase):
         response = self.client.get(self.url)
         self.assertContains(response, "Submit")
 
-    @patch("allele.views.fetch_allele_data")
+    @patch("allele.clients.fetch_allele_data")
     def test_creates_allele_with_valid_form_data(
         self, mock_fetch_allele_data: MagicMock
     ):
@@ -48,7 +60,8 @@ class AlleleCreateTest(ProtectedViewTestMixin, TestCase):
                 "type": "hla",
             }
         ]
-        response = self.client.post(self.url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data)
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Allele.objects.count(), initial_allele_count + 1)
         new_allele = Allele.objects.first()
@@ -56,6 +69,8 @@ class AlleleCreateTest(ProtectedViewTestMixin, TestCase):
         self.assertEqual(new_allele.name, "ASH*01:02:03")
         self.assertEqual(new_allele.car_id, "XAHLA123")
         self.assertEqual(new_allele.added_by, self.user4_yes_phi_yes_perms)
+        self.assertRedirects(response, new_allele.get_absolute_url())
+        self.assertEqual(new_allele.metadata_status, MetadataStatus.DONE)
 
     def test_does_not_create_allele_with_invalid_form_data(self):
         initial_allele_count = Allele.objects.count()
@@ -98,6 +113,73 @@ class AlleleDetailTest(ProtectedViewTestMixin, TestCase):
         self.assertContains(response, haplotype_name)
 
 
+@override_settings(JOBS_RUN_INLINE=True)
+class AlleleMetadataTest(ProtectedViewTestMixin, TestCase):
+    fixtures = ["test_alleles.json"]
+    url = reverse("allele-metadata", kwargs={"slug": "A000001"})
+    template = "common/partials/metadata_status.html"
+    page_name = ""
+    expected_text = ["Fetching details"]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user4_yes_phi_yes_perms)
+        self.allele = Allele.objects.get(slug="A000001")
+        self.allele.car_id = None
+        self.allele.save()
+        request_metadata(self.allele)
+
+    def test_detail_page_polls_while_pending(self):
+        response = self.client.get(self.allele.get_absolute_url())
+        self.assertContains(response, f'hx-get="{self.url}"')
+
+    def test_refreshes_the_detail_page_once_done(self):
+        Allele.objects.filter(pk=self.allele.pk).update(
+            metadata_status=MetadataStatus.DONE
+        )
+        response = self.client.get(self.url, headers={"HX-Request": "true"})
+        self.assertEqual(response["HX-Refresh"], "true")
+        response = self.client.get(self.url)
+        self.assertRedirects(response, self.allele.get_absolute_url())
+
+    def test_treats_a_lookup_without_a_job_as_failed(self):
+        Job.objects.all().delete()
+        response = self.client.get(self.url)
+        self.assertContains(response, "Retry")
+        self.assertNotContains(response, "hx-get")
+
+    @patch("allele.clients.fetch_allele_data")
+    def test_leaves_the_lookup_pending_until_the_last_attempt(
+        self, mock_fetch_allele_data: MagicMock
+    ):
+        mock_fetch_allele_data.return_value = None
+        with self.assertLogs("job.worker", "ERROR"):
+            run_worker(burst=True)
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (JobStatus.QUEUED, 1))
+        self.assertContains(self.client.get(self.url), "Fetching details")
+
+    @patch("allele.clients.fetch_allele_data")
+    def test_retries_a_failed_lookup(self, mock_fetch_allele_data: MagicMock):
+        mock_fetch_allele_data.return_value = None
+        Job.objects.update(max_attempts=1)
+        with self.assertLogs("job.worker", "ERROR"):
+            run_worker(burst=True)
+        self.allele.refresh_from_db()
+        self.assertEqual(self.allele.metadata_status, MetadataStatus.FAILED)
+        self.assertContains(self.client.get(self.url), "Retry")
+
+        mock_fetch_allele_data.return_value = [{"id": "XAHLA123"}]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url)
+        self.allele.refresh_from_db()
+        self.assertEqual(self.allele.metadata_status, MetadataStatus.DONE)
+        self.assertEqual(self.allele.car_id, "XAHLA123")
+        record = self.allele.history.first()
+        self.assertEqual(record.car_id, "XAHLA123")
+        self.assertFalse(hasattr(record, "metadata_status"))
+
+
 class AlleleListTest(ProtectedViewTestMixin, TestCase):
     fixtures = ["test_alleles.json"]
     url = reverse("allele-list")
@@ -117,3 +199,123 @@ class AlleleListTest(ProtectedViewTestMixin, TestCase):
     def setUp(self):
         super().setUp()
         self.client.force_login(self.user4_yes_phi_yes_perms)
+
+    def test_name_prefix_search_matches_whole_fields(self):
+        Allele.objects.create(name="A*010:01")
+        response = self.client.get(self.url, {"q": "a*01"})
+        self.assertContains(response, "A*01:02:03")
+        self.assertNotContains(response, "A*010:01")
+
+    def test_partly_typed_fields_match_the_start_of_names(self):
+        for query in ["a*0", "A*01:0", "HLA-A*01:02:0"]:
+            with self.subTest(query=query):
+                response = self.client.get(self.url, {"q": query})
+                self.assertContains(response, "A*01:02:03")
+        self.assertNotContains(self.client.get(self.url, {"q": "A*1"}), "A*01:02:03")
+
+    def test_gene_search_matches_every_allele_of_the_gene(self):
+        response = self.client.get(self.url, {"q": "B*"})
+        self.assertContains(response, "B*04:05:06")
+        self.assertNotContains(response, "A*01:02:03")
+
+
+class NomenclatureTest(TestCase):
+    def test_parses_allele_names(self):
+        self.assertEqual(
+            parse_allele_name("DRB1*15:01:01:02N"),
+            AlleleName(gene="DRB1", fields=("15", "01", "01", "02"), suffix="N"),
+        )
+        self.assertEqual(
+            parse_allele_name("HLA-a*02:101"),
+            AlleleName(gene="A", fields=("02", "101")),
+        )
+
+    def test_rejects_other_names(self):
+        for name in ["DRB1", "DRB1*", "DRB1*15:01:01:01:01", "A*02~B*07", "A*:01"]:
+            with self.subTest(name=name):
+                self.assertIsNone(parse_allele_name(name))
+
+    def test_parses_name_prefixes(self):
+        self.assertEqual(parse_allele_name_prefix("DRB1*"), AlleleName("DRB1", ()))
+        self.assertEqual(
+            parse_allele_name_prefix("drb1*15:"), AlleleName("DRB1", ("15",))
+        )
+        self.assertIsNone(parse_allele_name_prefix("DRB1"))
+        self.assertIsNone(parse_allele_name_prefix("XAHLA123"))
+
+    def test_prefixes_ending_in_a_short_field_are_incomplete(self):
+        for prefix, complete in [
+            ("DRB1*", True),
+            ("DRB1*15", True),
+            ("DRB1*15:0", False),
+        ]:
+            with self.subTest(prefix=prefix):
+                parsed = parse_allele_name_prefix(prefix)
+                assert parsed is not None
+                self.assertEqual(is_complete_prefix(parsed), complete)
+
+
+class AlleleNamePartsTest(TestCase):
+    def setUp(self):
+        for name in ["DRB1*15:01", "DRB1*15:01:01", "DRB1*150:01", "A*02:01N", "A*09"]:
+            Allele.objects.create(name=name)
+
+    def test_saving_parses_the_name(self):
+        allele = Allele.objects.get(name="A*02:01N")
+        self.assertEqual(
+            (allele.gene, allele.field_1, allele.field_2, allele.field_3),
+            ("A", 2, 1, None),
+        )
+        self.assertEqual(allele.suffix, "N")
+        self.assertEqual(allele.num_fields, 2)
+
+    def test_renaming_reparses_the_name(self):
+        allele = Allele.objects.get(name="A*09")
+        allele.name = "B*07:02"
+        allele.save(update_fields=["name"])
+        allele.refresh_from_db()
+        self.assertEqual((allele.gene, allele.num_fields), ("B", 2))
+
+    def test_unparseable_names_have_no_parts(self):
+        allele = Allele.objects.create(name="not an allele")
+        self.assertEqual(allele.gene, "")
+        self.assertIsNone(allele.num_fields)
+
+    def test_filters_by_name_prefix(self):
+        self.assertEqual(
+            set(
+                Allele.objects.with_name_prefix("DRB1*15").values_list(
+                    "name", flat=True
+                )
+            ),
+            {"DRB1*15:01", "DRB1*15:01:01"},
+        )
+        self.assertFalse(Allele.objects.with_name_prefix("DRB1").exists())
+        self.assertEqual(
+            set(
+                Allele.objects.with_name_prefix("DRB1*1").values_list("name", flat=True)
+            ),
+            {"DRB1*15:01", "DRB1*15:01:01", "DRB1*150:01"},
+        )
+
+    def test_filters_by_gene_and_resolution(self):
+        self.assertEqual(Allele.objects.of_gene("drb1").count(), 3)
+        self.assertEqual(
+            list(
+                Allele.objects.of_gene("DRB1")
+                .with_resolution(2)
+                .in_name_order()
+                .values_list("name", flat=True)
+            ),
+            ["DRB1*15:01", "DRB1*150:01"],
+        )
+
+    def test_orders_by_gene_then_fields(self):
+        self.assertEqual(
+            list(Allele.objects.in_name_order().values_list("name", flat=True)),
+            ["A*02:01N", "A*09", "DRB1*15:01", "DRB1*15:01:01", "DRB1*150:01"],
+        )
+
+    def test_parts_are_not_recorded_in_history(self):
+        record = Allele.objects.get(name="A*09").history.latest()
+        self.assertFalse(hasattr(record, "gene"))
@@ -6,6 +6,11 @@ from allele.views import AlleleList
 urlpatterns = [
     path("create", views.AlleleCreate.as_view(), name="allele-create"),
     path("<slug:slug>/detail", views.AlleleDetail.as_view(), name="allele-detail"),
+    path(
+        "<slug:slug>/metadata",
+        views.AlleleMetadata.as_view(),
+        name="allele-metadata",
+    ),
     path("<slug:slug>/history", views.AlleleHistory.as_view(), name="allele-history"),
     path(
         "<slug:slug>/history/<int:history_id>/change",
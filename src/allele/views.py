@@ -1,20 +1,21 @@
 from typing import cast
 
 from django.contrib import messages
+from django.db.models import QuerySet
 from django.http import HttpResponse
-from django.shortcuts import redirect
-from django.urls import reverse_lazy
 from django.views.generic import CreateView, DetailView
 from django_tables2 import RequestConfig
 
-from allele.clients import fetch_allele_data, get_car_id
 from allele.forms import AlleleForm
 from allele.models import Allele
+from allele.nomenclature import parse_allele_name_prefix
 from allele.tables import AlleleTable
 from auth_.permissions import ProtectedViewMixin
+from common.constants.models import MetadataStatus
 from common.history import resolve_changes
+from common.metadata import request_metadata
 from common.tables import HistoryTable
-from common.views import SearchListView
+from common.views import MetadataContextMixin, MetadataStatusView, SearchListView
 from curation.tables import CurationTable
 from haplotype.tables import HaplotypeTable
 
@@ -23,38 +24,36 @@ class AlleleCreate(ProtectedViewMixin, CreateView):
     model = Allele
     form_class = AlleleForm
     template_name = "allele/create.html"
-    success_url = reverse_lazy("allele-list")
 
     def form_valid(self, form: AlleleForm) -> HttpResponse:
-        """Fetches and adds data from the ClinGen Allele Registry and records user.
+        """Adds the allele and records the user.
+
+        Its CAR ID is fetched from the ClinGen Allele Registry in the background.
 
         Returns:
-             The success page for the allele if the form is valid, or the form with
-             errors if the form isn't valid.
+             The allele's detail page.
         """
-        allele_data = fetch_allele_data(form.instance.name)
-        if allele_data:
-            form.instance.car_id = get_car_id(allele_data)
-            form.instance.added_by = self.request.user
-            messages.success(self.request, "Added allele.")
-            return super().form_valid(form)
-        message = (
-            "Oops, something went wrong trying to fetch data from the "
-            "ClinGen Allele Registry. Please try again later."
-        )
-        messages.warning(self.request, message)
-        return redirect("allele-create")
+        form.instance.added_by = self.request.user
+        form.instance.metadata_status = MetadataStatus.PENDING
+        response = super().form_valid(form)
+        request_metadata(self.object)
+        messages.success(self.request, "Added allele. Its CAR ID is being fetched.")
+        return response
 
 
-class AlleleDetail(ProtectedViewMixin, DetailView):
+class AlleleDetail(ProtectedViewMixin, MetadataContextMixin, DetailView):
     model = Allele
     template_name = "allele/detail.html"
+    metadata_url_name = "allele-metadata"
 
     def get_context_data(self, **kwargs: object) -> dict:
         context = super().get_context_data(**kwargs)
         obj = cast(Allele, self.object)
         haplotype_table = HaplotypeTable(obj.haplotypes.all(), prefix="haplotype_")  # type: ignore
-        curation_table = CurationTable(obj.curations.all(), prefix="curation_")  # type: ignore
+        curations = obj.curations.with_scores().select_related(  # type: ignore
+            "allele", "haplotype", "disease"
+        )
+        curation_table = CurationTable(curations, prefix="curation_")
         RequestConfig(self.request).configure(haplotype_table)
         RequestConfig(self.request).configure(curation_table)
         context["haplotype_table"] = haplotype_table
@@ -62,6 +61,11 @@ class AlleleDetail(ProtectedViewMixin, DetailView):
         return context
 
 
+class AlleleMetadata(ProtectedViewMixin, MetadataStatusView):
+    model = Allele
+    metadata_url_name = "allele-metadata"
+
+
 class AlleleHistory(ProtectedViewMixin, DetailView):
     model = Allele
     template_name = "allele/history.html"
@@ -98,5 +102,17 @@ class AlleleList(ProtectedViewMixin, SearchListView):
     template_name = "allele/list.html"
     ordering = ["-updated_at"]
     table_class = AlleleTable
-    search_fields = ["slug", "name", "car_id"]
     table_pagination = {"per_page": 25}
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Matches the start of an allele name field by field, e.g., "DRB1*15".
+
+        A last field that's still being typed, e.g., the "0" of "DRB1*15:0", matches
+        the names that start with it. Other queries are searched as usual.
+
+        Returns:
+            The matching alleles.
+        """
+        if parse_allele_name_prefix(query) is None:
+            return super().search(queryset, query)
+        return queryset.with_name_prefix(query)  # type: ignore[attr-defined]
@@ -2,7 +2,8 @@
 
 from django.contrib.auth.models import User
 from django.db import models
-from simple_history.models import HistoricalRecords
+
+from common.history import ChangedHistoricalRecords
 
 
 class UserProfile(models.Model):
@@ -30,7 +31,7 @@ class UserProfile(models.Model):
         verbose_name="Updated At",
         help_text="When the user profile was last updated.",
     )
-    history = HistoricalRecords()
+    history = ChangedHistoricalRecords()
 
     class Meta:
         """Provides metadata."""
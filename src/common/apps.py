@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+from django.utils.module_loading import autodiscover_modules
+
+
+class CommonConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "common"
+
+    def ready(self) -> None:
+        # Importing the clients registers each model's metadata lookup.
+        autodiscover_modules("clients")
+        from common import signals  # Connects the signal receivers.
+
+        signals.connect_post_init_receivers()
+
+        post_migrate.connect(build_search_index_after_migrate, sender=self)
+
+
+def build_search_index_after_migrate(**kwargs) -> None:  # noqa: ARG001
+    """Builds the search index the first time the database is migrated with it."""
+    from common.search import ensure_search_index
+
+    ensure_search_index()
@@ -0,0 +1,378 @@
+"""Houses code for generating synthetic data to benchmark the HCI against.
+
+The data is random but seeded, so the same scale and seed always produce the same
+records. The evidence inputs are drawn from rough distributions of what curators enter
+(most evidence is included, most associations are significant, odds ratios cluster a
+little above one, and so on), and the scores are computed with the batch scoring
+engine, so the records look like ones saved through the forms.
+"""
+
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from django.contrib.auth.models import User
+from django.db import models, transaction
+
+from allele.models import Allele
+from auth_.models import UserProfile
+from common.search import rebuild_search_index
+from common.slugs import assign_slugs
+from curation.constants.models.common import Status
+from curation.constants.models.curation import Classification, CurationTypes
+from curation.constants.models.evidence import (
+    AdditionalPhenotypes,
+    EffectSizeStatistic,
+    MultipleTestingCorrection,
+    PValueComparator,
+    TypingMethod,
+    Zygosity,
+)
+from curation.models import Curation, Demographic, Evidence
+from curation.score import set_batch_scores
+from disease.models import Disease
+from haplotype.models import Haplotype
+from publication.constants.models import PublicationTypes
+from publication.models import Publication
+from repo.models import PublishedCuration
+
+# The number of each kind of record generated at a scale of 1.
+BASE_COUNTS = {
+    "alleles": 2000,
+    "haplotypes": 500,
+    "diseases": 1000,
+    "publications": 2000,
+    "curations": 1000,
+}
+
+# Curations have from zero to this many pieces of evidence, 10 on average.
+MAX_EVIDENCE_PER_CURATION = 20
+
+PUBLISHED_FRACTION = 0.3
+
+BATCH_SIZE = 500
+
+GENES = ("A", "B", "C", "DRB1", "DRB3", "DQA1", "DQB1", "DPA1", "DPB1")
+
+GROUPS = (
+    "African",
+    "African American",
+    "Asian",
+    "European",
+    "Latin American",
+    "Near Eastern",
+    "Oceanian",
+    "South Asian",
+)
+
+
+@dataclass
+class BenchmarkData:
+    """The records the benchmarks use, from the generated data."""
+
+    curator: User
+    # The published curation with the most evidence.
+    published_curation: PublishedCuration
+    # A curation with an update in its history, for the change pages.
+    changed_curation: Curation
+    counts: dict[str, int]
+
+
+def _choose(rng: random.Random, weights: dict[Any, float]) -> Any:  # noqa: ANN401
+    """Returns one of the keys, with the values as relative weights."""
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _decimal(value: float) -> Decimal:
+    """Returns the value as a decimal that fits the evidence effect size columns."""
+    return Decimal(f"{value:.5f}")
+
+
+def _create(
+    model: type[models.Model],
+    objs: list[Any],
+    curator: User,
+    **extra: Callable[[Any], str],
+) -> list[Any]:
+    """Bulk creates objects with slugs and a "created" history record each.
+
+    Returns:
+        The created objects.
+    """
+    assign_slugs(objs)
+    for obj in objs:
+        for field, make_value in extra.items():
+            setattr(obj, field, make_value(obj))
+    objs = model.objects.bulk_create(objs, batch_size=BATCH_SIZE)  # type: ignore[attr-defined]
+    model.history.bulk_history_create(  # type: ignore[attr-defined]
+        objs, batch_size=BATCH_SIZE, default_user=curator
+    )
+    return objs
+
+
+def _make_evidence(
+    rng: random.Random, curation: Curation, publication: Publication, curator: User
+) -> Evidence:
+    """Returns unsaved evidence with randomly drawn inputs."""
+    is_gwas = rng.random() < 0.2
+    statistic = _choose(
+        rng,
+        {
+            EffectSizeStatistic.ODDS_RATIO: 0.6,
+            EffectSizeStatistic.RELATIVE_RISK: 0.2,
+            EffectSizeStatistic.BETA: 0.1,
+            EffectSizeStatistic.OTHER: 0.1,
+        },
+    )
+    effect = rng.lognormvariate(0.4, 0.6)
+    spread = rng.uniform(0.05, 0.5)
+    effect_sizes: dict[str, Decimal | None] = {}
+    if statistic in {EffectSizeStatistic.ODDS_RATIO, EffectSizeStatistic.RELATIVE_RISK}:
+        field = (
+            "odds_ratio"
+            if statistic == EffectSizeStatistic.ODDS_RATIO
+            else "relative_risk"
+        )
+        effect_sizes[field] = _decimal(effect)
+        effect_sizes["ci_start"] = _decimal(effect * (1 - spread))
+        effect_sizes["ci_end"] = _decimal(effect * (1 + spread))
+    elif statistic == EffectSizeStatistic.BETA:
+        beta = rng.gauss(0, 0.5)
+        effect_sizes["beta"] = _decimal(beta)
+        effect_sizes["ci_start"] = _decimal(beta - spread)
+        effect_sizes["ci_end"] = _decimal(beta + spread)
+
+    has_p_value = rng.random() < 0.9
+    return Evidence(
+        curation=curation,
+        publication=publication,
+        status=Status.DONE if rng.random() < 0.7 else Status.IN_PROGRESS,
+        is_included=rng.random() < 0.75,
+        is_gwas=is_gwas,
+        num_fields=_choose(rng, {1: 0.1, 2: 0.3, 3: 0.4, 4: 0.2}),
+        zygosity=_choose(rng, {Zygosity.MONOALLELIC: 0.8, Zygosity.BIALLELIC: 0.2}),
+        phase_confirmed=rng.random() < 0.1,
+        typing_method=_choose(
+            rng,
+            {
+                TypingMethod.HIGH_RES_TYPING: 0.3,
+                TypingMethod.NEXT_GENERATION_SEQ: 0.2,
+                TypingMethod.LOW_RES_TYPING: 0.15,
+                TypingMethod.IMPUTATION: 0.15,
+                TypingMethod.SANGER_SEQ: 0.1,
+                TypingMethod.SEROLOGICAL: 0.05,
+                TypingMethod.LONG_READ_SEQ: 0.05,
+            },
+        ),
+        p_value_comparator=_choose(
+            rng,
+            {
+                PValueComparator.EXACT: 0.6,
+                PValueComparator.LESS_THAN: 0.3,
+                PValueComparator.LESS_THAN_OR_EQUAL: 0.1,
+            },
+        ),
+        p_value=(
+            Decimal(f"{10 ** -rng.uniform(1, 12 if is_gwas else 6):.2e}")
+            if has_p_value
+            else None
+        ),
+        multiple_testing_correction=_choose(
+            rng,
+            {
+                "": 0.5,
+                MultipleTestingCorrection.OVERALL: 0.3,
+                MultipleTestingCorrection.TWO_STEP: 0.2,
+            },
+        ),
+        effect_size_statistic=statistic,
+        cohort_size=min(int(rng.lognormvariate(7, 1.2)), 2_000_000),
+        additional_phenotypes=_choose(
+            rng,
+            {
+                "": 0.7,
+                AdditionalPhenotypes.SPECIFIC_DISEASE_RELATED: 0.2,
+                AdditionalPhenotypes.ONLY_DISEASE_TESTED: 0.1,
+            },
+        ),
+        has_association=has_p_value and rng.random() < 0.85,
+        added_by=curator,
+        **effect_sizes,
+    )
+
+
+@transaction.atomic
+def generate_benchmark_data(scale: float = 1.0, seed: int = 0) -> BenchmarkData:
+    """Fills the database with synthetic alleles, curations, evidence, and so on.
+
+    Args:
+        scale: How much data to generate, as a multiple of `BASE_COUNTS`.
+        seed: The seed for the random choices.
+
+    Returns:
+        The records the benchmarks use and how many of each kind were created.
+    """
+    rng = random.Random(seed)  # noqa: S311 (Not used for anything security related.)
+    counts = {name: max(int(count * scale), 2) for name, count in BASE_COUNTS.items()}
+
+    curator = User.objects.create(username=f"benchmark_curator_{seed}")
+    UserProfile.objects.create(
+        user=curator, has_signed_phi_agreement=True, has_curation_permissions=True
+    )
+
+    alleles = [
+        Allele(
+            name=f"{GENES[i % len(GENES)]}*{i // 100 + 1:02d}:{i % 100 + 1:02d}:01",
+            car_id=f"CABENCH{seed}{i:07d}",
+            added_by=curator,
+        )
+        for i in range(counts["alleles"])
+    ]
+    for allele in alleles:
+        allele.set_name_parts()
+    alleles = _create(Allele, alleles, curator)
+
+    haplotypes = _create(
+        Haplotype,
+        [
+            Haplotype(name=f"haplotype-{seed}-{i}", added_by=curator)
+            for i in range(counts["haplotypes"])
+        ],
+        curator,
+    )
+    Haplotype.alleles.through.objects.bulk_create(
+        [
+            Haplotype.alleles.through(haplotype=haplotype, allele=allele)
+            for haplotype in haplotypes
+            for allele in rng.sample(alleles, k=min(rng.randint(2, 3), len(alleles)))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    diseases = _create(
+        Disease,
+        [
+            Disease(
+                mondo_id=f"MONDO:{seed}{i:07d}",
+                name=f"benchmark disease {i}",
+                added_by=curator,
+            )
+            for i in range(counts["diseases"])
+        ],
+        curator,
+    )
+
+    publications = _create(
+        Publication,
+        [
+            Publication(
+                publication_type=PublicationTypes.PUBMED,
+                pubmed_id=f"{seed}{i:08d}",
+                title=f"Benchmark publication {i}",
+                author=f"Author{i % 500}",
+                publication_year=rng.randint(1990, 2025),
+                added_by=curator,
+            )
+            for i in range(counts["publications"])
+        ],
+        curator,
+    )
+
+    demographics = [
+        Demographic.objects.get_or_create(group=group)[0] for group in GROUPS
+    ]
+
+    curations = []
+    for i in range(counts["curations"]):
+        is_allele = rng.random() < 0.7
+        # The first curation is always published and the second never is, so the
+        # benchmarks have both to work with however small the scale.
+        is_published = i == 0 or (i > 1 and rng.random() < PUBLISHED_FRACTION)
+        curations.append(
+            Curation(
+                curation_type=(
+                    CurationTypes.ALLELE if is_allele else CurationTypes.HAPLOTYPE
+                ),
+                allele=rng.choice(alleles) if is_allele else None,
+                haplotype=None if is_allele else rng.choice(haplotypes),
+                disease=rng.choice(diseases),
+                status=(
+                    Status.PUBLISHED
+                    if is_published
+                    else Status.IN_PROGRESS
+                    if i == 1
+                    else _choose(
+                        rng,
+                        {
+                            Status.IN_PROGRESS: 0.6,
+                            Status.READY_FOR_REVIEW: 0.2,
+                            Status.PROVISIONAL: 0.2,
+                        },
+                    )
+                ),
+                ep_classification=(
+                    rng.choice([Classification.LIMITED, Classification.MODERATE])
+                    if is_published
+                    else None
+                ),
+                added_by=curator,
+            )
+        )
+    curations = _create(Curation, curations, curator, lineage_path=lambda c: f"{c.pk}/")
+
+    evidence = [
+        _make_evidence(rng, curation, rng.choice(publications), curator)
+        for curation in curations
+        for _ in range(rng.randint(0, MAX_EVIDENCE_PER_CURATION))
+    ]
+    set_batch_scores(evidence)
+    evidence = _create(Evidence, evidence, curator)
+    Evidence.demographics.through.objects.bulk_create(
+        [
+            Evidence.demographics.through(evidence=item, demographic=demographic)
+            for item in evidence
+            for demographic in rng.sample(demographics, k=rng.randint(0, 2))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    published_curations = PublishedCuration.objects.bulk_create(
+        [
+            PublishedCuration(curation=curation, published_by=curator)
+            for curation in curations
+            if curation.status == Status.PUBLISHED
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    PublishedCuration.history.bulk_history_create(  # type: ignore[attr-defined]
+        published_curations, batch_size=BATCH_SIZE, default_user=curator
+    )
+
+    evidence_counts: dict[int, int] = {}
+    for item in evidence:
+        evidence_counts[item.curation_id] = evidence_counts.get(item.curation_id, 0) + 1  # type: ignore[attr-defined]
+    published_curation = max(
+        published_curations,
+        key=lambda p: evidence_counts.get(p.curation_id, 0),  # type: ignore[attr-defined]
+    )
+
+    # Saving normally records an "updated" history record to diff against.
+    changed_curation = next(c for c in curations if c.status == Status.IN_PROGRESS)
+    changed_curation.ep_evidence_summary = "Updated for the benchmarks."
+    changed_curation.save()
+
+    # Bulk creating skips the signals that keep the search index up to date.
+    rebuild_search_index()
+
+    return BenchmarkData(
+        curator=curator,
+        published_curation=published_curation,
+        changed_curation=changed_curation,
+        counts={
+            **counts,
+            "evidence": len(evidence),
+            "published_curations": len(published_curations),
+        },
+    )
@@ -0,0 +1,274 @@
+"""Houses the benchmarks for the HCI's hot paths and the code that runs them.
+
+Each benchmark is a function that does the work being measured once; `run_benchmarks`
+calls it a number of times and records the wall-clock time and the number of queries of
+each run. Every run happens in a transaction that is rolled back, so benchmarks that
+write (like copying a curation) see the same data every time.
+"""
+
+import json
+import platform
+import statistics
+import subprocess  # noqa: S404 (Only used to ask git for the commit.)
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import django
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from common.benchmark_data import BenchmarkData
+from common.queries import record_queries
+from curation.models import Curation, Evidence
+from curation.score import SCORE_INPUT_FIELDS, get_batch_scores
+from job.worker import run_worker
+
+# The number of curations whose score is computed one at a time.
+SCORE_SAMPLE_SIZE = 100
+
+
+@dataclass
+class BenchmarkContext:
+    """What a benchmark needs: the generated data and a logged in client."""
+
+    data: BenchmarkData
+    client: Client
+
+
+@dataclass
+class BenchmarkResult:
+    """The timings of one benchmark's runs, in milliseconds."""
+
+    name: str
+    description: str
+    runs: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    max_ms: float
+    queries: int
+
+
+BENCHMARKS: dict[str, tuple[str, Callable[[BenchmarkContext], None]]] = {}
+
+
+def benchmark(
+    name: str, description: str
+) -> Callable[[Callable[[BenchmarkContext], None]], Callable[[BenchmarkContext], None]]:
+    """Registers a benchmark under a name.
+
+    Returns:
+        A decorator that registers the function and returns it unchanged.
+    """
+
+    def register(
+        func: Callable[[BenchmarkContext], None],
+    ) -> Callable[[BenchmarkContext], None]:
+        BENCHMARKS[name] = (description, func)
+        return func
+
+    return register
+
+
+def _get(context: BenchmarkContext, url: str, **extra: str) -> None:
+    """GETs the URL, reading a streamed body to the end.
+
+    Raises:
+        AssertionError: If the response isn't a 200.
+    """
+    response = context.client.get(url, **extra)
+    if response.status_code != 200:  # noqa: PLR2004
+        msg = f"GET {url} returned {response.status_code}."
+        raise AssertionError(msg)
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+
+
+@benchmark("curation_score", "Curation.score for 100 curations, one at a time")
+def _curation_score(context: BenchmarkContext) -> None:  # noqa: ARG001
+    for curation in Curation.objects.order_by("pk")[:SCORE_SAMPLE_SIZE]:
+        _ = curation.score
+
+
+@benchmark("batch_scoring", "Batch scoring every piece of evidence")
+def _batch_scoring(context: BenchmarkContext) -> None:  # noqa: ARG001
+    get_batch_scores(list(Evidence.objects.values(*SCORE_INPUT_FIELDS)))
+
+
+@benchmark("curation_list", "The curation search page")
+def _curation_list(context: BenchmarkContext) -> None:
+    _get(context, reverse("curation-list"))
+
+
+@benchmark("curation_list_search", "The curation search page, searching for 'A*'")
+def _curation_list_search(context: BenchmarkContext) -> None:
+    _get(context, reverse("curation-list"), QUERY_STRING="q=A%2A")
+
+
+@benchmark("repo_list", "The HLArepo search page")
+def _repo_list(context: BenchmarkContext) -> None:
+    _get(context, reverse("repo-search"))
+
+
+@benchmark("repo_list_search", "The HLArepo search page, searching for 'A*'")
+def _repo_list_search(context: BenchmarkContext) -> None:
+    _get(context, reverse("repo-search"), QUERY_STRING="q=A%2A")
+
+
+@benchmark("repo_download_all", "The full JSON export, streamed uncompressed")
+def _repo_download_all(context: BenchmarkContext) -> None:
+    _get(context, reverse("repo-download-all"))
+
+
+@benchmark("curation_change", "The history diff page for an updated curation")
+def _curation_change(context: BenchmarkContext) -> None:
+    curation = context.data.changed_curation
+    record = curation.history.latest()  # type: ignore[attr-defined]
+    _get(
+        context,
+        reverse(
+            "curation-change",
+            kwargs={"curation_slug": curation.slug, "history_id": record.history_id},
+        ),
+    )
+
+
+@benchmark("curation_copy", "Copying the published curation with the most evidence")
+def _curation_copy(context: BenchmarkContext) -> None:
+    slug = context.data.published_curation.curation.slug
+    response = context.client.post(
+        reverse("curation-copy", kwargs={"curation_slug": slug})
+    )
+    if response.status_code != 302:  # noqa: PLR2004
+        msg = f"Copying {slug} returned {response.status_code}."
+        raise AssertionError(msg)
+    # The copy is made by the job the request queues.
+    run_worker(burst=True)
+
+
+def run_benchmark(
+    context: BenchmarkContext, name: str, repeat: int = 5
+) -> BenchmarkResult:
+    """Runs one benchmark a number of times, rolling back after each run.
+
+    Returns:
+        The benchmark's timings, and the number of queries a run issues.
+    """
+    description, func = BENCHMARKS[name]
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        with transaction.atomic(), record_queries() as stats:
+            start = time.perf_counter()
+            func(context)
+            timings.append((time.perf_counter() - start) * 1000)
+            transaction.set_rollback(True)
+        queries = stats.count
+    return BenchmarkResult(
+        name=name,
+        description=description,
+        runs=repeat,
+        min_ms=round(min(timings), 3),
+        median_ms=round(statistics.median(timings), 3),
+        mean_ms=round(statistics.fmean(timings), 3),
+        max_ms=round(max(timings), 3),
+        queries=queries,
+    )
+
+
+def run_benchmarks(
+    data: BenchmarkData, names: list[str] | None = None, repeat: int = 5
+) -> list[BenchmarkResult]:
+    """Runs the named benchmarks, or all of them, against the generated data.
+
+    Returns:
+        The results, in the order the benchmarks were registered.
+    """
+    client = Client()
+    client.force_login(data.curator)
+    context = BenchmarkContext(data=data, client=client)
+    return [
+        run_benchmark(context, name, repeat)
+        for name in BENCHMARKS
+        if names is None or name in names
+    ]
+
+
+def get_commit() -> str:
+    """Returns the current git commit, or the deployed version if git isn't there."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607 (Whichever git is on the PATH.)
+            capture_output=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return settings.GIT_SHA
+    return result.stdout.strip()
+
+
+def make_report(
+    results: list[BenchmarkResult], data: BenchmarkData, **options: float
+) -> dict[str, Any]:
+    """Returns the results with what is needed to compare them with another run.
+
+    Returns:
+        A JSON-serializable report.
+    """
+    return {
+        "commit": get_commit(),
+        "created_at": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "options": options,
+        "counts": data.counts,
+        "benchmarks": [asdict(result) for result in results],
+    }
+
+
+def compare_reports(
+    baseline: dict[str, Any], report: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Compares the median timings and query counts of two reports.
+
+    Returns:
+        A row per benchmark in both reports, with the change in median time as a ratio
+        of the new time to the baseline's (so below 1 is faster).
+    """
+    baseline_results = {result["name"]: result for result in baseline["benchmarks"]}
+    rows = []
+    for result in report["benchmarks"]:
+        before = baseline_results.get(result["name"])
+        if before is None:
+            continue
+        rows.append(
+            {
+                "name": result["name"],
+                "baseline_median_ms": before["median_ms"],
+                "median_ms": result["median_ms"],
+                "ratio": round(result["median_ms"] / before["median_ms"], 3)
+                if before["median_ms"]
+                else None,
+                "baseline_queries": before["queries"],
+                "queries": result["queries"],
+            }
+        )
+    return rows
+
+
+def write_report(report: dict[str, Any], path: Path) -> None:
+    """Writes a report as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,181 @@
+"""Houses the shared HTTP client the apps' clients call third-party services with.
+
+Each upstream service (the ClinGen Allele Registry, the Ontology Lookup Service,
+PubMed's E-utilities, and the bioRxiv/medRxiv API) gets one pooled `requests.Session`
+per process, so lookups reuse kept-alive connections instead of opening a new TCP and
+TLS connection every time. Requests that fail with a connection error, a 429, or a 5xx
+are retried a few times with jittered exponential backoff (honoring Retry-After), and
+each upstream's connection pool is capped and blocks when full, which limits how many
+requests the HCI makes to it at once. Every request's latency and outcome are logged and
+added up per upstream in `get_metrics`.
+"""
+
+import functools
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """A third-party service and how to talk to it."""
+
+    name: str
+    description: str
+    # The most connections, and therefore concurrent requests, to the service.
+    max_connections: int = 4
+    retries: int = 3
+    backoff_factor: float = 0.5
+    backoff_jitter: float = 0.5
+    connect_timeout: float = 3.05
+    # How long `common.upstream_cache` treats a response as fresh, how long it treats
+    # a 404 as fresh, and how long past freshness it serves a response while fetching
+    # a new one.
+    cache_ttl: timedelta = timedelta(days=7)
+    negative_cache_ttl: timedelta = timedelta(hours=1)
+    stale_ttl: timedelta = timedelta(days=30)
+
+
+UPSTREAMS = {
+    upstream.name: upstream
+    for upstream in [
+        # CAR IDs never change once they're assigned.
+        Upstream("car", "ClinGen Allele Registry", cache_ttl=timedelta(days=30)),
+        Upstream("ols", "Ontology Lookup Service"),
+        # NCBI allows 10 requests a second with an API key.
+        Upstream("pubmed", "PubMed E-utilities", max_connections=3),
+        # Preprints get new versions, and the most recent one is used.
+        Upstream("rxiv", "bioRxiv/medRxiv API", cache_ttl=timedelta(days=1)),
+    ]
+}
+
+
+@dataclass
+class UpstreamMetrics:
+    """The requests made to an upstream service by this process."""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+_metrics: dict[str, UpstreamMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+@functools.cache
+def get_session(upstream_name: str) -> requests.Session:
+    """Returns the pooled, retrying session for an upstream service."""
+    upstream = UPSTREAMS[upstream_name]
+    retry = Retry(
+        total=upstream.retries,
+        backoff_factor=upstream.backoff_factor,
+        backoff_jitter=upstream.backoff_jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=upstream.max_connections,
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _record(
+    upstream_name: str, duration_ms: float, *, failed: bool, retries: int
+) -> None:
+    with _metrics_lock:
+        metrics = _metrics.setdefault(upstream_name, UpstreamMetrics())
+        metrics.requests += 1
+        metrics.errors += int(failed)
+        metrics.retries += retries
+        metrics.total_ms += duration_ms
+        metrics.max_ms = max(metrics.max_ms, duration_ms)
+
+
+def fetch(
+    upstream_name: str, url: str, timeout: float = 5, **kwargs: object
+) -> requests.Response:
+    """GETs a URL from an upstream service, retrying transient failures.
+
+    Failures left after the retries, including error statuses, raise the usual
+    `requests.exceptions.RequestException` subclasses.
+
+    Args:
+        upstream_name: The key of the service in `UPSTREAMS`.
+        url: The URL to get.
+        timeout: The read timeout in seconds.
+        **kwargs: Passed on to `requests.Session.get`.
+
+    Returns:
+        The successful response.
+    """
+    upstream = UPSTREAMS[upstream_name]
+    start = time.perf_counter()
+    status: int | str = "error"
+    retries = 0
+    try:
+        response = get_session(upstream_name).get(
+            url, timeout=(upstream.connect_timeout, timeout), **kwargs
+        )
+        status = response.status_code
+        retry_state = getattr(response.raw, "retries", None)
+        retries = len(retry_state.history) if retry_state is not None else 0
+        response.raise_for_status()
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        failed = not isinstance(status, int) or status >= 400  # noqa: PLR2004
+        _record(upstream_name, duration_ms, failed=failed, retries=retries)
+        logger.log(
+            logging.WARNING if failed else logging.DEBUG,
+            "upstream=%s status=%s retries=%d ms=%.1f",
+            upstream_name,
+            status,
+            retries,
+            duration_ms,
+        )
+    return response
+
+
+def get_metrics() -> dict[str, dict[str, float]]:
+    """Returns the totals of this process's requests to each upstream service.
+
+    Returns:
+        The request, error, and retry counts, and the total, mean, and maximum latency
+        in milliseconds, keyed by upstream name.
+    """
+    with _metrics_lock:
+        return {
+            name: {
+                **asdict(metrics),
+                "mean_ms": metrics.total_ms / metrics.requests
+                if metrics.requests
+                else 0.0,
+            }
+            for name, metrics in _metrics.items()
+        }
+
+
+def reset_metrics() -> None:
+    """Forgets the requests recorded so far."""
+    with _metrics_lock:
+        _metrics.clear()
@@ -0,0 +1,16 @@
+"""Houses constants used in the models of several apps."""
+
+
+class MetadataStatus:
+    """Defines where an object's lookup in a third-party service stands."""
+
+    PENDING = "PEN"
+    FAILED = "FAI"
+    DONE = "DON"
+
+
+METADATA_STATUS_CHOICES = {
+    MetadataStatus.PENDING: "Pending",
+    MetadataStatus.FAILED: "Failed",
+    MetadataStatus.DONE: "Done",
+}
@@ -1,9 +1,29 @@
-"""Provides a hacky function for getting human-readable history diffs."""
+"""Provides the HCI's history tracking and a hacky function for human-readable diffs.
 
+Every model keeps a `django-simple-history` table with a full copy of the row for each
+save, so saves that change nothing (e.g., submitting a form unchanged) used to add rows
+that only said the object had been saved. `ChangedHistoricalRecords` leaves those out,
+both for single saves and for `bulk_history_create(..., update=True)`. An object's
+tracked values are remembered when it's loaded, so a save that changed a value is
+recorded without another query; only a save that seems to have changed nothing is
+compared against the object's latest history record before being left out.
+`compact_history` removes the rows that add nothing from existing history.
+"""
+
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
 from typing import Any
 
 from django.core.exceptions import FieldDoesNotExist
 from django.db import models
+from django.db.models import Max
+from simple_history.manager import HistoryManager
+from simple_history.models import HistoricalRecords
+
+# How many history records are deleted per query.
+DELETE_BATCH_SIZE = 500
+
+MISSING = object()
 
 
 def resolve_changes(
@@ -42,3 +62,256 @@ def resolve_changes(
             pass
         result.append({"field": label, "old": old_val, "new": new_val})
     return result
+
+
+def get_compared_fields(fields: Iterable[models.Field]) -> list[models.Field]:
+    """Returns the tracked fields whose values decide whether a save changed anything.
+
+    Fields with `auto_now` change on every save, so they're left out.
+    """
+    return [field for field in fields if not getattr(field, "auto_now", False)]
+
+
+def get_tracked_values(obj: Any, fields: Sequence[models.Field]) -> dict[str, Any]:  # noqa: ANN401
+    """Returns an object's values for the fields.
+
+    Deferred fields are read as `MISSING` rather than fetched.
+
+    Returns:
+        The values by attribute name.
+    """
+    return {field.attname: obj.__dict__.get(field.attname, MISSING) for field in fields}
+
+
+def get_changed_objects(
+    history_model: type[models.Model], objs: Sequence[models.Model]
+) -> list[models.Model]:
+    """Returns the objects whose tracked values differ from their last history record.
+
+    Objects whose values differ from the ones they were loaded with are changed without
+    a query; the rest are compared against their latest history records in one query.
+    Objects without history count as changed.
+
+    Returns:
+        The changed objects, in the order given.
+    """
+    fields = get_compared_fields(history_model.tracked_fields)  # type: ignore[attr-defined]
+    unsure = [
+        obj
+        for obj in objs
+        if getattr(obj, "_history_values", None) == get_tracked_values(obj, fields)
+    ]
+    if not unsure:
+        return list(objs)
+    pk_name = history_model.instance_type._meta.pk.attname  # type: ignore[attr-defined] # noqa: SLF001
+    latest_ids = (
+        history_model._default_manager.filter(  # noqa: SLF001
+            **{f"{pk_name}__in": [obj.pk for obj in unsure]}
+        )
+        .order_by()
+        .values(pk_name)
+        .annotate(latest_id=Max("history_id"))
+        .values("latest_id")
+    )
+    latest = {
+        getattr(record, pk_name): record
+        for record in history_model._default_manager.filter(history_id__in=latest_ids)  # noqa: SLF001
+    }
+    unchanged = {
+        id(obj)
+        for obj in unsure
+        if obj.pk in latest
+        and all(
+            getattr(latest[obj.pk], field.attname) == getattr(obj, field.attname)
+            for field in fields
+        )
+    }
+    return [obj for obj in objs if id(obj) not in unchanged]
+
+
+class ChangedHistoryManager(HistoryManager):
+    """Leaves the objects that didn't change out of bulk-created update records."""
+
+    def bulk_history_create(  # noqa: PLR0913
+        self,
+        objs: Iterable[models.Model],
+        batch_size: int | None = None,
+        update: bool = False,  # noqa: FBT001, FBT002
+        default_user: models.Model | None = None,
+        default_change_reason: str = "",
+        default_date: datetime | None = None,
+        custom_historical_attrs: dict | None = None,
+    ) -> list[models.Model] | None:
+        """Bulk creates the history for the objects, skipping unchanged updates.
+
+        Returns:
+            The created history records.
+        """
+        objs = list(objs)
+        if update:
+            objs = get_changed_objects(self.model, objs)
+        records = super().bulk_history_create(
+            objs,
+            batch_size=batch_size,
+            update=update,
+            default_user=default_user,
+            default_change_reason=default_change_reason,
+            default_date=default_date,
+            custom_historical_attrs=custom_historical_attrs,
+        )
+        fields = get_compared_fields(self.model.tracked_fields)
+        for obj in objs:
+            obj._history_values = get_tracked_values(obj, fields)  # noqa: SLF001
+        return records
+
+
+class ChangedHistoricalRecords(HistoricalRecords):
+    """Records an object's history only when a save changes a tracked field.
+
+    Args:
+        compact: Whether `compact_history` may remove the model's history records that
+            add nothing, e.g., False for records that are part of an audit trail.
+    """
+
+    def __init__(self, *args, compact: bool = True, **kwargs) -> None:
+        """Uses a history manager that skips unchanged objects when bulk creating."""
+        kwargs.setdefault("history_manager", ChangedHistoryManager)
+        super().__init__(*args, **kwargs)
+        self.compact = compact
+
+    def finalize(self, sender: type[models.Model], **kwargs) -> None:
+        """Remembers the tracked values of the model's objects as they're loaded."""
+        super().finalize(sender, **kwargs)
+        if self.cls is sender:
+            self.compared_fields = get_compared_fields(self.fields_included(sender))
+            models.signals.post_init.connect(
+                self.remember_values, sender=sender, weak=False
+            )
+
+    def create_history_model(
+        self,
+        model: type[models.Model],
+        inherited: bool,  # noqa: FBT001
+    ) -> type[models.Model]:
+        history_model = super().create_history_model(model, inherited)
+        history_model.history_compactable = self.compact  # type: ignore[attr-defined]
+        return history_model
+
+    def remember_values(self, instance: models.Model, **kwargs) -> None:  # noqa: ARG002
+        """Remembers an object's tracked values."""
+        instance._history_values = get_tracked_values(instance, self.compared_fields)  # noqa: SLF001
+
+    def create_historical_record(
+        self, instance: models.Model, history_type: str, using: str | None = None
+    ) -> None:
+        """Records a save or deletion, unless it's a save that changed nothing."""
+        history_model = getattr(type(instance), self.manager_name).model
+        if history_type == "~" and not get_changed_objects(history_model, [instance]):
+            return
+        super().create_historical_record(instance, history_type, using=using)
+        self.remember_values(instance)
+
+
+def get_kept_ids(history_model: type[models.Model]) -> models.QuerySet | None:
+    """Returns the objects whose history `compact_history` has to keep whole.
+
+    A model lists them with a `get_history_kept_ids` class method, e.g., published
+    curations, whose history is part of their audit trail.
+
+    Returns:
+        A queryset of the objects' primary keys, or None if there are none.
+    """
+    model = history_model.instance_type  # type: ignore[attr-defined]
+    get_ids = getattr(model, "get_history_kept_ids", None)
+    return None if get_ids is None else get_ids()
+
+
+def find_compactable_records(
+    history_model: type[models.Model],
+    *,
+    before: datetime,
+    window: timedelta | None = None,
+) -> list[int]:
+    """Finds the history records that add nothing to an object's history.
+
+    An update record made before `before` is removable if it records the same tracked
+    values as the record before it, so the diffs between the remaining records still
+    show every change. Given a `window`, an update is also removable if the same user
+    made another update to the object within `window` after it; the later record has
+    the values the run of edits ended with, but the intermediate states are lost, so
+    that's opt-in. Records of creations and deletions, records with a change reason,
+    and the history of objects listed by `get_kept_ids` are always kept.
+
+    Returns:
+        The removable records' history IDs.
+    """
+    pk_name = history_model.instance_type._meta.pk.attname  # type: ignore[attr-defined] # noqa: SLF001
+    fields = [
+        field.attname
+        for field in get_compared_fields(history_model.tracked_fields)  # type: ignore[attr-defined]
+    ]
+    records = history_model._default_manager.order_by(  # noqa: SLF001
+        pk_name, "history_date", "history_id"
+    )
+    kept_ids = get_kept_ids(history_model)
+    if kept_ids is not None:
+        records = records.exclude(**{f"{pk_name}__in": kept_ids})
+    removable = []
+    previous = None
+    names = dict.fromkeys(
+        [
+            "history_id",
+            "history_type",
+            "history_date",
+            "history_user_id",
+            "history_change_reason",
+            pk_name,
+            *fields,
+        ]
+    )
+    for record in records.values(*names).iterator(chunk_size=2000):
+        if previous is None or previous[pk_name] != record[pk_name]:
+            previous = record
+            continue
+        is_update = record["history_type"] == "~"
+        if (
+            is_update
+            and record["history_date"] < before
+            and not record["history_change_reason"]
+            and all(previous[name] == record[name] for name in fields)
+        ):
+            removable.append(record["history_id"])
+            continue
+        if (
+            window is not None
+            and is_update
+            and previous["history_type"] == "~"
+            and previous["history_date"] < before
+            and not previous["history_change_reason"]
+            and previous["history_user_id"] == record["history_user_id"]
+            and record["history_date"] - previous["history_date"] <= window
+        ):
+            removable.append(previous["history_id"])
+        previous = record
+    return removable
+
+
+def compact_history(
+    history_model: type[models.Model],
+    *,
+    before: datetime,
+    window: timedelta | None = None,
+    dry_run: bool = False,
+) -> int:
+    """Deletes the history records that `find_compactable_records` finds.
+
+    Returns:
+        How many records were (or, for a dry run, would be) deleted.
+    """
+    removable = find_compactable_records(history_model, before=before, window=window)
+    if not dry_run:
+        for start in range(0, len(removable), DELETE_BATCH_SIZE):
+            history_model._default_manager.filter(  # noqa: SLF001
+                history_id__in=removable[start : start + DELETE_BATCH_SIZE]
+            ).delete()
+    return len(removable)
@@ -0,0 +1,32 @@
+"""Houses the common app's tasks."""
+
+from django.apps import apps
+
+from common.metadata import LOOKUP_TASK, run_metadata_lookup
+from common.upstream_cache import REVALIDATE_TASK, revalidate
+from job.models import Job
+from job.registry import register_task
+
+
+@register_task(LOOKUP_TASK, max_attempts=3)
+def look_up_metadata(job: Job, model: str, pk: int) -> None:
+    """Fills in an object's metadata, leaving it pending until the last attempt.
+
+    Raises:
+        RuntimeError: If the lookup failed, so the job is retried.
+    """
+    if not run_metadata_lookup(apps.get_model(model), pk, final=job.is_last_attempt):
+        msg = f"Unable to look up the metadata of {model} {pk}."
+        raise RuntimeError(msg)
+
+
+@register_task(REVALIDATE_TASK)
+def revalidate_upstream_response(
+    job: Job,  # noqa: ARG001
+    upstream_name: str,
+    url: str,
+    secret_params: list[str],
+    timeout: float,
+) -> None:
+    """Refetches a stale cached response from an upstream service."""
+    revalidate(upstream_name, url, secret_params, timeout)
@@ -0,0 +1,112 @@
+"""Provides a command for benchmarking the HCI's hot paths on synthetic data."""
+
+import json
+import logging
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test.utils import override_settings
+
+from common.benchmark_data import generate_benchmark_data
+from common.benchmarks import (
+    BENCHMARKS,
+    compare_reports,
+    make_report,
+    run_benchmarks,
+    write_report,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates synthetic data in a throwaway test database, times the list, "
+        "detail, scoring, export, history, and copy hot paths against it, and "
+        "optionally writes the results as JSON for comparing across commits."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="How much data to generate; 1 is about 1,000 curations.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="The seed for the synthetic data."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="How many times to run each one."
+        )
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            choices=list(BENCHMARKS),
+            help="Run only these benchmarks.",
+        )
+        parser.add_argument(
+            "--output", type=Path, help="Write the results to this JSON file."
+        )
+        parser.add_argument(
+            "--compare",
+            type=Path,
+            help="Compare the results with those in this JSON file.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["repeat"] < 1:
+            msg = "The repeat must be at least 1."
+            raise CommandError(msg)
+        baseline = None
+        if options["compare"] is not None:
+            with options["compare"].open(encoding="utf-8") as f:
+                baseline = json.load(f)
+
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        # The per-request query logs would swamp the output and the timings.
+        logging.disable(logging.INFO)
+        try:
+            with (
+                TemporaryDirectory() as snapshot_dir,
+                override_settings(
+                    ALLOWED_HOSTS=["testserver"],
+                    DEBUG=False,
+                    REPO_SNAPSHOT_DIR=snapshot_dir,
+                ),
+            ):
+                self.stdout.write("Generating the benchmark data...")
+                data = generate_benchmark_data(options["scale"], options["seed"])
+                self.stdout.write(
+                    ", ".join(f"{count} {name}" for name, count in data.counts.items())
+                )
+                results = run_benchmarks(data, options["only"], options["repeat"])
+                report = make_report(
+                    results,
+                    data,
+                    scale=options["scale"],
+                    seed=options["seed"],
+                    repeat=options["repeat"],
+                )
+        finally:
+            logging.disable(logging.NOTSET)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        for result in results:
+            self.stdout.write(
+                f"{result.name:<24} median {result.median_ms:>10.2f} ms  "
+                f"min {result.min_ms:>10.2f} ms  {result.queries:>5} queries"
+            )
+        if baseline is not None:
+            self.stdout.write(f"Compared with {baseline['commit']}:")
+            for row in compare_reports(baseline, report):
+                ratio = "n/a" if row["ratio"] is None else f"{row['ratio']:.2f}x"
+                self.stdout.write(
+                    f"{row['name']:<24} {row['baseline_median_ms']:>10.2f} ms -> "
+                    f"{row['median_ms']:>10.2f} ms ({ratio}), "
+                    f"{row['baseline_queries']} -> {row['queries']} queries"
+                )
+        if options["output"] is not None:
+            write_report(report, options["output"])
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
@@ -0,0 +1,69 @@
+"""Provides a command for removing the history records that add nothing."""
+
+from argparse import ArgumentParser
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from common.history import compact_history
+
+
+class Command(BaseCommand):
+    help = (
+        "Removes the history records older than --days that add nothing: updates that "
+        "changed no tracked field and, with --window, all but the last of a user's "
+        "updates to an object within that many minutes. Creations, deletions, records "
+        "with a change reason, and the history of published curations are kept."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Keep the history of the last this many days whole (default: 90).",
+        )
+        parser.add_argument(
+            "--window",
+            type=int,
+            help=(
+                "Also collapse a user's updates this many minutes apart, removing "
+                "their intermediate states (default: don't)."
+            ),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the records that would be removed without removing them.",
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002
+        if options["days"] < 0 or (options["window"] or 0) < 0:
+            msg = "--days and --window can't be negative."
+            raise CommandError(msg)
+        before = timezone.now() - timedelta(days=options["days"])
+        window = None
+        if options["window"] is not None:
+            window = timedelta(minutes=options["window"])
+        history_models = [
+            model
+            for model in apps.get_models()
+            if getattr(model, "history_compactable", False)
+        ]
+        total = 0
+        for history_model in history_models:
+            with transaction.atomic():
+                count = compact_history(
+                    history_model,
+                    before=before,
+                    window=window,
+                    dry_run=options["dry_run"],
+                )
+            total += count
+            label = history_model._meta.label  # noqa: SLF001
+            self.stdout.write(f"{label}: {count} records")
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total} history records."))
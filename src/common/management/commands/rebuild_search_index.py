@@ -0,0 +1,18 @@
+"""Provides a command for rebuilding the search index from scratch."""
+
+from django.core.management.base import BaseCommand
+
+from common.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreates the search document of every object with a search page. Run it "
+        "after changing a view's search fields or bulk loading data."
+    )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002
+        counts = rebuild_search_index()
+        for label, count in counts.items():
+            self.stdout.write(f"{label}: {count} documents")
+        self.stdout.write(self.style.SUCCESS("Rebuilt the search index."))
@@ -0,0 +1,55 @@
+"""Provides a command for filling the upstream cache with lookups of given IDs."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from allele.clients import fetch_allele_data
+from disease.clients import fetch_disease_data
+from publication.clients import fetch_pubmed_data, fetch_rxiv_data
+from publication.models import PublicationTypes
+
+LOOKUPS: dict[str, Callable[[str], object]] = {
+    "car": fetch_allele_data,
+    "ols": fetch_disease_data,
+    "pubmed": fetch_pubmed_data,
+    "biorxiv": lambda doi: fetch_rxiv_data(PublicationTypes.BIORXIV, doi),
+    "medrxiv": lambda doi: fetch_rxiv_data(PublicationTypes.MEDRXIV, doi),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Looks up IDs in a third-party service so their responses are cached, e.g., "
+        "to record the responses an offline environment is served."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "upstream", choices=list(LOOKUPS), help="The service to look the IDs up in."
+        )
+        parser.add_argument(
+            "ids",
+            nargs="*",
+            help="Allele names, MONDO IDs, PubMed IDs, or DOIs, per the service.",
+        )
+        parser.add_argument(
+            "--file", type=Path, help="Also look up the IDs in this file, one per line."
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002
+        ids = list(options["ids"])
+        if options["file"] is not None:
+            with options["file"].open(encoding="utf-8") as f:
+                ids.extend(line.strip() for line in f if line.strip())
+        if not ids:
+            msg = "Give at least one ID, or a file of them."
+            raise CommandError(msg)
+
+        lookup = LOOKUPS[options["upstream"]]
+        failed = [id_ for id_ in ids if lookup(id_) is None]
+        for id_ in failed:
+            self.stderr.write(f"Unable to look up {id_}.")
+        cached = len(ids) - len(failed)
+        self.stdout.write(self.style.SUCCESS(f"Cached {cached} of {len(ids)} lookups."))
@@ -0,0 +1,113 @@
+"""Houses the background lookups that fill in new objects' third-party metadata.
+
+Adding an allele, disease, or publication used to look it up in the CAR, OLS, PubMed, or
+bioRxiv/medRxiv while the request waited, holding one of the few Gunicorn workers for as
+long as the service took to answer. Instead, the create views save the object with its
+metadata pending and return at once. The lookup runs as a job (see `job.queue`), which
+is retried with backoff when the service doesn't answer, and the object's detail page
+polls `MetadataStatusView` until it's done.
+"""
+
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from django.db import models
+
+from common.constants.models import MetadataStatus
+from job.models import Job
+from job.queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+# The function that fills in each model's metadata, keyed by model.
+METADATA_LOOKUPS: dict[type[models.Model], Callable[[Any], bool]] = {}
+
+# The task that runs the lookups, registered in `common.jobs`.
+LOOKUP_TASK = "common.look_up_metadata"
+
+
+def register_metadata_lookup(
+    model: type[models.Model],
+) -> Callable[[Callable[[Any], bool]], Callable[[Any], bool]]:
+    """Registers the function that fills in a model's metadata.
+
+    The function is given an object, sets its metadata fields without saving it, and
+    returns whether the lookup succeeded.
+
+    Returns:
+        A decorator that registers the function and returns it unchanged.
+    """
+
+    def register(lookup: Callable[[Any], bool]) -> Callable[[Any], bool]:
+        METADATA_LOOKUPS[model] = lookup
+        return lookup
+
+    return register
+
+
+def get_metadata_key(obj: models.Model) -> str:
+    """Returns the key of an object's lookup job, e.g., "allele.allele:12"."""
+    return f"{obj._meta.label_lower}:{obj.pk}"  # noqa: SLF001
+
+
+def get_metadata_status(obj: models.Model) -> str:
+    """Returns an object's metadata status, counting a lookup with no job as failed.
+
+    A pending lookup whose job is gone, e.g., because it was deleted, would otherwise
+    never finish or be retried.
+    """
+    if (
+        obj.metadata_status == MetadataStatus.PENDING
+        and not Job.objects.active()
+        .filter(task=LOOKUP_TASK, key=get_metadata_key(obj))
+        .exists()
+    ):
+        return MetadataStatus.FAILED
+    return obj.metadata_status
+
+
+def run_metadata_lookup(
+    model: type[models.Model], pk: int, *, final: bool = True
+) -> bool:
+    """Looks up an object's metadata and saves it along with the lookup's outcome.
+
+    Args:
+        model: The object's model.
+        pk: The object's primary key.
+        final: Whether to mark the metadata failed if the lookup fails, rather than
+            leave it pending for a retry.
+
+    Returns:
+        Whether the lookup succeeded, or there was nothing left to look up.
+    """
+    obj: Any = model._default_manager.filter(pk=pk).first()  # noqa: SLF001
+    if obj is None or obj.metadata_status != MetadataStatus.PENDING:
+        return True
+    try:
+        found = METADATA_LOOKUPS[model](obj)
+    except Exception:
+        logger.exception("Unable to look up the metadata of %s %s", model.__name__, pk)
+        found = False
+    if not found and not final:
+        return False
+    obj.metadata_status = MetadataStatus.DONE if found else MetadataStatus.FAILED
+    # Credit the change to whoever added the object, not to "unknown".
+    obj._history_user = obj.added_by  # noqa: SLF001
+    obj.save()
+    return found
+
+
+def request_metadata(obj: models.Model) -> None:
+    """Marks an object's metadata pending and queues a job to look it up."""
+    if obj.metadata_status != MetadataStatus.PENDING:
+        obj.metadata_status = MetadataStatus.PENDING
+        obj.save_without_historical_record(
+            update_fields=["metadata_status", "updated_at"]
+        )
+    enqueue(
+        LOOKUP_TASK,
+        {"model": obj._meta.label_lower, "pk": obj.pk},  # noqa: SLF001
+        key=get_metadata_key(obj),
+        added_by=obj.added_by,
+    )
@@ -0,0 +1,78 @@
+"""Houses the HCI's middleware."""
+
+import logging
+from collections.abc import Callable
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from common.queries import QueryStats, record_queries
+
+logger = logging.getLogger(__name__)
+
+
+def get_query_budget(view_name: str) -> int | None:
+    """Returns the most queries a view may issue, or None if it has no budget."""
+    return getattr(settings, "QUERY_BUDGETS", {}).get(view_name)
+
+
+class QueryBudgetMiddleware:
+    """Records the SQL queries each request issues and reports them.
+
+    The query count, duplicate count, and total database time are sent back in a
+    `Server-Timing` header, logged as one line per request, and attached to the
+    response as `query_stats` for tests. A request that issues more queries than its
+    view's entry in `settings.QUERY_BUDGETS` is logged as a warning.
+
+    Queries a streaming response issues while it is being sent happen after the
+    response leaves the middleware, so they aren't counted.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """Wraps the next middleware or view in the chain."""
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with record_queries() as stats:
+            response = self.get_response(request)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        view_name = resolver_match.view_name if resolver_match else ""
+        budget = get_query_budget(view_name)
+        response.query_stats = stats  # type: ignore[attr-defined]
+        self.add_server_timing(response, stats)
+
+        over_budget = budget is not None and stats.count > budget
+        logger.log(
+            logging.WARNING if over_budget else logging.DEBUG,
+            "view=%s method=%s status=%s queries=%d duplicates=%d db_ms=%.2f budget=%s",
+            view_name or "-",
+            request.method,
+            response.status_code,
+            stats.count,
+            stats.duplicate_count,
+            stats.duration * 1000,
+            budget if budget is not None else "-",
+            extra={
+                "query_stats": {
+                    "view": view_name,
+                    "method": request.method,
+                    "status": response.status_code,
+                    "queries": stats.count,
+                    "duplicates": stats.duplicate_count,
+                    "db_ms": round(stats.duration * 1000, 2),
+                    "budget": budget,
+                }
+            },
+        )
+        return response
+
+    @staticmethod
+    def add_server_timing(response: HttpResponse, stats: QueryStats) -> None:
+        """Appends the database metric to the response's `Server-Timing` header."""
+        metric = (
+            f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries, '
+            f'{stats.duplicate_count} duplicates"'
+        )
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {metric}" if existing else metric
@@ -0,0 +1,105 @@
+# Generated by Django 6.0.6 on 2026-10-18 02:17
+
+from django.db import migrations, models
+
+SQLITE_CREATE = [
+    # An external content FTS5 table mirrors search_document's content without
+    # storing a second copy of it, and the triggers keep the two in step.
+    """
+    CREATE VIRTUAL TABLE search_document_fts USING fts5(
+        content, content='search_document', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER search_document_ai AFTER INSERT ON search_document BEGIN
+        INSERT INTO search_document_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER search_document_ad AFTER DELETE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER search_document_au AFTER UPDATE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO search_document_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS search_document_au",
+    "DROP TRIGGER IF EXISTS search_document_ad",
+    "DROP TRIGGER IF EXISTS search_document_ai",
+    "DROP TABLE IF EXISTS search_document_fts",
+]
+
+def create_search_index(apps, schema_editor):
+    """Creates the FTS5 table over search_document on SQLite."""
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    """Drops the FTS5 table created by create_search_index."""
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "model",
+                    models.CharField(
+                        help_text="The label of the object's model, e.g., curation.curation.",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.BigIntegerField(help_text="The primary key of the object."),
+                ),
+                (
+                    "content",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="The values of the object's search fields, separated by spaces.",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Document",
+                "verbose_name_plural": "Search Documents",
+                "db_table": "search_document",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("model", "object_id"), name="unique_search_document"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 6.0.6 on 2026-10-18 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UpstreamResponse",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "upstream",
+                    models.CharField(
+                        help_text="The key of the service in common.clients.UPSTREAMS, e.g., car.",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "url",
+                    models.TextField(
+                        help_text="The URL that was fetched, without its API key."
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="The SHA-256 of the upstream and URL, which lookups are keyed by.",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(
+                        help_text="The HTTP status of the response."
+                    ),
+                ),
+                (
+                    "content",
+                    models.BinaryField(blank=True, default=b"", help_text="The body."),
+                ),
+                (
+                    "content_type",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="The Content-Type of the response.",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "fetched_at",
+                    models.DateTimeField(help_text="When the response was fetched."),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        help_text="When the response stops being fresh and is refetched."
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Upstream Response",
+                "verbose_name_plural": "Upstream Responses",
+                "db_table": "upstream_response",
+            },
+        ),
+    ]
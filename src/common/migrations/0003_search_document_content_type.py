@@ -0,0 +1,118 @@
+# Generated by Django 6.0.6 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# A copy of the FTS5 table and triggers created by 0001_initial. Rebuilding
+# search_document to change its columns drops its triggers, so they are dropped first
+# and created again afterwards.
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE search_document_fts USING fts5(
+        content, content='search_document', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER search_document_ai AFTER INSERT ON search_document BEGIN
+        INSERT INTO search_document_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER search_document_ad AFTER DELETE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER search_document_au AFTER UPDATE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO search_document_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS search_document_au",
+    "DROP TRIGGER IF EXISTS search_document_ad",
+    "DROP TRIGGER IF EXISTS search_document_ai",
+    "DROP TABLE IF EXISTS search_document_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """Creates the FTS5 table over search_document on SQLite."""
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    """Drops the FTS5 table and the search documents, which are keyed by label.
+
+    The documents are rebuilt with their content types once the database is migrated
+    (see `CommonConfig`).
+    """
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+    apps.get_model("common", "SearchDocument").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0002_upstream_response"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_search_index, create_search_index),
+        migrations.RemoveConstraint(
+            model_name="searchdocument",
+            name="unique_search_document",
+        ),
+        migrations.RemoveField(
+            model_name="searchdocument",
+            name="model",
+        ),
+        migrations.AddField(
+            model_name="searchdocument",
+            name="content_type",
+            field=models.ForeignKey(
+                help_text="The model of the object.",
+                on_delete=django.db.models.deletion.CASCADE,
+                to="contenttypes.contenttype",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="searchdocument",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id"), name="unique_search_document"
+            ),
+        ),
+        migrations.CreateModel(
+            name="SearchDocumentFTS",
+            fields=[
+                (
+                    "document",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="fts",
+                        serialize=False,
+                        to="common.searchdocument",
+                    ),
+                ),
+                ("content", models.TextField()),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "search_document_fts",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
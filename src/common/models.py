@@ -0,0 +1,107 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """Holds the searchable text of one object in a model that has a search page.
+
+    The documents are kept up to date by the receivers in `common/signals.py` and
+    searched by the backends in `common/search.py`. Each indexed model declares its
+    `search_fields` and a `GenericRelation` to its documents, so searches join them in
+    with the ORM. On SQLite they are mirrored into an FTS5 table (`SearchDocumentFTS`)
+    created by this app's migrations.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        help_text="The model of the object.",
+    )
+    object_id = models.BigIntegerField(help_text="The primary key of the object.")
+    content = models.TextField(
+        blank=True,
+        default="",
+        help_text="The values of the object's search fields, separated by spaces.",
+    )
+
+    class Meta:
+        db_table = "search_document"
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id"], name="unique_search_document"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        content_type = ContentType.objects.get_for_id(self.content_type_id)
+        return f"{content_type.app_label}.{content_type.model}:{self.object_id}"
+
+
+class SearchDocumentFTS(models.Model):
+    """Exposes the FTS5 table mirroring `SearchDocument`'s content to the ORM.
+
+    The table is created, and kept in step with `search_document` by triggers, in this
+    app's first migration, so Django doesn't manage it. `rank` is FTS5's BM25 rank of
+    the row against the query it's matched with, lower being better.
+    """
+
+    document = models.OneToOneField(
+        SearchDocument,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="fts",
+    )
+    content = models.TextField()
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "search_document_fts"
+
+    def __str__(self) -> str:
+        return str(self.document_id)
+
+
+class UpstreamResponse(models.Model):
+    """Holds a third-party service's response to a lookup, for `common.upstream_cache`.
+
+    Successful responses and 404s are both kept, each until its upstream's TTL for that
+    kind of response runs out; the row is then replaced by the next lookup.
+    """
+
+    upstream = models.CharField(
+        max_length=20,
+        help_text="The key of the service in common.clients.UPSTREAMS, e.g., car.",
+    )
+    url = models.TextField(help_text="The URL that was fetched, without its API key.")
+    key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="The SHA-256 of the upstream and URL, which lookups are keyed by.",
+    )
+    status_code = models.PositiveSmallIntegerField(
+        help_text="The HTTP status of the response."
+    )
+    content = models.BinaryField(blank=True, default=b"", help_text="The body.")
+    content_type = models.CharField(
+        blank=True,
+        default="",
+        max_length=100,
+        help_text="The Content-Type of the response.",
+    )
+    fetched_at = models.DateTimeField(help_text="When the response was fetched.")
+    expires_at = models.DateTimeField(
+        help_text="When the response stops being fresh and is refetched."
+    )
+
+    class Meta:
+        db_table = "upstream_response"
+        verbose_name = "Upstream Response"
+        verbose_name_plural = "Upstream Responses"
+
+    def __str__(self) -> str:
+        return f"{self.upstream} {self.status_code} {self.url}"
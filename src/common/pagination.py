@@ -0,0 +1,99 @@
+"""Houses the paginators `SearchListView` pages its tables with.
+
+Counting every match of a broad search is as expensive as finding them, so
+`CappedPaginator` stops counting at `settings.SEARCH_RESULT_COUNT_CAP` and the page
+reports "10,000+ results". Pages past the cap are reached with keyset pagination: each
+page after the last numbered one starts after a cursor holding the sort key and primary
+key of the previous page's last row, so the database seeks to it with an index instead
+of reading and discarding every earlier row as an OFFSET does.
+"""
+
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Model, Q, QuerySet
+from django.utils.functional import cached_property
+from django_tables2.paginators import LazyPaginator
+
+DEFAULT_RESULT_COUNT_CAP = 10_000
+
+CURSOR_SEPARATOR = "~"
+
+
+def get_result_count_cap() -> int:
+    """Returns the number of results past which searches stop counting."""
+    return getattr(settings, "SEARCH_RESULT_COUNT_CAP", DEFAULT_RESULT_COUNT_CAP)
+
+
+def get_queryset(object_list: object) -> QuerySet | None:
+    """Returns the queryset behind a table's rows, or None if there isn't one."""
+    data = getattr(object_list, "data", object_list)
+    data = getattr(data, "data", data)
+    return data if isinstance(data, QuerySet) else None
+
+
+class CappedPaginator(Paginator):
+    """Counts the objects only up to the result count cap.
+
+    The count is a single `COUNT(*)` over the first cap + 1 rows, so a search with
+    millions of matches costs no more to count than one with ten thousand.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        """Returns the number of objects, or the cap if there are more."""
+        cap = get_result_count_cap()
+        queryset = get_queryset(self.object_list)
+        if queryset is None:
+            count = len(self.object_list)  # type: ignore[arg-type]
+        else:
+            count = queryset[: cap + 1].count()
+        self.is_capped = count > cap
+        return min(count, cap)
+
+
+class KeysetPaginator(LazyPaginator):
+    """Pages through the rows after a cursor without counting them.
+
+    The queryset is already filtered to the rows after the cursor, so only the first
+    page is ever shown; whether there's a next page is known from fetching one extra
+    row.
+    """
+
+    is_capped = True
+
+
+def encode_cursor(obj: Model, field: str) -> str:
+    """Returns a cursor for the rows after an object, ordered by a field then by key."""
+    value = obj
+    for name in field.split("__"):
+        value = getattr(value, name)
+    return f"{value.isoformat()}{CURSOR_SEPARATOR}{obj.pk}"  # type: ignore[attr-defined]
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """Splits a cursor into its sort key and primary key.
+
+    Returns:
+        The sort key and primary key, or None if the cursor is malformed.
+    """
+    value, _, pk = cursor.rpartition(CURSOR_SEPARATOR)
+    try:
+        return datetime.fromisoformat(value), int(pk)
+    except ValueError:
+        return None
+
+
+def seek(queryset: QuerySet, field: str, cursor: tuple[datetime, int]) -> QuerySet:
+    """Filters a queryset to the rows after a cursor.
+
+    The queryset has to be ordered by the field and then the primary key, descending.
+
+    Returns:
+        The filtered queryset.
+    """
+    value, pk = cursor
+    return queryset.filter(
+        Q(**{f"{field}__lt": value}) | Q(**{field: value, "pk__lt": pk})
+    )
@@ -0,0 +1,70 @@
+"""Houses code for counting and timing the SQL queries a block of code issues.
+
+Queries are recorded with a database execute wrapper rather than `connection.queries`,
+so they are recorded with `DEBUG` off too. A query's signature is its SQL with the
+parameters left as placeholders, so the same query run once per row of a table (an N+1)
+shows up as one signature run many times.
+"""
+
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.db import connections
+
+
+@dataclass
+class QueryStats:
+    """The queries recorded while a block of code ran."""
+
+    count: int = 0
+    duration: float = 0.0
+    signatures: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Returns the signatures run more than once, with how many times each ran."""
+        return {sql: count for sql, count in self.signatures.items() if count > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        """Returns the number of queries that repeated an earlier query's signature."""
+        return sum(count - 1 for count in self.duplicates.values())
+
+    def record(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: object,
+        many: bool,  # noqa: FBT001 (Signature required by execute_wrapper.)
+        context: dict[str, Any],
+    ) -> object:
+        """Runs and records one query; installed with `connection.execute_wrapper`.
+
+        Returns:
+            Whatever the query returns.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.signatures[sql] += 1
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryStats]:
+    """Records the queries issued on every database connection inside the block.
+
+    Yields:
+        The stats, which are filled in as queries run.
+    """
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats.record))
+        yield stats
@@ -0,0 +1,132 @@
+"""Houses the cache of rendered search results behind `SearchListView`'s HTMX searches.
+
+A search box fires a request after every pause in typing, and a room of curators often
+searches for the same things, so the rendered results partial is cached for a short
+time under the view, its query string, and a generation number that every write that
+can change search results bumps. Repeated searches are then served without running
+their search, and no one sees results older than their own last save.
+
+Identical searches that arrive together are coalesced: the first one renders the
+results while the others wait for them to appear in the cache. Searches a person has
+typed past are cancelled by the search box itself (`hx-sync="this:replace"`), so the
+server doesn't track them.
+
+Only the generation lives in the shared cache configured by `settings.CACHES`, so a
+write made by one web process or by the job worker expires the results every other
+process serves, at the cost of one read per search. The finished results and the locks
+that coalesce searches live in each process's own memory (the "search-results" cache),
+so serving, waiting for, and caching results never write to the database.
+"""
+
+import hashlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.http import HttpRequest
+
+GENERATION_KEY = "search-results:generation"
+
+# The per-process cache holding finished results and the locks.
+RESULTS_CACHE = "search-results"
+
+# How long cached results are served for, in seconds.
+DEFAULT_TIMEOUT = 30
+
+# How long a search waits for an identical one to render its results, in seconds.
+COALESCE_WAIT = 2.0
+
+COALESCE_POLL_INTERVAL = 0.05
+
+
+@dataclass(frozen=True)
+class CachedResults:
+    """A rendered results partial and its ETag."""
+
+    content: bytes
+    content_type: str
+    etag: str
+
+
+def get_timeout() -> int:
+    """Returns how long cached results are served for, in seconds."""
+    return getattr(settings, "SEARCH_RESULTS_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def get_generation() -> int:
+    """Returns the current generation of cached search results.
+
+    A generation lost from the shared cache (e.g., culled) starts again from the
+    current time rather than from 0, so it can't match results cached before.
+    """
+    return cache.get_or_set(GENERATION_KEY, time.time_ns, timeout=None)
+
+
+def _bump() -> None:
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_generation() -> None:
+    """Makes every cached search result stale once the current transaction commits.
+
+    Bumping any sooner would let another process cache results that don't have the
+    writes yet under the new generation.
+    """
+    transaction.on_commit(_bump)
+
+
+def make_key(view_name: str, request: HttpRequest) -> str:
+    """Returns the cache key of a search's results.
+
+    The key covers the whole query string (the query, page, sort, and cursor), whether
+    the user is logged in, and the current generation.
+    """
+    params = sorted(
+        (name, value) for name, values in request.GET.lists() for value in values
+    )
+    digest = hashlib.sha256(repr(params).encode()).hexdigest()
+    authenticated = int(request.user.is_authenticated)
+    return f"search-results:{get_generation()}:{view_name}:{authenticated}:{digest}"
+
+
+def get_or_render(key: str, render: Callable[[], CachedResults]) -> CachedResults:
+    """Returns cached results, waiting for an identical search or rendering them.
+
+    A search that waits out `COALESCE_WAIT` without the results appearing renders them
+    itself.
+
+    Returns:
+        The results.
+    """
+    results_cache = caches[RESULTS_CACHE]
+    results = results_cache.get(key)
+    if results is not None:
+        return results
+    lock_key = f"{key}:lock"
+    has_lock = results_cache.add(lock_key, 1, timeout=COALESCE_WAIT)
+    if not has_lock:
+        deadline = time.monotonic() + COALESCE_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(COALESCE_POLL_INTERVAL)
+            results = results_cache.get(key)
+            if results is not None:
+                return results
+    try:
+        results = render()
+        results_cache.set(key, results, timeout=get_timeout())
+    finally:
+        if has_lock:
+            results_cache.delete(lock_key)
+    return results
+
+
+def make_results(content: bytes, content_type: str) -> CachedResults:
+    """Returns rendered results with an ETag derived from their content."""
+    digest = hashlib.sha256(content).hexdigest()[:32]
+    return CachedResults(content=content, content_type=content_type, etag=f'"{digest}"')
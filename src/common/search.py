@@ -0,0 +1,285 @@
+"""Houses the full-text search index and the backends `SearchListView` searches with.
+
+Every model with a search page declares its `search_fields` and a `GenericRelation`
+named `search_documents`. Each object of those models has a `SearchDocument` holding the
+values of its search fields, including ones on related objects like a curation's allele
+name, so a search reads one indexed table instead of ORing `LIKE '%q%'` across every
+field and join. The documents are updated by the receivers in `common/signals.py`
+whenever an object, or an object its document includes fields from, is saved, and are
+deleted along with their object.
+
+On SQLite, the words of the query are matched as prefixes in an FTS5 table and the
+results ranked with BM25. Other databases, and models without search documents, fall
+back to the unindexed `__icontains` search.
+"""
+
+import functools
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from itertools import batched
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import F, Q, QuerySet
+from django.db.models.sql.compiler import SQLCompiler
+from django.utils.module_loading import import_string
+
+from common.models import SearchDocument, SearchDocumentFTS
+
+# The number of objects indexed per query when rebuilding the index.
+INDEX_BATCH_SIZE = 500
+
+# The characters FTS5's default tokenizer treats as part of a word; everything else,
+# including the "*" and ":" in allele names, separates words.
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+VENDOR_BACKENDS = {"sqlite": "common.search.SQLiteSearchBackend"}
+
+
+@SearchDocumentFTS._meta.get_field("content").register_lookup  # noqa: SLF001
+class Match(models.Lookup):
+    """Matches an FTS5 column against a full-text query, e.g., `'"A 02"*'`."""
+
+    lookup_name = "match"
+
+    def as_sql(
+        self, compiler: SQLCompiler, connection: BaseDatabaseWrapper
+    ) -> tuple[str, list]:
+        """Returns the MATCH condition.
+
+        Returns:
+            The SQL and its parameters.
+        """
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+@functools.cache
+def get_indexed_models() -> dict[type[models.Model], list[str]]:
+    """Returns the search fields of each model that declares them."""
+    return {
+        model: list(model.search_fields)  # type: ignore[attr-defined]
+        for model in apps.get_models()
+        if getattr(model, "search_fields", None)
+    }
+
+
+def get_search_fields(model: type[models.Model]) -> list[str]:
+    """Returns the fields a model's search page matches, if it has one."""
+    return get_indexed_models().get(model, [])
+
+
+@functools.cache
+def get_dependents(model: type[models.Model]) -> list[tuple[type[models.Model], str]]:
+    """Finds the indexed models whose documents include fields of another model.
+
+    For example, a curation's document includes its allele's name, so saving an allele
+    has to update the documents of the curations with that allele.
+
+    Returns:
+        The indexed models, each with the lookup from it to the other model.
+    """
+    dependents = []
+    for indexed_model, fields in get_indexed_models().items():
+        lookups = set()
+        for field in fields:
+            path = field.split("__")[:-1]
+            related_model = indexed_model
+            for i, name in enumerate(path):
+                related_model = related_model._meta.get_field(name).related_model  # noqa: SLF001
+                if related_model is model:
+                    lookups.add("__".join(path[: i + 1]))
+        dependents.extend((indexed_model, lookup) for lookup in sorted(lookups))
+    return dependents
+
+
+@functools.cache
+def get_relevant_fields(model: type[models.Model]) -> frozenset[str]:
+    """Returns the names of a model's fields that any search document includes."""
+    relevant = {field.split("__")[0] for field in get_search_fields(model)}
+    for dependent, lookup in get_dependents(model):
+        relevant.update(
+            field.removeprefix(f"{lookup}__").split("__")[0]
+            for field in get_search_fields(dependent)
+            if field.startswith(f"{lookup}__")
+        )
+    return frozenset(relevant)
+
+
+@functools.cache
+def can_change_search_results(model: type[models.Model]) -> bool:
+    """Returns whether writes to a model can change what a search page shows.
+
+    That's true of the indexed models, the models their documents include fields of,
+    like a curation's allele, and the models with a foreign key to an indexed model,
+    like the evidence a curation's suggested classification is scored from. History
+    records are left out, since they're only written alongside a write that counts.
+    """
+    if model in get_indexed_models() or get_dependents(model):
+        return True
+    if hasattr(model, "instance_type"):  # A `simple_history` historical model.
+        return False
+    return any(
+        field.many_to_one and field.related_model in get_indexed_models()
+        for field in model._meta.get_fields()  # noqa: SLF001
+    )
+
+
+def get_indexed_values(instance: models.Model) -> dict[str, object]:
+    """Returns the loaded values of an object's fields that search documents include.
+
+    Fields that weren't loaded, like deferred ones, are left out.
+    """
+    values = {}
+    for name in get_relevant_fields(type(instance)):
+        field = instance._meta.get_field(name)  # noqa: SLF001
+        if (
+            field.concrete
+            and not field.many_to_many
+            and field.attname in vars(instance)
+        ):
+            values[field.attname] = vars(instance)[field.attname]
+    return values
+
+
+def index_objects(model: type[models.Model], pks: Iterable[int] | QuerySet) -> None:
+    """Creates or updates the search documents of some of a model's objects."""
+    rows = model._default_manager.filter(pk__in=pks).values_list(  # noqa: SLF001
+        "pk", *get_search_fields(model)
+    )
+    values_by_pk: dict[int, dict[str, None]] = defaultdict(dict)
+    for pk, *values in rows:
+        # A dict keeps the values in order without repeating any.
+        values_by_pk[pk].update(
+            (str(value), None) for value in values if value not in {None, ""}
+        )
+    content_type = ContentType.objects.get_for_model(model)
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(
+                content_type=content_type, object_id=pk, content=" ".join(values)
+            )
+            for pk, values in values_by_pk.items()
+        ],
+        batch_size=INDEX_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id"],
+        update_fields=["content"],
+    )
+
+
+def rebuild_search_index() -> dict[str, int]:
+    """Recreates every search document from scratch.
+
+    This is needed after changing a model's search fields, or after creating or
+    updating objects in ways that don't send signals, like `bulk_create`.
+
+    Returns:
+        The number of documents for each model, keyed by model label.
+    """
+    SearchDocument.objects.all().delete()
+    counts = {}
+    for model in get_indexed_models():
+        pks = model._default_manager.values_list("pk", flat=True).order_by("pk")  # noqa: SLF001
+        for batch in batched(pks.iterator(), INDEX_BATCH_SIZE, strict=False):
+            index_objects(model, batch)
+        counts[model._meta.label_lower] = SearchDocument.objects.filter(  # noqa: SLF001
+            content_type=ContentType.objects.get_for_model(model)
+        ).count()
+    return counts
+
+
+def ensure_search_index() -> None:
+    """Builds the search index if it's empty but there are objects to index."""
+    if SearchDocument.objects.exists():
+        return
+    if any(model._default_manager.exists() for model in get_indexed_models()):  # noqa: SLF001
+        rebuild_search_index()
+
+
+class SearchBackend:
+    """Filters a queryset down to the objects that match a search query."""
+
+    def search(
+        self, queryset: QuerySet, query: str, search_fields: list[str]
+    ) -> QuerySet:
+        """Returns the objects that match the query.
+
+        Raises:
+            NotImplementedError: Always; subclasses implement this.
+        """
+        raise NotImplementedError
+
+
+class ContainsSearchBackend(SearchBackend):
+    """ORs case-insensitive substring matches across the search fields.
+
+    This needs no index, but it has to scan every row (and every joined row).
+    """
+
+    def search(
+        self, queryset: QuerySet, query: str, search_fields: list[str]
+    ) -> QuerySet:
+        """Returns the objects with a search field that contains the query.
+
+        Returns:
+            The filtered queryset.
+        """
+        filters = Q()
+        for field in search_fields:
+            filters |= Q(**{f"{field}__icontains": query})
+        return queryset.filter(filters)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Matches each word of the query as a prefix with SQLite's FTS5.
+
+    Each whitespace-separated term of the query is matched as a phrase, with the last
+    word a prefix, so "A*02" matches "A*02:01" but not "A*01:02". The documents are
+    joined into the queryset's own query, so filtering, ranking, and counting the
+    results each take a single query. The queryset is annotated with a `search_rank`,
+    and `rank_ordering` orders it best match first (lower BM25 ranks are better).
+    """
+
+    rank_ordering = "search_rank"
+
+    def get_match(self, query: str) -> str | None:
+        """Returns the FTS5 query for a search query.
+
+        Returns:
+            The FTS5 query, or None if the search query has no words to match.
+        """
+        phrases = []
+        for term in query.split():
+            tokens = TOKEN_RE.findall(term)
+            if tokens:
+                phrases.append(f'"{" ".join(tokens)}"*')
+        return " AND ".join(phrases) or None
+
+    def search(
+        self, queryset: QuerySet, query: str, search_fields: list[str]
+    ) -> QuerySet:
+        """Returns the objects whose search documents match the query.
+
+        Returns:
+            The filtered queryset, annotated with each object's `search_rank`.
+        """
+        match = self.get_match(query)
+        if queryset.model not in get_indexed_models() or match is None:
+            return ContainsSearchBackend().search(queryset, query, search_fields)
+        return queryset.filter(search_documents__fts__content__match=match).annotate(
+            search_rank=F("search_documents__fts__rank")
+        )
+
+
+def get_search_backend() -> SearchBackend:
+    """Returns the backend in `settings.SEARCH_BACKEND`, or the database's default."""
+    path = getattr(settings, "SEARCH_BACKEND", None) or VENDOR_BACKENDS.get(
+        connection.vendor, "common.search.ContainsSearchBackend"
+    )
+    return import_string(path)()
@@ -0,0 +1,93 @@
+"""Houses signal receivers for the common app."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from common.results_cache import bump_generation
+from common.search import (
+    can_change_search_results,
+    get_dependents,
+    get_indexed_models,
+    get_indexed_values,
+    get_relevant_fields,
+    index_objects,
+)
+
+
+def remember_indexed_values(instance: models.Model, **kwargs) -> None:  # noqa: ARG001
+    """Remembers the values of an object's fields that search documents include."""
+    instance._indexed_values = get_indexed_values(instance)  # noqa: SLF001
+
+
+def connect_post_init_receivers() -> None:
+    """Connects `remember_indexed_values` to the models search documents include.
+
+    Every object loaded sends `post_init`, so only the indexed models and the models
+    their documents include fields of receive it.
+    """
+    for model in apps.get_models():
+        if get_relevant_fields(model):
+            post_init.connect(remember_indexed_values, sender=model)
+
+
+@receiver(post_save)
+def update_search_documents(
+    sender: type[models.Model],
+    instance: models.Model,
+    created: bool,  # noqa: FBT001
+    update_fields: frozenset[str] | None = None,
+    **kwargs,  # noqa: ARG001
+) -> None:
+    """Updates the search documents that include the saved object's fields.
+
+    Saves that don't change any of those fields, like a curation's status changing,
+    don't touch the index.
+    """
+    relevant_fields = get_relevant_fields(sender)
+    if not relevant_fields:
+        return
+    if update_fields is not None and relevant_fields.isdisjoint(update_fields):
+        return
+    indexed_values = get_indexed_values(instance)
+    unchanged = indexed_values == getattr(instance, "_indexed_values", None)
+    instance._indexed_values = indexed_values  # noqa: SLF001
+    if unchanged and not created:
+        return
+    if sender in get_indexed_models():
+        index_objects(sender, [instance.pk])
+    for dependent, lookup in get_dependents(sender):
+        index_objects(
+            dependent,
+            dependent._default_manager.filter(**{lookup: instance.pk}).values("pk"),  # noqa: SLF001
+        )
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(m2m_changed)
+def expire_search_results(sender: type[models.Model], **kwargs) -> None:  # noqa: ARG001
+    """Makes the cached search results stale after a write that can change them.
+
+    Writes to other models, like a running job's progress or a cached upstream
+    response, leave the results cached.
+    """
+    if can_change_search_results(sender):
+        bump_generation()
+
+
+@contextmanager
+def bulk_writes() -> Iterator[None]:
+    """Runs bulk writes in a transaction, then expires the cached search results.
+
+    Bulk writes don't send the signals that `expire_search_results` receives, so code
+    writing in bulk does so in this block instead. The results expire when the block
+    commits, and not at all if it's rolled back.
+    """
+    with transaction.atomic():
+        bump_generation()
+        yield
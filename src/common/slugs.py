@@ -0,0 +1,102 @@
+"""Houses the allocation of new objects' primary keys and slugs.
+
+A slug is a model's prefix and its object's zero-padded primary key, e.g., A000001. It
+used to be written by a second save once the INSERT had handed back the primary key,
+which doubled the writes and the history records for every new object. Instead, the
+primary keys are taken from the table's own sequence before the INSERT, so the slug goes
+in with the rest of the row, and a batch of objects can get theirs in one query before
+`bulk_create`. Since it's the same sequence that the table's INSERTs without a primary
+key use, fixtures, the admin, and raw inserts can't collide with an allocated key.
+"""
+
+from collections.abc import Sequence
+from typing import ClassVar
+
+from django.db import NotSupportedError, connection, models
+
+
+def allocate_ids(model: type[models.Model], count: int) -> list[int]:
+    """Takes the next primary keys from a model's table's sequence.
+
+    On SQLite, the sequence is the table's row in `sqlite_sequence`, which Django's
+    AUTOINCREMENT tables keep at the largest primary key they've used. Keys that are
+    taken but never inserted, e.g., because the transaction rolled back, are skipped,
+    as they would be by the database.
+
+    Returns:
+        The primary keys, in ascending order.
+
+    Raises:
+        NotSupportedError: If the database isn't SQLite or PostgreSQL.
+    """
+    if count <= 0:
+        return []
+    table = model._meta.db_table  # noqa: SLF001
+    column = model._meta.pk.column  # noqa: SLF001
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                "UPDATE sqlite_sequence SET seq = seq + %s WHERE name = %s "
+                "RETURNING seq",
+                [count, table],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                # The table has never had a row inserted, e.g., right after migrating.
+                quote_name = connection.ops.quote_name
+                sql = (
+                    "INSERT INTO sqlite_sequence (name, seq) "  # noqa: S608 (The names come from the model.)
+                    f"SELECT %s, COALESCE(MAX({quote_name(column)}), 0) + %s "
+                    f"FROM {quote_name(table)} RETURNING seq"
+                )
+                cursor.execute(sql, [table, count])
+                row = cursor.fetchone()
+            last = row[0]
+            return list(range(last - count + 1, last + 1))
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                "FROM generate_series(1, %s)",
+                [table, column, count],
+            )
+            return sorted(row[0] for row in cursor.fetchall())
+    msg = f"Allocating primary keys isn't supported on {connection.vendor}."
+    raise NotSupportedError(msg)
+
+
+def assign_slugs(objs: Sequence["SlugMixin"]) -> None:
+    """Gives new objects their primary keys and slugs, e.g., before `bulk_create`.
+
+    Objects that already have a primary key keep it, and objects that already have a
+    slug keep it. The objects must all be of the same model.
+    """
+    if not objs:
+        return
+    model = type(objs[0])
+    new = [obj for obj in objs if obj.pk is None]
+    for obj, pk in zip(new, allocate_ids(model, len(new)), strict=True):
+        obj.pk = pk
+    for obj in objs:
+        if not obj.slug:
+            obj.slug = f"{model.slug_prefix}{obj.pk:06d}"
+
+
+class SlugMixin:
+    """Gives a model's new objects their slugs in the same write that inserts them.
+
+    Models using it have a `slug` field and set `slug_prefix`.
+    """
+
+    slug_prefix: ClassVar[str]
+    pk: int | None
+    slug: str
+    _state: models.base.ModelState
+
+    def save(self, *args, **kwargs) -> None:
+        """Allocates a new object's primary key and slug, then saves it."""
+        if self._state.adding:
+            if self.pk is None:
+                # The primary key will be new, so there's no row to try to update first.
+                kwargs.setdefault("force_insert", True)
+            assign_slugs([self])
+        super().save(*args, **kwargs)  # type: ignore[misc]
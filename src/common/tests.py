@@ -1,14 +1,63 @@
 """Houses code used commonly in tests."""
 
 import logging
+import threading
 from contextlib import contextmanager
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
 from typing import Any
+from unittest.mock import patch
 
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError
+from simple_history.manager import HistoryManager
 
+from allele.models import Allele
 from auth_.models import UserProfile
+from common.benchmark_data import generate_benchmark_data
+from common.benchmarks import (
+    BENCHMARKS,
+    compare_reports,
+    make_report,
+    run_benchmarks,
+)
+from common.clients import fetch, get_metrics, get_session, reset_metrics
+from common.constants.models import MetadataStatus
+from common.history import compact_history
+from common.middleware import get_query_budget
+from common.models import SearchDocument, UpstreamResponse
+from common.queries import record_queries
+from common.results_cache import (
+    GENERATION_KEY,
+    RESULTS_CACHE,
+    get_generation,
+    get_or_render,
+    make_results,
+)
+from common.search import (
+    can_change_search_results,
+    get_search_backend,
+    rebuild_search_index,
+)
+from common.signals import bulk_writes
+from common.slugs import allocate_ids, assign_slugs
+from common.upstream_cache import REVALIDATE_TASK, fetch_cached, restore_secrets
+from curation.models import Curation, Evidence
+from disease.models import Disease
+from job.models import Job
+from job.worker import run_worker
+from repo.models import PublishedCuration
 
 
 class SuppressRequestLoggingMixin:
@@ -26,6 +75,42 @@ class SuppressRequestLoggingMixin:
             logger.setLevel(previous_level)
 
 
+class QueryBudgetTestMixin:
+    """Mixin that asserts a view stays within its query budget.
+
+    Budgets are set per URL name in `settings.QUERY_BUDGETS`; the query counts come
+    from `common.middleware.QueryBudgetMiddleware`.
+    """
+
+    client: Any
+    fail: Any
+
+    def assertWithinQueryBudget(self, url: str, **extra: str) -> HttpResponse:  # noqa: N802
+        """GETs the URL and fails if the view issued more queries than its budget.
+
+        The failure message lists the queries that were run more than once, which is
+        usually where the extra queries come from.
+
+        Returns:
+            The response.
+        """
+        response = self.client.get(url, **extra)
+        view_name = response.resolver_match.view_name
+        budget = get_query_budget(view_name)
+        if budget is None:
+            self.fail(f"{view_name} has no entry in settings.QUERY_BUDGETS.")
+        stats = response.query_stats
+        if stats.count > budget:
+            duplicates = "\n".join(
+                f"  {count}x {sql}" for sql, count in stats.duplicates.items()
+            )
+            self.fail(
+                f"{view_name} issued {stats.count} queries; its budget is {budget}."
+                + (f"\nDuplicated queries:\n{duplicates}" if duplicates else "")
+            )
+        return response
+
+
 class BaseViewTestMixin:
     """Base mixin with common view tests."""
 
@@ -194,3 +279,663 @@ class SearchListViewTest(ProtectedViewTestMixin, TestCase):
         self.assertContains(response_empty_q, "A000001")
         self.assertContains(response_empty_q, "A000002")
         self.assertContains(response_empty_q, "A000003")
+
+
+class SearchIndexTest(TestCase):
+    """Tests for the search documents and the indexed search backend."""
+
+    fixtures = ["test_alleles.json", "test_diseases.json", "test_curations.json"]
+
+    def search(self, query: str) -> list[str]:
+        alleles = get_search_backend().search(
+            Allele.objects.all(), query, ["slug", "name", "car_id"]
+        )
+        return list(alleles.values_list("slug", flat=True))
+
+    def get_content(self, obj: Allele | Curation) -> str:
+        return obj.search_documents.get().content
+
+    def test_loaded_objects_are_indexed(self):
+        self.assertEqual(
+            self.get_content(Allele.objects.get(pk=1)), "A000001 A*01:02:03 XAHLA123"
+        )
+
+    def test_document_includes_related_fields(self):
+        content = self.get_content(Curation.objects.get(pk=1))
+        self.assertIn("C000001", content)
+        self.assertIn("A*01:02:03", content)
+
+    def test_renaming_an_allele_reindexes_its_curations(self):
+        allele = Allele.objects.get(pk=1)
+        allele.name = "A*99:01"
+        allele.save()
+        self.assertIn("A*99:01", self.get_content(allele))
+        self.assertIn("A*99:01", self.get_content(Curation.objects.get(pk=1)))
+
+    def test_unrelated_changes_do_not_touch_the_index(self):
+        allele = Allele.objects.get(pk=1)
+        with record_queries() as stats:
+            allele.save()
+        self.assertFalse(any("search_document" in sql for sql in stats.signatures))
+
+    def test_only_indexed_and_included_models_remember_indexed_values(self):
+        self.assertIn("_indexed_values", vars(Allele.objects.get(pk=1)))
+        self.assertIn("_indexed_values", vars(Disease.objects.first()))
+        job = Job.objects.create(task="common.look_up_metadata")
+        self.assertNotIn("_indexed_values", vars(Job.objects.get(pk=job.pk)))
+
+    def test_deleted_objects_are_unindexed(self):
+        Allele.objects.create(name="DQB1*01:01", car_id="XAHLA000")
+        allele = Allele.objects.get(name="DQB1*01:01")
+        allele.delete()
+        self.assertFalse(
+            SearchDocument.objects.filter(
+                content_type=ContentType.objects.get_for_model(Allele),
+                object_id=allele.pk,
+            ).exists()
+        )
+
+    def test_words_match_as_prefixes(self):
+        self.assertEqual(self.search("A*01"), ["A000001"])
+        self.assertEqual(self.search("xahla4"), ["A000002"])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search("A*01 XAHLA123"), ["A000001"])
+        self.assertEqual(self.search("A*01 XAHLA456"), [])
+
+    def test_queries_without_words_fall_back_to_substring_matching(self):
+        self.assertEqual(len(self.search("*")), 3)
+
+    def test_rebuilding_recreates_every_document(self):
+        SearchDocument.objects.all().delete()
+        counts = rebuild_search_index()
+        self.assertEqual(counts["allele.allele"], 3)
+        self.assertEqual(counts["curation.curation"], 1)
+        self.assertEqual(self.search("C*07"), ["A000003"])
+
+
+class SearchPaginationTest(TestCase):
+    """Tests for how `SearchListView` counts and pages through results."""
+
+    fixtures = ["test_alleles.json"]
+    url = reverse("allele-list")
+
+    def setUp(self):
+        user = User.objects.create(username="curator")
+        UserProfile.objects.create(
+            user=user, has_signed_phi_agreement=True, has_curation_permissions=True
+        )
+        self.client.force_login(user)
+        for i in range(30):
+            Allele.objects.create(name=f"DQB1*{i + 1:02d}:01")
+
+    def get_slugs(self, response: HttpResponse) -> list[str]:
+        return [row.record.slug for row in response.context["table"].page.object_list]
+
+    def test_results_are_counted_once(self):
+        with record_queries() as stats:
+            response = self.client.get(self.url, {"q": "DQB1"})
+        counts = [sql for sql in stats.signatures if "COUNT(" in sql.upper()]
+        self.assertEqual(len(counts), 1)
+        self.assertContains(response, "30 results")
+
+    @override_settings(SEARCH_RESULT_COUNT_CAP=10)
+    def test_counts_are_capped(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, "10+ results")
+        self.assertEqual(len(self.get_slugs(response)), 10)
+        self.assertIsNotNone(response.context["next_page_url"])
+
+    @override_settings(SEARCH_RESULT_COUNT_CAP=10)
+    def test_pages_past_the_cap_by_cursor(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url + first.context["next_page_url"])
+        self.assertContains(second, "More results")
+        self.assertIsNone(second.context["next_page_url"])
+        slugs = self.get_slugs(first) + self.get_slugs(second)
+        self.assertEqual(
+            slugs,
+            list(
+                Allele.objects.order_by("-updated_at", "-pk").values_list(
+                    "slug", flat=True
+                )
+            ),
+        )
+
+    @override_settings(SEARCH_RESULT_COUNT_CAP=10)
+    def test_no_cursor_when_sorted_by_a_column(self):
+        response = self.client.get(self.url, {"sort": "name"})
+        self.assertIsNone(response.context["next_page_url"])
+
+    def test_malformed_cursors_are_ignored(self):
+        response = self.client.get(self.url, {"after": "not-a-cursor"})
+        self.assertContains(response, "33 results")
+
+    @override_settings(SEARCH_RESULT_COUNT_CAP=33)
+    def test_counts_up_to_the_cap_are_exact(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["result_count"], 33)
+        self.assertFalse(response.context["result_count_capped"])
+
+
+class SearchResultsCacheTest(TestCase):
+    """Tests for how `SearchListView` caches and coalesces HTMX searches."""
+
+    fixtures = ["test_alleles.json"]
+    url = reverse("allele-list")
+
+    def setUp(self):
+        cache.clear()
+        caches[RESULTS_CACHE].clear()
+        user = User.objects.create(username="curator")
+        UserProfile.objects.create(
+            user=user, has_signed_phi_agreement=True, has_curation_permissions=True
+        )
+        self.client.force_login(user)
+
+    def search(self, query: str, **extra: str) -> HttpResponse:
+        return self.client.get(self.url, {"q": query}, HTTP_HX_REQUEST="true", **extra)
+
+    def test_repeated_searches_are_served_from_the_cache(self):
+        self.search("A*01")
+        with record_queries() as stats:
+            response = self.search("A*01")
+        self.assertContains(response, "A000001")
+        self.assertFalse(any('"allele"' in sql for sql in stats.signatures))
+
+    def test_searches_dont_write_to_the_database(self):
+        get_generation()  # Stored once, by the first search after a deploy.
+        for _ in range(2):
+            with record_queries() as stats:
+                self.search("A*01")
+            self.assertFalse(
+                [sql for sql in stats.signatures if not sql.startswith("SELECT")]
+            )
+
+    def test_a_lost_generation_doesnt_serve_older_results(self):
+        generation = get_generation()
+        cache.delete(GENERATION_KEY)
+        self.assertNotEqual(get_generation(), generation)
+
+    def test_writes_expire_cached_results(self):
+        self.search("DQB1")
+        with self.captureOnCommitCallbacks(execute=True):
+            Allele.objects.create(name="DQB1*06:02")
+        self.assertContains(self.search("DQB1"), "DQB1*06:02")
+
+    def test_only_writes_that_can_change_results_expire_them(self):
+        now = timezone.now()
+        with self.captureOnCommitCallbacks() as callbacks:
+            UpstreamResponse.objects.create(
+                upstream="car",
+                url="/",
+                key="car:/",
+                status_code=200,
+                fetched_at=now,
+                expires_at=now,
+            )
+            Job.objects.create(task="common.look_up_metadata").set_progress(1)
+        self.assertEqual(callbacks, [])
+        self.assertTrue(can_change_search_results(Evidence))
+
+    def test_writes_bump_the_generation_once_committed(self):
+        generation = get_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            Allele.objects.get(slug="A000001").save()
+            self.assertEqual(get_generation(), generation)
+        self.assertGreater(get_generation(), generation)
+
+    def test_bulk_writes_expire_cached_results_once_committed(self):
+        generation = get_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            with bulk_writes():
+                Allele.objects.bulk_create([Allele(name="DQB1*06:02")])
+            self.assertEqual(get_generation(), generation)
+        self.assertGreater(get_generation(), generation)
+
+        generation = get_generation()
+        with (
+            self.captureOnCommitCallbacks(execute=True),
+            self.assertRaises(ValueError),
+            bulk_writes(),
+        ):
+            raise ValueError
+        self.assertEqual(get_generation(), generation)
+
+    def test_current_copies_are_not_resent(self):
+        etag = self.search("A*01")["ETag"]
+        response = self.search("A*01", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_partials_vary_by_hx_request(self):
+        response = self.search("A*01")
+        self.assertIn("HX-Request", response["Vary"])
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_full_pages_are_not_cached(self):
+        response = self.client.get(self.url, {"q": "A*01"})
+        self.assertNotIn("ETag", response)
+
+    def test_waiting_searches_get_the_first_ones_results(self):
+        results = make_results(b"results", "text/html")
+        results_cache = caches[RESULTS_CACHE]
+        results_cache.add("key:lock", 1)  # An identical search is rendering.
+        # It finishes while this one waits.
+        threading.Timer(0.1, results_cache.set, ["key", results]).start()
+        self.assertEqual(get_or_render("key", lambda: self.fail()), results)
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers each path with the statuses queued for it, then with 200s."""
+
+    statuses: dict[str, list[int]] = {}
+
+    def do_GET(self):  # noqa: N802
+        queued = self.statuses.get(self.path, [])
+        self.send_response(queued.pop(0) if queued else 200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+class UpstreamClientTest(SimpleTestCase):
+    """Tests for the pooled, retrying client in `common.clients`."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        reset_metrics()
+
+    def test_transient_failures_are_retried(self):
+        FlakyHandler.statuses["/flaky"] = [503, 502]
+        response = fetch("car", f"{self.base_url}/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_metrics()["car"]["retries"], 2)
+        self.assertEqual(get_metrics()["car"]["errors"], 0)
+
+    def test_other_failures_raise_and_are_counted(self):
+        FlakyHandler.statuses["/missing"] = [404]
+        with self.assertRaises(HTTPError), self.assertLogs("common.clients", "WARNING"):
+            fetch("ols", f"{self.base_url}/missing")
+        metrics = get_metrics()["ols"]
+        self.assertEqual((metrics["requests"], metrics["errors"]), (1, 1))
+
+    def test_sessions_are_shared_per_upstream(self):
+        self.assertIs(get_session("pubmed"), get_session("pubmed"))
+        self.assertIsNot(get_session("pubmed"), get_session("rxiv"))
+
+    def test_connections_are_kept_alive(self):
+        fetch("rxiv", f"{self.base_url}/a")
+        fetch("rxiv", f"{self.base_url}/b")
+        pool = get_session("rxiv").get_adapter(self.base_url).poolmanager
+        self.assertEqual(len(pool.pools), 1)
+
+
+class UpstreamCacheTest(TestCase):
+    """Tests for the database-backed cache in `common.upstream_cache`."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        reset_metrics()
+
+    def expire(self, age: timedelta) -> None:
+        UpstreamResponse.objects.update(expires_at=timezone.now() - age)
+
+    def test_fresh_responses_are_not_refetched(self):
+        first = fetch_cached("car", f"{self.base_url}/fresh")
+        second = fetch_cached("car", f"{self.base_url}/fresh")
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), {})
+        self.assertEqual(get_metrics()["car"]["requests"], 1)
+
+    def test_not_found_is_cached(self):
+        FlakyHandler.statuses["/gone"] = [404]
+        with self.assertLogs("common.clients", "WARNING"):
+            with self.assertRaises(HTTPError):
+                fetch_cached("ols", f"{self.base_url}/gone")
+            with self.assertRaises(HTTPError):
+                fetch_cached("ols", f"{self.base_url}/gone")
+        self.assertEqual(get_metrics()["ols"]["requests"], 1)
+
+    def test_stale_responses_are_served_and_revalidated(self):
+        fetch_cached("rxiv", f"{self.base_url}/stale")
+        self.expire(timedelta(hours=1))
+        response = fetch_cached("rxiv", f"{self.base_url}/stale")
+        fetch_cached("rxiv", f"{self.base_url}/stale")
+        self.assertTrue(response.from_cache)
+        self.assertEqual(get_metrics()["rxiv"]["requests"], 1)
+        self.assertEqual(Job.objects.filter(task=REVALIDATE_TASK).count(), 1)
+        run_worker(burst=True)
+        self.assertEqual(get_metrics()["rxiv"]["requests"], 2)
+        self.assertGreater(UpstreamResponse.objects.get().expires_at, timezone.now())
+
+    def test_revalidations_already_done_are_skipped(self):
+        fetch_cached("rxiv", f"{self.base_url}/skipped")
+        self.expire(timedelta(hours=1))
+        fetch_cached("rxiv", f"{self.base_url}/skipped")
+        UpstreamResponse.objects.update(expires_at=timezone.now() + timedelta(hours=1))
+        run_worker(burst=True)
+        self.assertEqual(get_metrics()["rxiv"]["requests"], 1)
+
+    def test_revalidation_jobs_leave_api_keys_out(self):
+        fetch_cached("pubmed", f"{self.base_url}/revalidate?id=1&api_key=a")
+        self.expire(timedelta(hours=1))
+        fetch_cached("pubmed", f"{self.base_url}/revalidate?id=1&api_key=a")
+        arguments = Job.objects.get(task=REVALIDATE_TASK).arguments
+        self.assertEqual(arguments["url"], f"{self.base_url}/revalidate?id=1")
+        with patch.dict("os.environ", {"PUBMED_API_KEY": "b"}):
+            url = restore_secrets(arguments["url"], arguments["secret_params"])
+        self.assertEqual(url, f"{self.base_url}/revalidate?id=1&api_key=b")
+
+    def test_old_responses_are_served_if_refetching_fails(self):
+        fetch_cached("pubmed", f"{self.base_url}/old")
+        self.expire(timedelta(days=365))
+        FlakyHandler.statuses["/old"] = [400]
+        with self.assertLogs("common.upstream_cache", "WARNING"):
+            response = fetch_cached("pubmed", f"{self.base_url}/old")
+        self.assertTrue(response.from_cache)
+        self.assertEqual(get_metrics()["pubmed"]["requests"], 2)
+
+    def test_api_keys_are_left_out_of_the_cache(self):
+        fetch_cached("pubmed", f"{self.base_url}/keyed?id=1&api_key=a")
+        response = fetch_cached("pubmed", f"{self.base_url}/keyed?id=1&api_key=b")
+        self.assertTrue(response.from_cache)
+        self.assertEqual(
+            UpstreamResponse.objects.get().url, f"{self.base_url}/keyed?id=1"
+        )
+
+    @override_settings(UPSTREAM_CACHE_OFFLINE=True)
+    def test_offline_serves_only_cached_responses(self):
+        with self.assertRaises(RequestsConnectionError):
+            fetch_cached("car", f"{self.base_url}/offline")
+        with override_settings(UPSTREAM_CACHE_OFFLINE=False):
+            fetch_cached("car", f"{self.base_url}/offline")
+        self.expire(timedelta(days=365))
+        self.assertTrue(fetch_cached("car", f"{self.base_url}/offline").from_cache)
+        self.assertEqual(get_metrics()["car"]["requests"], 1)
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+    """Tests for the query stats `QueryBudgetMiddleware` reports."""
+
+    fixtures = ["test_alleles.json"]
+    url = reverse("allele-list")
+
+    def setUp(self):
+        user = User.objects.create(username="curator")
+        UserProfile.objects.create(
+            user=user, has_signed_phi_agreement=True, has_curation_permissions=True
+        )
+        self.client.force_login(user)
+
+    def test_server_timing_header_reports_queries(self):
+        response = self.client.get(self.url)
+        stats = response.query_stats
+        self.assertGreater(stats.count, 0)
+        self.assertRegex(
+            response["Server-Timing"],
+            rf'^db;dur=[\d.]+;desc="{stats.count} queries, \d+ duplicates"$',
+        )
+
+    def test_record_queries_counts_duplicates(self):
+        with record_queries() as stats:
+            list(Allele.objects.filter(pk=1))
+            list(Allele.objects.filter(pk=2))
+            Allele.objects.count()
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.duplicate_count, 1)
+        self.assertEqual(list(stats.duplicates.values()), [2])
+
+    def test_logs_warning_when_over_budget(self):
+        with (
+            override_settings(QUERY_BUDGETS={"allele-list": 1}),
+            self.assertLogs("common.middleware", logging.WARNING) as logs,
+        ):
+            self.client.get(self.url)
+        self.assertIn("view=allele-list", logs.output[0])
+        self.assertIn("budget=1", logs.output[0])
+
+    def test_logs_nothing_above_debug_when_within_budget(self):
+        with (
+            override_settings(QUERY_BUDGETS={"allele-list": 100}),
+            self.assertNoLogs("common.middleware", logging.INFO),
+        ):
+            self.client.get(self.url)
+
+
+class BenchmarkTest(TestCase):
+    """Tests that the benchmarks run against a small amount of generated data."""
+
+    def setUp(self):
+        self.data = generate_benchmark_data(scale=0.01)
+
+    def test_generates_scored_evidence(self):
+        self.assertEqual(Evidence.objects.count(), self.data.counts["evidence"])
+        self.assertTrue(Evidence.objects.filter(score__gt=0).exists())
+        self.assertEqual(
+            PublishedCuration.objects.count(), self.data.counts["published_curations"]
+        )
+
+    def test_runs_every_benchmark_and_rolls_back(self):
+        num_curations = Curation.objects.count()
+        results = run_benchmarks(self.data, repeat=2)
+        self.assertEqual([result.name for result in results], list(BENCHMARKS))
+        for result in results:
+            self.assertEqual(result.runs, 2)
+            self.assertLessEqual(result.min_ms, result.max_ms)
+        # The copy benchmark's new curations are rolled back after each run.
+        self.assertEqual(Curation.objects.count(), num_curations)
+
+    def test_compare_reports(self):
+        results = run_benchmarks(self.data, names=["batch_scoring"], repeat=1)
+        report = make_report(results, self.data)
+        rows = compare_reports(report, report)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["name"], "batch_scoring")
+        self.assertEqual(rows[0]["queries"], rows[0]["baseline_queries"])
+
+
+class SlugTest(TestCase):
+    """Tests that new objects get their slugs in the same write that inserts them."""
+
+    fixtures = ["test_diseases.json"]
+
+    def test_saves_new_objects_once(self):
+        disease = Disease.objects.create(mondo_id="MONDO:0000002")
+        self.assertEqual(disease.slug, f"D{disease.pk:06d}")
+        self.assertEqual(
+            list(disease.history.values_list("history_type", flat=True)),  # type: ignore[attr-defined]
+            ["+"],
+        )
+
+    def test_keeps_given_slugs_and_primary_keys(self):
+        disease = Disease.objects.create(slug="D999999", mondo_id="MONDO:0000002")
+        self.assertEqual(disease.slug, "D999999")
+        disease = Disease.objects.create(pk=500, mondo_id="MONDO:0000003")
+        self.assertEqual(disease.slug, "D000500")
+
+    def test_assigns_slugs_for_bulk_create(self):
+        diseases = [Disease(mondo_id=f"MONDO:000000{i}") for i in range(2, 5)]
+        assign_slugs(diseases)
+        Disease.objects.bulk_create(diseases)
+        last = Disease.objects.get(pk=diseases[-1].pk)
+        self.assertEqual(last.slug, f"D{last.pk:06d}")
+        created = Disease.objects.create(mondo_id="MONDO:0000005")
+        self.assertEqual(created.pk, last.pk + 1)
+
+    def test_continues_after_the_largest_primary_key(self):
+        Disease.objects.create(pk=100, mondo_id="MONDO:0000002")
+        self.assertEqual(allocate_ids(Disease, 2), [101, 102])
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'disease'")
+        self.assertEqual(allocate_ids(Disease, 1), [101])
+
+
+class HistoryTest(TestCase):
+    """Tests that history is only recorded for changes and can be compacted."""
+
+    fixtures = [
+        "test_alleles.json",
+        "test_diseases.json",
+        "test_curations.json",
+    ]
+
+    def history_types(self, obj: Any) -> list[str]:  # noqa: ANN401
+        """Returns the types of an object's history records, oldest first."""
+        return list(
+            obj.history.order_by("history_id").values_list("history_type", flat=True)
+        )
+
+    def test_skips_saves_that_change_nothing(self):
+        disease = Disease.objects.create(mondo_id="MONDO:0000002")
+        disease.save()
+        disease = Disease.objects.get(pk=disease.pk)
+        disease.save()
+        disease.metadata_status = MetadataStatus.FAILED
+        disease.save()
+        self.assertEqual(self.history_types(disease), ["+"])
+        disease.name = "oran berry allergy"
+        disease.save()
+        self.assertEqual(self.history_types(disease), ["+", "~"])
+
+    def test_records_the_first_save_of_objects_without_history(self):
+        disease = Disease.objects.get(pk=1)
+        disease.save()
+        self.assertEqual(self.history_types(disease), ["~"])
+
+    def test_records_changes_made_since_loading_without_a_query(self):
+        disease = Disease.objects.create(mondo_id="MONDO:0000002")
+        disease.name = "oran berry allergy"
+        with CaptureQueriesContext(connection) as queries:
+            disease.save()
+        history_selects = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "disease_historicaldisease"')
+        ]
+        self.assertEqual(history_selects, [])
+
+    def test_compares_against_the_latest_record(self):
+        disease = Disease.objects.create(mondo_id="MONDO:0000002")
+        Disease.objects.filter(pk=disease.pk).update(name="oran berry allergy")
+        disease.refresh_from_db()
+        disease.name = ""
+        disease.save()
+        self.assertEqual(self.history_types(disease), ["+"])
+        disease.refresh_from_db()
+        disease.name = "oran berry allergy"
+        Disease.objects.filter(pk=disease.pk).update(name="")
+        disease.save()
+        self.assertEqual(self.history_types(disease), ["+", "~"])
+
+    def test_bulk_update_history_skips_unchanged_objects(self):
+        first, second = Disease.objects.filter(pk__in=[1, 2]).order_by("pk")
+        Disease.history.bulk_history_create([first, second])  # type: ignore[attr-defined]
+        first.name = "oran berry allergy"
+        records = Disease.history.bulk_history_create(  # type: ignore[attr-defined]
+            [first, second], update=True
+        )
+        self.assertEqual([record.id for record in records], [1])
+        records = Disease.history.bulk_history_create(  # type: ignore[attr-defined]
+            [first, second], update=True
+        )
+        self.assertEqual(records, [])
+
+    def age_history(self, obj: Any, dates: list[timedelta]) -> None:  # noqa: ANN401
+        """Moves an object's history records back by the given ages, oldest first."""
+        records = obj.history.order_by("history_id")
+        for record, age in zip(records, dates, strict=True):
+            records.filter(history_id=record.history_id).update(
+                history_date=timezone.now() - age
+            )
+
+    def test_compacts_runs_of_updates_and_unchanged_records(self):
+        user = User.objects.create(username="curator")
+        disease = Disease.objects.create(mondo_id="MONDO:0000002", added_by=user)
+        for name in ["a", "b", "c"]:
+            disease.name = name
+            disease._history_user = user  # noqa: SLF001
+            disease.save()
+        # An unchanged record, as saves were recorded before they were skipped.
+        HistoryManager.bulk_history_create(Disease.history, [disease], update=True)  # type: ignore[attr-defined]
+        days = timedelta(days=1)
+        minutes = timedelta(minutes=1)
+        self.age_history(
+            disease,
+            [
+                200 * days,
+                200 * days - minutes,
+                200 * days - 2 * minutes,
+                days,
+                0 * days,
+            ],
+        )
+        history_model = Disease.history.model  # type: ignore[attr-defined]
+        before = timezone.now() - 90 * days
+        self.assertEqual(
+            compact_history(
+                history_model, before=before, window=timedelta(hours=1), dry_run=True
+            ),
+            1,
+        )
+        self.assertEqual(len(self.history_types(disease)), 5)
+        compact_history(history_model, before=before, window=timedelta(hours=1))
+        names = list(
+            disease.history.order_by("history_id").values_list("name", flat=True)
+        )  # type: ignore[attr-defined]
+        self.assertEqual(names, ["", "b", "c", "c"])
+        compact_history(history_model, before=timezone.now())
+        self.assertEqual(self.history_types(disease), ["+", "~", "~"])
+
+    def test_keeps_the_history_of_published_curations(self):
+        curation = Curation.objects.get(pk=1)
+        curation.save()
+        curation.curation_type = "HAP"
+        curation.save()
+        Curation.history.update(history_date=timezone.now() - timedelta(days=365))  # type: ignore[attr-defined]
+        PublishedCuration.objects.create(curation=curation)
+        out = StringIO()
+        call_command("compact_history", stdout=out)
+        self.assertEqual(len(self.history_types(curation)), 2)
+        self.assertIn("Removed 0 history records.", out.getvalue())
+        PublishedCuration.objects.all().delete()
+        call_command("compact_history", "--window", "60", stdout=out)
+        self.assertEqual(len(self.history_types(curation)), 1)
+
+    def test_only_unchanged_records_are_removed_by_default(self):
+        disease = Disease.objects.create(mondo_id="MONDO:0000002")
+        for name in ["a", "b"]:
+            disease.name = name
+            disease.save()
+        HistoryManager.bulk_history_create(Disease.history, [disease], update=True)  # type: ignore[attr-defined]
+        self.age_history(disease, [timedelta(days=100)] * 4)
+        call_command("compact_history", stdout=StringIO())
+        names = disease.history.order_by("history_id").values_list("name", flat=True)  # type: ignore[attr-defined]
+        self.assertEqual(list(names), ["", "a", "b"])
@@ -0,0 +1,232 @@
+"""Houses the database-backed cache in front of the lookups in `common.clients`.
+
+Third-party records rarely change, and the same ones are looked up again and again (a
+publication form that fails validation looks its PubMed ID up again on resubmission),
+so each upstream response is kept in an `UpstreamResponse` row:
+
+- A fresh response (younger than its upstream's `cache_ttl`) is served as is.
+- A 404 is cached too, for the shorter `negative_cache_ttl`, and raised from the cache.
+- A response past its TTL but within `stale_ttl` is served immediately while a
+  `common.revalidate_upstream_response` job fetches a new one (stale-while-revalidate).
+- If fetching a new response fails, the old one is served instead.
+
+With `settings.UPSTREAM_CACHE_OFFLINE` on, nothing is fetched and only cached
+responses, however old, are served, so tests and local development can run against
+recorded responses (loaded with `loaddata`, or recorded with `warm_upstream_cache`).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from common.clients import UPSTREAMS, fetch
+from common.models import UpstreamResponse
+from job.queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+# The task that refetches stale responses, registered in `common.jobs`.
+REVALIDATE_TASK = "common.revalidate_upstream_response"
+
+# Query parameters left out of cached URLs and queued revalidations, so keys aren't
+# stored in the database and recorded responses match whichever key fetched them, and
+# the environment variable a revalidation fills each back in from.
+SECRET_PARAMS = {"api_key": "PUBMED_API_KEY"}
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """The parts of a response the apps' clients use."""
+
+    url: str
+    status_code: int
+    content: bytes
+    content_type: str = ""
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        """Returns the body decoded as UTF-8."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> object:
+        """Returns the body parsed as JSON."""
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """Raises an `HTTPError` if the response is an error, like `requests` does.
+
+        Raises:
+            requests.exceptions.HTTPError: If the status is 400 or above.
+        """
+        if self.status_code >= 400:  # noqa: PLR2004
+            msg = f"{self.status_code} Error for url: {self.url}"
+            raise requests.exceptions.HTTPError(msg)
+
+
+def is_offline() -> bool:
+    """Returns whether lookups are only served from the cache."""
+    return getattr(settings, "UPSTREAM_CACHE_OFFLINE", False)
+
+
+def redact(url: str) -> str:
+    """Returns a URL without its secret query parameters."""
+    parts = urlsplit(url)
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in SECRET_PARAMS
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def restore_secrets(url: str, names: list[str]) -> str:
+    """Returns a redacted URL with its secret query parameters filled back in."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(name, os.getenv(SECRET_PARAMS[name], "")) for name in names]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def make_key(upstream_name: str, url: str) -> str:
+    """Returns the key of a URL's cached response."""
+    return hashlib.sha256(f"{upstream_name} {redact(url)}".encode()).hexdigest()
+
+
+def _from_entry(entry: UpstreamResponse) -> CachedResponse:
+    response = CachedResponse(
+        url=entry.url,
+        status_code=entry.status_code,
+        content=bytes(entry.content),
+        content_type=entry.content_type,
+        from_cache=True,
+    )
+    response.raise_for_status()
+    return response
+
+
+def refresh(upstream_name: str, url: str, timeout: float = 5) -> CachedResponse:
+    """Fetches a URL and caches the response if it's a success or a 404.
+
+    Returns:
+        The successful response.
+
+    Raises:
+        requests.exceptions.HTTPError: If the response is an error, including a 404.
+    """
+    try:
+        response = fetch(upstream_name, url, timeout=timeout)
+    except requests.exceptions.HTTPError as error:
+        if error.response is None or error.response.status_code != 404:  # noqa: PLR2004
+            raise
+        response = error.response
+    upstream = UPSTREAMS[upstream_name]
+    now = timezone.now()
+    ttl = upstream.cache_ttl if response.ok else upstream.negative_cache_ttl
+    UpstreamResponse.objects.update_or_create(
+        key=make_key(upstream_name, url),
+        defaults={
+            "upstream": upstream_name,
+            "url": redact(url),
+            "status_code": response.status_code,
+            "content": response.content,
+            "content_type": response.headers.get("Content-Type", ""),
+            "fetched_at": now,
+            "expires_at": now + ttl,
+        },
+    )
+    cached = CachedResponse(
+        url=url,
+        status_code=response.status_code,
+        content=response.content,
+        content_type=response.headers.get("Content-Type", ""),
+    )
+    cached.raise_for_status()
+    return cached
+
+
+def queue_revalidation(upstream_name: str, url: str, timeout: float = 5) -> None:
+    """Queues a job to refresh a URL's cached response, unless one is already queued.
+
+    The job's arguments hold the URL without its secret query parameters, which
+    `revalidate` fills back in from the worker's environment.
+    """
+    secret_params = [
+        name
+        for name, _ in parse_qsl(urlsplit(url).query, keep_blank_values=True)
+        if name in SECRET_PARAMS
+    ]
+    enqueue(
+        REVALIDATE_TASK,
+        {
+            "upstream_name": upstream_name,
+            "url": redact(url),
+            "secret_params": secret_params,
+            "timeout": timeout,
+        },
+        key=make_key(upstream_name, url),
+    )
+
+
+def revalidate(
+    upstream_name: str, url: str, secret_params: list[str], timeout: float = 5
+) -> None:
+    """Refreshes a redacted URL's cached response, unless it's fresh again.
+
+    A failed fetch is logged rather than raised, since the stale response is still
+    served and the next stale hit queues another revalidation.
+    """
+    entry = UpstreamResponse.objects.filter(key=make_key(upstream_name, url)).first()
+    if entry is not None and timezone.now() < entry.expires_at:
+        return
+    try:
+        refresh(upstream_name, restore_secrets(url, secret_params), timeout)
+    except requests.exceptions.RequestException:
+        logger.warning("Unable to revalidate %s response for %s", upstream_name, url)
+
+
+def fetch_cached(upstream_name: str, url: str, timeout: float = 5) -> CachedResponse:
+    """GETs a URL from an upstream service through the cache.
+
+    Args:
+        upstream_name: The key of the service in `UPSTREAMS`.
+        url: The URL to get.
+        timeout: The read timeout in seconds, if the URL has to be fetched.
+
+    Returns:
+        The successful response, cached or fetched.
+
+    Raises:
+        requests.exceptions.ConnectionError: If lookups are offline and the URL isn't
+            cached.
+        requests.exceptions.RequestException: If fetching fails, or the cached
+            response is a 404, as `common.clients.fetch` raises them.
+    """
+    entry = UpstreamResponse.objects.filter(key=make_key(upstream_name, url)).first()
+    if is_offline():
+        if entry is None:
+            msg = f"{url} isn't cached, and upstream lookups are offline."
+            raise requests.exceptions.ConnectionError(msg)
+        return _from_entry(entry)
+    now = timezone.now()
+    if entry is not None:
+        if now < entry.expires_at:
+            return _from_entry(entry)
+        stale_until = entry.expires_at + UPSTREAMS[upstream_name].stale_ttl
+        if entry.status_code < 400 and now < stale_until:  # noqa: PLR2004
+            queue_revalidation(upstream_name, url, timeout)
+            return _from_entry(entry)
+    try:
+        return refresh(upstream_name, url, timeout)
+    except requests.exceptions.RequestException:
+        if entry is None or entry.status_code >= 400:  # noqa: PLR2004
+            raise
+        logger.warning("Serving a stale %s response for %s", upstream_name, url)
+        return _from_entry(entry)
@@ -1,21 +1,147 @@
-from django.db.models import Q, QuerySet
-from django.views.generic import ListView
-from django_tables2 import SingleTableMixin
+from datetime import datetime
+from typing import Any
+
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views.generic import DetailView, ListView
+from django_tables2 import SingleTableMixin, Table
+
+from common.constants.models import MetadataStatus
+from common.metadata import get_metadata_status, request_metadata
+from common.pagination import (
+    CappedPaginator,
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+    seek,
+)
+from common.results_cache import (
+    CachedResults,
+    get_or_render,
+    make_key,
+    make_results,
+)
+from common.search import get_search_backend, get_search_fields
 
 
 class SearchListView(SingleTableMixin, ListView):
-    search_fields: list[str] = []
+    # The query parameter holding the keyset pagination cursor.
+    cursor_param = "after"
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        """Serves HTMX searches from the results cache.
+
+        Identical searches share one render, and a client whose copy is current gets
+        a 304.
+
+        Returns:
+            The results partial for HTMX requests, or the full page otherwise.
+        """
+        if not request.headers.get("HX-Request"):
+            return super().get(request, *args, **kwargs)
+        view_name = request.resolver_match.view_name  # type: ignore[union-attr]
+
+        def render() -> CachedResults:
+            response = super(SearchListView, self).get(request, *args, **kwargs)
+            response.render()  # type: ignore[attr-defined]
+            return make_results(response.content, response["Content-Type"])
+
+        results = get_or_render(make_key(view_name, request), render)
+        response = get_conditional_response(request, etag=results.etag) or HttpResponse(
+            results.content, content_type=results.content_type
+        )
+        response["ETag"] = results.etag
+        # Browsers may keep the partial but have to check it's current before use.
+        response["Cache-Control"] = "private, no-cache"
+        patch_vary_headers(response, ["HX-Request"])
+        return response
 
     def get_queryset(self) -> QuerySet:
         qs = super().get_queryset()
         q = self.request.GET.get("q", "").strip()
-        if q and self.search_fields:
-            filters = Q()
-            for field in self.search_fields:
-                filters |= Q(**{f"{field}__icontains": q})
-            qs = qs.filter(filters)
+        if q and get_search_fields(qs.model):
+            qs = self.search(qs, q)
+        # Results in the default order can be paged through with a cursor.
+        self.keyset_field = self.get_keyset_field()
+        if self.keyset_field and qs.query.order_by == (f"-{self.keyset_field}",):
+            qs = qs.order_by(f"-{self.keyset_field}", "-pk")
+            cursor = self.get_cursor()
+            if cursor:
+                qs = seek(qs, self.keyset_field, cursor)
+        else:
+            self.keyset_field = None
         return qs
 
+    def get_keyset_field(self) -> str | None:
+        """Returns the field the default ordering sorts by, if it can page by it.
+
+        Keyset pagination needs a single descending field, like `-updated_at`.
+        """
+        ordering = self.get_ordering()
+        if (
+            isinstance(ordering, (list, tuple))
+            and len(ordering) == 1
+            and ordering[0].startswith("-")
+        ):
+            return ordering[0].removeprefix("-")
+        return None
+
+    def get_cursor(self) -> tuple[datetime, int] | None:
+        """Returns the decoded keyset pagination cursor from the query string."""
+        return decode_cursor(self.request.GET.get(self.cursor_param, ""))
+
+    def get_table_pagination(self, table: Table) -> dict | bool:
+        """Caps the result count, or pages by cursor when there is one.
+
+        Returns:
+            The pagination options for the table, or False to not paginate it.
+        """
+        pagination = super().get_table_pagination(table)
+        if pagination is False:
+            return False
+        if self.keyset_field and self.get_cursor():
+            return {**pagination, "paginator_class": KeysetPaginator, "page": 1}
+        return {**pagination, "paginator_class": CappedPaginator}
+
+    def get_next_page_url(self, table: Table) -> str | None:
+        """Returns the URL of the page after the current one by cursor, if any.
+
+        Cursors take over where the numbered pages stop, i.e., from the last numbered
+        page of a capped result count.
+        """
+        page = getattr(table, "page", None)
+        if not self.keyset_field or page is None or not page.object_list:
+            return None
+        if self.request.GET.get(table.prefixed_order_by_field):
+            return None  # Sorted by a column, not by the keyset field.
+        if isinstance(table.paginator, KeysetPaginator):
+            if not page.has_next():
+                return None
+        elif not table.paginator.is_capped or page.has_next():
+            return None
+        last = list(page.object_list)[-1].record
+        params = self.request.GET.copy()
+        params.pop(table.prefixed_page_field, None)
+        params[self.cursor_param] = encode_cursor(last, self.keyset_field)
+        return f"?{params.urlencode()}"
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Filters the queryset down to the objects that match the search query.
+
+        Returns:
+            The matching objects, best matches first unless the table is sorted by a
+            column.
+        """
+        backend = get_search_backend()
+        queryset = backend.search(queryset, query, get_search_fields(queryset.model))
+        rank_ordering = getattr(backend, "rank_ordering", None)
+        if rank_ordering is not None and "search_rank" in queryset.query.annotations:
+            queryset = queryset.order_by(rank_ordering, *queryset.query.order_by)
+        return queryset
+
     def get_table_data(self) -> QuerySet:
         return self.object_list
 
@@ -26,6 +152,66 @@ class SearchListView(SingleTableMixin, ListView):
 
     def get_context_data(self, **kwargs: object) -> dict:
         context = super().get_context_data(**kwargs)
+        table = context["table"]
+        paginator = getattr(table, "paginator", None)
         context["query"] = self.request.GET.get("q", "").strip()
-        context["result_count"] = self.object_list.count()
+        # The paginator's count is the only count; paging by cursor skips counting.
+        if isinstance(paginator, KeysetPaginator):
+            context["result_count"] = None
+            context["result_count_capped"] = True
+        elif isinstance(paginator, CappedPaginator):
+            context["result_count"] = paginator.count
+            context["result_count_capped"] = paginator.is_capped
+        else:
+            context["result_count"] = len(table.rows)
+            context["result_count_capped"] = False
+        context["next_page_url"] = self.get_next_page_url(table)
+        return context
+
+
+class MetadataContextMixin:
+    """Adds the context of `common/partials/metadata_status.html` to a detail view.
+
+    Subclasses set `metadata_url_name` to the name of their `MetadataStatusView`'s URL,
+    which takes the object's slug.
+    """
+
+    metadata_url_name = ""
+
+    def get_context_data(self, **kwargs: object) -> dict:
+        context = super().get_context_data(**kwargs)  # type: ignore[misc]
+        obj: Any = self.object  # type: ignore[attr-defined]
+        status = get_metadata_status(obj)
+        context["metadata_pending"] = status == MetadataStatus.PENDING
+        context["metadata_failed"] = status == MetadataStatus.FAILED
+        context["metadata_url"] = reverse(
+            self.metadata_url_name, kwargs={"slug": obj.slug}
+        )
         return context
+
+
+class MetadataStatusView(MetadataContextMixin, DetailView):
+    """Reports an object's metadata lookup to its detail page, and retries it.
+
+    The detail page polls with GETs while the lookup is pending; once it's done, the
+    response tells HTMX to reload the page to show the metadata. A POST retries a failed
+    lookup.
+    """
+
+    template_name = "common/partials/metadata_status.html"
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:  # noqa: ARG002
+        self.object = self.get_object()
+        if get_metadata_status(self.object) == MetadataStatus.DONE:
+            if not request.headers.get("HX-Request"):
+                return redirect(self.object)
+            response = HttpResponse()
+            response["HX-Refresh"] = "true"
+            return response
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+    def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:  # noqa: ARG002
+        self.object = self.get_object()
+        if get_metadata_status(self.object) == MetadataStatus.FAILED:
+            request_metadata(self.object)
+        return self.render_to_response(self.get_context_data(object=self.object))
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "curation",
     "disease",
     "haplotype",
+    "job",
     "publication",
     "repo",
 ]
@@ -52,6 +53,8 @@ INSTALLED_APPS = [
 SECURE_CROSS_ORIGIN_OPENER_POLICY = "same-origin-allow-popups"
 
 MIDDLEWARE = [
+    # This goes first so it records the queries made by the rest of the middleware.
+    "common.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -123,6 +126,68 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 
 STATIC_ROOT = BASE_DIR / "public"
 
+# Pre-built, compressed exports of the published repository are written here whenever
+# a published curation changes.
+REPO_SNAPSHOT_DIR = BASE_DIR.parent / "snapshots"
+
+# The most SQL queries a request to each view (by URL name) should issue, however many
+# rows it shows. Requests over budget are logged as warnings, and tests can assert them
+# with `common.tests.QueryBudgetTestMixin`.
+QUERY_BUDGETS = {
+    "curation-list": 6,
+    "curation-detail": 8,
+    "evidence-detail": 10,
+    "repo-search": 7,
+    "repo-detail": 6,
+    "repo-history": 4,
+}
+
+# Search pages stop counting results past this many and show e.g. "10,000+ results";
+# the pages after it are reached by cursor (see `common.pagination`).
+SEARCH_RESULT_COUNT_CAP = 10_000
+
+# The default cache is shared by every Gunicorn worker and the job worker, so a write in
+# one process expires the search results that all of them serve (see
+# `common.results_cache`). It's a database table, created by `manage.py
+# createcachetable`, since the HCI has no cache server; pointing `BACKEND` at Redis or
+# Memcached needs no other change. The rendered search results, and the locks that
+# coalesce identical searches, are kept in each process's memory instead, so searching
+# doesn't write to the database.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "cache",
+    },
+    "search-results": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "search-results",
+    },
+}
+
+# How long, in seconds, a search page's rendered HTMX results are served from the cache
+# (see `common.results_cache`). Any write that can change them expires them sooner.
+SEARCH_RESULTS_CACHE_TIMEOUT = 30
+
+# Whether lookups in the CAR, OLS, PubMed, and bioRxiv/medRxiv are only served from
+# the database (see `common.upstream_cache`), e.g., to develop offline against responses
+# recorded with `manage.py warm_upstream_cache`.
+UPSTREAM_CACHE_OFFLINE = os.getenv("UPSTREAM_CACHE_OFFLINE") == "true"
+
+# Whether queued jobs run in the web process as soon as the request that queued them
+# commits, rather than waiting for `manage.py run_jobs` (see `job.queue`), e.g., to
+# develop without running a worker.
+JOBS_RUN_INLINE = os.getenv("JOBS_RUN_INLINE") == "true"
+
+# How many seconds a running job can go without reporting progress or a heartbeat before
+# its worker is assumed to have died and the job is queued again. On SQLite a task that
+# isn't idempotent (e.g., copying a curation, which takes seconds) blocks its heartbeat
+# for the whole of its transaction, so it has to finish within this time.
+JOB_TIMEOUT = 600
+
+# How often, in seconds, a worker records that the job it's running is still alive. It
+# needs to be well under `JOB_TIMEOUT`.
+JOB_HEARTBEAT_INTERVAL = 60
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 STORAGES = {
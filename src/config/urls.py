@@ -11,6 +11,7 @@ urlpatterns = [
     path("curation/", include("curation.urls")),
     path("disease/", include("disease.urls")),
     path("haplotype/", include("haplotype.urls")),
+    path("job/", include("job.urls")),
     path("publication/", include("publication.urls")),
     path("repo/", include("repo.urls")),
 ]
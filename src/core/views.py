@@ -9,7 +9,10 @@ def home(request: HttpRequest) -> HttpResponse:
     """Returns the home page."""
     context: dict = {}
     if request.user.is_authenticated:
-        table = CurationTable(request.user.curations_added.all())  # type: ignore
+        curations = request.user.curations_added.with_scores().select_related(  # type: ignore
+            "allele", "haplotype", "disease"
+        )
+        table = CurationTable(curations)
         RequestConfig(request).configure(table)
         context["curation_table"] = table
     return render(request, "core/home.html", context)
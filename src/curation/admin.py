@@ -35,6 +35,7 @@ class EvidenceAdmin(SimpleHistoryAdmin):
         "curation",
         "publication",
         "status",
+        "score",
         "added_at",
     ]
     list_filter = ["status"]
@@ -35,3 +35,9 @@ CLASSIFICATION_CHOICES = {
     Classification.DISPUTED: "Disputed",
     Classification.REFUTED: "Refuted",
 }
+
+# A curation's suggested classification is limited when its score is below
+# MODERATE_MIN_SCORE, moderate up to and including MODERATE_MAX_SCORE, and strong above
+# that. A score of zero has no suggested classification.
+MODERATE_MIN_SCORE = 25
+MODERATE_MAX_SCORE = 50
@@ -2,7 +2,7 @@
 
 from decimal import Decimal
 
-from curation.interval import Interval
+from curation.interval import Interval, IntervalSet
 
 
 class Points:
@@ -248,3 +248,48 @@ class Intervals:
     S3A = Step3AIntervals()
     S3C = Step3CIntervals()
     S4 = Step4Intervals()
+
+
+class Brackets:
+    """Defines the point brackets for the bracketed steps, built once at import."""
+
+    S3A_GWAS = IntervalSet(
+        [
+            (Intervals.S3A.GWAS_1, Points.S3A_INTERVAL_1),
+            (Intervals.S3A.GWAS_2, Points.S3A_INTERVAL_2),
+            (Intervals.S3A.GWAS_3, Points.S3A_INTERVAL_3),
+            (Intervals.S3A.GWAS_4, Points.S3A_INTERVAL_4),
+            (Intervals.S3A.GWAS_5, Points.S3A_INTERVAL_5),
+        ]
+    )
+    S3A_NON_GWAS = IntervalSet(
+        [
+            (Intervals.S3A.NON_GWAS_1, Points.S3A_INTERVAL_1),
+            (Intervals.S3A.NON_GWAS_2, Points.S3A_INTERVAL_2),
+            (Intervals.S3A.NON_GWAS_3, Points.S3A_INTERVAL_3),
+            (Intervals.S3A.NON_GWAS_4, Points.S3A_INTERVAL_4),
+            (Intervals.S3A.NON_GWAS_5, Points.S3A_INTERVAL_5),
+        ]
+    )
+    # Cohort sizes are whole numbers, so the step 4 brackets only need to be contiguous
+    # over the integers.
+    S4_GWAS = IntervalSet(
+        [
+            (Intervals.S4.GWAS_1, Points.S4_INTERVAL_1),
+            (Intervals.S4.GWAS_2, Points.S4_INTERVAL_2),
+            (Intervals.S4.GWAS_3, Points.S4_INTERVAL_3),
+            (Intervals.S4.GWAS_4, Points.S4_INTERVAL_4),
+            (Intervals.S4.GWAS_5, Points.S4_INTERVAL_5),
+        ],
+        step=Decimal("1"),
+    )
+    S4_NON_GWAS = IntervalSet(
+        [
+            (Intervals.S4.NON_GWAS_1, Points.S4_INTERVAL_1),
+            (Intervals.S4.NON_GWAS_2, Points.S4_INTERVAL_2),
+            (Intervals.S4.NON_GWAS_3, Points.S4_INTERVAL_3),
+            (Intervals.S4.NON_GWAS_4, Points.S4_INTERVAL_4),
+            (Intervals.S4.NON_GWAS_5, Points.S4_INTERVAL_5),
+        ],
+        step=Decimal("1"),
+    )
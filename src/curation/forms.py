@@ -1,13 +1,22 @@
 from django import forms
-from django.forms import ModelForm, modelformset_factory
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db.models import Model
+from django.forms import BaseModelFormSet, ModelForm, modelformset_factory
+from django.utils import timezone
 
+from allele.models import Allele
+from common.signals import bulk_writes
 from curation.constants.models.curation import CLASSIFICATION_CHOICES
 from curation.models import Curation, Evidence
+from curation.score import SCORE_FIELDS, set_batch_scores
 
 HLA_CURATION_TASKFORCE_ID = "40033"
 
 EP_CHOICES = [(HLA_CURATION_TASKFORCE_ID, "HLA Curation Taskforce")]
 
+BULK_EDIT_BATCH_SIZE = 500
+
 
 class CurationCreateForm(ModelForm):
     class Meta:
@@ -15,6 +24,11 @@ class CurationCreateForm(ModelForm):
         fields = ["curation_type", "allele", "haplotype", "disease"]
         widgets = {"curation_type": forms.RadioSelect}
 
+    def __init__(self, *args, **kwargs) -> None:
+        """Lists the alleles by gene and fields rather than by primary key."""
+        super().__init__(*args, **kwargs)
+        self.fields["allele"].queryset = Allele.objects.in_name_order()  # type: ignore[attr-defined]
+
 
 class EPReviewForm(forms.Form):
     DECISION_CHOICES = [
@@ -76,10 +90,97 @@ class EvidenceTopLevelEditForm(ModelForm):
         }
 
 
+class LoadedObjectChoiceField(forms.ModelChoiceField):
+    """Cleans a primary key to one of the objects a formset has already loaded.
+
+    A model formset's primary key field otherwise fetches each form's object again.
+    """
+
+    def __init__(self, objects: dict[int, Model], **kwargs) -> None:
+        """Looks primary keys up in the given objects rather than a queryset."""
+        super().__init__(queryset=None, **kwargs)
+        self.objects = objects
+
+    def to_python(self, value: object) -> Model | None:
+        if value in self.empty_values:
+            return None
+        try:
+            return self.objects[int(value)]  # type: ignore[arg-type]
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice"
+            ) from error
+
+
+class BaseEvidenceTopLevelEditFormSet(BaseModelFormSet):
+    """Edits a curation's evidence in a few queries however much evidence it has.
+
+    Only the evidence whose forms changed is saved, with one `bulk_update` of the
+    changed fields and the stored scores and one bulk insert of their history.
+    """
+
+    def add_fields(self, form: forms.Form, index: int | None) -> None:
+        super().add_fields(form, index)
+        pk_name = self.model._meta.pk.name  # noqa: SLF001
+        if not hasattr(self, "_loaded_objects"):
+            self._loaded_objects = {obj.pk: obj for obj in self.get_queryset()}
+        field = form.fields[pk_name]
+        form.fields[pk_name] = LoadedObjectChoiceField(
+            self._loaded_objects,
+            initial=field.initial,
+            required=False,
+            widget=field.widget,
+        )
+
+    def save(
+        self,
+        commit: bool = True,  # noqa: FBT001, FBT002
+        *,
+        user: User | None = None,
+    ) -> list[Evidence]:
+        """Saves the changed evidence in bulk.
+
+        Args:
+            commit: Whether to save the evidence, rather than only return it.
+            user: The user editing the evidence, whom its history records.
+
+        Returns:
+            The changed evidence.
+        """
+        if not commit:
+            return super().save(commit=False)
+        changed = [form for form in self.initial_forms if form.has_changed()]
+        self.changed_objects = [(form.instance, form.changed_data) for form in changed]
+        self.new_objects, self.deleted_objects = [], []
+        evidence = [form.instance for form in changed]
+        if not evidence:
+            return []
+        fields = {name for form in changed for name in form.changed_data}
+        now = timezone.now()
+        for item in evidence:
+            item.updated_at = now
+        set_batch_scores(evidence)
+        with bulk_writes():
+            Evidence.objects.bulk_update(
+                evidence,
+                [*sorted(fields), *SCORE_FIELDS, "updated_at"],
+                batch_size=BULK_EDIT_BATCH_SIZE,
+            )
+            Evidence.history.bulk_history_create(  # type: ignore[attr-defined]
+                evidence,
+                batch_size=BULK_EDIT_BATCH_SIZE,
+                update=True,
+                default_user=user,
+            )
+        return evidence
+
+
 EvidenceTopLevelEditFormSet = modelformset_factory(
     Evidence,
     form=EvidenceTopLevelEditForm,
+    formset=BaseEvidenceTopLevelEditFormSet,
     extra=0,
+    edit_only=True,
 )
 
 
@@ -171,3 +272,37 @@ class EvidenceEditForm(ModelForm):
             raise forms.ValidationError({"demographics_text_quotes": error})
 
         return cleaned_data
+
+
+class EvidenceImportForm(forms.Form):
+    file = forms.FileField(
+        label="File",
+        help_text=(
+            "A CSV or TSV file with a header row naming the columns and a row for each "
+            "evidence."
+        ),
+    )
+    skip_invalid = forms.BooleanField(
+        required=False,
+        label="Add the valid rows even if some rows have errors",
+    )
+
+
+class EvidenceImportRowForm(EvidenceEditForm):
+    """Validates one row of an evidence import the way the evidence edit page does.
+
+    The demographics are chosen from those loaded once for the whole import rather than
+    queried for each row.
+    """
+
+    demographics = forms.MultipleChoiceField(required=False)
+
+    class Meta(EvidenceEditForm.Meta):
+        fields = ["status", "is_included", *EvidenceEditForm.Meta.fields]
+
+    def __init__(
+        self, *args, demographic_choices: list[tuple[str, str]], **kwargs
+    ) -> None:
+        """Offers the demographics loaded for the import, keyed by primary key."""
+        super().__init__(*args, **kwargs)
+        self.fields["demographics"].choices = demographic_choices  # type: ignore[attr-defined]
@@ -0,0 +1,331 @@
+"""Houses the bulk importer that adds a curation's evidence from a spreadsheet.
+
+Curators often extract a paper's evidence into a spreadsheet before entering it, and
+retyping hundreds of rows into the evidence form means a form submission, a save, and a
+history record each. The importer reads a CSV or TSV file one row at a time, validates
+every row with the same form and validators as the evidence edit page, and reports the
+rows with errors by row number. Unless the caller asks to skip them, one invalid row
+means nothing is added. The valid rows are scored together, then created along with
+their demographics and history records with a few bulk queries.
+"""
+
+import csv
+import itertools
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from django import forms
+from django.contrib.auth.models import User
+from django.db.models import Q
+
+from common.signals import bulk_writes
+from common.slugs import assign_slugs
+from curation.forms import EvidenceImportRowForm
+from curation.models import Curation, Demographic, Evidence
+from curation.score import set_batch_scores
+from curation.validators.views import (
+    validate_beta,
+    validate_ci_end,
+    validate_ci_start,
+    validate_effect_size_statistic,
+    validate_has_association_and_p_value,
+    validate_odds_ratio,
+    validate_relative_risk,
+)
+from publication.importer import DOI_RE, PUBMED_ID_RE
+from publication.models import Publication
+
+PUBLICATION_SLUG_RE = re.compile(r"P\d{6}", re.IGNORECASE)
+DEMOGRAPHIC_SEPARATOR = ";"
+
+# The most rows imported at once.
+MAX_ROWS = 1000
+
+BATCH_SIZE = 500
+
+# The columns a file can have, besides "publication".
+COLUMNS = EvidenceImportRowForm.Meta.fields
+
+TRUE_VALUES = {"yes", "y", "true", "t", "1"}
+FALSE_VALUES = {"no", "n", "false", "f", "0", ""}
+
+
+@dataclass
+class RowError:
+    """The problems with one row of a file, numbered as in a spreadsheet."""
+
+    row: int
+    messages: list[str]
+
+
+@dataclass
+class ImportResult:
+    """The evidence an import added, and the rows that couldn't be added."""
+
+    created: list[Evidence] = field(default_factory=list)
+    errors: list[RowError] = field(default_factory=list)
+
+
+def normalize_column(name: str) -> str:
+    """Turns a header such as "P-value String" into a column name.
+
+    Returns:
+        The name in lowercase with runs of spaces and hyphens turned into underscores.
+    """
+    return re.sub(r"[\s\-]+", "_", name.strip().lower())
+
+
+def read_rows(lines: Iterable[str]) -> Iterator[tuple[int, dict[str, str]]]:
+    """Reads a CSV or TSV file's rows as they're needed.
+
+    The file is TSV if its header has a tab in it and CSV otherwise. Rows with nothing
+    in them are skipped.
+
+    Args:
+        lines: The file's lines, e.g., a file opened in text mode with `newline=""`.
+
+    Yields:
+        Each row's number (the header is row 1) and its values by column name.
+    """
+    lines = iter(lines)
+    header_line = next(lines, "")
+    delimiter = "\t" if "\t" in header_line else ","
+    reader = csv.reader(itertools.chain([header_line], lines), delimiter=delimiter)
+    header = [normalize_column(name) for name in next(reader, [])]
+    for number, values in enumerate(reader, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        yield (
+            number,
+            dict(zip(header, (value.strip() for value in values), strict=False)),
+        )
+
+
+def find_publications(values: Iterable[str]) -> dict[str, Publication]:
+    """Looks up the publications a file names by slug, PubMed ID, or DOI in one query.
+
+    Returns:
+        The publications found, by the value (in lowercase) that named them.
+    """
+    slugs, pubmed_ids, dois = {}, {}, {}
+    for value in values:
+        if PUBLICATION_SLUG_RE.fullmatch(value):
+            slugs[value.upper()] = value
+        elif match := PUBMED_ID_RE.fullmatch(value):
+            pubmed_ids[match.group(1)] = value
+        elif match := DOI_RE.fullmatch(value):
+            dois[match.group(1)] = value
+    if not (slugs or pubmed_ids or dois):
+        return {}
+    publications = Publication.objects.filter(
+        Q(slug__in=slugs) | Q(pubmed_id__in=pubmed_ids) | Q(doi__in=dois)
+    )
+    found = {}
+    for publication in publications:
+        for value in (
+            slugs.get(publication.slug),
+            pubmed_ids.get(publication.pubmed_id or ""),
+            dois.get(publication.doi or ""),
+        ):
+            if value is not None:
+                found[value.lower()] = publication
+    return found
+
+
+class RowParser:
+    """Turns a row's values into the data the evidence import form takes.
+
+    Booleans can be written as yes or no, choices as their code or their label, and
+    demographics as their groups separated by semicolons, all in any case. Blank values
+    take the field's default.
+    """
+
+    def __init__(self, demographics: Iterable[Demographic]) -> None:
+        """Builds the lookups for the choice fields and the demographics."""
+        form = EvidenceImportRowForm(demographic_choices=[])
+        self.fields = form.fields
+        self.choices = {}
+        for name, form_field in self.fields.items():
+            if name == "demographics" or not hasattr(form_field, "choices"):
+                continue
+            lookup = {}
+            for value, label in form_field.choices:  # type: ignore[attr-defined]
+                lookup[str(label).lower()] = str(value)
+                lookup[str(value).lower()] = str(value)
+            self.choices[name] = lookup
+        self.demographics = {
+            demographic.group.lower(): str(demographic.pk)
+            for demographic in demographics
+        }
+
+    def parse(self, row: dict[str, str]) -> tuple[dict, list[str]]:
+        """Converts a row's values, noting the values that can't be converted.
+
+        Returns:
+            The form data and the error messages.
+        """
+        data: dict = {}
+        errors = []
+        for name in COLUMNS:
+            value = row.get(name, "")
+            form_field = self.fields[name]
+            if name == "demographics":
+                groups = [
+                    group.strip().lower()
+                    for group in value.split(DEMOGRAPHIC_SEPARATOR)
+                    if group.strip()
+                ]
+                unknown = [group for group in groups if group not in self.demographics]
+                if unknown:
+                    errors.append(f"demographics: Unknown groups {', '.join(unknown)}.")
+                data[name] = [self.demographics[g] for g in groups if g not in unknown]
+            elif not value:
+                initial = form_field.initial
+                data[name] = "" if initial is None else str(initial)
+            elif name in self.choices:
+                data[name] = self.choices[name].get(value.lower(), value)
+            elif isinstance(form_field, forms.BooleanField):
+                if value.lower() in TRUE_VALUES:
+                    data[name] = "True"
+                elif value.lower() in FALSE_VALUES:
+                    data[name] = "False"
+                else:
+                    errors.append(f"{name}: Enter yes or no.")
+            else:
+                data[name] = value
+        return data, errors
+
+
+def validate_row(form: EvidenceImportRowForm) -> list[str]:
+    """Validates a row as the evidence edit page validates a submission.
+
+    Returns:
+        The error messages, each starting with the column it's about, if any.
+    """
+    if form.is_valid():
+        validate_effect_size_statistic(form)
+        validate_has_association_and_p_value(form)
+        validate_odds_ratio(form)
+        validate_relative_risk(form)
+        validate_beta(form)
+        validate_ci_start(form)
+        validate_ci_end(form)
+    return [
+        f"{name}: {message}" if name != "__all__" else message
+        for name, messages in form.errors.items()
+        for message in messages
+    ]
+
+
+def _read_file(lines: Iterable[str], errors: list[RowError]) -> list:
+    rows = read_rows(lines)
+    number = 1
+    parsed: list[tuple[int, dict[str, str]]] = []
+    try:
+        for number, row in rows:
+            if not parsed:
+                columns = set(row)
+                unknown = sorted(columns - {"publication", *COLUMNS})
+                if unknown:
+                    message = f"Unknown columns: {', '.join(unknown)}."
+                    errors.append(RowError(1, [message]))
+                if "publication" not in columns:
+                    message = "The file needs a publication column."
+                    errors.append(RowError(1, [message]))
+                if errors:
+                    return []
+            if len(parsed) == MAX_ROWS:
+                message = f"Import at most {MAX_ROWS} rows at once."
+                errors.append(RowError(number, [message]))
+                return []
+            parsed.append((number, row))
+    except (csv.Error, UnicodeDecodeError) as error:
+        errors.append(RowError(number + 1, [f"Unable to read the file: {error}"]))
+        return []
+    if not parsed:
+        errors.append(RowError(1, ["The file has no rows of evidence."]))
+    return parsed
+
+
+def _validate_rows(
+    curation: Curation,
+    rows: list[tuple[int, dict[str, str]]],
+    added_by: User | None,
+    errors: list[RowError],
+) -> list[tuple[Evidence, list[str]]]:
+    publications = find_publications(row.get("publication", "") for _, row in rows)
+    demographics = list(Demographic.objects.all())
+    parser = RowParser(demographics)
+    choices = [(str(demographic.pk), demographic.group) for demographic in demographics]
+    valid = []
+    for number, row in rows:
+        value = row.get("publication", "")
+        publication = publications.get(value.lower())
+        if publication is None:
+            message = f"publication: There's no publication {value!r} in the HCI."
+            errors.append(RowError(number, [message]))
+            continue
+        data, messages = parser.parse(row)
+        # Every row shares the curation instance, so validating the rows' resolutions
+        # reads a haplotype's alleles once (see `Haplotype.min_resolution`).
+        instance = Evidence(
+            curation=curation, publication=publication, added_by=added_by
+        )
+        form = EvidenceImportRowForm(
+            data, instance=instance, demographic_choices=choices
+        )
+        messages += validate_row(form)
+        if messages:
+            errors.append(RowError(number, messages))
+        else:
+            valid.append((form.instance, form.cleaned_data["demographics"]))
+    return valid
+
+
+def import_evidence(
+    curation: Curation,
+    lines: Iterable[str],
+    added_by: User | None = None,
+    *,
+    skip_invalid: bool = False,
+) -> ImportResult:
+    """Adds evidence to a curation from a CSV or TSV file.
+
+    Args:
+        curation: The curation to add the evidence to.
+        lines: The file's lines, e.g., a file opened in text mode with `newline=""`.
+        added_by: The user adding the evidence.
+        skip_invalid: Whether to add the valid rows when some rows have errors.
+
+    Returns:
+        The evidence added and the errors found. Nothing is added if the file itself
+        has errors, e.g., an unknown column.
+    """
+    result = ImportResult()
+    rows = _read_file(lines, result.errors)
+    if result.errors:
+        return result
+    valid = _validate_rows(curation, rows, added_by, result.errors)
+    if result.errors and not skip_invalid:
+        return result
+
+    evidence = [instance for instance, _ in valid]
+    set_batch_scores(evidence)
+    with bulk_writes():
+        assign_slugs(evidence)
+        created = Evidence.objects.bulk_create(evidence, batch_size=BATCH_SIZE)
+        through = Evidence.demographics.through
+        through.objects.bulk_create(
+            [
+                through(evidence_id=instance.pk, demographic_id=int(pk))
+                for instance, (_, demographic_pks) in zip(created, valid, strict=True)
+                for pk in demographic_pks
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Evidence.history.bulk_history_create(
+            created, batch_size=BATCH_SIZE, default_user=added_by
+        )
+    result.created = created
+    return result
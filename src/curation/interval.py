@@ -1,11 +1,16 @@
-"""Houses a custom interval class used in scoring."""
+"""Houses custom interval classes used in scoring."""
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
 from decimal import Decimal
+from itertools import pairwise
 
 
 class Interval:
     """Defines an interval."""
 
+    __slots__ = ("end", "end_inclusive", "start", "start_inclusive", "variable")
+
     def __init__(
         self,
         *,
@@ -62,3 +67,83 @@ class Interval:
             upper_bound_check = number < self.end
 
         return lower_bound_check and upper_bound_check
+
+
+class IntervalSet:
+    """Defines a set of disjoint, contiguous intervals, each mapped to a value.
+
+    The intervals are sorted and validated once when the set is built, after which
+    finding the interval that contains a number takes O(log n) time.
+    """
+
+    __slots__ = ("_starts", "intervals", "values")
+
+    def __init__(
+        self,
+        brackets: Iterable[tuple[Interval, float]],
+        *,
+        step: Decimal | None = None,
+    ) -> None:
+        """Sorts and validates the intervals.
+
+        Args:
+            brackets: Pairs of intervals and the values they map to.
+            step: The spacing between allowed values when the variable is discrete,
+                e.g. `Decimal("1")` for cohort sizes. Discrete intervals are contiguous
+                when no allowed value falls between them, so [1000, 2499] and
+                [2500, 4999] are contiguous when the step is 1.
+
+        Raises:
+            ValueError: If there are no intervals, or any two neighboring intervals
+                overlap or leave a gap between them.
+        """
+        brackets = sorted(brackets, key=lambda bracket: bracket[0].start)
+        if not brackets:
+            message = "An interval set needs at least one interval."
+            raise ValueError(message)
+        self.intervals = tuple(interval for interval, _ in brackets)
+        self.values = tuple(value for _, value in brackets)
+        self._starts = [interval.start for interval in self.intervals]
+
+        for lower, upper in pairwise(self.intervals):
+            if step is None:
+                is_contiguous = (
+                    lower.end == upper.start
+                    and lower.end_inclusive != upper.start_inclusive
+                )
+            else:
+                first_value_above = (
+                    lower.end + step if lower.end_inclusive else lower.end
+                )
+                first_value_in = (
+                    upper.start if upper.start_inclusive else upper.start + step
+                )
+                is_contiguous = first_value_above == first_value_in
+            if not is_contiguous:
+                message = f"{lower!r} and {upper!r} are not disjoint and contiguous."
+                raise ValueError(message)
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the object for the developer."""
+        intervals = ", ".join(repr(interval) for interval in self.intervals)
+        return f"IntervalSet({intervals})"
+
+    def get(self, number: Decimal) -> float | None:
+        """Returns the value of the interval that contains the number, if any."""
+        index = bisect_right(self._starts, number) - 1
+        # A number on an exclusive start belongs to the interval below it.
+        for candidate in (index, index - 1):
+            if candidate >= 0 and self.intervals[candidate].contains(number):
+                return self.values[candidate]
+        return None
+
+    def get_below(self, number: Decimal) -> float | None:
+        """Returns the value of the interval containing the numbers just below it.
+
+        This is used for comparisons like "p < 0.05": when the number is on a boundary
+        between two intervals, the lower interval is the one that applies.
+        """
+        index = bisect_left(self._starts, number) - 1
+        if index >= 0 and number <= self.intervals[index].end:
+            return self.values[index]
+        return None
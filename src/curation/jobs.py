@@ -0,0 +1,39 @@
+"""Houses the curation app's tasks."""
+
+from common.signals import bulk_writes
+from curation.constants.models.common import Status
+from curation.models import Curation
+from job.models import Job
+from job.registry import register_task
+
+COPY_TASK = "curation.copy"
+
+
+@register_task(COPY_TASK, idempotent=False)
+def copy_curation(job: Job, curation_pk: int) -> dict[str, str]:
+    """Creates a new editable curation copied from a published one.
+
+    Each run makes another copy, so the worker runs it in one transaction, with the
+    evidence copied in bulk, and its progress goes from none of the evidence to all of
+    it when the copy commits.
+
+    Returns:
+        The new copy's URL and a message about it.
+    """
+    source = Curation.objects.get(pk=curation_pk)
+    job.set_progress(0, total=source.evidence.count())  # type: ignore[attr-defined]
+    new_curation = Curation.objects.create(
+        copied_from=source,
+        curation_type=source.curation_type,
+        allele=source.allele,
+        haplotype=source.haplotype,
+        disease=source.disease,
+        status=Status.IN_PROGRESS,
+        added_by=job.added_by,
+    )
+    with bulk_writes():
+        source.evidence.copy_to(new_curation, added_by=job.added_by)  # type: ignore[attr-defined]
+    return {
+        "url": new_curation.get_absolute_url(),
+        "message": f"Copy created as {new_curation.slug}.",
+    }
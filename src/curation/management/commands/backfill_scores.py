@@ -0,0 +1,36 @@
+"""Provides a command for recomputing the stored evidence scores."""
+
+from argparse import ArgumentParser
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+
+from curation.models import Evidence
+from curation.score import SCORE_FIELDS, SCORE_INPUT_FIELDS, get_batch_scores
+
+
+class Command(BaseCommand):
+    help = "Recomputes and stores the scores for every evidence record."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of evidence records to update per query.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        rows = Evidence.objects.order_by("pk").values("pk", *SCORE_INPUT_FIELDS)
+        count = 0
+        for batch in batched(
+            rows.iterator(chunk_size=batch_size), batch_size, strict=False
+        ):
+            evidence = [
+                Evidence(pk=row["pk"], **scores)
+                for row, scores in zip(batch, get_batch_scores(batch), strict=True)
+            ]
+            Evidence.objects.bulk_update(evidence, SCORE_FIELDS)
+            count += len(evidence)
+        self.stdout.write(self.style.SUCCESS(f"Rescored {count} evidence records."))
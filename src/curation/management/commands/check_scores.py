@@ -0,0 +1,38 @@
+"""Provides a command for finding evidence whose stored scores are out of date."""
+
+from itertools import batched
+
+from django.core.management.base import BaseCommand, CommandError
+
+from curation.models import Evidence
+from curation.score import SCORE_FIELDS, SCORE_INPUT_FIELDS, get_batch_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares every evidence record's stored scores against freshly computed "
+        "scores and exits with an error if any are out of date."
+    )
+
+    def handle(self, *args, **options) -> None:
+        num_stale = 0
+        rows = Evidence.objects.order_by("pk").values(
+            "slug", *SCORE_INPUT_FIELDS, *SCORE_FIELDS
+        )
+        for batch in batched(rows.iterator(chunk_size=500), 500, strict=False):
+            for row, scores in zip(batch, get_batch_scores(batch), strict=True):
+                stale_fields = [
+                    field_name
+                    for field_name, value in scores.items()
+                    if row[field_name] != value
+                ]
+                if stale_fields:
+                    num_stale += 1
+                    self.stdout.write(f"{row['slug']}: {', '.join(stale_fields)}")
+        if num_stale:
+            message = (
+                f"{num_stale} evidence records have stale scores. "
+                "Run the backfill_scores command to fix them."
+            )
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS("All stored evidence scores are current."))
@@ -0,0 +1,56 @@
+"""Provides a command for adding a curation's evidence from a spreadsheet."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from curation.importer import import_evidence
+from curation.models import Curation
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds evidence to a curation from a CSV or TSV file with a row for each "
+        "evidence, adding none if any row has errors unless --skip-invalid is given."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("curation", help="The curation's ID, e.g., C000001.")
+        parser.add_argument("file", type=Path, help="The CSV or TSV file.")
+        parser.add_argument(
+            "--user", help="The username of the user to record as adding them."
+        )
+        parser.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="Add the valid rows even if some rows have errors.",
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002
+        curation = (
+            Curation.objects.select_related("allele", "haplotype")
+            .filter(slug=options["curation"])
+            .first()
+        )
+        if curation is None:
+            msg = f"There's no curation {options['curation']}."
+            raise CommandError(msg)
+        if curation.is_locked:
+            msg = f"{curation.slug} is locked and cannot be edited."
+            raise CommandError(msg)
+        added_by = None
+        if options["user"] is not None:
+            added_by = User.objects.filter(username=options["user"]).first()
+            if added_by is None:
+                msg = f"There's no user named {options['user']}."
+                raise CommandError(msg)
+
+        with options["file"].open(encoding="utf-8-sig", newline="") as file:
+            result = import_evidence(
+                curation, file, added_by, skip_invalid=options["skip_invalid"]
+            )
+        for error in result.errors:
+            self.stderr.write(f"Row {error.row}: {' '.join(error.messages)}")
+        self.stdout.write(self.style.SUCCESS(f"Added {len(result.created)} evidence."))
@@ -0,0 +1,167 @@
+# Generated by Django 6.0.6 on 2026-10-18 01:29
+
+from django.db import migrations, models
+
+# The existing evidence is scored by `manage.py backfill_scores`, which deploys run after
+# migrating, rather than here, so later changes to the scoring can't change or break
+# this migration.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curation", "0020_alter_curation_copied_from_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evidence",
+            name="score",
+            field=models.FloatField(
+                default=0.0,
+                editable=False,
+                help_text="The final score for the evidence, computed on save.",
+                verbose_name="Score",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_before_multipliers",
+            field=models.FloatField(
+                default=0.0,
+                editable=False,
+                help_text="The sum of the step points, computed on save.",
+                verbose_name="Score Before Multipliers",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_1a",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the curation type, computed on save.",
+                null=True,
+                verbose_name="Step 1A Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_1b",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the allele resolution, computed on save.",
+                null=True,
+                verbose_name="Step 1B Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_1c",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the zygosity, computed on save.",
+                null=True,
+                verbose_name="Step 1C Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_1d",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the phase confirmation, computed on save.",
+                null=True,
+                verbose_name="Step 1D Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_2",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the typing method, computed on save.",
+                null=True,
+                verbose_name="Step 2 Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_3a",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the p-value, computed on save.",
+                null=True,
+                verbose_name="Step 3A Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_3b",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the multiple testing correction, computed on save.",
+                null=True,
+                verbose_name="Step 3B Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_3c1",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the effect size, computed on save.",
+                null=True,
+                verbose_name="Step 3C (OR/RR/Beta) Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_3c2",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the confidence interval, computed on save.",
+                null=True,
+                verbose_name="Step 3C (CI) Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_4",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the cohort size, computed on save.",
+                null=True,
+                verbose_name="Step 4 Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_5",
+            field=models.FloatField(
+                editable=False,
+                help_text="The points for the additional phenotypes, computed on save.",
+                null=True,
+                verbose_name="Step 5 Points",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_6a",
+            field=models.FloatField(
+                default=0.0,
+                editable=False,
+                help_text="The multiplier for the association, computed on save.",
+                verbose_name="Step 6A Multiplier",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidence",
+            name="score_step_6b",
+            field=models.FloatField(
+                default=1.0,
+                editable=False,
+                help_text="The multiplier for the allele resolution, computed on save.",
+                verbose_name="Step 6B Multiplier",
+            ),
+        ),
+    ]
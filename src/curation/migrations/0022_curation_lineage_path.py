@@ -0,0 +1,43 @@
+# Generated by Django 6.0.6 on 2026-10-18 01:56
+
+from django.db import migrations, models
+
+
+def backfill_lineage_paths(apps, schema_editor):
+    Curation = apps.get_model("curation", "Curation")
+    curations = list(Curation.objects.only("pk", "copied_from_id"))
+    parents = {curation.pk: curation.copied_from_id for curation in curations}
+    paths = {}
+
+    def get_path(pk):
+        if pk not in paths:
+            parent_id = parents.get(pk)
+            paths[pk] = (get_path(parent_id) if parent_id else "") + f"{pk}/"
+        return paths[pk]
+
+    for curation in curations:
+        curation.lineage_path = get_path(curation.pk)
+    Curation.objects.bulk_update(curations, ["lineage_path"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curation", "0021_evidence_score_columns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="curation",
+            name="lineage_path",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                help_text="The IDs of the curations this curation descends from, oldest first, then its own ID, each followed by a slash; maintained on save.",
+                max_length=1000,
+                verbose_name="Lineage Path",
+            ),
+        ),
+        migrations.RunPython(backfill_lineage_paths, migrations.RunPython.noop),
+    ]
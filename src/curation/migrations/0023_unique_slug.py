@@ -0,0 +1,46 @@
+# Generated by Django 6.0.6 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+def backfill_slugs(apps, schema_editor):
+    # Existing slugs are kept; only objects whose second save never happened lack one.
+    for model_name, prefix in [("Curation", "C"), ("Evidence", "E")]:
+        model = apps.get_model("curation", model_name)
+        objs = list(model.objects.filter(slug="").only("pk"))
+        for obj in objs:
+            obj.slug = f"{prefix}{obj.pk:06d}"
+        model.objects.bulk_update(objs, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curation", "0022_curation_lineage_path"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="curation",
+            name="slug",
+            field=models.SlugField(
+                default="",
+                help_text="The human-readable ID for the object.",
+                max_length=7,
+                unique=True,
+                verbose_name="Human-Readable ID",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="evidence",
+            name="slug",
+            field=models.SlugField(
+                default="",
+                help_text="The human-readable ID for the object.",
+                max_length=7,
+                unique=True,
+                verbose_name="Human-Readable ID",
+            ),
+        ),
+    ]
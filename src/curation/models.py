@@ -3,12 +3,17 @@
 import copy
 
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
+from django.db.models import Case, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Concat, Substr
 from django.http import HttpResponseBase
 from django.urls import reverse
-from simple_history.models import HistoricalRecords
 
 from allele.models import Allele
+from common.history import ChangedHistoricalRecords
+from common.models import SearchDocument
+from common.slugs import SlugMixin, assign_slugs
 from curation.constants.models.common import (
     CURATION_STATUS_CHOICES,
     CURATION_STATUS_TRANSITIONS,
@@ -18,6 +23,8 @@ from curation.constants.models.common import (
 from curation.constants.models.curation import (
     CLASSIFICATION_CHOICES,
     CURATION_TYPE_CHOICES,
+    MODERATE_MAX_SCORE,
+    MODERATE_MIN_SCORE,
     Classification,
     CurationTypes,
 )
@@ -32,19 +39,10 @@ from curation.constants.models.evidence import (
     Zygosity,
 )
 from curation.score import (
-    get_step_1a_points,
-    get_step_1b_points,
-    get_step_1c_points,
-    get_step_1d_points,
-    get_step_2_points,
-    get_step_3a_points,
-    get_step_3b_points,
-    get_step_3c1_points,
-    get_step_3c2_points,
-    get_step_4_points,
-    get_step_5_points,
-    get_step_6a_multiplier,
-    get_step_6b_multiplier,
+    SCORE_FIELDS,
+    SCORE_INPUT_FIELDS,
+    get_batch_scores,
+    get_scores,
 )
 from curation.validators.models.curation import (
     validate_curation_type,
@@ -67,11 +65,68 @@ from disease.models import Disease
 from haplotype.models import Haplotype
 from publication.models import Publication
 
+# Step 1A depends on the curation type, so we rescore a curation's evidence when the
+# curation type or the allele/haplotype being curated changes.
+CURATION_SCORING_FIELDS = ("curation_type", "allele_id", "haplotype_id")
+
+# How many rows each query writes when copying evidence in bulk.
+COPY_BATCH_SIZE = 500
+
+
+def get_suggested_classification(score: float) -> str | None:
+    """Returns the classification code suggested by a curation's score."""
+    if score == 0:
+        return None
+    if score < MODERATE_MIN_SCORE:
+        return Classification.LIMITED
+    if score <= MODERATE_MAX_SCORE:
+        return Classification.MODERATE
+    return Classification.STRONG
+
+
+class CurationQuerySet(models.QuerySet):
+    def with_scores(self) -> "CurationQuerySet":
+        """Annotates each curation with its score and suggested classification.
+
+        Both are computed by the database in the same grouped query that fetches the
+        curations, so rendering a page of curations doesn't query each curation's
+        evidence. The `score` and `suggested_classification` properties use these
+        annotations when they're present.
+
+        Returns:
+            The annotated queryset.
+        """
+        return self.annotate(
+            annotated_score=Coalesce(
+                Sum("evidence__score", filter=Q(evidence__is_included=True)),
+                Value(0.0),
+            ),
+        ).annotate(
+            # This mirrors get_suggested_classification.
+            annotated_suggested_classification=Case(
+                When(annotated_score=0, then=Value(None)),
+                When(
+                    annotated_score__lt=MODERATE_MIN_SCORE,
+                    then=Value(Classification.LIMITED),
+                ),
+                When(
+                    annotated_score__lte=MODERATE_MAX_SCORE,
+                    then=Value(Classification.MODERATE),
+                ),
+                default=Value(Classification.STRONG),
+                output_field=models.CharField(),
+            ),
+        )
+
+
+class Curation(SlugMixin, models.Model):
+    slug_prefix = "C"
+    search_fields = ["slug", "allele__name", "haplotype__name", "disease__name"]
 
-class Curation(models.Model):
     slug = models.SlugField(
         default="",
         max_length=7,
+        unique=True,
         verbose_name="Human-Readable ID",
         help_text="The human-readable ID for the object.",
     )
@@ -133,6 +188,17 @@ class Curation(models.Model):
         verbose_name="Copied From",
         help_text="The published curation this curation was copied from, if any.",
     )
+    lineage_path = models.CharField(
+        max_length=1000,
+        default="",
+        editable=False,
+        db_index=True,
+        verbose_name="Lineage Path",
+        help_text=(
+            "The IDs of the curations this curation descends from, oldest first, "
+            "then its own ID, each followed by a slash; maintained on save."
+        ),
+    )
     allele = models.ForeignKey(
         Allele,
         blank=True,
@@ -176,7 +242,11 @@ class Curation(models.Model):
         verbose_name="Updated At",
         help_text="When the curation was last updated.",
     )
-    history = HistoricalRecords()
+    # The lineage path is derived from the copied_from chain, so it isn't tracked.
+    search_documents = GenericRelation(SearchDocument)
+    history = ChangedHistoricalRecords(excluded_fields=["lineage_path"])
+
+    objects = CurationQuerySet.as_manager()
 
     class Meta:
         db_table = "curation"
@@ -187,19 +257,91 @@ class Curation(models.Model):
         return f"Curation #{self.pk} ({self.curation_type})"
 
     def save(self, *args, **kwargs) -> None:
+        loaded_scoring_values = getattr(self, "_loaded_scoring_values", None)
+        if self._state.adding and self.pk is None:
+            # The lineage path ends with the curation's own primary key, so it's needed
+            # before the curation is inserted.
+            assign_slugs([self])
+            kwargs.setdefault("force_insert", True)
+        if self.update_lineage_path() and kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "lineage_path"}
         super().save(*args, **kwargs)
-        if not self.slug:
-            self.slug = f"C{self.pk:06d}"
-            self.save(update_fields=["slug"])
+        scoring_values = self._scoring_values()
+        if loaded_scoring_values not in (None, scoring_values):
+            self.rescore_evidence()
+        self._loaded_scoring_values = scoring_values
 
     def get_absolute_url(self) -> HttpResponseBase | str | None:
         return reverse("curation-detail", kwargs={"curation_slug": self.slug})
 
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "Curation":  # noqa: ANN001
+        """Remembers the loaded values of the fields the evidence scores depend on.
+
+        Returns:
+            The curation instance loaded from the database.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_scoring_values = instance._scoring_values()  # noqa: SLF001
+        return instance
+
+    @classmethod
+    def get_history_kept_ids(cls) -> models.QuerySet:
+        """Returns the published curations, whose history is part of the audit trail.
+
+        Returns:
+            The curations' primary keys, whose history `compact_history` keeps whole.
+        """
+        return cls.objects.filter(
+            Q(status=Status.PUBLISHED) | Q(publication__isnull=False)
+        ).values("pk")
+
     def clean(self) -> None:
         super().clean()
         validate_status(self)
         validate_curation_type(self)
 
+    def _scoring_values(self) -> tuple:
+        # Read from __dict__ so that deferred fields aren't fetched.
+        return tuple(self.__dict__.get(name) for name in CURATION_SCORING_FIELDS)
+
+    def update_lineage_path(self) -> bool:
+        """Recomputes the lineage path if the curation was copied from a new curation.
+
+        The paths of any curations copied from this one, directly or transitively, are
+        rewritten in the database to start with the new path.
+
+        Returns:
+            Whether the lineage path changed and needs to be saved.
+        """
+        ids = self.lineage_path.split("/")[:-1]
+        path_parent_id = ids[-2] if len(ids) > 1 else None
+        parent_id = str(self.copied_from_id) if self.copied_from_id else None  # type: ignore
+        if ids and ids[-1] == str(self.pk) and path_parent_id == parent_id:
+            return False
+        parent_path = self.copied_from.lineage_path if self.copied_from else ""
+        old_path = self.lineage_path
+        self.lineage_path = f"{parent_path}{self.pk}/"
+        if old_path:
+            Curation.objects.filter(lineage_path__startswith=old_path).exclude(
+                pk=self.pk
+            ).update(
+                lineage_path=Concat(
+                    Value(self.lineage_path),
+                    Substr("lineage_path", len(old_path) + 1),
+                )
+            )
+        return True
+
+    def rescore_evidence(self) -> None:
+        """Recomputes and stores the scores of all of the curation's evidence."""
+        rows = list(self.evidence.values("pk", *SCORE_INPUT_FIELDS))  # type: ignore
+        evidence = [
+            Evidence(pk=row["pk"], **scores)
+            for row, scores in zip(rows, get_batch_scores(rows), strict=True)
+        ]
+        Evidence.objects.bulk_update(evidence, SCORE_FIELDS)
+
     @property
     def is_locked(self) -> bool:
         return self.status in (
@@ -248,23 +390,18 @@ class Curation(models.Model):
     def suggested_classification(self) -> str | None:
         if self.pk is None:
             return None
-        s = self.score
-        if s == 0:
-            return None
-        if s < 25:
-            return Classification.LIMITED
-        if s <= 50:
-            return Classification.MODERATE
-        return Classification.STRONG
+        if hasattr(self, "annotated_suggested_classification"):
+            return self.annotated_suggested_classification
+        return get_suggested_classification(self.score)
 
     @property
     def score(self) -> float:
-        """Returns the score for the curation."""
-        total = 0.0
-        for evidence in self.evidence.all():  # type: ignore
-            if evidence.is_included:
-                total += evidence.score
-        return total
+        """Returns the sum of the scores of the curation's included evidence."""
+        if hasattr(self, "annotated_score"):
+            return self.annotated_score
+        return self.evidence.filter(is_included=True).aggregate(  # type: ignore
+            total=Coalesce(Sum("score"), Value(0.0)),
+        )["total"]
 
 
 class Demographic(models.Model):
@@ -286,7 +423,7 @@ class Demographic(models.Model):
         verbose_name="Updated At",
         help_text="When the demographic was last updated.",
     )
-    history = HistoricalRecords()
+    history = ChangedHistoricalRecords()
 
     class Meta:
         db_table = "demographic"
@@ -297,10 +434,55 @@ class Demographic(models.Model):
         return self.group
 
 
-class Evidence(models.Model):
+class EvidenceQuerySet(models.QuerySet):
+    def copy_to(
+        self, curation: "Curation", added_by: User | None = None
+    ) -> list["Evidence"]:
+        """Copies the evidence, with its demographics, to the given curation.
+
+        The copies (with their slugs), their demographics, and their "created" history
+        are each written in bulk, so copying hundreds of evidence takes a handful of
+        queries rather than several per evidence. Their stored scores are copied rather
+        than recomputed.
+
+        Returns:
+            The copies, in the same order as the queryset.
+        """
+        sources = list(self.prefetch_related("demographics"))
+        copies = []
+        for source in sources:
+            new = copy.copy(source)
+            new.__dict__.pop("_prefetched_objects_cache", None)
+            new.pk = None
+            new.slug = ""
+            new._state.adding = True  # noqa: SLF001
+            new.curation = curation
+            new.added_by = added_by
+            copies.append(new)
+        assign_slugs(copies)
+        copies = self.model.objects.bulk_create(copies, batch_size=COPY_BATCH_SIZE)
+        through = self.model.demographics.through
+        through.objects.bulk_create(
+            [
+                through(evidence_id=new.pk, demographic_id=demographic.pk)
+                for source, new in zip(sources, copies, strict=True)
+                for demographic in source.demographics.all()
+            ],
+            batch_size=COPY_BATCH_SIZE,
+        )
+        self.model.history.bulk_history_create(  # type: ignore[attr-defined]
+            copies, batch_size=COPY_BATCH_SIZE, default_user=added_by
+        )
+        return copies
+
+
+class Evidence(SlugMixin, models.Model):
+    slug_prefix = "E"
+
     slug = models.SlugField(
         default="",
         max_length=7,
+        unique=True,
         verbose_name="Human-Readable ID",
         help_text="The human-readable ID for the object.",
     )
@@ -597,6 +779,96 @@ class Evidence(models.Model):
         default="",
         verbose_name="Notes",
     )
+    score_step_1a = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 1A Points",
+        help_text="The points for the curation type, computed on save.",
+    )
+    score_step_1b = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 1B Points",
+        help_text="The points for the allele resolution, computed on save.",
+    )
+    score_step_1c = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 1C Points",
+        help_text="The points for the zygosity, computed on save.",
+    )
+    score_step_1d = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 1D Points",
+        help_text="The points for the phase confirmation, computed on save.",
+    )
+    score_step_2 = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 2 Points",
+        help_text="The points for the typing method, computed on save.",
+    )
+    score_step_3a = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 3A Points",
+        help_text="The points for the p-value, computed on save.",
+    )
+    score_step_3b = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 3B Points",
+        help_text="The points for the multiple testing correction, computed on save.",
+    )
+    score_step_3c1 = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 3C (OR/RR/Beta) Points",
+        help_text="The points for the effect size, computed on save.",
+    )
+    score_step_3c2 = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 3C (CI) Points",
+        help_text="The points for the confidence interval, computed on save.",
+    )
+    score_step_4 = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 4 Points",
+        help_text="The points for the cohort size, computed on save.",
+    )
+    score_step_5 = models.FloatField(
+        editable=False,
+        null=True,
+        verbose_name="Step 5 Points",
+        help_text="The points for the additional phenotypes, computed on save.",
+    )
+    score_step_6a = models.FloatField(
+        default=0.0,
+        editable=False,
+        verbose_name="Step 6A Multiplier",
+        help_text="The multiplier for the association, computed on save.",
+    )
+    score_step_6b = models.FloatField(
+        default=1.0,
+        editable=False,
+        verbose_name="Step 6B Multiplier",
+        help_text="The multiplier for the allele resolution, computed on save.",
+    )
+    score_before_multipliers = models.FloatField(
+        default=0.0,
+        editable=False,
+        verbose_name="Score Before Multipliers",
+        help_text="The sum of the step points, computed on save.",
+    )
+    score = models.FloatField(
+        default=0.0,
+        editable=False,
+        verbose_name="Score",
+        help_text="The final score for the evidence, computed on save.",
+    )
     added_by = models.ForeignKey(
         User,
         blank=True,
@@ -616,7 +888,11 @@ class Evidence(models.Model):
         verbose_name="Updated At",
         help_text="When the evidence was last updated.",
     )
-    history = HistoricalRecords()
+    # The score columns are derived from the other fields, so there's no point in
+    # recording them in the history.
+    history = ChangedHistoricalRecords(excluded_fields=list(SCORE_FIELDS))
+
+    objects = EvidenceQuerySet.as_manager()
 
     class Meta:
         db_table = "evidence"
@@ -627,10 +903,11 @@ class Evidence(models.Model):
         return f"Evidence #{self.pk}"
 
     def save(self, *args, **kwargs) -> None:
+        """Computes the stored scores."""
+        self.set_scores()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], *SCORE_FIELDS}
         super().save(*args, **kwargs)
-        if not self.slug:
-            self.slug = f"E{self.pk:06d}"
-            self.save(update_fields=["slug"])
 
     def get_absolute_url(self) -> HttpResponseBase | str | None:
         curation_pk = self.curation.slug if self.curation else None
@@ -642,22 +919,16 @@ class Evidence(models.Model):
             },
         )
 
-    def copy_to(self, curation: "Curation", added_by: User | None = None) -> "Evidence":
-        """Creates and returns a copy of this evidence attached to the given curation.
+    @classmethod
+    def get_history_kept_ids(cls) -> models.QuerySet:
+        """Returns the evidence of published curations, whose history is kept whole.
 
         Returns:
-            The newly created Evidence copy.
+            The evidence's primary keys.
         """
-        demographics = list(self.demographics.all())
-        new = copy.copy(self)
-        new.pk = None
-        new.slug = ""
-        new._state.adding = True  # noqa: SLF001
-        new.curation = curation
-        new.added_by = added_by
-        new.save()
-        new.demographics.set(demographics)
-        return new
+        return cls.objects.filter(curation__in=Curation.get_history_kept_ids()).values(
+            "pk"
+        )
 
     def clean(self) -> None:
         validate_publication(self)
@@ -672,75 +943,7 @@ class Evidence(models.Model):
         validate_ci_start_string(self)
         validate_ci_end_string(self)
 
-    @property
-    def score(self) -> float:
-        return self.score_before_multipliers * self.score_step_6a * self.score_step_6b
-
-    @property
-    def score_before_multipliers(self) -> float:
-        """Returns the score for the evidence before multipliers are applied."""
-        return (
-            (self.score_step_1a if self.score_step_1a else 0)
-            + (self.score_step_1b if self.score_step_1b else 0)
-            + (self.score_step_1c if self.score_step_1c else 0)
-            + (self.score_step_1d if self.score_step_1d else 0)
-            + (self.score_step_2 if self.score_step_2 else 0)
-            + (self.score_step_3a if self.score_step_3a else 0)
-            + (self.score_step_3b if self.score_step_3b else 0)
-            + (self.score_step_3c1 if self.score_step_3c1 else 0)
-            + (self.score_step_3c2 if self.score_step_3c2 else 0)
-            + (self.score_step_4 if self.score_step_4 else 0)
-            + (self.score_step_5 if self.score_step_5 else 0)
-        )
-
-    @property
-    def score_step_1a(self) -> float | None:
-        return get_step_1a_points(self)
-
-    @property
-    def score_step_1b(self) -> float | None:
-        return get_step_1b_points(self)
-
-    @property
-    def score_step_1c(self) -> float | None:
-        return get_step_1c_points(self)
-
-    @property
-    def score_step_1d(self) -> float | None:
-        return get_step_1d_points(self)
-
-    @property
-    def score_step_2(self) -> float | None:
-        return get_step_2_points(self)
-
-    @property
-    def score_step_3a(self) -> float | None:
-        return get_step_3a_points(self)
-
-    @property
-    def score_step_3b(self) -> float | None:
-        return get_step_3b_points(self)
-
-    @property
-    def score_step_3c1(self) -> float | None:
-        return get_step_3c1_points(self)
-
-    @property
-    def score_step_3c2(self) -> float | None:
-        return get_step_3c2_points(self)
-
-    @property
-    def score_step_4(self) -> float | None:
-        return get_step_4_points(self)
-
-    @property
-    def score_step_5(self) -> float | None:
-        return get_step_5_points(self)
-
-    @property
-    def score_step_6a(self) -> float:
-        return get_step_6a_multiplier(self)
-
-    @property
-    def score_step_6b(self) -> float:
-        return get_step_6b_multiplier(self)
+    def set_scores(self) -> None:
+        """Sets the stored score fields from the evidence's current field values."""
+        for field_name, value in get_scores(self).items():
+            setattr(self, field_name, value)
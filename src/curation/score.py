@@ -1,6 +1,8 @@
 """Houses code for scoring evidence based on the HLA scoring framework."""
 
+from collections.abc import Iterable, Mapping
 from decimal import Decimal
+from typing import Any
 
 from curation.constants.models.curation import CurationTypes
 from curation.constants.models.evidence import (
@@ -11,7 +13,7 @@ from curation.constants.models.evidence import (
     TypingMethod,
     Zygosity,
 )
-from curation.constants.score import Intervals, Points
+from curation.constants.score import Brackets, Intervals, Points
 from curation.interval import Interval
 
 
@@ -82,40 +84,10 @@ def get_step_2_points(evidence) -> float | None:
 def get_step_3a_points(evidence) -> float | None:
     if evidence.p_value is None:
         return None
-
-    gwas_intervals = [
-        (Intervals.S3A.GWAS_1, Points.S3A_INTERVAL_1),
-        (Intervals.S3A.GWAS_2, Points.S3A_INTERVAL_2),
-        (Intervals.S3A.GWAS_3, Points.S3A_INTERVAL_3),
-        (Intervals.S3A.GWAS_4, Points.S3A_INTERVAL_4),
-        (Intervals.S3A.GWAS_5, Points.S3A_INTERVAL_5),
-    ]
-
-    non_gwas_intervals = [
-        (Intervals.S3A.NON_GWAS_1, Points.S3A_INTERVAL_1),
-        (Intervals.S3A.NON_GWAS_2, Points.S3A_INTERVAL_2),
-        (Intervals.S3A.NON_GWAS_3, Points.S3A_INTERVAL_3),
-        (Intervals.S3A.NON_GWAS_4, Points.S3A_INTERVAL_4),
-        (Intervals.S3A.NON_GWAS_5, Points.S3A_INTERVAL_5),
-    ]
-
-    intervals = gwas_intervals if evidence.is_gwas else non_gwas_intervals
-
-    p_value = evidence.p_value
-
+    brackets = Brackets.S3A_GWAS if evidence.is_gwas else Brackets.S3A_NON_GWAS
     if evidence.p_value_comparator == PValueComparator.LESS_THAN:
-        # "< X": find the interval whose exclusive upper bound is exactly X.
-        # Every bracket boundary is an exact Decimal, so == is safe here.
-        for interval, points in intervals:
-            if not interval.end_inclusive and interval.end == p_value:
-                return points
-        # p_value isn't exactly on a bracket boundary, so "just below X"
-        # lands in the same bracket as X itself. Fall through to normal containment.
-
-    for interval, points in intervals:
-        if interval.contains(p_value):
-            return points
-    return None
+        return brackets.get_below(evidence.p_value)
+    return brackets.get(evidence.p_value)
 
 
 def get_step_3b_points(evidence) -> float | None:
@@ -213,29 +185,8 @@ def get_step_3c2_points(evidence) -> float | None:
 def get_step_4_points(evidence) -> float | None:
     if evidence.cohort_size is None:
         return None
-
-    gwas_intervals = [
-        (Intervals.S4.GWAS_1, Points.S4_INTERVAL_1),
-        (Intervals.S4.GWAS_2, Points.S4_INTERVAL_2),
-        (Intervals.S4.GWAS_3, Points.S4_INTERVAL_3),
-        (Intervals.S4.GWAS_4, Points.S4_INTERVAL_4),
-        (Intervals.S4.GWAS_5, Points.S4_INTERVAL_5),
-    ]
-
-    non_gwas_intervals = [
-        (Intervals.S4.NON_GWAS_1, Points.S4_INTERVAL_1),
-        (Intervals.S4.NON_GWAS_2, Points.S4_INTERVAL_2),
-        (Intervals.S4.NON_GWAS_3, Points.S4_INTERVAL_3),
-        (Intervals.S4.NON_GWAS_4, Points.S4_INTERVAL_4),
-        (Intervals.S4.NON_GWAS_5, Points.S4_INTERVAL_5),
-    ]
-
-    intervals = gwas_intervals if evidence.is_gwas else non_gwas_intervals
-
-    for interval, points in intervals:
-        if interval.contains(Decimal(evidence.cohort_size)):
-            return points
-    return None
+    brackets = Brackets.S4_GWAS if evidence.is_gwas else Brackets.S4_NON_GWAS
+    return brackets.get(Decimal(evidence.cohort_size))
 
 
 def get_step_5_points(evidence) -> float | None:
@@ -269,3 +220,249 @@ def get_step_6b_multiplier(evidence) -> float:
     if evidence.num_fields == 1:
         return Points.S6B_1_FIELD
     return Points.S6B_MORE_THAN_1_FIELD
+
+
+# The per-step points and totals that get_scores computes. The Evidence model stores
+# each of these in a column of the same name.
+SCORE_FIELDS = (
+    "score_step_1a",
+    "score_step_1b",
+    "score_step_1c",
+    "score_step_1d",
+    "score_step_2",
+    "score_step_3a",
+    "score_step_3b",
+    "score_step_3c1",
+    "score_step_3c2",
+    "score_step_4",
+    "score_step_5",
+    "score_step_6a",
+    "score_step_6b",
+    "score_before_multipliers",
+    "score",
+)
+
+
+def get_scores(evidence) -> dict[str, float | None]:
+    """Returns the points for every step and the totals, keyed by score field."""
+    scores: dict[str, float | None] = {
+        "score_step_1a": get_step_1a_points(evidence),
+        "score_step_1b": get_step_1b_points(evidence),
+        "score_step_1c": get_step_1c_points(evidence),
+        "score_step_1d": get_step_1d_points(evidence),
+        "score_step_2": get_step_2_points(evidence),
+        "score_step_3a": get_step_3a_points(evidence),
+        "score_step_3b": get_step_3b_points(evidence),
+        "score_step_3c1": get_step_3c1_points(evidence),
+        "score_step_3c2": get_step_3c2_points(evidence),
+        "score_step_4": get_step_4_points(evidence),
+        "score_step_5": get_step_5_points(evidence),
+    }
+    score_before_multipliers = sum((points or 0 for points in scores.values()), 0.0)
+    score_step_6a = get_step_6a_multiplier(evidence)
+    score_step_6b = get_step_6b_multiplier(evidence)
+    scores["score_step_6a"] = score_step_6a
+    scores["score_step_6b"] = score_step_6b
+    scores["score_before_multipliers"] = score_before_multipliers
+    scores["score"] = score_before_multipliers * score_step_6a * score_step_6b
+    return scores
+
+
+# The evidence columns get_batch_scores reads from each row. Pass these to a queryset's
+# values() method to score evidence without loading model instances.
+SCORE_INPUT_FIELDS = (
+    "curation__curation_type",
+    "is_gwas",
+    "num_fields",
+    "zygosity",
+    "phase_confirmed",
+    "typing_method",
+    "p_value_comparator",
+    "p_value",
+    "multiple_testing_correction",
+    "effect_size_statistic",
+    "odds_ratio",
+    "relative_risk",
+    "beta",
+    "ci_start",
+    "ci_end",
+    "cohort_size",
+    "additional_phenotypes",
+    "has_association",
+)
+
+_STEP_1A_POINTS = {
+    CurationTypes.ALLELE: Points.S1A_ALLELE,
+    CurationTypes.HAPLOTYPE: Points.S1A_HAPLOTYPE,
+}
+
+_STEP_1B_POINTS = {
+    1: Points.S1B_1_FIELD,
+    2: Points.S1B_2_FIELD,
+    3: Points.S1B_3_FIELD,
+    4: Points.S1B_4_FIELD,
+}
+
+_STEP_1C_POINTS = {
+    Zygosity.MONOALLELIC: Points.S1C_MONOALLELIC,
+    Zygosity.BIALLELIC: Points.S1C_BIALLELIC,
+}
+
+_STEP_2_POINTS = {
+    TypingMethod.TAG_SNPS: Points.S2_TAG_SNPS,
+    TypingMethod.MICROARRAYS: Points.S2_MICROARRAYS,
+    TypingMethod.SEROLOGICAL: Points.S2_SEROLOGICAL,
+    TypingMethod.IMPUTATION: Points.S2_IMPUTATION,
+    TypingMethod.LOW_RES_TYPING: Points.S2_LOW_RES_TYPING,
+    TypingMethod.HIGH_RES_TYPING: Points.S2_HIGH_RES_TYPING,
+    TypingMethod.WHOLE_EXOME_SEQ: Points.S2_WHOLE_EXOME_SEQ,
+    TypingMethod.RNA_SEQ: Points.S2_RNA_SEQ,
+    TypingMethod.SANGER_SEQ: Points.S2_SANGER_SEQ,
+    TypingMethod.WHOLE_GENE_SEQ: Points.S2_WHOLE_GENE_SEQ,
+    TypingMethod.WHOLE_GENOME_SEQ: Points.S2_WHOLE_GENOME_SEQ,
+    TypingMethod.NEXT_GENERATION_SEQ: Points.S2_NEXT_GENERATION_SEQ,
+    TypingMethod.LONG_READ_SEQ: Points.S2_LONG_READ_SEQ,
+}
+
+_STEP_3B_POINTS = {
+    MultipleTestingCorrection.OVERALL: Points.S3B_OVERALL,
+    MultipleTestingCorrection.TWO_STEP: Points.S3B_TWO_STEP,
+}
+
+_STEP_5_POINTS = {
+    AdditionalPhenotypes.SPECIFIC_DISEASE_RELATED: Points.S5_SPECIFIC_PHENOTYPE,
+    AdditionalPhenotypes.ONLY_DISEASE_TESTED: Points.S5_ONLY_DISEASE_TESTED,
+}
+
+# Maps each effect size statistic to the column holding its value, the value a
+# confidence interval must not cross, and the interval thresholds for step 3C.
+_EFFECT_SIZES = {
+    EffectSizeStatistic.ODDS_RATIO: (
+        "odds_ratio",
+        Decimal("1.0"),
+        Intervals.S3C.OR_RR_2.end,
+        Intervals.S3C.OR_RR_1.start,
+    ),
+    EffectSizeStatistic.RELATIVE_RISK: (
+        "relative_risk",
+        Decimal("1.0"),
+        Intervals.S3C.OR_RR_2.end,
+        Intervals.S3C.OR_RR_1.start,
+    ),
+    EffectSizeStatistic.BETA: (
+        "beta",
+        Decimal("0.0"),
+        Intervals.S3C.BETA_2.end,
+        Intervals.S3C.BETA_1.start,
+    ),
+}
+
+
+def _get_row_scores(row: Mapping[str, Any]) -> dict[str, float | None]:
+    """Returns the points for every step and the totals for one row of evidence.
+
+    Returns:
+        The points for every step and the totals, keyed by score field.
+    """
+    is_gwas = row["is_gwas"]
+
+    score_step_3a = None
+    p_value = row["p_value"]
+    if p_value is not None:
+        brackets = Brackets.S3A_GWAS if is_gwas else Brackets.S3A_NON_GWAS
+        if row["p_value_comparator"] == PValueComparator.LESS_THAN:
+            score_step_3a = brackets.get_below(p_value)
+        else:
+            score_step_3a = brackets.get(p_value)
+
+    score_step_3c1 = None
+    score_step_3c2 = None
+    effect_size = _EFFECT_SIZES.get(row["effect_size_statistic"])
+    if effect_size is not None:
+        field_name, does_not_cross_value, lower_threshold, upper_threshold = effect_size
+        value = row[field_name]
+        if value:
+            if value <= lower_threshold or value >= upper_threshold:
+                score_step_3c1 = Points.S3C_OR_RR_BETA
+            ci_start = row["ci_start"]
+            ci_end = row["ci_end"]
+            has_confidence_interval = ci_start and ci_end
+            if has_confidence_interval and not (
+                ci_start <= does_not_cross_value <= ci_end
+            ):
+                score_step_3c2 = Points.S3C_CI_DOES_NOT_CROSS
+
+    score_step_4 = None
+    cohort_size = row["cohort_size"]
+    if cohort_size is not None:
+        brackets = Brackets.S4_GWAS if is_gwas else Brackets.S4_NON_GWAS
+        score_step_4 = brackets.get(cohort_size)
+
+    scores: dict[str, float | None] = {
+        "score_step_1a": _STEP_1A_POINTS.get(row["curation__curation_type"]),
+        "score_step_1b": _STEP_1B_POINTS.get(row["num_fields"]),
+        "score_step_1c": _STEP_1C_POINTS.get(row["zygosity"]),
+        "score_step_1d": (
+            Points.S1D_PHASE_CONFIRMED
+            if row["phase_confirmed"]
+            else Points.S1D_PHASE_NOT_CONFIRMED
+        ),
+        "score_step_2": _STEP_2_POINTS.get(row["typing_method"]),
+        "score_step_3a": score_step_3a,
+        "score_step_3b": _STEP_3B_POINTS.get(row["multiple_testing_correction"]),
+        "score_step_3c1": score_step_3c1,
+        "score_step_3c2": score_step_3c2,
+        "score_step_4": score_step_4,
+        "score_step_5": _STEP_5_POINTS.get(row["additional_phenotypes"]),
+    }
+    score_before_multipliers = sum((points or 0 for points in scores.values()), 0.0)
+    score_step_6a = (
+        Points.S6A_ASSOCIATION if row["has_association"] else Points.S6A_NO_ASSOCIATION
+    )
+    score_step_6b = (
+        Points.S6B_1_FIELD if row["num_fields"] == 1 else Points.S6B_MORE_THAN_1_FIELD
+    )
+    scores["score_step_6a"] = score_step_6a
+    scores["score_step_6b"] = score_step_6b
+    scores["score_before_multipliers"] = score_before_multipliers
+    scores["score"] = score_before_multipliers * score_step_6a * score_step_6b
+    return scores
+
+
+def get_batch_scores(
+    rows: Iterable[Mapping[str, Any]],
+) -> list[dict[str, float | None]]:
+    """Scores many rows of evidence at once.
+
+    Each row is a mapping with a key for every name in SCORE_INPUT_FIELDS, such as the
+    dicts returned by `Evidence.objects.values(*SCORE_INPUT_FIELDS)`. The categorical
+    steps use prebuilt lookup tables and the bracketed steps use the prebuilt interval
+    sets in Brackets, so no model instances or per-step function calls are needed.
+
+    Returns:
+        The same breakdown as get_scores for each row, in the order of the rows.
+    """
+    return [_get_row_scores(row) for row in rows]
+
+
+def set_batch_scores(evidence: Iterable[Any]) -> None:
+    """Fills in unsaved evidence's score columns with get_batch_scores.
+
+    `Evidence.save()` scores one evidence at a time, which `bulk_create` skips, so
+    evidence that's bulk created is scored with this first.
+    """
+    evidence = list(evidence)
+    rows = [
+        {
+            field: (
+                item.curation.curation_type
+                if field == "curation__curation_type"
+                else getattr(item, field)
+            )
+            for field in SCORE_INPUT_FIELDS
+        }
+        for item in evidence
+    ]
+    for item, scores in zip(evidence, get_batch_scores(rows), strict=True):
+        for field, value in scores.items():
+            setattr(item, field, value)
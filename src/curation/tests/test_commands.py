@@ -0,0 +1,83 @@
+"""Houses tests for the curation app's management commands."""
+
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from curation.constants.score import Points
+from curation.models import Evidence
+
+
+class TestScoreCommands(TestCase):
+    fixtures = [
+        "test_alleles.json",
+        "test_diseases.json",
+        "test_curations.json",
+        "test_publications.json",
+        "test_evidence.json",
+    ]
+
+    def test_check_scores_passes_when_scores_are_current(self):
+        out = StringIO()
+        call_command("check_scores", stdout=out)
+        self.assertIn("current", out.getvalue())
+
+    def test_check_scores_fails_when_scores_are_stale(self):
+        Evidence.objects.filter(pk=1).update(score_step_1a=None, score=100.0)
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("check_scores", stdout=out)
+        self.assertIn("E000001: score_step_1a, score", out.getvalue())
+
+    def test_backfill_scores_fixes_stale_scores(self):
+        Evidence.objects.filter(pk=1).update(score_step_1a=None, score=100.0)
+        call_command("backfill_scores", stdout=StringIO())
+        evidence = Evidence.objects.get(pk=1)
+        self.assertEqual(evidence.score_step_1a, Points.S1A_ALLELE)
+        self.assertEqual(evidence.score, 0.0)
+        call_command("check_scores", stdout=StringIO())
+
+
+class TestImportEvidenceCommand(TestCase):
+    fixtures = [
+        "test_alleles.json",
+        "test_diseases.json",
+        "test_publications.json",
+        "test_curations.json",
+    ]
+
+    def call(self, text: str, *args: str) -> tuple[str, str]:
+        """Runs the command on a file with the text.
+
+        Returns:
+            The command's output and its errors.
+        """
+        out, err = StringIO(), StringIO()
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "evidence.tsv"
+            path.write_text(text, encoding="utf-8")
+            call_command(
+                "import_evidence", "C000001", str(path), *args, stdout=out, stderr=err
+            )
+        return out.getvalue(), err.getvalue()
+
+    def test_adds_evidence(self):
+        out, _ = self.call("publication\tzygosity\nP000001\tBI\nPMID:123\tMO\n")
+        self.assertIn("Added 2 evidence.", out)
+        self.assertEqual(Evidence.objects.count(), 2)
+
+    def test_reports_row_errors(self):
+        text = "publication\tzygosity\nP000001\tBI\nP000001\tXX\n"
+        out, err = self.call(text)
+        self.assertIn("Row 3: zygosity:", err)
+        self.assertIn("Added 0 evidence.", out)
+        out, _ = self.call(text, "--skip-invalid")
+        self.assertIn("Added 1 evidence.", out)
+
+    def test_unknown_users_are_an_error(self):
+        with self.assertRaises(CommandError):
+            self.call("publication\nP000001\n", "--user", "nobody")
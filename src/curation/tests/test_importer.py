@@ -0,0 +1,155 @@
+"""Houses tests for the curation app's evidence importer."""
+
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from curation.constants.models.curation import CurationTypes
+from curation.constants.models.evidence import (
+    PValueComparator,
+    TypingMethod,
+    Zygosity,
+)
+from curation.importer import import_evidence
+from curation.models import Curation, Evidence
+from curation.score import get_scores
+from haplotype.models import Haplotype
+
+HEADER = (
+    "Publication,Is Included,Zygosity,Typing Method,Demographics,"
+    "Demographics Text Quotes,P-value String,Has Association\n"
+)
+
+
+class ImportEvidenceTest(TestCase):
+    fixtures = [
+        "test_alleles.json",
+        "test_diseases.json",
+        "test_publications.json",
+        "test_curations.json",
+        "test_haplotypes.json",
+        "demographics.json",
+    ]
+
+    def setUp(self):
+        self.user = User.objects.create(username="curator")
+        self.curation = Curation.objects.get(slug="C000001")
+
+    def import_(self, text: str, **kwargs):  # noqa: ANN201
+        """Imports the text as a file.
+
+        Returns:
+            The import's result.
+        """
+        return import_evidence(
+            self.curation, text.splitlines(keepends=True), self.user, **kwargs
+        )
+
+    def test_adds_evidence_with_scores_demographics_and_history(self):
+        result = self.import_(
+            HEADER
+            + "P000001,yes,BI,imputation,European; east asian,Quote,<0.001,Yes\n"
+            + "PMID:123,no,Monoallelic (heterozygous),,,,,\n"
+        )
+        self.assertEqual(result.errors, [])
+        self.assertEqual(len(result.created), 2)
+        first, second = Evidence.objects.filter(curation=self.curation).order_by("pk")
+        self.assertTrue(first.slug.startswith("E"))
+        self.assertTrue(first.is_included)
+        self.assertEqual(first.zygosity, Zygosity.BIALLELIC)
+        self.assertEqual(first.typing_method, TypingMethod.IMPUTATION)
+        self.assertEqual(
+            sorted(first.demographics.values_list("group", flat=True)),
+            ["East Asian", "European"],
+        )
+        self.assertEqual(first.p_value_comparator, PValueComparator.LESS_THAN)
+        self.assertFalse(second.is_included)
+        self.assertTrue(second.needs_review)
+        for evidence in (first, second):
+            for name, value in get_scores(evidence).items():
+                self.assertEqual(getattr(evidence, name), value, name)
+            self.assertEqual(evidence.history.get().history_user, self.user)
+            self.assertEqual(evidence.added_by, self.user)
+
+    def test_reads_tsv_files(self):
+        result = self.import_("publication\tzygosity\n10.1000/123\tmo\n")
+        self.assertEqual(result.errors, [])
+        self.assertEqual(result.created[0].publication.slug, "P000001")
+
+    def test_adds_nothing_when_a_row_has_errors(self):
+        result = self.import_(
+            HEADER
+            + "P000001,yes,BI,,,,,\n"
+            + "P000002,yes,BI,,,,,\n"
+            + "P000001,maybe,XX,imputation,Atlantean,,abc,\n"
+            + "P999999,,,,,,,\n"
+        )
+        self.assertEqual(result.created, [])
+        self.assertEqual(Evidence.objects.count(), 0)
+        self.assertEqual([error.row for error in result.errors], [3, 4, 5])
+        self.assertIn("Preprint", " ".join(result.errors[0].messages))
+        messages = " ".join(result.errors[1].messages)
+        for text in ["is_included", "atlantean", "zygosity", "p_value_string"]:
+            self.assertIn(text, messages)
+        self.assertIn("P999999", result.errors[2].messages[0])
+
+    def test_can_add_the_valid_rows_anyway(self):
+        result = self.import_(
+            HEADER + "P000001,yes,BI,,,,,\nP000001,yes,XX,,,,,\n",
+            skip_invalid=True,
+        )
+        self.assertEqual(len(result.created), 1)
+        self.assertEqual([error.row for error in result.errors], [3])
+        self.assertEqual(Evidence.objects.count(), 1)
+
+    def test_rejects_files_with_unknown_or_missing_columns(self):
+        result = self.import_("zygosity,score\nBI,10\n")
+        self.assertEqual(result.errors[0].messages, ["Unknown columns: score."])
+        self.assertEqual(
+            result.errors[1].messages, ["The file needs a publication column."]
+        )
+
+    def test_rejects_empty_files(self):
+        result = self.import_("publication\n\n")
+        self.assertEqual(
+            result.errors[0].messages, ["The file has no rows of evidence."]
+        )
+
+    def test_limits_the_rows_imported_at_once(self):
+        with patch("curation.importer.MAX_ROWS", 2):
+            result = self.import_("publication\n" + "P000001\n" * 3)
+        self.assertEqual(result.errors[0].row, 4)
+        self.assertEqual(Evidence.objects.count(), 0)
+
+    def test_queries_do_not_grow_with_the_rows(self):
+        row = "P000001,yes,BI,imputation,European,Quote,,\n"
+        self.import_(HEADER + row)
+        with self.assertNumQueries(8):
+            self.import_(HEADER + row * 2)
+        with self.assertNumQueries(8):
+            self.import_(HEADER + row * 40)
+
+    def test_queries_do_not_grow_with_the_rows_of_a_haplotype_curation(self):
+        haplotype_curation = Curation.objects.create(
+            curation_type=CurationTypes.HAPLOTYPE,
+            haplotype=Haplotype.objects.get(pk=1),
+            disease=self.curation.disease,
+        )
+        row = "P000001,3\n"
+
+        def import_rows(count: int) -> None:
+            # A fresh curation each time, so nothing is kept from an earlier import.
+            curation = Curation.objects.get(pk=haplotype_curation.pk)
+            result = import_evidence(
+                curation, ["publication,num_fields\n", *[row] * count], self.user
+            )
+            self.assertEqual(result.errors, [])
+
+        with CaptureQueriesContext(connection) as few_rows:
+            import_rows(2)
+        with CaptureQueriesContext(connection) as many_rows:
+            import_rows(40)
+        self.assertEqual(len(few_rows), len(many_rows))
@@ -1,9 +1,9 @@
-"""Tests our custom interval class."""
+"""Tests our custom interval classes."""
 
 from decimal import Decimal
 from unittest import TestCase
 
-from curation.interval import Interval
+from curation.interval import Interval, IntervalSet
 
 
 class IntervalTest(TestCase):
@@ -74,3 +74,190 @@ class IntervalTest(TestCase):
 
     def test_mixed_interval_2_contains_upper_boundary(self):
         self.assertFalse(self.mixed_interval_2.contains(Decimal("0.3")))
+
+    def test_str_and_repr(self):
+        self.assertEqual(str(self.mixed_interval_2), "0.1 ≤ n < 0.3")
+        self.assertEqual(repr(self.mixed_interval_1), "Interval((0.1, 0.3])")
+
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.inclusive_interval, "__dict__"))
+
+
+def make_interval(
+    start: str, end: str, *, start_inclusive: bool, end_inclusive: bool
+) -> Interval:
+    """Returns an interval over a variable named n."""
+    return Interval(
+        start=Decimal(start),
+        end=Decimal(end),
+        start_inclusive=start_inclusive,
+        end_inclusive=end_inclusive,
+        variable="n",
+    )
+
+
+class IntervalSetTest(TestCase):
+    def setUp(self):
+        # Given out of order to check that the set sorts them.
+        self.interval_set = IntervalSet(
+            [
+                (
+                    make_interval(
+                        "1", "Infinity", start_inclusive=True, end_inclusive=False
+                    ),
+                    3.0,
+                ),
+                (
+                    make_interval(
+                        "-Infinity", "0.5", start_inclusive=False, end_inclusive=False
+                    ),
+                    1.0,
+                ),
+                (
+                    make_interval(
+                        "0.5", "1", start_inclusive=True, end_inclusive=False
+                    ),
+                    2.0,
+                ),
+            ]
+        )
+        self.discrete_interval_set = IntervalSet(
+            [
+                (
+                    make_interval(
+                        "-Infinity", "10", start_inclusive=False, end_inclusive=False
+                    ),
+                    1.0,
+                ),
+                (
+                    make_interval("10", "19", start_inclusive=True, end_inclusive=True),
+                    2.0,
+                ),
+                (
+                    make_interval(
+                        "20", "Infinity", start_inclusive=True, end_inclusive=False
+                    ),
+                    3.0,
+                ),
+            ],
+            step=Decimal("1"),
+        )
+
+    def test_get_middle(self):
+        self.assertEqual(self.interval_set.get(Decimal("0.7")), 2.0)
+
+    def test_get_boundary(self):
+        self.assertEqual(self.interval_set.get(Decimal("0.5")), 2.0)
+        self.assertEqual(self.interval_set.get(Decimal("1")), 3.0)
+
+    def test_get_below_boundary(self):
+        self.assertEqual(self.interval_set.get_below(Decimal("0.5")), 1.0)
+        self.assertEqual(self.interval_set.get_below(Decimal("1")), 2.0)
+
+    def test_get_below_middle(self):
+        self.assertEqual(self.interval_set.get_below(Decimal("0.7")), 2.0)
+
+    def test_get_exclusive_start(self):
+        interval_set = IntervalSet(
+            [
+                (
+                    make_interval("0", "1", start_inclusive=True, end_inclusive=True),
+                    1.0,
+                ),
+                (
+                    make_interval("1", "2", start_inclusive=False, end_inclusive=True),
+                    2.0,
+                ),
+            ]
+        )
+        self.assertEqual(interval_set.get(Decimal("1")), 1.0)
+        self.assertEqual(interval_set.get(Decimal("2")), 2.0)
+        self.assertIsNone(interval_set.get(Decimal("-1")))
+        self.assertIsNone(interval_set.get(Decimal("3")))
+
+    def test_get_discrete(self):
+        self.assertEqual(self.discrete_interval_set.get(Decimal("9")), 1.0)
+        self.assertEqual(self.discrete_interval_set.get(Decimal("10")), 2.0)
+        self.assertEqual(self.discrete_interval_set.get(Decimal("19")), 2.0)
+        self.assertEqual(self.discrete_interval_set.get(Decimal("20")), 3.0)
+
+    def test_rejects_empty(self):
+        with self.assertRaises(ValueError):
+            IntervalSet([])
+
+    def test_rejects_overlap(self):
+        with self.assertRaises(ValueError):
+            IntervalSet(
+                [
+                    (
+                        make_interval(
+                            "0", "1", start_inclusive=True, end_inclusive=True
+                        ),
+                        1.0,
+                    ),
+                    (
+                        make_interval(
+                            "1", "2", start_inclusive=True, end_inclusive=True
+                        ),
+                        2.0,
+                    ),
+                ]
+            )
+
+    def test_rejects_gap(self):
+        with self.assertRaises(ValueError):
+            IntervalSet(
+                [
+                    (
+                        make_interval(
+                            "0", "1", start_inclusive=True, end_inclusive=False
+                        ),
+                        1.0,
+                    ),
+                    (
+                        make_interval(
+                            "2", "3", start_inclusive=True, end_inclusive=False
+                        ),
+                        2.0,
+                    ),
+                ]
+            )
+
+    def test_rejects_discrete_gap(self):
+        with self.assertRaises(ValueError):
+            IntervalSet(
+                [
+                    (
+                        make_interval(
+                            "0", "9", start_inclusive=True, end_inclusive=True
+                        ),
+                        1.0,
+                    ),
+                    (
+                        make_interval(
+                            "11", "20", start_inclusive=True, end_inclusive=True
+                        ),
+                        2.0,
+                    ),
+                ],
+                step=Decimal("1"),
+            )
+
+    def test_integer_contiguous_needs_step(self):
+        with self.assertRaises(ValueError):
+            IntervalSet(
+                [
+                    (
+                        make_interval(
+                            "0", "9", start_inclusive=True, end_inclusive=True
+                        ),
+                        1.0,
+                    ),
+                    (
+                        make_interval(
+                            "10", "20", start_inclusive=True, end_inclusive=True
+                        ),
+                        2.0,
+                    ),
+                ]
+            )
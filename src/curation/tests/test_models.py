@@ -25,6 +25,7 @@ from curation.models import (
     Demographic,
     Evidence,
 )
+from curation.validators.models.evidence import validate_num_fields
 from disease.models import Disease
 from haplotype.models import Haplotype
 from publication.models import Publication
@@ -174,6 +175,46 @@ class TestCuration(TestCase):
         )
         self.assertEqual(copy.copied_from, self.curation)
 
+    def _copy(self, curation: Curation) -> Curation:
+        return Curation.objects.create(
+            copied_from=curation,
+            curation_type=curation.curation_type,
+            allele=curation.allele,
+            disease=curation.disease,
+        )
+
+    def test_lineage_path_is_own_id_when_created(self):
+        self.curation.save()
+        self.curation.refresh_from_db()
+        self.assertEqual(self.curation.lineage_path, f"{self.curation.pk}/")
+
+    def test_lineage_path_extends_copied_from_path(self):
+        self.curation.save()
+        copy = self._copy(self.curation)
+        copy_of_copy = self._copy(copy)
+        copy_of_copy.refresh_from_db()
+        self.assertEqual(
+            copy_of_copy.lineage_path,
+            f"{self.curation.pk}/{copy.pk}/{copy_of_copy.pk}/",
+        )
+
+    def test_lineage_path_of_descendants_follows_a_new_copied_from(self):
+        self.curation.save()
+        copy = self._copy(self.curation)
+        copy_of_copy = self._copy(copy)
+        root = Curation.objects.create(
+            curation_type=self.curation.curation_type,
+            allele=self.allele,
+            disease=self.disease,
+        )
+
+        copy.copied_from = root
+        copy.save()
+        copy_of_copy.refresh_from_db()
+        self.assertEqual(
+            copy_of_copy.lineage_path, f"{root.pk}/{copy.pk}/{copy_of_copy.pk}/"
+        )
+
     def test_is_not_valid_when_allele_not_provided_at_creation(self):
         with self.assertRaises(ValidationError):
             curation = Curation(
@@ -193,6 +234,65 @@ class TestCuration(TestCase):
             curation.clean()
 
 
+class TestCurationWithScores(TestCase):
+    fixtures = [
+        "test_alleles.json",
+        "test_diseases.json",
+        "test_curations.json",
+        "test_publications.json",
+    ]
+
+    def setUp(self):
+        self.curation = Curation.objects.get(pk=1)
+        self.publication = Publication.objects.get(pk=1)
+
+    def _add_evidence(self, *, is_included: bool) -> Evidence:
+        return Evidence.objects.create(
+            curation=self.curation,
+            publication=self.publication,
+            is_included=is_included,
+            has_association=True,
+            typing_method=TypingMethod.LONG_READ_SEQ,
+            cohort_size=11000,
+        )
+
+    def test_score_is_zero_without_evidence(self):
+        curation = Curation.objects.with_scores().get(pk=1)
+        self.assertEqual(curation.score, 0.0)
+        self.assertIsNone(curation.suggested_classification)
+
+    def test_score_matches_unannotated_score(self):
+        self._add_evidence(is_included=True)
+        self._add_evidence(is_included=True)
+        self._add_evidence(is_included=False)
+        curation = Curation.objects.with_scores().get(pk=1)
+        self.assertEqual(curation.score, Curation.objects.get(pk=1).score)
+        self.assertEqual(
+            curation.suggested_classification,
+            Curation.objects.get(pk=1).suggested_classification,
+        )
+
+    def test_only_included_evidence_is_summed(self):
+        included = self._add_evidence(is_included=True)
+        self._add_evidence(is_included=False)
+        curation = Curation.objects.with_scores().get(pk=1)
+        self.assertEqual(curation.score, included.score)
+
+    def test_suggested_classification_thresholds(self):
+        for _ in range(3):
+            self._add_evidence(is_included=True)
+        curation = Curation.objects.with_scores().get(pk=1)
+        self.assertEqual(curation.score, 27.0)
+        self.assertEqual(curation.suggested_classification, Classification.MODERATE)
+
+    def test_annotations_do_not_query_evidence(self):
+        self._add_evidence(is_included=True)
+        curation = Curation.objects.with_scores().get(pk=1)
+        with self.assertNumQueries(0):
+            _ = curation.score
+            _ = curation.suggested_classification
+
+
 class TestEvidence(TestCase):
     fixtures = [
         "test_alleles.json",
@@ -661,6 +761,62 @@ class TestEvidence(TestCase):
         self.assertIn("has_association", context.exception.message_dict)
 
 
+class TestCopyEvidence(TestCase):
+    fixtures = [
+        "test_alleles.json",
+        "test_diseases.json",
+        "test_curations.json",
+        "test_publications.json",
+        "demographics.json",
+    ]
+
+    def setUp(self):
+        self.curation = Curation.objects.get(pk=1)
+        self.publication = Publication.objects.get(pk=1)
+        self.demographics = list(Demographic.objects.order_by("pk")[:2])
+        self.target = Curation.objects.create(
+            curation_type=self.curation.curation_type,
+            allele=self.curation.allele,
+            disease=self.curation.disease,
+        )
+
+    def _add_evidence(self, count: int) -> None:
+        for i in range(count):
+            evidence = Evidence.objects.create(
+                curation=self.curation,
+                publication=self.publication,
+                zygosity=Zygosity.BIALLELIC if i % 2 else Zygosity.MONOALLELIC,
+            )
+            evidence.demographics.set(self.demographics[: i % 3])
+
+    def test_copies_fields_demographics_scores_and_history(self):
+        self._add_evidence(3)
+        sources = list(self.curation.evidence.order_by("pk"))  # type: ignore[attr-defined]
+        copies = self.curation.evidence.order_by("pk").copy_to(self.target)  # type: ignore[attr-defined]
+        self.assertEqual(len(copies), 3)
+        for source, copy in zip(sources, copies, strict=True):
+            copy.refresh_from_db()
+            self.assertNotEqual(copy.pk, source.pk)
+            self.assertEqual(copy.slug, f"E{copy.pk:06d}")
+            self.assertEqual(copy.curation, self.target)
+            self.assertEqual(copy.zygosity, source.zygosity)
+            self.assertEqual(copy.score, source.score)
+            self.assertEqual(
+                list(copy.demographics.order_by("pk")),
+                list(source.demographics.order_by("pk")),
+            )
+            self.assertEqual(copy.history.get().history_type, "+")  # type: ignore[attr-defined]
+        self.assertEqual(self.curation.evidence.count(), 3)  # type: ignore[attr-defined]
+
+    def test_takes_the_same_queries_for_any_amount_of_evidence(self):
+        self._add_evidence(2)
+        with self.assertNumQueries(6):
+            self.curation.evidence.copy_to(self.target)  # type: ignore[attr-defined]
+        self._add_evidence(30)
+        with self.assertNumQueries(6):
+            self.curation.evidence.copy_to(self.target)  # type: ignore[attr-defined]
+
+
 class TestValidateNumFields(TestCase):
     # Curation pk=1 is an allele curation for A*01:02:03 (3-field min).
     # Haplotype pk=1 is A*01:02:03~B*04:05:06 (also 3-field min on both alleles).
@@ -699,6 +855,15 @@ class TestValidateNumFields(TestCase):
         self.evidence.num_fields = 4
         self.evidence.clean()
 
+    def test_unparseable_allele_names_count_their_colons(self):
+        allele = self.allele_curation.allele
+        allele.name = "not-hla:01:02"
+        allele.save()
+        self.assertIsNone(allele.num_fields)
+        self.evidence.num_fields = 1
+        with self.assertRaises(ValidationError):
+            self.evidence.clean()
+
     def test_no_curation_does_not_raise(self):
         evidence = Evidence(publication=self.publication, num_fields=4)
         evidence.save()
@@ -753,3 +918,61 @@ class TestValidateNumFields(TestCase):
         with self.assertRaises(ValidationError) as context:
             evidence.clean()
         self.assertIn("num_fields", context.exception.message_dict)
+
+    def test_haplotype_alleles_are_read_once_per_curation(self):
+        curation = Curation.objects.create(
+            curation_type=CurationTypes.HAPLOTYPE,
+            haplotype=Haplotype.objects.get(pk=1),
+            disease=Disease.objects.get(pk=1),
+        )
+        curation = Curation.objects.select_related("haplotype").get(pk=curation.pk)
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                validate_num_fields(Evidence(curation=curation, num_fields=3))
+
+
+class TestStoredScores(TestCase):
+    fixtures = [
+        "test_alleles.json",
+        "test_diseases.json",
+        "test_curations.json",
+        "test_publications.json",
+        "test_haplotypes.json",
+    ]
+
+    def setUp(self):
+        self.curation = Curation.objects.get(pk=1)
+        self.evidence = Evidence.objects.create(
+            curation=self.curation,
+            publication=Publication.objects.get(pk=1),
+            p_value=Decimal("0.0004"),
+            has_association=True,
+            typing_method=TypingMethod.LONG_READ_SEQ,
+        )
+
+    def test_scores_are_stored_on_save(self):
+        evidence = Evidence.objects.get(pk=self.evidence.pk)
+        self.assertEqual(evidence.score_step_2, Points.S2_LONG_READ_SEQ)
+        self.assertEqual(evidence.score_step_3a, Points.S3A_INTERVAL_4)
+        self.assertEqual(
+            evidence.score,
+            Points.S1A_ALLELE + Points.S2_LONG_READ_SEQ + Points.S3A_INTERVAL_4,
+        )
+
+    def test_scores_can_be_filtered_in_the_database(self):
+        self.assertTrue(Evidence.objects.filter(score__gt=0).exists())
+
+    def test_evidence_is_rescored_when_curation_type_changes(self):
+        curation = Curation.objects.get(pk=1)
+        curation.curation_type = CurationTypes.HAPLOTYPE
+        curation.haplotype = Haplotype.objects.get(pk=1)
+        curation.allele = None
+        curation.save()
+        evidence = Evidence.objects.get(pk=self.evidence.pk)
+        self.assertEqual(evidence.score_step_1a, Points.S1A_HAPLOTYPE)
+
+    def test_evidence_is_not_rescored_when_status_changes(self):
+        curation = Curation.objects.get(pk=1)
+        curation.status = Status.READY_FOR_REVIEW
+        with self.assertNumQueries(2):  # The update and its history record.
+            curation.save()
@@ -0,0 +1,165 @@
+"""Tests the batch scoring engine against the per-instance scoring functions."""
+
+from decimal import Decimal
+from itertools import product
+from unittest import TestCase
+
+from curation.constants.models.curation import CURATION_TYPE_CHOICES, CurationTypes
+from curation.constants.models.evidence import (
+    ADDITIONAL_PHENOTYPES_CHOICES,
+    EFFECT_SIZE_STATISTIC_CHOICES,
+    MULTIPLE_TESTING_CORRECTION_CHOICES,
+    P_VALUE_COMPARATOR_CHOICES,
+    ZYGOSITY_CHOICES,
+    PValueComparator,
+    TypingMethod,
+)
+from curation.constants.score import Points
+from curation.models import Curation, Evidence
+from curation.score import SCORE_INPUT_FIELDS, get_batch_scores, get_scores
+
+
+def make_row(**fields) -> dict:
+    """Returns a row of score inputs with sensible defaults for unset fields."""
+    row = dict.fromkeys(SCORE_INPUT_FIELDS)
+    row.update(
+        {
+            "curation__curation_type": CurationTypes.ALLELE,
+            "is_gwas": False,
+            "phase_confirmed": False,
+            "has_association": True,
+        }
+    )
+    row.update(fields)
+    return row
+
+
+def make_evidence(row: dict) -> Evidence:
+    """Returns an unsaved evidence instance with the same inputs as the row."""
+    fields = {
+        name: value for name, value in row.items() if name != "curation__curation_type"
+    }
+    curation = Curation(curation_type=row["curation__curation_type"])
+    return Evidence(curation=curation, **fields)
+
+
+class BatchScoresTest(TestCase):
+    def assertMatchesPerInstanceScores(self, rows: list[dict]) -> None:  # noqa: N802
+        batch_scores = get_batch_scores(rows)
+        self.assertEqual(len(batch_scores), len(rows))
+        for row, scores in zip(rows, batch_scores, strict=True):
+            with self.subTest(row=row):
+                self.assertEqual(scores, get_scores(make_evidence(row)))
+
+    def test_returns_nothing_for_no_rows(self):
+        self.assertEqual(get_batch_scores([]), [])
+
+    def test_categorical_steps_match(self):
+        rows = [
+            make_row(
+                curation__curation_type=curation_type,
+                num_fields=num_fields,
+                zygosity=zygosity,
+                phase_confirmed=phase_confirmed,
+                typing_method=typing_method,
+                multiple_testing_correction=correction,
+                additional_phenotypes=phenotypes,
+                has_association=has_association,
+            )
+            for (
+                curation_type,
+                num_fields,
+                zygosity,
+                phase_confirmed,
+                typing_method,
+                correction,
+                phenotypes,
+                has_association,
+            ) in product(
+                [None, *CURATION_TYPE_CHOICES],
+                [None, 1, 2, 3, 4],
+                [None, *ZYGOSITY_CHOICES],
+                [False, True],
+                [None, TypingMethod.SEROLOGICAL, TypingMethod.LONG_READ_SEQ],
+                [None, *MULTIPLE_TESTING_CORRECTION_CHOICES],
+                [None, *ADDITIONAL_PHENOTYPES_CHOICES],
+                [False, True],
+            )
+        ]
+        self.assertMatchesPerInstanceScores(rows)
+
+    def test_p_value_brackets_match(self):
+        p_values = [
+            None,
+            Decimal("1e-20"),
+            Decimal("1e-14"),
+            Decimal("2e-14"),
+            Decimal("1e-11"),
+            Decimal("5e-8"),
+            Decimal("1e-4"),
+            Decimal("0.0001"),
+            Decimal("0.0003"),
+            Decimal("0.0005"),
+            Decimal("0.01"),
+            Decimal("0.05"),
+            Decimal("0.5"),
+            Decimal("1"),
+        ]
+        rows = [
+            make_row(is_gwas=is_gwas, p_value=p_value, p_value_comparator=comparator)
+            for is_gwas, p_value, comparator in product(
+                [False, True], p_values, [None, *P_VALUE_COMPARATOR_CHOICES]
+            )
+        ]
+        self.assertMatchesPerInstanceScores(rows)
+
+    def test_less_than_boundary_lands_in_bracket_below(self):
+        row = make_row(
+            is_gwas=False,
+            p_value=Decimal("0.05"),
+            p_value_comparator=PValueComparator.LESS_THAN,
+        )
+        self.assertEqual(get_batch_scores([row])[0]["score_step_3a"], 0.5)
+
+    def test_cohort_size_brackets_match(self):
+        cohort_sizes = [None, 0, 49, 50, 99, 100, 249, 250, 499, 500, 999, 1000]
+        cohort_sizes += [2499, 2500, 4999, 5000, 9999, 10000, 100000]
+        rows = [
+            make_row(is_gwas=is_gwas, cohort_size=cohort_size)
+            for is_gwas, cohort_size in product([False, True], cohort_sizes)
+        ]
+        self.assertMatchesPerInstanceScores(rows)
+
+    def test_effect_size_steps_match(self):
+        effect_sizes = [None, Decimal(0), Decimal("-0.5"), Decimal("0.5"), Decimal(1)]
+        effect_sizes += [Decimal("1.5"), Decimal(2), Decimal(3)]
+        ci_bounds = [None, Decimal(0), Decimal("-1"), Decimal("0.5"), Decimal(1)]
+        ci_bounds += [Decimal("1.5")]
+        rows = [
+            make_row(
+                effect_size_statistic=statistic,
+                odds_ratio=value,
+                relative_risk=value,
+                beta=value,
+                ci_start=ci_start,
+                ci_end=ci_end,
+            )
+            for statistic, value, ci_start, ci_end in product(
+                [None, *EFFECT_SIZE_STATISTIC_CHOICES],
+                effect_sizes,
+                ci_bounds,
+                ci_bounds,
+            )
+        ]
+        self.assertMatchesPerInstanceScores(rows)
+
+    def test_totals(self):
+        row = make_row(
+            curation__curation_type=CurationTypes.HAPLOTYPE,
+            num_fields=1,
+            typing_method=TypingMethod.LONG_READ_SEQ,
+        )
+        scores = get_batch_scores([row])[0]
+        expected_before = Points.S1A_HAPLOTYPE + Points.S2_LONG_READ_SEQ
+        self.assertEqual(scores["score_before_multipliers"], expected_before)
+        self.assertEqual(scores["score"], expected_before * Points.S6B_1_FIELD)
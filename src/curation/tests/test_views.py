@@ -1,12 +1,22 @@
 """Houses tests for the curation app's views."""
 
+from tempfile import TemporaryDirectory
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from allele.models import Allele
 from auth_.models import UserProfile
-from common.tests import ProtectedViewTestMixin, SuppressRequestLoggingMixin
+from common.results_cache import get_generation
+from common.tests import (
+    ProtectedViewTestMixin,
+    QueryBudgetTestMixin,
+    SuppressRequestLoggingMixin,
+)
 from curation.constants.models.common import Status
 from curation.constants.models.curation import Classification, CurationTypes
 from curation.constants.models.evidence import (
@@ -16,13 +26,18 @@ from curation.constants.models.evidence import (
     TypingMethod,
     Zygosity,
 )
+from curation.forms import EvidenceTopLevelEditFormSet
+from curation.jobs import COPY_TASK
 from curation.models import (
     Curation,
     Demographic,
     Evidence,
 )
+from curation.score import get_scores
 from disease.models import Disease
 from haplotype.models import Haplotype
+from job.models import Job
+from job.worker import claim_job, run_worker
 from publication.models import Publication
 from repo.models import PublishedCuration
 
@@ -72,7 +87,7 @@ class CurationCreateTest(ProtectedViewTestMixin, TestCase):
         self.assertEqual(new_curation.added_by, self.user4_yes_phi_yes_perms)
 
 
-class CurationDetailTest(ProtectedViewTestMixin, TestCase):
+class CurationDetailTest(QueryBudgetTestMixin, ProtectedViewTestMixin, TestCase):
     fixtures = [
         "test_alleles.json",
         "test_diseases.json",
@@ -109,6 +124,20 @@ class CurationDetailTest(ProtectedViewTestMixin, TestCase):
         )
         self.assertContains(response, "0.0")  # Should default to a score of 0.0.
 
+    def test_within_query_budget(self):
+        curation = Curation.objects.get(slug="C000001")
+        publication = Publication.objects.get(pk=1)
+        demographic = Demographic.objects.create(group="Kanto")
+        for _ in range(10):
+            evidence = Evidence.objects.create(
+                curation=curation,
+                publication=publication,
+                is_included=True,
+                has_association=True,
+            )
+            evidence.demographics.add(demographic)
+        self.assertWithinQueryBudget(self.url)
+
 
 class CurationEditEvidenceTest(ProtectedViewTestMixin, TestCase):
     fixtures = [
@@ -117,6 +146,7 @@ class CurationEditEvidenceTest(ProtectedViewTestMixin, TestCase):
         "test_publications.json",
         "test_curations.json",
         "test_evidence.json",
+        "test_haplotypes.json",
     ]
     url = reverse("curation-edit-evidence", kwargs={"curation_slug": "C000001"})
     template = "curation/edit/evidence.html"
@@ -133,8 +163,96 @@ class CurationEditEvidenceTest(ProtectedViewTestMixin, TestCase):
         super().setUp()
         self.client.force_login(self.user4_yes_phi_yes_perms)
 
+    def post_data(self, **changes: dict[str, str]) -> dict[str, str]:
+        """Builds the formset's data, changing the given evidence's fields.
 
-class CurationListTest(ProtectedViewTestMixin, TestCase):
+        Returns:
+            The POST data.
+        """
+        evidence = list(
+            Evidence.objects.filter(curation__slug="C000001").order_by("pk")
+        )
+        data = {
+            "form-TOTAL_FORMS": str(len(evidence)),
+            "form-INITIAL_FORMS": str(len(evidence)),
+        }
+        for index, item in enumerate(evidence):
+            fields = {"id": str(item.pk), "status": item.status}
+            if item.is_included:
+                fields["is_included"] = "on"
+            fields.update(changes.get(item.slug, {}))
+            data.update({f"form-{index}-{k}": v for k, v in fields.items() if v})
+        return data
+
+    def add_evidence(self, count: int) -> None:
+        """Adds evidence to the curation."""
+        curation = Curation.objects.get(slug="C000001")
+        publication = Publication.objects.get(pk=1)
+        for _ in range(count):
+            Evidence.objects.create(curation=curation, publication=publication)
+
+    def test_saves_only_the_changed_evidence(self):
+        self.add_evidence(2)
+        first, second, third = Evidence.objects.order_by("pk")
+        history_count = Evidence.history.count()  # type: ignore[attr-defined]
+        data = self.post_data(
+            **{first.slug: {"is_included": "on"}, third.slug: {"status": Status.DONE}}
+        )
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 302)
+        first.refresh_from_db()
+        third.refresh_from_db()
+        self.assertTrue(first.is_included)
+        self.assertEqual(first.score, get_scores(first)["score"])
+        self.assertEqual(third.status, Status.DONE)
+        self.assertEqual(Evidence.history.count(), history_count + 2)  # type: ignore[attr-defined]
+        latest = first.history.latest()  # type: ignore[attr-defined]
+        self.assertEqual(latest.history_type, "~")
+        self.assertEqual(latest.history_user, self.user4_yes_phi_yes_perms)
+        self.assertEqual(second.history.count(), 1)  # type: ignore[attr-defined]
+
+    def test_history_records_the_editing_user(self):
+        evidence = Evidence.objects.get()
+        data = self.post_data(**{evidence.slug: {"status": Status.DONE}})
+        formset = EvidenceTopLevelEditFormSet(data, queryset=Evidence.objects.all())
+        self.assertTrue(formset.is_valid())
+        formset.save(user=self.user4_yes_phi_yes_perms)
+        latest = evidence.history.latest()  # type: ignore[attr-defined]
+        self.assertEqual(latest.history_user, self.user4_yes_phi_yes_perms)
+
+    def test_does_not_add_evidence(self):
+        data = self.post_data()
+        data["form-TOTAL_FORMS"] = "2"
+        data.update({"form-1-status": Status.IN_PROGRESS, "form-1-id": ""})
+        self.client.post(self.url, data)
+        self.assertEqual(Evidence.objects.count(), 1)
+
+    def test_queries_do_not_grow_with_the_evidence(self):
+        def count_queries() -> tuple[int, int]:
+            with CaptureQueriesContext(connection) as get_queries:
+                self.client.get(self.url)
+            evidence = Evidence.objects.order_by("pk")
+            changes = {item.slug: {"status": Status.DONE} for item in evidence}
+            with CaptureQueriesContext(connection) as post_queries:
+                self.client.post(self.url, self.post_data(**changes))
+            Evidence.objects.update(status=Status.IN_PROGRESS)
+            return len(get_queries), len(post_queries)
+
+        # Validating each form checks its resolution against the haplotype's alleles.
+        Curation.objects.filter(slug="C000001").update(
+            curation_type=CurationTypes.HAPLOTYPE,
+            allele=None,
+            haplotype=Haplotype.objects.get(pk=1),
+        )
+        self.add_evidence(1)
+        Evidence.objects.update(num_fields=3)
+        few = count_queries()
+        self.add_evidence(30)
+        Evidence.objects.update(num_fields=3)
+        self.assertEqual(count_queries(), few)
+
+
+class CurationListTest(QueryBudgetTestMixin, ProtectedViewTestMixin, TestCase):
     fixtures = ["test_alleles.json", "test_diseases.json", "test_curations.json"]
     url = reverse("curation-list")
     template = "curation/list.html"
@@ -159,6 +277,38 @@ class CurationListTest(ProtectedViewTestMixin, TestCase):
         super().setUp()
         self.client.force_login(self.user4_yes_phi_yes_perms)
 
+    def _add_scored_curations(self, num_curations: int) -> None:
+        for _ in range(num_curations):
+            curation = Curation.objects.create(
+                curation_type=CurationTypes.ALLELE,
+                allele=Allele.objects.get(pk=1),
+                disease=Disease.objects.get(pk=1),
+            )
+            Evidence.objects.create(
+                curation=curation,
+                is_included=True,
+                has_association=True,
+                typing_method=TypingMethod.LONG_READ_SEQ,
+            )
+
+    def test_query_count_does_not_depend_on_number_of_rows(self):
+        self._add_scored_curations(2)
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(self.url)
+        self._add_scored_curations(10)
+        with CaptureQueriesContext(connection) as large_page:
+            self.client.get(self.url)
+        self.assertEqual(len(small_page), len(large_page))
+
+    def test_within_query_budget(self):
+        self._add_scored_curations(10)
+        self.assertWithinQueryBudget(self.url)
+        # HTMX searches, first rendered and then served from the results cache, once
+        # the generation they're cached under has been stored.
+        get_generation()
+        for _ in range(2):
+            self.assertWithinQueryBudget(f"{self.url}?q=C0", HTTP_HX_REQUEST="true")
+
 
 class EvidenceCreateTest(ProtectedViewTestMixin, TestCase):
     fixtures = [
@@ -192,7 +342,52 @@ class EvidenceCreateTest(ProtectedViewTestMixin, TestCase):
         self.assertEqual(new_evidence.added_by, self.user4_yes_phi_yes_perms)
 
 
-class EvidenceDetailTest(ProtectedViewTestMixin, TestCase):
+class EvidenceImportTest(ProtectedViewTestMixin, TestCase):
+    fixtures = [
+        "test_alleles.json",
+        "test_diseases.json",
+        "test_publications.json",
+        "test_curations.json",
+    ]
+    url = reverse("evidence-import", kwargs={"curation_slug": "C000001"})
+    template = "evidence/import.html"
+    page_name = "Import Evidence"
+    expected_text = ["Import Evidence", "File", "publication", "zygosity", "Import"]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user4_yes_phi_yes_perms)
+
+    def test_adds_evidence_from_the_file(self):
+        file = SimpleUploadedFile("evidence.csv", b"publication,zygosity\nP000001,BI\n")
+        response = self.client.post(self.url, {"file": file}, follow=True)
+        self.assertRedirects(
+            response, reverse("curation-detail", kwargs={"curation_slug": "C000001"})
+        )
+        self.assertContains(response, "1 evidence added.")
+        evidence = Evidence.objects.get()
+        self.assertEqual(evidence.zygosity, Zygosity.BIALLELIC)
+        self.assertEqual(evidence.added_by, self.user4_yes_phi_yes_perms)
+
+    def test_lists_the_rows_with_errors(self):
+        file = SimpleUploadedFile(
+            "evidence.csv", b"publication,zygosity\nP000001,BI\nP000001,XX\n"
+        )
+        response = self.client.post(self.url, {"file": file})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "No evidence was added.")
+        self.assertContains(response, "<td>3</td>", html=True)
+        self.assertFalse(Evidence.objects.exists())
+
+    def test_redirects_when_the_curation_is_locked(self):
+        Curation.objects.filter(slug="C000001").update(status=Status.PROVISIONAL)
+        response = self.client.get(self.url)
+        self.assertRedirects(
+            response, reverse("curation-detail", kwargs={"curation_slug": "C000001"})
+        )
+
+
+class EvidenceDetailTest(QueryBudgetTestMixin, ProtectedViewTestMixin, TestCase):
     fixtures = [
         "test_alleles.json",
         "test_diseases.json",
@@ -235,6 +430,13 @@ class EvidenceDetailTest(ProtectedViewTestMixin, TestCase):
         response = self.client.get(f"{self.url}?tab=matrix")
         self.assertContains(response, "Total")
 
+    def test_within_query_budget(self):
+        evidence = Evidence.objects.get(slug="E000001")
+        for name in ("Kanto", "Johto", "Hoenn"):
+            evidence.demographics.add(Demographic.objects.create(group=name))
+        self.assertWithinQueryBudget(self.url)
+        self.assertWithinQueryBudget(f"{self.url}?tab=matrix")
+
 
 class EvidenceEditTest(ProtectedViewTestMixin, TestCase):
     fixtures = [
@@ -573,6 +775,10 @@ class CurationCopyTest(SuppressRequestLoggingMixin, TestCase):
     ]
 
     def setUp(self):
+        # The worker also runs any queued snapshot rebuild, which mustn't write to the
+        # real snapshot directory.
+        snapshot_dir = self.enterContext(TemporaryDirectory())
+        self.enterContext(override_settings(REPO_SNAPSHOT_DIR=snapshot_dir))
         self.allele = Allele.objects.get(pk=1)
         self.disease = Disease.objects.get(pk=1)
         self.user = _make_user_with_profile(username="curator_f")
@@ -590,11 +796,17 @@ class CurationCopyTest(SuppressRequestLoggingMixin, TestCase):
 
     def test_copy_creates_new_curation_with_copied_from_set(self):
         response = self.client.post(self._url())
-        self.assertEqual(response.status_code, 302)
+        job = Job.objects.get(task=COPY_TASK)
+        self.assertRedirects(response, job.get_absolute_url())
+        self.assertFalse(Curation.objects.exclude(pk=self.curation.pk).exists())
+        run_worker(burst=True)
         copy = Curation.objects.exclude(pk=self.curation.pk).first()
         assert copy is not None
         self.assertEqual(copy.copied_from, self.curation)
         self.assertEqual(copy.status, Status.IN_PROGRESS)
+        self.assertEqual(copy.added_by, self.user)
+        response = self.client.get(job.get_absolute_url())
+        self.assertRedirects(response, copy.get_absolute_url())
 
     def test_copy_deep_copies_evidence(self):
         pub = Publication.objects.get(pk=1)
@@ -603,9 +815,19 @@ class CurationCopyTest(SuppressRequestLoggingMixin, TestCase):
         )
         response = self.client.post(self._url())
         self.assertEqual(response.status_code, 302)
+        run_worker(burst=True)
         copy = Curation.objects.exclude(pk=self.curation.pk).first()
         assert copy is not None
         self.assertEqual(copy.evidence.count(), 1)  # type: ignore
+        job = Job.objects.get(task=COPY_TASK)
+        self.assertEqual((job.progress, job.total), (1, 1))
+
+    def test_double_submits_share_one_copy(self):
+        first = self.client.post(self._url())
+        claim_job()  # The worker has started on the first submit.
+        second = self.client.post(self._url())
+        self.assertEqual(first["Location"], second["Location"])
+        self.assertEqual(Job.objects.filter(task=COPY_TASK).count(), 1)
 
     def test_copy_fails_when_source_not_published(self):
         curation2 = _make_curation(self.allele, self.disease)
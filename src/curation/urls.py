@@ -49,6 +49,11 @@ urlpatterns = [
         views.EvidenceCreate.as_view(),
         name="evidence-create",
     ),
+    path(
+        "<slug:curation_slug>/evidence/import",
+        views.EvidenceImport.as_view(),
+        name="evidence-import",
+    ),
     path(
         "<slug:curation_slug>/evidence/<slug:evidence_slug>/detail",
         views.EvidenceDetail.as_view(),
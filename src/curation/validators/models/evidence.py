@@ -16,11 +16,9 @@ def _min_num_fields(evidence) -> int | None:
     if not curation:
         return None
     if curation.curation_type == CurationTypes.ALLELE and curation.allele:
-        return curation.allele.name.count(":") + 1
+        return curation.allele.resolution
     if curation.curation_type == CurationTypes.HAPLOTYPE and curation.haplotype:
-        alleles = curation.haplotype.alleles.all()
-        if alleles:
-            return min(a.name.count(":") + 1 for a in alleles)
+        return curation.haplotype.min_resolution
     return None
 
 
@@ -1,8 +1,10 @@
+import io
 from typing import cast
 
 from django.contrib import messages
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Prefetch
 from django.http import (
     HttpRequest,
     HttpResponse,
@@ -11,7 +13,7 @@ from django.http import (
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import DetailView
-from django.views.generic.edit import CreateView, UpdateView
+from django.views.generic.edit import CreateView, FormView, UpdateView
 from django_tables2 import RequestConfig
 
 from auth_.permissions import (
@@ -29,8 +31,11 @@ from curation.forms import (
     EPReviewForm,
     EvidenceCreateForm,
     EvidenceEditForm,
+    EvidenceImportForm,
     EvidenceTopLevelEditFormSet,
 )
+from curation.importer import COLUMNS, import_evidence
+from curation.jobs import COPY_TASK
 from curation.models import (
     Curation,
     Evidence,
@@ -45,6 +50,7 @@ from curation.validators.views import (
     validate_odds_ratio,
     validate_relative_risk,
 )
+from job.queue import enqueue
 
 
 class CurationCreate(ProtectedViewMixin, CreateView):
@@ -63,6 +69,9 @@ class CurationCreate(ProtectedViewMixin, CreateView):
 
 class CurationDetail(ProtectedViewMixin, DetailView):
     model = Curation
+    queryset = Curation.objects.with_scores().prefetch_related(
+        Prefetch("evidence", queryset=Evidence.objects.select_related("publication"))
+    )
     template_name = "curation/detail.html"
     slug_field = "slug"
     slug_url_kwarg = "curation_slug"
@@ -76,17 +85,18 @@ def curation_edit_evidence(request: HttpRequest, curation_slug: str) -> HttpResp
          request: The Django request object.
          curation_slug: The curation object's slug (human-readable ID).
     """
-    curation = get_object_or_404(Curation, slug=curation_slug)
+    curation = get_object_or_404(Curation.objects.with_scores(), slug=curation_slug)
 
     if curation.is_locked:
         messages.error(request, "This curation is locked and cannot be edited.")
         return redirect("curation-detail", curation_slug=curation.slug)
 
-    evidence = Evidence.objects.filter(curation=curation)
+    # Through the curation, so the forms' validation shares its allele or haplotype.
+    evidence = curation.evidence.select_related("publication")  # type: ignore[attr-defined]
     if request.method == "POST":
         evidence_formset = EvidenceTopLevelEditFormSet(request.POST, queryset=evidence)
         if evidence_formset.is_valid():
-            evidence_formset.save()
+            evidence_formset.save(user=cast(User, request.user))
             messages.success(request, "Changes saved successfully.")
             return redirect("curation-detail", curation_slug=curation.slug)
     else:
@@ -128,8 +138,56 @@ class EvidenceCreate(ProtectedViewMixin, CreateView):
         return context
 
 
+class EvidenceImport(ProtectedViewMixin, FormView):
+    """Adds a curation's evidence from a CSV or TSV file, listing any rows' errors."""
+
+    form_class = EvidenceImportForm
+    template_name = "evidence/import.html"
+
+    def dispatch(
+        self, request: HttpRequest, *args, **kwargs
+    ) -> HttpResponse | HttpResponseRedirect | None:
+        self.curation = get_object_or_404(
+            Curation.objects.select_related("allele", "haplotype"),
+            slug=kwargs.get("curation_slug"),
+        )
+        if self.curation.is_locked:
+            messages.error(request, "This curation is locked and cannot be edited.")
+            return redirect("curation-detail", curation_slug=self.curation.slug)
+        return super().dispatch(request, *args, **kwargs)  # type: ignore[return-value]
+
+    def form_valid(self, form: EvidenceImportForm) -> HttpResponse:
+        file = io.TextIOWrapper(
+            form.cleaned_data["file"].file, encoding="utf-8-sig", newline=""
+        )
+        result = import_evidence(
+            self.curation,
+            file,
+            cast(User, self.request.user),
+            skip_invalid=form.cleaned_data["skip_invalid"],
+        )
+        if result.errors and not result.created:
+            messages.error(self.request, "No evidence was added. Please fix the rows.")
+            return self.render_to_response(
+                self.get_context_data(form=form, row_errors=result.errors)
+            )
+        messages.success(self.request, f"{len(result.created)} evidence added.")
+        if result.errors:
+            message = f"Skipped {len(result.errors)} rows with errors."
+            messages.warning(self.request, message)
+        return redirect("curation-detail", curation_slug=self.curation.slug)
+
+    def get_context_data(self, **kwargs):  # noqa
+        """Returns the context with the curation and the columns a file can have."""
+        context = super().get_context_data(**kwargs)
+        context["curation_slug"] = self.curation.slug
+        context["columns"] = ["publication", *COLUMNS]
+        return context
+
+
 class EvidenceDetail(ProtectedViewMixin, DetailView):
     model = Evidence
+    queryset = Evidence.objects.prefetch_related("demographics")
     template_name = "evidence/detail.html"
     slug_field = "slug"
     slug_url_kwarg = "evidence_slug"
@@ -251,7 +309,7 @@ def curation_review(request: HttpRequest, curation_slug: str) -> HttpResponse:
     Returns:
         Redirect on POST success, or the review form page on GET.
     """
-    curation = get_object_or_404(Curation, slug=curation_slug)
+    curation = get_object_or_404(Curation.objects.with_scores(), slug=curation_slug)
 
     if request.method == "POST":
         form = EPReviewForm(request.POST)
@@ -293,10 +351,11 @@ def curation_review(request: HttpRequest, curation_slug: str) -> HttpResponse:
 
 @protected_view
 def curation_copy(request: HttpRequest, curation_slug: str) -> HttpResponse:
-    """Creates a new editable curation copied from a published one.
+    """Queues a job to create a new editable curation copied from a published one.
 
     Returns:
-        Redirect to the new copy's detail page, or curation detail on non-POST.
+        Redirect to the job's progress page, which goes on to the new copy's detail
+        page once it's made, or curation detail on non-POST.
     """
     if request.method != "POST":
         return redirect("curation-detail", curation_slug=curation_slug)
@@ -308,21 +367,15 @@ def curation_copy(request: HttpRequest, curation_slug: str) -> HttpResponse:
 
         return HttpResponseBadRequest("Only published curations can be copied.")
 
-    with transaction.atomic():
-        new_curation = Curation.objects.create(
-            copied_from=source,
-            curation_type=source.curation_type,
-            allele=source.allele,
-            haplotype=source.haplotype,
-            disease=source.disease,
-            status=Status.IN_PROGRESS,
-            added_by=cast(User, request.user),
-        )
-        for evidence in source.evidence.prefetch_related("demographics").all():  # type: ignore
-            evidence.copy_to(new_curation, added_by=cast(User, request.user))
-
-    messages.success(request, f"Copy created as {new_curation.slug}.")
-    return redirect("curation-detail", curation_slug=new_curation.slug)
+    user = cast(User, request.user)
+    # The key makes a double submit return the same job rather than a second copy.
+    job = enqueue(
+        COPY_TASK,
+        {"curation_pk": source.pk},
+        key=f"copy:{source.pk}:{user.pk}",
+        added_by=user,
+    )
+    return redirect(job)
 
 
 class CurationHistory(ProtectedViewMixin, DetailView):
@@ -400,8 +453,10 @@ class EvidenceChange(ProtectedViewMixin, DetailView):
 
 class CurationList(ProtectedViewMixin, SearchListView):
     model = Curation
+    queryset = Curation.objects.with_scores().select_related(
+        "allele", "haplotype", "disease"
+    )
     template_name = "curation/list.html"
     ordering = ["-updated_at"]
     table_class = CurationTable
-    search_fields = ["slug", "allele__name", "haplotype__name", "disease__name"]
     table_pagination = {"per_page": 25}
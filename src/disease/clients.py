@@ -4,6 +4,10 @@ import logging
 
 import requests
 
+from common.metadata import register_metadata_lookup
+from common.upstream_cache import fetch_cached
+from disease.models import Disease
+
 MONDO_URL = "https://www.ebi.ac.uk/ols4/api/ontologies/mondo/terms?iri=http://purl.obolibrary.org/obo"
 
 logger = logging.getLogger(__name__)
@@ -21,8 +25,7 @@ def fetch_disease_data(mondo_id: str, timeout: int = 5) -> dict | None:
     """
     try:
         mondo_id = mondo_id.replace(":", "_")
-        response = requests.get(f"{MONDO_URL}/{mondo_id}", timeout=timeout)
-        response.raise_for_status()
+        response = fetch_cached("ols", f"{MONDO_URL}/{mondo_id}", timeout=timeout)
     except (
         requests.exceptions.ConnectionError,
         requests.exceptions.HTTPError,
@@ -80,3 +83,18 @@ def get_iri(data: dict) -> str:
     if iri == "":
         logger.warning("Unable to get IRI from OLS data; returning empty string")
     return iri
+
+
+@register_metadata_lookup(Disease)
+def look_up_disease(disease: Disease) -> bool:
+    """Fills in a disease's name and IRI from the Ontology Lookup Service.
+
+    Returns:
+        Whether the OLS answered.
+    """
+    disease_data = fetch_disease_data(disease.mondo_id)
+    if not disease_data:
+        return False
+    disease.name = get_name(disease_data)
+    disease.iri = get_iri(disease_data)
+    return True
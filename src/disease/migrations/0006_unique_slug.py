@@ -0,0 +1,34 @@
+# Generated by Django 6.0.6 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+def backfill_slugs(apps, schema_editor):
+    # Existing slugs are kept; only objects whose second save never happened lack one.
+    Disease = apps.get_model("disease", "Disease")
+    objs = list(Disease.objects.filter(slug="").only("pk"))
+    for obj in objs:
+        obj.slug = f"D{obj.pk:06d}"
+    Disease.objects.bulk_update(objs, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("disease", "0005_disease_metadata_status"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="disease",
+            name="slug",
+            field=models.SlugField(
+                default="",
+                help_text="The human-readable ID for the object.",
+                max_length=7,
+                unique=True,
+                verbose_name="Human-Readable ID",
+            ),
+        ),
+    ]
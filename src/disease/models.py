@@ -1,17 +1,25 @@
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.http import HttpResponseBase
 from django.urls import reverse
-from simple_history.models import HistoricalRecords
 
+from common.constants.models import METADATA_STATUS_CHOICES, MetadataStatus
+from common.history import ChangedHistoricalRecords
+from common.models import SearchDocument
+from common.slugs import SlugMixin
 from disease.constants.models import DISEASE_TYPE_CHOICES, DiseaseTypes
 from disease.validators.models import validate_disease_type_mondo, validate_mondo_id
 
 
-class Disease(models.Model):
+class Disease(SlugMixin, models.Model):
+    slug_prefix = "D"
+    search_fields = ["slug", "name", "mondo_id"]
+
     slug = models.SlugField(
         default="",
         max_length=7,
+        unique=True,
         verbose_name="Human-Readable ID",
         help_text="The human-readable ID for the object.",
     )
@@ -65,7 +73,16 @@ class Disease(models.Model):
         verbose_name="Updated At",
         help_text="When the disease was last updated.",
     )
-    history = HistoricalRecords()
+    metadata_status = models.CharField(
+        choices=METADATA_STATUS_CHOICES,
+        default=MetadataStatus.DONE,
+        editable=False,
+        max_length=3,
+        verbose_name="Metadata Status",
+        help_text="Whether the disease's details have been fetched.",
+    )
+    search_documents = GenericRelation(SearchDocument)
+    history = ChangedHistoricalRecords(excluded_fields=["metadata_status"])
 
     class Meta:
         """Provides metadata."""
@@ -76,14 +93,8 @@ class Disease(models.Model):
 
     def __str__(self) -> str:
         """Returns a string representation of the disease."""
-        return self.name
-
-    def save(self, *args, **kwargs) -> None:
-        """Adds a human-readable ID."""
-        super().save(*args, **kwargs)
-        if not self.slug:
-            self.slug = f"D{self.pk:06d}"
-            self.save(update_fields=["slug"])
+        # The name is empty until it's fetched from the OLS.
+        return self.name or self.mondo_id
 
     def get_absolute_url(self) -> HttpResponseBase | str | None:
         """Returns the details page for a specific disease."""
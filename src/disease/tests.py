@@ -1,12 +1,13 @@
 from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from common.tests import ProtectedViewTestMixin
 from disease.models import Disease
 
 
+@override_settings(JOBS_RUN_INLINE=True)
 class DiseaseCreateTest(ProtectedViewTestMixin, TestCase):
     url = reverse("disease-create")
     template = "disease/create.html"
@@ -25,7 +26,7 @@ class DiseaseCreateTest(ProtectedViewTestMixin, TestCase):
         response = self.client.get(self.url)
         self.assertContains(response, "Submit")
 
-    @patch("disease.views.fetch_disease_data")
+    @patch("disease.clients.fetch_disease_data")
     def test_creates_disease_with_valid_form_data(
         self, mock_fetch_disease_data: MagicMock
     ):
@@ -41,7 +42,8 @@ class DiseaseCreateTest(ProtectedViewTestMixin, TestCase):
                 ]
             }
         }
-        response = self.client.post(self.url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data)
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Disease.objects.count(), initial_disease_count + 1)
         new_disease = Disease.objects.first()
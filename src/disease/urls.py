@@ -6,6 +6,11 @@ from disease.views import DiseaseList
 urlpatterns = [
     path("create", views.DiseaseCreate.as_view(), name="disease-create"),
     path("<slug:slug>/detail", views.DiseaseDetail.as_view(), name="disease-detail"),
+    path(
+        "<slug:slug>/metadata",
+        views.DiseaseMetadata.as_view(),
+        name="disease-metadata",
+    ),
     path("<slug:slug>/history", views.DiseaseHistory.as_view(), name="disease-history"),
     path(
         "<slug:slug>/history/<int:history_id>/change",
@@ -2,17 +2,16 @@ from typing import cast
 
 from django.contrib import messages
 from django.http import HttpResponse
-from django.shortcuts import redirect
-from django.urls import reverse_lazy
 from django.views.generic import CreateView, DetailView
 from django_tables2 import RequestConfig
 
 from auth_.permissions import ProtectedViewMixin
+from common.constants.models import MetadataStatus
 from common.history import resolve_changes
+from common.metadata import request_metadata
 from common.tables import HistoryTable
-from common.views import SearchListView
+from common.views import MetadataContextMixin, MetadataStatusView, SearchListView
 from curation.tables import CurationTable
-from disease.clients import fetch_disease_data, get_iri, get_name
 from disease.forms import DiseaseForm
 from disease.models import Disease
 from disease.tables import DiseaseTable
@@ -22,37 +21,38 @@ class DiseaseCreate(ProtectedViewMixin, CreateView):
     model = Disease
     form_class = DiseaseForm
     template_name = "disease/create.html"
-    success_url = reverse_lazy("disease-list")
 
     def form_valid(self, form: DiseaseForm) -> HttpResponse:
-        disease_data = fetch_disease_data(form.instance.mondo_id)
-        if disease_data:
-            form.instance.name = get_name(disease_data)
-            form.instance.iri = get_iri(disease_data)
-            form.instance.added_by = self.request.user
-            messages.success(self.request, "Disease added.")
-            return super().form_valid(form)
-        message = (
-            "Oops, something went wrong trying to fetch data from the "
-            "Ontology Lookup Service. Please try again later."
-        )
-        messages.warning(self.request, message)
-        return redirect("disease-create")
+        form.instance.added_by = self.request.user
+        form.instance.metadata_status = MetadataStatus.PENDING
+        response = super().form_valid(form)
+        request_metadata(self.object)
+        messages.success(self.request, "Disease added. Its name is being fetched.")
+        return response
 
 
-class DiseaseDetail(ProtectedViewMixin, DetailView):
+class DiseaseDetail(ProtectedViewMixin, MetadataContextMixin, DetailView):
     model = Disease
     template_name = "disease/detail.html"
+    metadata_url_name = "disease-metadata"
 
     def get_context_data(self, **kwargs: object) -> dict:
         context = super().get_context_data(**kwargs)
         obj = cast(Disease, self.object)
-        curation_table = CurationTable(obj.curations.all())  # type: ignore
+        curations = obj.curations.with_scores().select_related(  # type: ignore
+            "allele", "haplotype", "disease"
+        )
+        curation_table = CurationTable(curations)
         RequestConfig(self.request).configure(curation_table)
         context["curation_table"] = curation_table
         return context
 
 
+class DiseaseMetadata(ProtectedViewMixin, MetadataStatusView):
+    model = Disease
+    metadata_url_name = "disease-metadata"
+
+
 class DiseaseHistory(ProtectedViewMixin, DetailView):
     model = Disease
     template_name = "disease/history.html"
@@ -89,5 +89,4 @@ class DiseaseList(ProtectedViewMixin, SearchListView):
     template_name = "disease/list.html"
     ordering = ["-updated_at"]
     table_class = DiseaseTable
-    search_fields = ["slug", "name", "mondo_id"]
     table_pagination = {"per_page": 25}
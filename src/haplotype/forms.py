@@ -1,6 +1,7 @@
 from django import forms
 from django.forms import ModelForm
 
+from allele.models import Allele
 from haplotype.models import Haplotype
 
 
@@ -9,3 +10,8 @@ class HaplotypeForm(ModelForm):
         model = Haplotype
         fields = ["alleles"]
         widgets = {"alleles": forms.SelectMultiple}
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Lists the alleles by gene and fields rather than by primary key."""
+        super().__init__(*args, **kwargs)
+        self.fields["alleles"].queryset = Allele.objects.in_name_order()  # type: ignore[attr-defined]
@@ -1,16 +1,25 @@
+from functools import cached_property
+
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.http import HttpResponseBase
 from django.urls import reverse
-from simple_history.models import HistoricalRecords
 
 from allele.models import Allele
+from common.history import ChangedHistoricalRecords
+from common.models import SearchDocument
+from common.slugs import SlugMixin
+
 
+class Haplotype(SlugMixin, models.Model):
+    slug_prefix = "H"
+    search_fields = ["slug", "name"]
 
-class Haplotype(models.Model):
     slug = models.SlugField(
         default="",
         max_length=7,
+        unique=True,
         verbose_name="Human-Readable ID",
         help_text="The human-readable ID for the object.",
     )
@@ -51,7 +60,8 @@ class Haplotype(models.Model):
         verbose_name="Updated At",
         help_text="When the haplotype was last updated.",
     )
-    history = HistoricalRecords()
+    search_documents = GenericRelation(SearchDocument)
+    history = ChangedHistoricalRecords()
 
     class Meta:
         db_table = "haplotype"
@@ -61,11 +71,14 @@ class Haplotype(models.Model):
     def __str__(self) -> str:
         return self.name
 
-    def save(self, *args, **kwargs) -> None:
-        super().save(*args, **kwargs)
-        if not self.slug:
-            self.slug = f"H{self.pk:06d}"
-            self.save(update_fields=["slug"])
-
     def get_absolute_url(self) -> HttpResponseBase | str | None:
         return reverse("haplotype-detail", kwargs={"slug": self.slug})
+
+    @cached_property
+    def min_resolution(self) -> int | None:
+        """The lowest resolution of the haplotype's alleles, or None if it has none.
+
+        It's kept on the instance and reads prefetched alleles, so validating every
+        evidence record of a curation reads the alleles at most once.
+        """
+        return min((allele.resolution for allele in self.alleles.all()), default=None)
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
 
+from allele.models import Allele
 from common.tests import ProtectedViewTestMixin
 from haplotype.models import Haplotype
 
@@ -45,6 +46,15 @@ class HaplotypeCreateTest(ProtectedViewTestMixin, TestCase):
         assert new_haplotype is not None
         self.assertEqual(new_haplotype.name, "A*01:02:03~B*04:05:06")
 
+    def test_unparseable_allele_names_are_sorted_by_their_gene(self):
+        allele = Allele.objects.create(name="A*01:02:03:04:05")
+        self.assertEqual(allele.gene, "")
+        response = self.client.post(self.url, {"alleles": ["2", str(allele.pk)]})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(
+            Haplotype.objects.filter(name="A*01:02:03:04:05~B*04:05:06").exists()
+        )
+
     def test_duplicate_allele_combination_returns_form_error(self):
         self.client.post(self.url, {"alleles": ["1", "2"]})
         initial_haplotype_count = Haplotype.objects.count()
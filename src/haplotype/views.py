@@ -33,7 +33,8 @@ class HaplotypeCreate(ProtectedViewMixin, CreateView):
         """
         unsorted_alleles: list[tuple[str, int]] = []
         for allele in form.cleaned_data["alleles"]:
-            gene = allele.name.split("*")[0]
+            # Names that can't be parsed have no gene, so it's read from the name.
+            gene = allele.gene or allele.name.split("*")[0]
             index = GENE_LIST.index(gene)
             unsorted_alleles.append((allele.name, index))
         sorted_alleles = sorted(unsorted_alleles, key=lambda item: item[1])
@@ -55,7 +56,10 @@ class HaplotypeDetail(ProtectedViewMixin, DetailView):
         context = super().get_context_data(**kwargs)
         obj = cast(Haplotype, self.object)
         allele_table = AlleleTable(obj.alleles.all(), prefix="allele_")
-        curation_table = CurationTable(obj.curations.all(), prefix="curation_")  # type: ignore
+        curations = obj.curations.with_scores().select_related(  # type: ignore
+            "allele", "haplotype", "disease"
+        )
+        curation_table = CurationTable(curations, prefix="curation_")
         RequestConfig(self.request).configure(allele_table)
         RequestConfig(self.request).configure(curation_table)
         context["allele_table"] = allele_table
@@ -99,5 +103,4 @@ class HaplotypeList(ProtectedViewMixin, SearchListView):
     template_name = "haplotype/list.html"
     ordering = ["-updated_at"]
     table_class = HaplotypeTable
-    search_fields = ["slug", "name"]
     table_pagination = {"per_page": 25}
@@ -0,0 +1,39 @@
+from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils import timezone
+
+from job.constants.models import JobStatus
+from job.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        "__str__",
+        "key",
+        "status",
+        "progress",
+        "total",
+        "attempts",
+        "added_by",
+        "added_at",
+        "finished_at",
+    ]
+    list_filter = ["status", "task"]
+    search_fields = ["task", "key"]
+    readonly_fields = [field.name for field in Job._meta.get_fields()]  # noqa: SLF001
+    actions = ["retry"]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:  # noqa: ARG002
+        return False
+
+    @admin.action(description="Retry the selected failed jobs")
+    def retry(self, request: HttpRequest, queryset: QuerySet) -> None:
+        count = queryset.filter(status=JobStatus.FAILED).update(
+            status=JobStatus.QUEUED,
+            attempts=0,
+            run_after=timezone.now(),
+            finished_at=None,
+        )
+        self.message_user(request, f"Queued {count} jobs again.")
@@ -0,0 +1,21 @@
+"""Houses constants used in the job app's models."""
+
+
+class JobStatus:
+    """Defines where a job stands in the queue."""
+
+    QUEUED = "QUE"
+    RUNNING = "RUN"
+    SUCCEEDED = "SUC"
+    FAILED = "FAI"
+
+
+JOB_STATUS_CHOICES = {
+    JobStatus.QUEUED: "Queued",
+    JobStatus.RUNNING: "Running",
+    JobStatus.SUCCEEDED: "Succeeded",
+    JobStatus.FAILED: "Failed",
+}
+
+# The statuses of jobs that haven't finished.
+ACTIVE_STATUSES = [JobStatus.QUEUED, JobStatus.RUNNING]
@@ -0,0 +1,44 @@
+"""Provides a command for running queued jobs."""
+
+import signal
+from types import FrameType
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from job.worker import run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs queued jobs until stopped, e.g., as a systemd service alongside "
+        "Gunicorn. SIGTERM and SIGINT stop it once the current job is done."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no queued job is ready to run instead of waiting for more.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="How many seconds to wait between checks of an empty queue.",
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002
+        stopping = False
+
+        def stop(signum: int, frame: FrameType | None) -> None:  # noqa: ARG001
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        count = run_worker(
+            burst=options["burst"],
+            poll_interval=options["poll_interval"],
+            should_stop=lambda: stopping,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Ran {count} jobs."))
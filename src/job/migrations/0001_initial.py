@@ -0,0 +1,188 @@
+# Generated by Django 6.0.6 on 2026-10-18 03:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Job",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "task",
+                    models.CharField(
+                        help_text="The name of the registered task the job runs, e.g., curation.copy.",
+                        max_length=64,
+                        verbose_name="Task",
+                    ),
+                ),
+                (
+                    "arguments",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="The keyword arguments the task is called with.",
+                        verbose_name="Arguments",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="What the job works on, so the same work isn't queued twice.",
+                        max_length=128,
+                        verbose_name="Key",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("QUE", "Queued"),
+                            ("RUN", "Running"),
+                            ("SUC", "Succeeded"),
+                            ("FAI", "Failed"),
+                        ],
+                        default="QUE",
+                        help_text="Whether the job is queued, running, succeeded, or failed.",
+                        max_length=3,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0,
+                        help_text="How many times the job has been started.",
+                        verbose_name="Attempts",
+                    ),
+                ),
+                (
+                    "max_attempts",
+                    models.PositiveSmallIntegerField(
+                        default=1,
+                        help_text="How many times the job is started before it's marked failed.",
+                        verbose_name="Max Attempts",
+                    ),
+                ),
+                (
+                    "run_after",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the job can next be started.",
+                        verbose_name="Run After",
+                    ),
+                ),
+                (
+                    "progress",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="How many of the job's steps are done.",
+                        verbose_name="Progress",
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="How many steps the job has, if known.",
+                        null=True,
+                        verbose_name="Total",
+                    ),
+                ),
+                (
+                    "result",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="What the task returned, e.g., the URL of what it made.",
+                        verbose_name="Result",
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="The traceback of the job's most recent failure.",
+                        verbose_name="Error",
+                    ),
+                ),
+                (
+                    "added_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="When the job was queued.",
+                        verbose_name="Added At",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the job's most recent attempt started.",
+                        null=True,
+                        verbose_name="Started At",
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the job succeeded or failed for good.",
+                        null=True,
+                        verbose_name="Finished At",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="When the job was last updated, e.g., by reporting progress.",
+                        verbose_name="Updated At",
+                    ),
+                ),
+                (
+                    "added_by",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="The user who started the job.",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="jobs_added",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Added By",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Job",
+                "verbose_name_plural": "Jobs",
+                "db_table": "job",
+                "indexes": [
+                    models.Index(fields=["status", "run_after"], name="job_queue_idx"),
+                    models.Index(fields=["task", "key"], name="job_key_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,153 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+
+from job.constants.models import ACTIVE_STATUSES, JOB_STATUS_CHOICES, JobStatus
+
+
+class JobQuerySet(models.QuerySet):
+    def active(self) -> "JobQuerySet":
+        """Returns the jobs that are queued or running."""
+        return self.filter(status__in=ACTIVE_STATUSES)
+
+
+class Job(models.Model):
+    task = models.CharField(
+        max_length=64,
+        verbose_name="Task",
+        help_text="The name of the registered task the job runs, e.g., curation.copy.",
+    )
+    arguments = models.JSONField(
+        blank=True,
+        default=dict,
+        verbose_name="Arguments",
+        help_text="The keyword arguments the task is called with.",
+    )
+    key = models.CharField(
+        blank=True,
+        default="",
+        max_length=128,
+        verbose_name="Key",
+        help_text="What the job works on, so the same work isn't queued twice.",
+    )
+    status = models.CharField(
+        choices=JOB_STATUS_CHOICES,
+        default=JobStatus.QUEUED,
+        max_length=3,
+        verbose_name="Status",
+        help_text="Whether the job is queued, running, succeeded, or failed.",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Attempts",
+        help_text="How many times the job has been started.",
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name="Max Attempts",
+        help_text="How many times the job is started before it's marked failed.",
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Run After",
+        help_text="When the job can next be started.",
+    )
+    progress = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Progress",
+        help_text="How many of the job's steps are done.",
+    )
+    total = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        verbose_name="Total",
+        help_text="How many steps the job has, if known.",
+    )
+    result = models.JSONField(
+        blank=True,
+        default=dict,
+        verbose_name="Result",
+        help_text="What the task returned, e.g., the URL of what it made.",
+    )
+    error = models.TextField(
+        blank=True,
+        default="",
+        verbose_name="Error",
+        help_text="The traceback of the job's most recent failure.",
+    )
+    added_by = models.ForeignKey(
+        User,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="jobs_added",
+        verbose_name="Added By",
+        help_text="The user who started the job.",
+    )
+    added_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Added At",
+        help_text="When the job was queued.",
+    )
+    started_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Started At",
+        help_text="When the job's most recent attempt started.",
+    )
+    finished_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Finished At",
+        help_text="When the job succeeded or failed for good.",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Updated At",
+        help_text="When the job was last updated, e.g., by reporting progress.",
+    )
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        db_table = "job"
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_queue_idx"),
+            models.Index(fields=["task", "key"], name="job_key_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk}"
+
+    def get_absolute_url(self) -> str:
+        return reverse("job-detail", kwargs={"pk": self.pk})
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {JobStatus.SUCCEEDED, JobStatus.FAILED}
+
+    @property
+    def is_last_attempt(self) -> bool:
+        """Whether the job won't be retried if its current attempt fails."""
+        return self.attempts >= self.max_attempts
+
+    @property
+    def percent_done(self) -> int | None:
+        if not self.total:
+            return None
+        return min(100, self.progress * 100 // self.total)
+
+    def set_progress(self, progress: int, total: int | None = None) -> None:
+        """Records how many of the job's steps are done, for its progress page.
+
+        Only the progress fields are written, so a long job can report often.
+        """
+        self.progress = progress
+        update_fields = ["progress", "updated_at"]
+        if total is not None:
+            self.total = total
+            update_fields.append("total")
+        self.save(update_fields=update_fields)
@@ -0,0 +1,60 @@
+"""Houses the function that queues jobs.
+
+Slow work (third-party lookups, importing publications, copying a curation with all of
+its evidence, rebuilding the repository snapshot) used to run inside the request that
+asked for it, holding a Gunicorn worker until it was done. Instead, the request queues a
+`Job` row in the database and returns at once, and the `run_jobs` command picks it up.
+There is no separate broker: the queue is the `job` table.
+"""
+
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from job.constants.models import ACTIVE_STATUSES, JobStatus
+from job.models import Job
+from job.registry import TASKS
+from job.worker import run_job_now
+
+
+def enqueue(
+    task: str,
+    arguments: dict[str, Any] | None = None,
+    *,
+    key: str = "",
+    added_by: User | None = None,
+) -> Job:
+    """Queues a job to run a task.
+
+    The worker can see the job once the current transaction commits. With
+    `settings.JOBS_RUN_INLINE` on, the job's first attempt runs then instead.
+
+    Args:
+        task: The name of a registered task. Other names raise a `KeyError`.
+        arguments: The JSON-serializable keyword arguments to call the task with.
+        key: What the job works on, e.g., "allele.allele:12". A job with the same task
+            and key that's still waiting to start is returned instead of queueing
+            another, as is one that's running if the task isn't idempotent.
+        added_by: The user who started the job.
+
+    Returns:
+        The queued job.
+    """
+    registered = TASKS[task]
+    if key:
+        statuses = [JobStatus.QUEUED] if registered.idempotent else ACTIVE_STATUSES
+        waiting = Job.objects.filter(task=task, key=key, status__in=statuses).first()
+        if waiting is not None:
+            return waiting
+    job = Job.objects.create(
+        task=task,
+        arguments=arguments or {},
+        key=key,
+        max_attempts=registered.max_attempts,
+        added_by=added_by,
+    )
+    if settings.JOBS_RUN_INLINE:
+        transaction.on_commit(lambda: run_job_now(job.pk))
+    return job
@@ -0,0 +1,56 @@
+"""Houses the registry of the tasks that jobs can run.
+
+Each app registers its tasks in a `jobs` module, which `JobConfig` imports at startup
+so that the web processes and the worker know the same tasks.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# The function a task runs, given its job and the job's arguments. It can return a
+# JSON-serializable dict, e.g., with the "url" of what it made.
+TaskFunction = Callable[..., dict[str, Any] | None]
+
+
+@dataclass(frozen=True)
+class Task:
+    """A function that can be queued, how many times to try it, and if it can rerun."""
+
+    name: str
+    function: TaskFunction
+    max_attempts: int
+    idempotent: bool = True
+
+
+# Every task that can be queued, keyed by name.
+TASKS: dict[str, Task] = {}
+
+
+def register_task(
+    name: str, max_attempts: int = 1, *, idempotent: bool = True
+) -> Callable[[TaskFunction], TaskFunction]:
+    """Registers a function as a task that jobs can run.
+
+    The function is called with the `Job` and then the job's arguments as keyword
+    arguments. If it raises, the job is retried with backoff until it has been tried
+    `max_attempts` times.
+
+    A task that isn't idempotent, e.g., one that makes a new object every time it runs,
+    is run in one transaction, so a failed attempt leaves nothing behind, and queueing
+    it returns the running job with the same key too, so it isn't run twice at once.
+
+    Returns:
+        A decorator that registers the function and returns it unchanged.
+    """
+
+    def register(function: TaskFunction) -> TaskFunction:
+        TASKS[name] = Task(
+            name=name,
+            function=function,
+            max_attempts=max_attempts,
+            idempotent=idempotent,
+        )
+        return function
+
+    return register
@@ -0,0 +1,233 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from common.tests import ProtectedViewTestMixin
+from job.constants.models import JobStatus
+from job.models import Job
+from job.queue import enqueue
+from job.registry import TASKS, register_task
+from job.worker import (
+    beat,
+    claim_job,
+    heartbeat,
+    requeue_stale_jobs,
+    run_job,
+    run_worker,
+)
+
+CALLS: list[int] = []
+
+
+@register_task("job.test_succeed")
+def succeed(job: Job, number: int) -> dict[str, str]:
+    """Counts to a number, recording the call.
+
+    Returns:
+        A message about the count.
+    """
+    job.set_progress(0, total=number)
+    CALLS.append(number)
+    return {"url": "/", "message": f"Counted to {number}."}
+
+
+@register_task("job.test_create_then_fail", idempotent=False)
+def create_then_fail(job: Job) -> None:
+    """Queues another job, then fails.
+
+    Raises:
+        RuntimeError: Always.
+    """
+    enqueue("job.test_succeed", {"number": job.pk})
+    msg = "Unable to finish the thing."
+    raise RuntimeError(msg)
+
+
+@register_task("job.test_fail", max_attempts=2)
+def fail(job: Job) -> None:  # noqa: ARG001
+    """Fails every time.
+
+    Raises:
+        RuntimeError: Always.
+    """
+    msg = "Unable to do the thing."
+    raise RuntimeError(msg)
+
+
+class QueueTest(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_runs_queued_jobs(self):
+        job = enqueue("job.test_succeed", {"number": 3})
+        self.assertEqual(run_worker(burst=True), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual((job.progress, job.total, job.attempts), (3, 3, 1))
+        self.assertEqual(job.result["message"], "Counted to 3.")
+        self.assertEqual(CALLS, [3])
+
+    def test_unknown_tasks_cannot_be_queued(self):
+        with self.assertRaises(KeyError):
+            enqueue("job.test_missing")
+
+    def test_jobs_with_the_same_key_share_a_queued_job(self):
+        first = enqueue("job.test_succeed", {"number": 1}, key="k")
+        second = enqueue("job.test_succeed", {"number": 1}, key="k")
+        self.assertEqual(first, second)
+        run_worker(burst=True)
+        third = enqueue("job.test_succeed", {"number": 1}, key="k")
+        self.assertNotEqual(first, third)
+
+    def test_claims_each_job_once(self):
+        job = enqueue("job.test_succeed", {"number": 1})
+        self.assertEqual(claim_job(), job)
+        self.assertIsNone(claim_job())
+
+    def test_retries_failed_jobs_with_backoff(self):
+        job = enqueue("job.test_fail")
+        with self.assertLogs("job.worker", "ERROR"):
+            run_worker(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (JobStatus.QUEUED, 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("Unable to do the thing.", job.error)
+
+        Job.objects.update(run_after=timezone.now())
+        with self.assertLogs("job.worker", "ERROR"):
+            run_worker(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (JobStatus.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_requeues_jobs_whose_worker_died(self):
+        job = enqueue("job.test_fail")
+        claim_job()
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.QUEUED)
+
+        claim_job()
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.FAILED)
+
+    def test_attempts_taken_over_by_another_worker_are_not_overwritten(self):
+        enqueue("job.test_fail")
+        first = claim_job()
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        requeue_stale_jobs()
+        second = claim_job()
+        with self.assertLogs("job.worker") as logs:
+            run_job(first)
+        self.assertIn("was queued again", logs.output[-1])
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.attempts), (JobStatus.RUNNING, 2))
+
+    def test_heartbeats_keep_running_jobs_from_going_stale(self):
+        job = enqueue("job.test_fail")
+        claim_job()
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        beat(job.pk)
+        self.assertEqual(requeue_stale_jobs(), 0)
+
+    @override_settings(JOB_HEARTBEAT_INTERVAL=0.01)
+    def test_heartbeats_go_on_until_the_task_returns(self):
+        job = enqueue("job.test_succeed", {"number": 1})
+        with patch("job.worker.beat") as beat_:
+            with heartbeat(job):
+                time.sleep(0.1)
+            count = beat_.call_count
+            time.sleep(0.05)
+        self.assertGreater(count, 0)
+        self.assertEqual(beat_.call_count, count)
+        beat_.assert_called_with(job.pk)
+
+    def test_tasks_that_are_not_idempotent_run_in_a_transaction(self):
+        job = enqueue("job.test_create_then_fail")
+        with self.assertLogs("job.worker", "ERROR"):
+            run_worker(burst=True)
+        self.assertFalse(Job.objects.exclude(pk=job.pk).exists())
+
+    def test_running_jobs_are_shared_only_by_tasks_that_are_not_idempotent(self):
+        first = enqueue("job.test_create_then_fail", key="k")
+        claim_job()
+        self.assertEqual(enqueue("job.test_create_then_fail", key="k"), first)
+        Job.objects.all().delete()
+        first = enqueue("job.test_succeed", {"number": 1}, key="k")
+        claim_job()
+        self.assertNotEqual(enqueue("job.test_succeed", {"number": 1}, key="k"), first)
+
+    def test_fails_jobs_with_no_registered_task(self):
+        job = Job.objects.create(task="job.test_removed")
+        with self.assertLogs("job.worker", "ERROR"):
+            run_worker(burst=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.FAILED)
+
+    @override_settings(JOBS_RUN_INLINE=True)
+    def test_runs_jobs_inline_once_committed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = enqueue("job.test_succeed", {"number": 2})
+            self.assertEqual(CALLS, [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+
+    def test_command_runs_queued_jobs(self):
+        enqueue("job.test_succeed", {"number": 1})
+        out = StringIO()
+        call_command("run_jobs", "--burst", stdout=out)
+        self.assertIn("Ran 1 jobs.", out.getvalue())
+
+    def test_tasks_are_registered_at_startup(self):
+        self.assertIn("common.revalidate_upstream_response", TASKS)
+        self.assertIn("common.look_up_metadata", TASKS)
+        self.assertIn("curation.copy", TASKS)
+        self.assertIn("publication.import", TASKS)
+        self.assertIn("repo.rebuild_snapshot", TASKS)
+
+
+class JobDetailTest(ProtectedViewTestMixin, TestCase):
+    template = "job/detail.html"
+    page_name = "Job"
+    expected_text = ["job.test_succeed", "Queued"]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user4_yes_phi_yes_perms)
+        self.job = enqueue(
+            "job.test_succeed", {"number": 1}, added_by=self.user4_yes_phi_yes_perms
+        )
+        self.url = self.job.get_absolute_url()
+
+    def test_polls_for_progress_until_done(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, f"/job/{self.job.pk}/progress")
+
+    def test_goes_on_to_what_the_job_made(self):
+        run_worker(burst=True)
+        progress_url = f"/job/{self.job.pk}/progress"
+        response = self.client.get(progress_url, headers={"HX-Request": "true"})
+        self.assertEqual(response["HX-Redirect"], "/")
+        response = self.client.get(self.url, follow=True)
+        self.assertRedirects(response, "/")
+        self.assertContains(response, "Counted to 1.")
+
+    def test_shows_failures(self):
+        Job.objects.update(status=JobStatus.FAILED)
+        response = self.client.get(self.url)
+        self.assertContains(response, "The job failed.")
+        self.assertNotContains(response, "hx-get")
+
+    def test_hides_other_users_jobs(self):
+        other = User.objects.create(username="other")
+        Job.objects.update(added_by=other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
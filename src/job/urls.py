@@ -0,0 +1,8 @@
+from django.urls import path
+
+from job import views
+
+urlpatterns = [
+    path("<int:pk>/detail", views.JobDetail.as_view(), name="job-detail"),
+    path("<int:pk>/progress", views.JobProgress.as_view(), name="job-progress"),
+]
@@ -0,0 +1,70 @@
+from django.contrib import messages
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.shortcuts import redirect
+from django.views.generic import DetailView
+
+from auth_.permissions import ProtectedViewMixin
+from job.constants.models import JobStatus
+from job.models import Job
+
+
+class JobMixin:
+    """Finds the user's job and sends them on to what it made once it's done."""
+
+    model = Job
+
+    def get_queryset(self) -> QuerySet:
+        """Limits users to their own jobs, unless they're staff.
+
+        Returns:
+            The jobs the user can see.
+        """
+        user = self.request.user  # type: ignore[attr-defined]
+        if user.is_staff:
+            return Job.objects.all()
+        return Job.objects.filter(added_by=user)
+
+    def get_result_url(self, request: HttpRequest, job: Job) -> str | None:
+        """Returns the URL of what a succeeded job made, adding its message, if any.
+
+        Returns:
+            The URL, or None if the job hasn't succeeded or made nothing to go to.
+        """
+        url = job.result.get("url")
+        if job.status != JobStatus.SUCCEEDED or not url:
+            return None
+        if job.result.get("message"):
+            messages.success(request, job.result["message"])
+        return url
+
+
+class JobDetail(ProtectedViewMixin, JobMixin, DetailView):
+    template_name = "job/detail.html"
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:  # noqa: ARG002
+        self.object = self.get_object()
+        url = self.get_result_url(request, self.object)
+        if url is not None:
+            return redirect(url)
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+
+class JobProgress(ProtectedViewMixin, JobMixin, DetailView):
+    """Returns a job's progress to its page, which polls it until the job is done.
+
+    Once a job that made something (e.g., a curation copy) succeeds, HTMX is sent on to
+    what it made.
+    """
+
+    template_name = "job/partials/progress.html"
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:  # noqa: ARG002
+        self.object = self.get_object()
+        if request.headers.get("HX-Request"):
+            url = self.get_result_url(request, self.object)
+            if url is not None:
+                response = HttpResponse()
+                response["HX-Redirect"] = url
+                return response
+        return self.render_to_response(self.get_context_data(object=self.object))
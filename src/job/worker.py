@@ -0,0 +1,237 @@
+"""Houses the worker that runs queued jobs.
+
+A job is claimed with a conditional update from queued to running, so several workers
+can share the queue without running a job twice, on SQLite and PostgreSQL alike. A job
+whose task raises is queued again with exponential backoff until it has been tried its
+task's `max_attempts` times, and a job left running by a worker that died is queued
+again once it hasn't reported progress for `settings.JOB_TIMEOUT` seconds. While a task
+runs, a heartbeat thread reports for it, so a long task that never reports progress
+isn't mistaken for one whose worker died and run a second time alongside itself. How an
+attempt ended is only recorded while the job is still that attempt's, so a worker whose
+job was queued again in the meantime can't overwrite the newer attempt.
+"""
+
+import logging
+import threading
+import time
+import traceback
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from job.constants.models import JobStatus
+from job.models import Job
+from job.registry import TASKS
+
+logger = logging.getLogger(__name__)
+
+# How long a failed job waits before its second attempt; each later wait doubles.
+RETRY_DELAY = timedelta(seconds=30)
+
+# How many of the oldest runnable jobs are tried when claiming one.
+CLAIM_BATCH_SIZE = 10
+
+
+def _claim(pk: int) -> Job | None:
+    now = timezone.now()
+    claimed = Job.objects.filter(pk=pk, status=JobStatus.QUEUED).update(
+        status=JobStatus.RUNNING,
+        attempts=F("attempts") + 1,
+        started_at=now,
+        updated_at=now,
+    )
+    return Job.objects.get(pk=pk) if claimed else None
+
+
+def claim_job() -> Job | None:
+    """Marks the oldest runnable job as running.
+
+    Returns:
+        The claimed job, or None if there's no job to run or other workers claimed them
+        first.
+    """
+    runnable = Job.objects.filter(
+        status=JobStatus.QUEUED, run_after__lte=timezone.now()
+    ).order_by("run_after", "pk")
+    for pk in runnable.values_list("pk", flat=True)[:CLAIM_BATCH_SIZE]:
+        job = _claim(pk)
+        if job is not None:
+            return job
+    return None
+
+
+def requeue_stale_jobs() -> int:
+    """Queues the running jobs that haven't reported progress in a while again.
+
+    Their worker most likely died, e.g., because it was restarted mid-job. A job that
+    has used up its attempts is marked failed instead.
+
+    Returns:
+        How many jobs were queued again or failed.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=JobStatus.RUNNING,
+        updated_at__lt=now - timedelta(seconds=settings.JOB_TIMEOUT),
+    )
+    message = "The job's worker stopped before the job finished."
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=JobStatus.FAILED, error=message, finished_at=now, updated_at=now
+    )
+    requeued = stale.update(
+        status=JobStatus.QUEUED, error=message, run_after=now, updated_at=now
+    )
+    return failed + requeued
+
+
+def beat(pk: int) -> None:
+    """Records that a running job's worker is still alive."""
+    Job.objects.filter(pk=pk, status=JobStatus.RUNNING).update(
+        updated_at=timezone.now()
+    )
+
+
+@contextmanager
+def heartbeat(job: Job) -> Iterator[None]:
+    """Keeps a running job from going stale until the block exits.
+
+    A thread calls `beat` every `settings.JOB_HEARTBEAT_INTERVAL` seconds. It dies with
+    the worker, so the job of a worker that died still goes stale.
+
+    On SQLite the beats can't be written while a task that isn't idempotent holds the
+    write lock in its transaction, so such a task has to finish within
+    `settings.JOB_TIMEOUT` seconds of its last progress report before the transaction.
+    """
+    stopped = threading.Event()
+
+    def run() -> None:
+        try:
+            while not stopped.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                try:
+                    beat(job.pk)
+                except DatabaseError:
+                    # E.g., SQLite is locked by the task's own transaction; the next
+                    # beat will try again.
+                    logger.warning("Unable to record job %s's heartbeat", job)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=run, name=f"job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def run_job(job: Job) -> None:
+    """Runs a claimed job's task and records whether it succeeded.
+
+    A task that isn't idempotent runs in one transaction. A task that raises is logged
+    and, if the job has attempts left, queued again after a delay that doubles with
+    each attempt.
+    """
+    task = TASKS.get(job.task)
+    if task is None:
+        logger.error("Job %s has no registered task", job)
+        _finish(
+            job,
+            status=JobStatus.FAILED,
+            error=f"There's no task named {job.task}.",
+            finished_at=timezone.now(),
+        )
+        return
+    try:
+        with heartbeat(job), nullcontext() if task.idempotent else transaction.atomic():
+            result = task.function(job, **job.arguments)
+    except Exception:
+        logger.exception("Job %s failed on attempt %s", job, job.attempts)
+        error = traceback.format_exc()
+        if not job.is_last_attempt:
+            _finish(
+                job,
+                status=JobStatus.QUEUED,
+                error=error,
+                run_after=timezone.now() + RETRY_DELAY * 2 ** (job.attempts - 1),
+            )
+        else:
+            _finish(
+                job, status=JobStatus.FAILED, error=error, finished_at=timezone.now()
+            )
+    else:
+        _finish(
+            job,
+            status=JobStatus.SUCCEEDED,
+            result=result or {},
+            error="",
+            finished_at=timezone.now(),
+            **({} if job.total is None else {"progress": job.total}),
+        )
+
+
+def _finish(job: Job, **fields: object) -> None:
+    """Records how a job's attempt ended, unless the job has since been taken from it.
+
+    The update only applies while the job is still running the same attempt. A job that
+    went stale may have been queued again and claimed by another worker, whose attempt
+    this one mustn't overwrite.
+    """
+    fields["updated_at"] = timezone.now()
+    updated = Job.objects.filter(
+        pk=job.pk, status=JobStatus.RUNNING, attempts=job.attempts
+    ).update(**fields)
+    if not updated:
+        logger.warning(
+            "Job %s was queued again before attempt %s finished", job, job.attempts
+        )
+        return
+    for name, value in fields.items():
+        setattr(job, name, value)
+
+
+def run_job_now(pk: int) -> None:
+    """Claims and runs a job right away, as `settings.JOBS_RUN_INLINE` asks for."""
+    job = _claim(pk)
+    if job is not None:
+        run_job(job)
+
+
+def run_worker(
+    *,
+    burst: bool = False,
+    poll_interval: float = 1.0,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> int:
+    """Runs queued jobs one at a time, waiting for more when the queue is empty.
+
+    Args:
+        burst: Whether to return once no job is runnable instead of waiting.
+        poll_interval: How many seconds to wait between checks of an empty queue.
+        should_stop: Returns whether to return after the current job.
+
+    Returns:
+        How many jobs were run.
+    """
+    count = 0
+    while not should_stop():
+        # Drop connections that errored or outlived `CONN_MAX_AGE`, as Django does
+        # between requests, unless jobs are being run inside a transaction, e.g., by a
+        # test.
+        if not connection.in_atomic_block:
+            close_old_connections()
+        requeue_stale_jobs()
+        job = claim_job()
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        count += 1
+    return count
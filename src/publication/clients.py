@@ -2,21 +2,33 @@
 
 import logging
 import os
+import time
+from collections.abc import Iterable, Iterator
+from itertools import batched
 
 import requests
-from bs4 import BeautifulSoup, PageElement
 from lxml import etree
 
-from publication.models import PublicationTypes
+from common.clients import fetch
+from common.metadata import register_metadata_lookup
+from common.upstream_cache import fetch_cached
+from publication.models import Publication, PublicationTypes
+from publication.pubmed import PubMedArticle, iter_pubmed_articles
 
 BIORXIV_URL = "https://api.biorxiv.org/details/biorxiv"
 MEDRXIV_URL = "https://api.biorxiv.org/details/medrxiv"
 PUBMED_URL = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?api_key={os.getenv('PUBMED_API_KEY')}&db=PubMed&retmode=xml"
 
+# The most PubMed IDs fetched per request; NCBI asks for POSTs above 200.
+PUBMED_BATCH_SIZE = 200
+
+# NCBI allows 10 requests a second with an API key and 3 without.
+PUBMED_REQUEST_INTERVAL = 0.1 if os.getenv("PUBMED_API_KEY") else 0.34
+
 logger = logging.getLogger(__name__)
 
 
-def fetch_pubmed_data(pubmed_id: str, timeout: int = 5) -> BeautifulSoup | None:
+def fetch_pubmed_data(pubmed_id: str, timeout: int = 5) -> PubMedArticle | None:
     """Fetches data about a PubMed article.
 
     Args:
@@ -24,12 +36,13 @@ def fetch_pubmed_data(pubmed_id: str, timeout: int = 5) -> BeautifulSoup | None:
         timeout: The timeout for the HTTP request in seconds.
 
     Returns:
-        The API endpoint's XML or None if there was an error.
+        The parsed article or None if there was an error or PubMed has no such article.
     """
     try:
-        response = requests.get(f"{PUBMED_URL}&id={pubmed_id}", timeout=timeout)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "xml")
+        response = fetch_cached(
+            "pubmed", f"{PUBMED_URL}&id={pubmed_id}", timeout=timeout
+        )
+        article = next(iter_pubmed_articles(response.content), None)
     except (
         requests.exceptions.ConnectionError,
         requests.exceptions.HTTPError,
@@ -42,66 +55,83 @@ def fetch_pubmed_data(pubmed_id: str, timeout: int = 5) -> BeautifulSoup | None:
         message = "Unable to get data from PubMed"
         logger.exception(message)
         return None
-    else:
-        return soup
+    if article is None:
+        logger.warning("PubMed has no article with ID %s", pubmed_id)
+    return article
+
+
+def fetch_pubmed_articles(
+    pubmed_ids: Iterable[str], timeout: int = 30
+) -> Iterator[PubMedArticle]:
+    """Fetches data about many PubMed articles, a batch of IDs per request.
 
+    The requests are spaced out to stay within NCBI's rate limit. A batch that can't be
+    fetched or parsed is logged and skipped, so its articles are just missing from the
+    results.
 
-def get_pubmed_title(soup: BeautifulSoup) -> str:
+    Args:
+        pubmed_ids: The PubMed IDs for the articles.
+        timeout: The timeout for each HTTP request in seconds.
+
+    Yields:
+        The articles that were found.
+    """
+    next_request_at = 0.0
+    for batch in batched(pubmed_ids, PUBMED_BATCH_SIZE, strict=False):
+        time.sleep(max(0.0, next_request_at - time.monotonic()))
+        next_request_at = time.monotonic() + PUBMED_REQUEST_INTERVAL
+        try:
+            response = fetch(
+                "pubmed", f"{PUBMED_URL}&id={','.join(batch)}", timeout=timeout
+            )
+            articles = list(iter_pubmed_articles(response.content))
+        except (requests.exceptions.RequestException, etree.XMLSyntaxError):
+            logger.exception("Unable to get a batch of %d from PubMed", len(batch))
+            continue
+        yield from articles
+
+
+def get_pubmed_title(article: PubMedArticle) -> str:
     """Extracts the title from the PubMed response.
 
     Args:
-        soup: The BeautifulSoup object representing the PubMed response.
+        article: The article parsed from the PubMed response.
 
     Returns:
         The title of the article if it can be found or an empty string otherwise.
     """
-    title = soup.find("ArticleTitle") or ""
-    if isinstance(title, PageElement):
-        return title.get_text(strip=True)
-    logger.warning("Unable to get title from PubMed data; returning empty string")
-    return title
+    if not article.title:
+        logger.warning("Unable to get title from PubMed data; returning empty string")
+    return article.title
 
 
-def get_pubmed_author(soup: BeautifulSoup) -> str:
+def get_pubmed_author(article: PubMedArticle) -> str:
     """Extracts the author from the PubMed response.
 
     Args:
-        soup: The BeautifulSoup object representing the PubMed response.
+        article: The article parsed from the PubMed response.
 
     Returns:
-        The first author in the author list if it can be found or an empty string
-        otherwise.
+        The surname of the first author in the author list if it can be found or an
+        empty string otherwise.
     """
-    author = soup.find("LastName") or ""  # Find the first instance of LastName.
-    if isinstance(author, PageElement):
-        return author.get_text(strip=True)
-    logger.warning("Unable to get author from PubMed data; returning empty string")
-    return author
+    if not article.author:
+        logger.warning("Unable to get author from PubMed data; returning empty string")
+    return article.author
 
 
-def get_pubmed_year(soup: BeautifulSoup) -> int | None:
+def get_pubmed_year(article: PubMedArticle) -> int | None:
     """Extracts the publication year from the PubMed response.
 
     Args:
-        soup: The BeautifulSoup object representing the PubMed response.
+        article: The article parsed from the PubMed response.
 
     Returns:
         The year of publication if it can be found as an integer, or None otherwise.
     """
-    pub_date = soup.find("PubDate")
-    if pub_date:
-        year = pub_date.find("Year")
-        if isinstance(year, PageElement):
-            year_text = year.get_text(strip=True)
-            try:
-                return int(year_text)
-            except (ValueError, TypeError):
-                logger.warning(
-                    f"Unable to convert year '{year_text}' to integer; returning None"
-                )
-                return None
+    if article.year is None:
         logger.warning("Unable to get year from PubMed data; returning None")
-    return None
+    return article.year
 
 
 def fetch_rxiv_data(rxiv_type: str, doi: str, timeout: int = 5) -> dict | None:
@@ -117,8 +147,7 @@ def fetch_rxiv_data(rxiv_type: str, doi: str, timeout: int = 5) -> dict | None:
     """
     url = BIORXIV_URL if rxiv_type == PublicationTypes.BIORXIV else MEDRXIV_URL
     try:
-        response = requests.get(f"{url}/{doi}", timeout=timeout)
-        response.raise_for_status()
+        response = fetch_cached("rxiv", f"{url}/{doi}", timeout=timeout)
     except (
         requests.exceptions.ConnectionError,
         requests.exceptions.HTTPError,
@@ -203,3 +232,27 @@ def get_rxiv_year(data: dict) -> int | None:
                 logger.warning("Unable to extract year from date; returning None")
     logger.warning("Unable to get year from Rxiv data; returning None")
     return None
+
+
+@register_metadata_lookup(Publication)
+def look_up_publication(publication: Publication) -> bool:
+    """Fills in a publication's title, author, and year from PubMed or bioRxiv/medRxiv.
+
+    Returns:
+        Whether the publication was found.
+    """
+    if publication.publication_type == PublicationTypes.PUBMED:
+        article = fetch_pubmed_data(publication.pubmed_id or "")
+        if not article:
+            return False
+        publication.author = get_pubmed_author(article)
+        publication.title = get_pubmed_title(article)
+        publication.publication_year = get_pubmed_year(article)
+        return True
+    rxiv_data = fetch_rxiv_data(publication.publication_type, publication.doi or "")
+    if not rxiv_data:
+        return False
+    publication.author = get_rxiv_author(rxiv_data)
+    publication.title = get_rxiv_title(rxiv_data)
+    publication.publication_year = get_rxiv_year(rxiv_data)
+    return True
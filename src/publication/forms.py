@@ -1,6 +1,8 @@
 from django import forms
+from django.core.exceptions import ValidationError
 from django.forms import ModelForm
 
+from publication.importer import MAX_IDENTIFIERS, parse_identifiers
 from publication.models import Publication
 
 
@@ -11,3 +13,40 @@ class PublicationForm(ModelForm):
         widgets = {
             "publication_type": forms.RadioSelect(),
         }
+
+
+class PublicationImportForm(forms.Form):
+    identifiers = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={"class": "textarea", "rows": 8}),
+        label="PubMed IDs and DOIs",
+        help_text=(
+            "PubMed IDs and bioRxiv/medRxiv DOIs, separated by spaces, commas, or new "
+            "lines."
+        ),
+    )
+    file = forms.FileField(
+        required=False,
+        label="File",
+        help_text="Or a text or CSV file of them.",
+    )
+
+    def clean(self) -> dict:
+        cleaned_data = super().clean()
+        text = cleaned_data.get("identifiers", "")
+        upload = cleaned_data.get("file")
+        if upload is not None:
+            try:
+                text += "\n" + upload.read().decode("utf-8-sig")
+            except UnicodeDecodeError:
+                self.add_error("file", "The file has to be UTF-8 text.")
+                return cleaned_data
+        identifiers = parse_identifiers(text)
+        if not identifiers:
+            msg = "Enter or upload at least one PubMed ID or DOI."
+            raise ValidationError(msg)
+        if len(identifiers) > MAX_IDENTIFIERS:
+            msg = f"Import at most {MAX_IDENTIFIERS} publications at once."
+            raise ValidationError(msg)
+        cleaned_data["text"] = text
+        return cleaned_data
@@ -0,0 +1,230 @@
+"""Houses the bulk importer that adds many publications at once.
+
+A literature review can cite hundreds of papers, and adding them one form submission at
+a time means one PubMed or bioRxiv/medRxiv lookup and several writes each. The importer
+takes a list of PubMed IDs and DOIs, fetches the PubMed records a batch of up to 200 per
+request, and creates the publications, their history records, and their search
+documents with a few bulk queries. The lookups can take minutes, so the import page runs
+it as a job (see `publication/jobs.py`).
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+
+from common.search import index_objects
+from common.signals import bulk_writes
+from common.slugs import assign_slugs
+from publication.clients import (
+    fetch_pubmed_articles,
+    fetch_rxiv_data,
+    get_rxiv_author,
+    get_rxiv_title,
+    get_rxiv_year,
+)
+from publication.constants.models import PublicationTypes
+from publication.models import Publication
+
+PUBMED_ID_RE = re.compile(r"(?:PMID:)?(\d{1,16})", re.IGNORECASE)
+DOI_RE = re.compile(r"(?:doi:|https?://(?:dx\.)?doi\.org/)?(10\.\d{4,9}/\S+)", re.I)
+SEPARATOR_RE = re.compile(r"[\s,;]+")
+
+# The most identifiers imported at once.
+MAX_IDENTIFIERS = 1000
+
+BATCH_SIZE = 500
+
+TITLE_LENGTH = Publication._meta.get_field("title").max_length  # noqa: SLF001
+AUTHOR_LENGTH = Publication._meta.get_field("author").max_length  # noqa: SLF001
+
+
+@dataclass
+class Identifiers:
+    """The PubMed IDs and DOIs in a list, and the entries that are neither."""
+
+    pubmed_ids: list[str] = field(default_factory=list)
+    dois: list[str] = field(default_factory=list)
+    invalid: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.pubmed_ids) + len(self.dois)
+
+
+@dataclass
+class ImportResult:
+    """What happened to each identifier in an import."""
+
+    created: list[Publication] = field(default_factory=list)
+    existing: list[str] = field(default_factory=list)
+    not_found: list[str] = field(default_factory=list)
+    invalid: list[str] = field(default_factory=list)
+
+    def get_message(self) -> str:
+        """Returns a message about the publications added and the entries skipped."""
+        parts = [f"{len(self.created)} publications added."]
+        for label, identifiers in [
+            ("Already added", self.existing),
+            ("Unable to find", self.not_found),
+            ("Not PubMed IDs or DOIs", self.invalid),
+        ]:
+            if identifiers:
+                parts.append(f"{label}: {', '.join(identifiers)}.")
+        return " ".join(parts)
+
+
+def parse_identifiers(text: str) -> Identifiers:
+    """Splits a list of PubMed IDs and DOIs, e.g., "PMID:11910336, 10.1101/123456".
+
+    The entries can be separated by whitespace, commas, or semicolons. DOIs can be
+    given as "doi:" names or doi.org URLs, and repeated entries are dropped.
+
+    Returns:
+        The PubMed IDs, DOIs, and unrecognized entries, each in the order given.
+    """
+    # Keep a "PMID: 123" together.
+    text = re.sub(r"PMID:\s+", "PMID:", text, flags=re.IGNORECASE)
+    identifiers = Identifiers()
+    for entry in SEPARATOR_RE.split(text.strip()):
+        if not entry:
+            continue
+        if match := PUBMED_ID_RE.fullmatch(entry):
+            identifiers.pubmed_ids.append(match.group(1))
+        elif match := DOI_RE.fullmatch(entry):
+            identifiers.dois.append(match.group(1))
+        else:
+            identifiers.invalid.append(entry)
+    identifiers.pubmed_ids = list(dict.fromkeys(identifiers.pubmed_ids))
+    identifiers.dois = list(dict.fromkeys(identifiers.dois))
+    identifiers.invalid = list(dict.fromkeys(identifiers.invalid))
+    return identifiers
+
+
+def _get_rxiv_publication(doi: str) -> Publication | None:
+    """Looks a DOI up in bioRxiv, then medRxiv.
+
+    Returns:
+        An unsaved publication for the preprint's most recent version, or None if
+        neither server has it.
+    """
+    for publication_type in [PublicationTypes.BIORXIV, PublicationTypes.MEDRXIV]:
+        data = fetch_rxiv_data(publication_type, doi)
+        if not data or not data.get("collection"):
+            continue
+        return Publication(
+            publication_type=publication_type,
+            doi=doi,
+            title=get_rxiv_title(data)[:TITLE_LENGTH],
+            author=get_rxiv_author(data)[:AUTHOR_LENGTH],
+            publication_year=get_rxiv_year(data),
+        )
+    return None
+
+
+def create_publications(
+    publications: Iterable[Publication], added_by: User | None = None
+) -> list[Publication]:
+    """Bulk creates publications with slugs, "created" history, and search documents.
+
+    A publication whose PubMed ID or DOI was added since the caller checked, e.g., by
+    an import running alongside, is skipped rather than failing the rest.
+
+    Returns:
+        The created publications.
+    """
+    publications = list(publications)
+    if not publications:
+        return []
+    for publication in publications:
+        publication.added_by = added_by
+    with bulk_writes():
+        assign_slugs(publications)
+        Publication.objects.bulk_create(
+            publications, batch_size=BATCH_SIZE, ignore_conflicts=True
+        )
+        # The primary keys were allocated up front, so the rows that made it in are
+        # the ones with them.
+        inserted = set(
+            Publication.objects.filter(
+                pk__in=[publication.pk for publication in publications]
+            ).values_list("pk", flat=True)
+        )
+        created = [
+            publication for publication in publications if publication.pk in inserted
+        ]
+        Publication.history.bulk_history_create(  # type: ignore[attr-defined]
+            created, batch_size=BATCH_SIZE, default_user=added_by
+        )
+        index_objects(Publication, inserted)
+    return created
+
+
+def import_publications(text: str, added_by: User | None = None) -> ImportResult:
+    """Adds the publications in a list of PubMed IDs and DOIs that aren't in the HCI.
+
+    PubMed IDs are fetched in batches; DOIs are looked up in bioRxiv and medRxiv one
+    at a time, as their API has no batch lookup.
+
+    Args:
+        text: The PubMed IDs and DOIs, as `parse_identifiers` takes them.
+        added_by: The user adding the publications.
+
+    Returns:
+        The created publications and the identifiers that were skipped.
+    """
+    identifiers = parse_identifiers(text)
+    result = ImportResult(invalid=identifiers.invalid)
+    existing_pubmed_ids = set(
+        Publication.objects.filter(pubmed_id__in=identifiers.pubmed_ids).values_list(
+            "pubmed_id", flat=True
+        )
+    )
+    existing_dois = set(
+        Publication.objects.filter(doi__in=identifiers.dois).values_list(
+            "doi", flat=True
+        )
+    )
+    pubmed_ids = [
+        id_ for id_ in identifiers.pubmed_ids if id_ not in existing_pubmed_ids
+    ]
+    dois = [doi for doi in identifiers.dois if doi not in existing_dois]
+    result.existing = [
+        *(id_ for id_ in identifiers.pubmed_ids if id_ in existing_pubmed_ids),
+        *(doi for doi in identifiers.dois if doi in existing_dois),
+    ]
+
+    articles = {
+        article.pubmed_id: article for article in fetch_pubmed_articles(pubmed_ids)
+    }
+    publications = []
+    for pubmed_id in pubmed_ids:
+        article = articles.get(pubmed_id)
+        if article is None:
+            result.not_found.append(pubmed_id)
+            continue
+        publications.append(
+            Publication(
+                publication_type=PublicationTypes.PUBMED,
+                pubmed_id=pubmed_id,
+                title=article.title[:TITLE_LENGTH],
+                author=article.author[:AUTHOR_LENGTH],
+                publication_year=article.year,
+            )
+        )
+    for doi in dois:
+        publication = _get_rxiv_publication(doi)
+        if publication is None:
+            result.not_found.append(doi)
+        else:
+            publications.append(publication)
+
+    result.created = create_publications(publications, added_by)
+    if len(result.created) < len(publications):
+        created_pks = {publication.pk for publication in result.created}
+        result.existing.extend(
+            publication.pubmed_id or publication.doi or ""
+            for publication in publications
+            if publication.pk not in created_pks
+        )
+    return result
@@ -0,0 +1,23 @@
+"""Houses the publication app's tasks."""
+
+from django.urls import reverse
+
+from job.models import Job
+from job.registry import register_task
+from publication.importer import import_publications
+
+IMPORT_TASK = "publication.import"
+
+
+@register_task(IMPORT_TASK)
+def import_publications_task(job: Job, text: str) -> dict[str, str]:
+    """Adds the publications in a list of PubMed IDs and DOIs, as the import page asks.
+
+    Identifiers already in the HCI are skipped, so running it again adds only what the
+    earlier run didn't.
+
+    Returns:
+        The publication list's URL and a message about what was added and skipped.
+    """
+    result = import_publications(text, job.added_by)
+    return {"url": reverse("publication-list"), "message": result.get_message()}
@@ -0,0 +1,48 @@
+"""Provides a command for adding many publications at once."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from publication.importer import import_publications
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds the publications for a list of PubMed IDs and bioRxiv/medRxiv DOIs, "
+        "skipping those already added."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("identifiers", nargs="*", help="PubMed IDs and DOIs.")
+        parser.add_argument(
+            "--file", type=Path, help="Also add the PubMed IDs and DOIs in this file."
+        )
+        parser.add_argument(
+            "--user", help="The username of the user to record as adding them."
+        )
+
+    def handle(self, *args, **options) -> None:  # noqa: ARG002
+        text = "\n".join(options["identifiers"])
+        if options["file"] is not None:
+            text += "\n" + options["file"].read_text(encoding="utf-8-sig")
+        added_by = None
+        if options["user"] is not None:
+            added_by = User.objects.filter(username=options["user"]).first()
+            if added_by is None:
+                msg = f"There's no user named {options['user']}."
+                raise CommandError(msg)
+
+        result = import_publications(text, added_by)
+        for label, identifiers in [
+            ("Already added", result.existing),
+            ("Unable to find", result.not_found),
+            ("Not PubMed IDs or DOIs", result.invalid),
+        ]:
+            if identifiers:
+                self.stderr.write(f"{label}: {', '.join(identifiers)}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Added {len(result.created)} publications.")
+        )
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.6 on 2026-10-18 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("publication", "0003_historicalpublication"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="publication",
+            name="metadata_status",
+            field=models.CharField(
+                choices=[("PEN", "Pending"), ("FAI", "Failed"), ("DON", "Done")],
+                default="DON",
+                editable=False,
+                help_text="Whether the publication's details have been fetched.",
+                max_length=3,
+                verbose_name="Metadata Status",
+            ),
+        ),
+    ]
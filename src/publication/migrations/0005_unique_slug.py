@@ -0,0 +1,34 @@
+# Generated by Django 6.0.6 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+def backfill_slugs(apps, schema_editor):
+    # Existing slugs are kept; only objects whose second save never happened lack one.
+    Publication = apps.get_model("publication", "Publication")
+    objs = list(Publication.objects.filter(slug="").only("pk"))
+    for obj in objs:
+        obj.slug = f"P{obj.pk:06d}"
+    Publication.objects.bulk_update(objs, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("publication", "0004_publication_metadata_status"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="publication",
+            name="slug",
+            field=models.SlugField(
+                default="",
+                help_text="The human-readable ID for the object.",
+                max_length=7,
+                unique=True,
+                verbose_name="Human-Readable ID",
+            ),
+        ),
+    ]
@@ -1,9 +1,13 @@
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.http import HttpResponseBase
 from django.urls import reverse
-from simple_history.models import HistoricalRecords
 
+from common.constants.models import METADATA_STATUS_CHOICES, MetadataStatus
+from common.history import ChangedHistoricalRecords
+from common.models import SearchDocument
+from common.slugs import SlugMixin
 from publication.constants.models import PUBLICATION_TYPE_CHOICES, PublicationTypes
 from publication.validators.models import (
     validate_publication_type_biorxiv,
@@ -12,10 +16,14 @@ from publication.validators.models import (
 )
 
 
-class Publication(models.Model):
+class Publication(SlugMixin, models.Model):
+    slug_prefix = "P"
+    search_fields = ["slug", "title", "author", "doi", "pubmed_id"]
+
     slug = models.SlugField(
         default="",
         max_length=7,
+        unique=True,
         verbose_name="Human-Readable ID",
         help_text="The human-readable ID for the object.",
     )
@@ -86,7 +94,16 @@ class Publication(models.Model):
         verbose_name="Updated At",
         help_text="When the publication was last updated.",
     )
-    history = HistoricalRecords()
+    metadata_status = models.CharField(
+        choices=METADATA_STATUS_CHOICES,
+        default=MetadataStatus.DONE,
+        editable=False,
+        max_length=3,
+        verbose_name="Metadata Status",
+        help_text="Whether the publication's details have been fetched.",
+    )
+    search_documents = GenericRelation(SearchDocument)
+    history = ChangedHistoricalRecords(excluded_fields=["metadata_status"])
 
     class Meta:
         db_table = "publication"
@@ -98,12 +115,6 @@ class Publication(models.Model):
         identifier = f"PMID:{self.pubmed_id}" if self.pubmed_id else self.doi
         return f"{title} ({identifier})."
 
-    def save(self, *args, **kwargs) -> None:
-        super().save(*args, **kwargs)
-        if not self.slug:
-            self.slug = f"P{self.pk:06d}"
-            self.save(update_fields=["slug"])
-
     def get_absolute_url(self) -> HttpResponseBase | str | None:
         return reverse("publication-detail", kwargs={"slug": self.slug})
 
@@ -0,0 +1,132 @@
+"""Houses the streaming parser for PubMed E-utilities `efetch` XML.
+
+The response bytes are fed straight to `lxml`'s `iterparse`, and each `PubmedArticle`
+element is read with precompiled XPath expressions as soon as its end tag is parsed and
+then discarded, so parsing a response takes one pass over it and as much memory as its
+largest article, however many articles it holds.
+"""
+
+import io
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from lxml import etree
+
+YEAR_RE = re.compile(r"\d{4}")
+
+# Each expression is evaluated against a `PubmedArticle` element.
+PUBMED_ID_XPATH = etree.XPath("string(MedlineCitation/PMID)")
+TITLE_XPATH = etree.XPath("MedlineCitation/Article/ArticleTitle")
+AUTHORS_XPATH = etree.XPath("MedlineCitation/Article/AuthorList/Author")
+# Real records nest the date in the journal issue, but any `PubDate` will do.
+PUB_DATE_XPATH = etree.XPath("(.//PubDate)[1]")
+JOURNAL_XPATH = etree.XPath(
+    "string(MedlineCitation/Article/Journal/Title"
+    " | MedlineCitation/MedlineJournalInfo/MedlineTA)"
+)
+DOI_XPATH = etree.XPath(
+    "PubmedData/ArticleIdList/ArticleId[@IdType='doi']/text()"
+    " | MedlineCitation/Article/ELocationID[@EIdType='doi']/text()"
+)
+MESH_TERMS_XPATH = etree.XPath(
+    "MedlineCitation/MeshHeadingList/MeshHeading/DescriptorName/text()"
+)
+
+
+@dataclass(frozen=True)
+class PubMedArticle:
+    """The parts of a PubMed record the HCI uses."""
+
+    pubmed_id: str
+    title: str
+    # The surname of the first author, as `Publication.author` holds it.
+    author: str
+    year: int | None
+    # Each author's surname and initials, e.g., "Oak P", or a group's name.
+    authors: tuple[str, ...] = ()
+    journal: str = ""
+    doi: str = ""
+    mesh_terms: tuple[str, ...] = ()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _text(element: etree._Element | None) -> str:
+    if element is None:
+        return ""
+    # Titles can contain markup, e.g., <i>HLA-B</i>.
+    return _normalize("".join(element.itertext()))
+
+
+def _get_author_name(author: etree._Element) -> str:
+    collective_name = author.findtext("CollectiveName")
+    if collective_name:
+        return _normalize(collective_name)
+    parts = [author.findtext("LastName"), author.findtext("Initials")]
+    return _normalize(" ".join(part for part in parts if part))
+
+
+def _get_year(article: etree._Element) -> int | None:
+    pub_dates = PUB_DATE_XPATH(article)
+    if not pub_dates:
+        return None
+    # Some dates are free text, e.g., <MedlineDate>1998 Dec-1999 Jan</MedlineDate>.
+    pub_date = pub_dates[0]
+    match = YEAR_RE.search(_text(pub_date.find("Year")) or _text(pub_date))
+    return int(match.group()) if match else None
+
+
+def parse_pubmed_article(article: etree._Element) -> PubMedArticle:
+    """Reads the parts the HCI uses from a `PubmedArticle` element.
+
+    Returns:
+        The article.
+    """
+    titles = TITLE_XPATH(article)
+    authors = AUTHORS_XPATH(article)
+    first_author = ""
+    if authors:
+        first_author = _normalize(
+            authors[0].findtext("LastName")
+            or authors[0].findtext("CollectiveName")
+            or ""
+        )
+    dois = DOI_XPATH(article)
+    return PubMedArticle(
+        pubmed_id=_normalize(PUBMED_ID_XPATH(article)),
+        title=_text(titles[0]) if titles else "",
+        author=first_author,
+        year=_get_year(article),
+        authors=tuple(filter(None, map(_get_author_name, authors))),
+        journal=_normalize(JOURNAL_XPATH(article)),
+        doi=_normalize(dois[0]) if dois else "",
+        mesh_terms=tuple(_normalize(term) for term in MESH_TERMS_XPATH(article)),
+    )
+
+
+def iter_pubmed_articles(content: bytes) -> Iterator[PubMedArticle]:
+    """Parses the articles in an `efetch` response one at a time.
+
+    Each `PubmedArticle` element is discarded once it's parsed, so a response with
+    hundreds of articles takes no more memory than one with a single article.
+
+    Args:
+        content: The XML of a `PubmedArticleSet`, undecoded.
+
+    Yields:
+        The articles, in the order they appear.
+    """
+    for _, article in etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        tag="PubmedArticle",
+        resolve_entities=False,
+        no_network=True,
+    ):
+        yield parse_pubmed_article(article)
+        article.clear(keep_tail=True)
+        while article.getprevious() is not None:
+            del article.getparent()[0]
@@ -8,6 +8,9 @@ hitting external APIs during regular test runs.
 To run these tests, set the environment variable RUN_CONTRACT_TESTS=1:
     RUN_CONTRACT_TESTS=1 just test-all
 
+They're database test cases because lookups go through the upstream cache, which
+is stored in the database.
+
 When you run these tests, you might see DEBUG logs, depending on how you've configured
 your logger. If you don't want the DEBUG logs, set the logger to the WARNING level.
 """
@@ -15,6 +18,8 @@ your logger. If you don't want the DEBUG logs, set the logger to the WARNING lev
 import os
 import unittest
 
+from django.test import TestCase
+
 from publication.clients import (
     fetch_pubmed_data,
     fetch_rxiv_data,
@@ -96,22 +101,22 @@ MEDRXIV_TEST_CASES = [
 
 
 @unittest.skipIf(SKIP_CONTRACT_TESTS, SKIP_REASON)
-class PubMedContractTest(unittest.TestCase):
-    def test_fetch_pubmed_data_returns_soup(self) -> None:
+class PubMedContractTest(TestCase):
+    def test_fetch_pubmed_data_returns_article(self) -> None:
         for test_case in PUBMED_TEST_CASES:
             with self.subTest(pubmed_id=test_case["pubmed_id"]):
-                soup = fetch_pubmed_data(test_case["pubmed_id"])
+                article = fetch_pubmed_data(test_case["pubmed_id"])
                 self.assertIsNotNone(
-                    soup,
+                    article,
                     f"Failed to fetch data for PubMed ID {test_case['pubmed_id']}",
                 )
 
     def test_get_pubmed_title_extracts_title(self) -> None:
         for test_case in PUBMED_TEST_CASES:
             with self.subTest(pubmed_id=test_case["pubmed_id"]):
-                soup = fetch_pubmed_data(test_case["pubmed_id"])
-                self.assertIsNotNone(soup)
-                title = get_pubmed_title(soup)  # type: ignore[arg-type]
+                article = fetch_pubmed_data(test_case["pubmed_id"])
+                self.assertIsNotNone(article)
+                title = get_pubmed_title(article)  # type: ignore[arg-type]
                 self.assertIn(
                     test_case["expected_title"],
                     title,
@@ -121,9 +126,9 @@ class PubMedContractTest(unittest.TestCase):
     def test_get_pubmed_author_extracts_author(self) -> None:
         for test_case in PUBMED_TEST_CASES:
             with self.subTest(pubmed_id=test_case["pubmed_id"]):
-                soup = fetch_pubmed_data(test_case["pubmed_id"])
-                self.assertIsNotNone(soup)
-                author = get_pubmed_author(soup)  # type: ignore[arg-type]
+                article = fetch_pubmed_data(test_case["pubmed_id"])
+                self.assertIsNotNone(article)
+                author = get_pubmed_author(article)  # type: ignore[arg-type]
                 self.assertEqual(
                     test_case["expected_author"],
                     author,
@@ -133,9 +138,9 @@ class PubMedContractTest(unittest.TestCase):
     def test_get_pubmed_year_extracts_year(self) -> None:
         for test_case in PUBMED_TEST_CASES:
             with self.subTest(pubmed_id=test_case["pubmed_id"]):
-                soup = fetch_pubmed_data(test_case["pubmed_id"])
-                self.assertIsNotNone(soup)
-                year = get_pubmed_year(soup)  # type: ignore[arg-type]
+                article = fetch_pubmed_data(test_case["pubmed_id"])
+                self.assertIsNotNone(article)
+                year = get_pubmed_year(article)  # type: ignore[arg-type]
                 self.assertEqual(
                     test_case["expected_year"],
                     year,
@@ -144,7 +149,7 @@ class PubMedContractTest(unittest.TestCase):
 
 
 @unittest.skipIf(SKIP_CONTRACT_TESTS, SKIP_REASON)
-class BioRxivContractTest(unittest.TestCase):
+class BioRxivContractTest(TestCase):
     def test_fetch_rxiv_data_returns_dict(self) -> None:
         for test_case in BIORXIV_TEST_CASES:
             with self.subTest(doi=test_case["doi"]):
@@ -194,7 +199,7 @@ class BioRxivContractTest(unittest.TestCase):
 
 
 @unittest.skipIf(SKIP_CONTRACT_TESTS, SKIP_REASON)
-class MedRxivContractTest(unittest.TestCase):
+class MedRxivContractTest(TestCase):
     def test_fetch_rxiv_data_returns_dict(self) -> None:
         for test_case in MEDRXIV_TEST_CASES:
             with self.subTest(doi=test_case["doi"]):
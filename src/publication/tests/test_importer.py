@@ -0,0 +1,197 @@
+"""Houses tests for the bulk publication importer and the PubMed parser."""
+
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from publication.clients import PUBMED_BATCH_SIZE, fetch_pubmed_articles
+from publication.importer import import_publications, parse_identifiers
+from publication.models import Publication
+from publication.pubmed import PubMedArticle, iter_pubmed_articles
+
+PUBMED_XML = b"""<?xml version="1.0" ?>
+<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2025//EN" "https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_250101.dtd">
+<PubmedArticleSet>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID Version="1">111</PMID>
+      <Article>
+        <Journal>
+          <JournalIssue>
+            <PubDate><Year>1999</Year><Month>Jan</Month></PubDate>
+          </JournalIssue>
+          <Title>Journal of Pok\xc3\xa9mon Immunology</Title>
+        </Journal>
+        <ArticleTitle>Alleles of <i>HLA-B</i> in Pok\xc3\xa9mon</ArticleTitle>
+        <AuthorList>
+          <Author><LastName>Oak</LastName><Initials>S</Initials></Author>
+          <Author><LastName>Birch</LastName><Initials>P</Initials></Author>
+          <Author><CollectiveName>Pallet Town Lab</CollectiveName></Author>
+        </AuthorList>
+      </Article>
+      <MeshHeadingList>
+        <MeshHeading><DescriptorName>HLA-B Antigens</DescriptorName></MeshHeading>
+        <MeshHeading><DescriptorName>Alleles</DescriptorName></MeshHeading>
+      </MeshHeadingList>
+    </MedlineCitation>
+    <PubmedData>
+      <ArticleIdList>
+        <ArticleId IdType="pubmed">111</ArticleId>
+        <ArticleId IdType="doi">10.1000/111</ArticleId>
+      </ArticleIdList>
+    </PubmedData>
+  </PubmedArticle>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID Version="1">222</PMID>
+      <Article>
+        <Journal>
+          <JournalIssue>
+            <PubDate><MedlineDate>1998 Dec-1999 Jan</MedlineDate></PubDate>
+          </JournalIssue>
+        </Journal>
+        <ArticleTitle>Haplotypes in the Johto region</ArticleTitle>
+        <AuthorList>
+          <Author><LastName>Elm</LastName></Author>
+        </AuthorList>
+      </Article>
+    </MedlineCitation>
+  </PubmedArticle>
+</PubmedArticleSet>
+"""
+
+ARTICLES = [
+    PubMedArticle("111", "Alleles of HLA-B in Pokémon", "Oak", 1999),
+    PubMedArticle("222", "Haplotypes in the Johto region", "Elm", 1998),
+]
+
+
+class PubMedParserTest(SimpleTestCase):
+    def test_parses_each_article(self):
+        oak, elm = iter_pubmed_articles(PUBMED_XML)
+        self.assertEqual(
+            oak,
+            PubMedArticle(
+                "111",
+                "Alleles of HLA-B in Pokémon",
+                "Oak",
+                1999,
+                authors=("Oak S", "Birch P", "Pallet Town Lab"),
+                journal="Journal of Pokémon Immunology",
+                doi="10.1000/111",
+                mesh_terms=("HLA-B Antigens", "Alleles"),
+            ),
+        )
+        self.assertEqual(
+            elm,
+            PubMedArticle(
+                "222", "Haplotypes in the Johto region", "Elm", 1998, authors=("Elm",)
+            ),
+        )
+
+    def test_parses_a_collective_first_author(self):
+        content = PUBMED_XML.replace(
+            b"<LastName>Oak</LastName><Initials>S</Initials>",
+            b"<CollectiveName>HLA Group</CollectiveName>",
+        )
+        self.assertEqual(next(iter_pubmed_articles(content)).author, "HLA Group")
+
+    def test_parses_an_empty_set(self):
+        self.assertEqual(list(iter_pubmed_articles(b"<PubmedArticleSet/>")), [])
+
+
+class FetchPubMedArticlesTest(SimpleTestCase):
+    @patch("publication.clients.time.sleep")
+    @patch("publication.clients.fetch")
+    def test_fetches_ids_in_batches(self, mock_fetch: MagicMock, _: MagicMock):
+        mock_fetch.return_value.content = PUBMED_XML
+        ids = [str(i) for i in range(PUBMED_BATCH_SIZE * 2 + 1)]
+        articles = list(fetch_pubmed_articles(ids))
+        self.assertEqual(mock_fetch.call_count, 3)
+        first_url = mock_fetch.call_args_list[0].args[1]
+        self.assertTrue(first_url.endswith(f"&id={','.join(ids[:PUBMED_BATCH_SIZE])}"))
+        self.assertEqual(len(articles), 6)
+
+    @patch("publication.clients.time.sleep")
+    @patch("publication.clients.fetch")
+    def test_skips_batches_that_fail(self, mock_fetch: MagicMock, _: MagicMock):
+        mock_fetch.return_value.content = b"<PubmedArticleSet>"
+        with self.assertLogs("publication.clients", "ERROR"):
+            self.assertEqual(list(fetch_pubmed_articles(["111"])), [])
+
+
+class ParseIdentifiersTest(SimpleTestCase):
+    def test_splits_pubmed_ids_and_dois(self):
+        identifiers = parse_identifiers(
+            "PMID: 111, 222;https://doi.org/10.1101/2020.01.01.123456\n"
+            "doi:10.1101/2021.02.02.654321 pokemon 111"
+        )
+        self.assertEqual(identifiers.pubmed_ids, ["111", "222"])
+        self.assertEqual(
+            identifiers.dois, ["10.1101/2020.01.01.123456", "10.1101/2021.02.02.654321"]
+        )
+        self.assertEqual(identifiers.invalid, ["pokemon"])
+        self.assertEqual(len(identifiers), 4)
+
+
+@patch("publication.importer.fetch_rxiv_data")
+@patch("publication.importer.fetch_pubmed_articles")
+class ImportPublicationsTest(TestCase):
+    fixtures = ["test_publications.json"]
+
+    def test_creates_publications_in_bulk(
+        self, mock_fetch_pubmed: MagicMock, mock_fetch_rxiv: MagicMock
+    ):
+        mock_fetch_pubmed.return_value = ARTICLES
+        mock_fetch_rxiv.side_effect = lambda publication_type, doi: (  # noqa: ARG005
+            {} if publication_type == "BIO" else {"collection": [{"title": "Preprint"}]}
+        )
+        result = import_publications("111 222 333 123 10.1101/789 bad")
+
+        mock_fetch_pubmed.assert_called_once_with(["111", "222", "333"])
+        self.assertEqual(result.existing, ["123"])
+        self.assertEqual(result.not_found, ["333"])
+        self.assertEqual(result.invalid, ["bad"])
+        oak = Publication.objects.get(pubmed_id="111")
+        self.assertEqual(oak.slug, f"P{oak.pk:06d}")
+        self.assertEqual(
+            (oak.title, oak.author, oak.publication_year),
+            ("Alleles of HLA-B in Pokémon", "Oak", 1999),
+        )
+        self.assertEqual(oak.history.get().history_type, "+")
+        preprint = Publication.objects.get(doi="10.1101/789")
+        self.assertEqual(
+            (preprint.publication_type, preprint.title), ("MED", "Preprint")
+        )
+        self.assertTrue(oak.search_documents.exists())
+
+    def test_skips_publications_added_while_importing(
+        self, mock_fetch_pubmed: MagicMock, mock_fetch_rxiv: MagicMock
+    ):
+        def fetch_while_another_import_adds_one(pubmed_ids: list[str]) -> list:  # noqa: ARG001
+            Publication.objects.create(pubmed_id="111", title="Added meanwhile")
+            return ARTICLES
+
+        mock_fetch_pubmed.side_effect = fetch_while_another_import_adds_one
+        mock_fetch_rxiv.return_value = None
+        result = import_publications("111 222")
+        self.assertEqual([p.pubmed_id for p in result.created], ["222"])
+        self.assertEqual(result.existing, ["111"])
+        self.assertEqual(
+            Publication.objects.get(pubmed_id="111").title, "Added meanwhile"
+        )
+        self.assertEqual(
+            result.get_message(), "1 publications added. Already added: 111."
+        )
+
+    def test_command_reports_skipped_identifiers(
+        self, mock_fetch_pubmed: MagicMock, mock_fetch_rxiv: MagicMock
+    ):
+        mock_fetch_pubmed.return_value = ARTICLES[:1]
+        mock_fetch_rxiv.return_value = None
+        out, err = StringIO(), StringIO()
+        call_command("import_publications", "111", "123", stdout=out, stderr=err)
+        self.assertIn("Added 1 publications.", out.getvalue())
+        self.assertIn("Already added: 123", err.getvalue())
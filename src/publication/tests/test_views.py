@@ -1,13 +1,18 @@
 from unittest.mock import MagicMock, patch
 
-from bs4 import BeautifulSoup
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from common.tests import ProtectedViewTestMixin
+from job.models import Job
+from job.worker import run_worker
+from publication.jobs import IMPORT_TASK
 from publication.models import Publication
+from publication.pubmed import PubMedArticle, iter_pubmed_articles
 
 
+@override_settings(JOBS_RUN_INLINE=True)
 class PublicationCreateTest(ProtectedViewTestMixin, TestCase):
     url = reverse("publication-create")
     template = "publication/create.html"
@@ -27,7 +32,7 @@ class PublicationCreateTest(ProtectedViewTestMixin, TestCase):
         super().setUp()
         self.client.force_login(self.user4_yes_phi_yes_perms)
 
-    @patch("publication.views.fetch_pubmed_data")
+    @patch("publication.clients.fetch_pubmed_data")
     def test_creates_pubmed_publication_with_valid_form_data(
         self, mock_fetch_pubmed_data: MagicMock
     ):
@@ -55,8 +60,11 @@ class PublicationCreateTest(ProtectedViewTestMixin, TestCase):
   </PubmedArticle>
 </PubmedArticleSet>
         """
-        mock_fetch_pubmed_data.return_value = BeautifulSoup(mock_pubmed_response, "xml")
-        response = self.client.post(self.url, data)
+        mock_fetch_pubmed_data.return_value = next(
+            iter_pubmed_articles(mock_pubmed_response.encode())
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data)
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Publication.objects.count(), initial_publication_count + 1)
         new_publication = Publication.objects.first()
@@ -68,7 +76,7 @@ class PublicationCreateTest(ProtectedViewTestMixin, TestCase):
         self.assertEqual(new_publication.title, "Common diseases in Pokémon")
         self.assertEqual(new_publication.publication_year, 1999)
 
-    @patch("publication.views.fetch_rxiv_data")
+    @patch("publication.clients.fetch_rxiv_data")
     def test_creates_biorxiv_publication_with_valid_form_data(
         self, mock_fetch_rxiv_data: MagicMock
     ):
@@ -83,7 +91,8 @@ class PublicationCreateTest(ProtectedViewTestMixin, TestCase):
                 }
             ]
         }
-        response = self.client.post(self.url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data)
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Publication.objects.count(), initial_publication_count + 1)
         new_publication = Publication.objects.first()
@@ -95,7 +104,7 @@ class PublicationCreateTest(ProtectedViewTestMixin, TestCase):
         self.assertEqual(new_publication.title, "Common diseases in Pokémon")
         self.assertEqual(new_publication.publication_year, 2020)
 
-    @patch("publication.views.fetch_rxiv_data")
+    @patch("publication.clients.fetch_rxiv_data")
     def test_creates_medrxiv_publication_with_valid_form_data(
         self, mock_fetch_rxiv_data: MagicMock
     ):
@@ -110,7 +119,8 @@ class PublicationCreateTest(ProtectedViewTestMixin, TestCase):
                 }
             ]
         }
-        response = self.client.post(self.url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data)
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Publication.objects.count(), initial_publication_count + 1)
         new_publication = Publication.objects.first()
@@ -136,6 +146,51 @@ class PublicationCreateTest(ProtectedViewTestMixin, TestCase):
         self.assertEqual(Publication.objects.count(), initial_publication_count)
 
 
+class PublicationImportTest(ProtectedViewTestMixin, TestCase):
+    url = reverse("publication-import")
+    template = "publication/import.html"
+    page_name = "Import Publications"
+    expected_text = ["Import Publications", "PubMed IDs and DOIs", "File", "Import"]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user4_yes_phi_yes_perms)
+
+    @patch("publication.importer.fetch_pubmed_articles")
+    def test_imports_pasted_and_uploaded_identifiers(
+        self, mock_fetch_pubmed_articles: MagicMock
+    ):
+        mock_fetch_pubmed_articles.return_value = [
+            PubMedArticle("111", "Common diseases in Pokémon", "Oak", 1999),
+            PubMedArticle("222", "Rare diseases in Pokémon", "Birch", 2001),
+        ]
+        upload = SimpleUploadedFile("ids.csv", b"222\n")
+        response = self.client.post(self.url, {"identifiers": "111", "file": upload})
+        job = Job.objects.get(task=IMPORT_TASK)
+        self.assertRedirects(response, job.get_absolute_url())
+        self.assertFalse(Publication.objects.exists())
+        run_worker(burst=True)
+        mock_fetch_pubmed_articles.assert_called_once_with(["111", "222"])
+        publications = Publication.objects.order_by("pubmed_id")
+        self.assertEqual([p.author for p in publications], ["Oak", "Birch"])
+        self.assertEqual(
+            {p.added_by for p in publications}, {self.user4_yes_phi_yes_perms}
+        )
+        response = self.client.get(job.get_absolute_url(), follow=True)
+        self.assertRedirects(response, reverse("publication-list"))
+        self.assertContains(response, "2 publications added.")
+
+    def test_double_submits_share_one_import(self):
+        self.client.post(self.url, {"identifiers": "111"})
+        self.client.post(self.url, {"identifiers": "111"})
+        self.assertEqual(Job.objects.filter(task=IMPORT_TASK).count(), 1)
+
+    def test_requires_an_identifier(self):
+        response = self.client.post(self.url, {"identifiers": "pokemon"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Enter or upload at least one PubMed ID or DOI.")
+
+
 class PublicationDetailTest(ProtectedViewTestMixin, TestCase):
     fixtures = ["test_publications.json"]
     url = reverse("publication-detail", kwargs={"slug": "P000001"})
@@ -5,11 +5,17 @@ from publication.views import PublicationList
 
 urlpatterns = [
     path("create", views.PublicationCreate.as_view(), name="publication-create"),
+    path("import", views.PublicationImport.as_view(), name="publication-import"),
     path(
         "<slug:slug>/detail",
         views.PublicationDetail.as_view(),
         name="publication-detail",
     ),
+    path(
+        "<slug:slug>/metadata",
+        views.PublicationMetadata.as_view(),
+        name="publication-metadata",
+    ),
     path(
         "<slug:slug>/history",
         views.PublicationHistory.as_view(),
@@ -1,29 +1,23 @@
+import hashlib
 from typing import cast
 
 from django.contrib import messages
+from django.contrib.auth.models import User
 from django.http import HttpResponse
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
 from django.views.generic import DetailView
-from django.views.generic.edit import CreateView
+from django.views.generic.edit import CreateView, FormView
 from django_tables2 import RequestConfig
 
 from auth_.permissions import ProtectedViewMixin
+from common.constants.models import MetadataStatus
 from common.history import resolve_changes
+from common.metadata import request_metadata
 from common.tables import HistoryTable
-from common.views import SearchListView
-from publication.clients import (
-    fetch_pubmed_data,
-    fetch_rxiv_data,
-    get_pubmed_author,
-    get_pubmed_title,
-    get_pubmed_year,
-    get_rxiv_author,
-    get_rxiv_title,
-    get_rxiv_year,
-)
-from publication.constants.models import PublicationTypes
-from publication.forms import PublicationForm
+from common.views import MetadataContextMixin, MetadataStatusView, SearchListView
+from job.queue import enqueue
+from publication.forms import PublicationForm, PublicationImportForm
+from publication.jobs import IMPORT_TASK
 from publication.models import Publication
 from publication.tables import PublicationTable
 
@@ -32,41 +26,51 @@ class PublicationCreate(ProtectedViewMixin, CreateView):
     model = Publication
     form_class = PublicationForm
     template_name = "publication/create.html"
-    success_url = reverse_lazy("publication-list")
 
     def form_valid(self, form: PublicationForm) -> HttpResponse:
-        if form.instance.publication_type == PublicationTypes.PUBMED:
-            pubmed_data = fetch_pubmed_data(form.instance.pubmed_id)
-            if pubmed_data:
-                form.instance.author = get_pubmed_author(pubmed_data)
-                form.instance.title = get_pubmed_title(pubmed_data)
-                form.instance.publication_year = get_pubmed_year(pubmed_data)
-                form.instance.added_by = self.request.user
-                messages.success(self.request, "Publication created.")
-                return super().form_valid(form)
-        elif (
-            form.instance.publication_type == PublicationTypes.BIORXIV
-            or form.instance.publication_type == PublicationTypes.MEDRXIV
-        ):
-            rxiv_data = fetch_rxiv_data(
-                form.instance.publication_type, form.instance.doi
-            )
-            if rxiv_data:
-                form.instance.author = get_rxiv_author(rxiv_data)
-                form.instance.title = get_rxiv_title(rxiv_data)
-                form.instance.publication_year = get_rxiv_year(rxiv_data)
-                form.instance.added_by = self.request.user
-                return super().form_valid(form)
-        message = (
-            "Oops, something went wrong trying to fetch data. Please try again later."
+        form.instance.added_by = self.request.user
+        form.instance.metadata_status = MetadataStatus.PENDING
+        response = super().form_valid(form)
+        request_metadata(self.object)
+        messages.success(
+            self.request, "Publication created. Its details are being fetched."
         )
-        messages.warning(self.request, message)
-        return redirect("publication-create")
+        return response
 
 
-class PublicationDetail(ProtectedViewMixin, DetailView):
+class PublicationImport(ProtectedViewMixin, FormView):
+    form_class = PublicationImportForm
+    template_name = "publication/import.html"
+
+    def form_valid(self, form: PublicationImportForm) -> HttpResponse:
+        """Queues the import, whose PubMed and preprint lookups can take minutes.
+
+        Returns:
+            Redirect to the job's progress page, which goes on to the publication list
+            once the import is done.
+        """
+        text = form.cleaned_data["text"]
+        user = cast(User, self.request.user)
+        digest = hashlib.sha256(text.encode()).hexdigest()[:32]
+        # The key makes a double submit return the same job rather than a second one.
+        job = enqueue(
+            IMPORT_TASK,
+            {"text": text},
+            key=f"import:{user.pk}:{digest}",
+            added_by=user,
+        )
+        return redirect(job)
+
+
+class PublicationDetail(ProtectedViewMixin, MetadataContextMixin, DetailView):
     model = Publication
     template_name = "publication/detail.html"
+    metadata_url_name = "publication-metadata"
+
+
+class PublicationMetadata(ProtectedViewMixin, MetadataStatusView):
+    model = Publication
+    metadata_url_name = "publication-metadata"
 
 
 class PublicationHistory(ProtectedViewMixin, DetailView):
@@ -105,5 +109,4 @@ class PublicationList(ProtectedViewMixin, SearchListView):
     template_name = "publication/list.html"
     ordering = ["-updated_at"]
     table_class = PublicationTable
-    search_fields = ["slug", "title", "author", "doi", "pubmed_id"]
     table_pagination = {"per_page": 25}
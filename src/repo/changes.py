@@ -0,0 +1,151 @@
+"""Houses code for the incremental "changed since" feed of the repository.
+
+The feed is keyed on the history ids of `PublishedCuration`'s historical records, which
+only ever increase, so a client can store the last cursor it saw and ask for just the
+changes after it.
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from curation.constants.models.common import Status
+from curation.models import Curation
+from repo.models import PublishedCuration
+from repo.serializers import serialize_published_curation
+
+
+class ChangeTypes:
+    """Defines the kinds of change the feed reports."""
+
+    PUBLISHED = "published"
+    UPDATED = "updated"
+    UNPUBLISHED = "unpublished"
+    SUPERSEDED = "superseded"
+
+
+HISTORY_CHANGE_TYPES = {
+    "+": ChangeTypes.PUBLISHED,
+    "~": ChangeTypes.UPDATED,
+    "-": ChangeTypes.UNPUBLISHED,
+}
+
+DEFAULT_PAGE_SIZE = 100
+
+MAX_PAGE_SIZE = 1000
+
+
+def _get_published_ancestors(curation_ids: set[int]) -> dict[int, list[int]]:
+    """Finds the published curations each curation was copied from, at any remove.
+
+    The ancestors are read from the curations' lineage paths, so however long the copy
+    chains are this takes two queries.
+
+    Returns:
+        The ids of the published ancestors' published curations, keyed by curation id.
+    """
+    lineage_paths = dict(
+        Curation.objects.filter(pk__in=curation_ids).values_list("pk", "lineage_path")
+    )
+    ancestor_ids = {
+        curation_id: [int(pk) for pk in lineage_path.split("/")[:-2]]
+        for curation_id, lineage_path in lineage_paths.items()
+    }
+    published_ids = dict(
+        PublishedCuration.objects.filter(
+            curation__in={pk for pks in ancestor_ids.values() for pk in pks},
+            curation__status=Status.PUBLISHED,
+        ).values_list("curation_id", "pk")
+    )
+    return {
+        curation_id: [published_ids[pk] for pk in pks if pk in published_ids]
+        for curation_id, pks in ancestor_ids.items()
+    }
+
+
+def get_changes(
+    since: int = 0, page_size: int = DEFAULT_PAGE_SIZE
+) -> tuple[list[dict[str, Any]], int, bool]:
+    """Returns the changes to the repository after a cursor.
+
+    Publishing a curation also supersedes any published curations it was copied from,
+    so each of those is reported as superseded with the same cursor as the publication.
+
+    Args:
+        since: The cursor of the last change the client has seen; 0 for everything.
+        page_size: The maximum number of historical records to report.
+
+    Returns:
+        The changes in the order they happened, the cursor to pass as `since` for the
+        next page, and whether there are more changes after this page.
+    """
+    records = list(
+        PublishedCuration.history.filter(history_id__gt=since)  # type: ignore
+        .order_by("history_id")
+        .values("history_id", "history_date", "history_type", "id", "curation_id")[
+            : page_size + 1
+        ]
+    )
+    has_more = len(records) > page_size
+    records = records[:page_size]
+    next_cursor = records[-1]["history_id"] if records else since
+
+    curation_ids = {record["curation_id"] for record in records}
+    created_curation_ids = {
+        record["curation_id"] for record in records if record["history_type"] == "+"
+    }
+    ancestors = _get_published_ancestors(created_curation_ids)
+    published_ids = {record["id"] for record in records}
+    published_ids.update(pk for ids in ancestors.values() for pk in ids)
+    published_curations = PublishedCuration.objects.for_export().in_bulk(published_ids)
+    slugs = dict(Curation.objects.filter(pk__in=curation_ids).values_list("pk", "slug"))
+    if deleted_ids := curation_ids - slugs.keys():
+        # A curation deleted after it was unpublished keeps its slug in its history.
+        slugs.update(
+            Curation.history.filter(id__in=deleted_ids)  # type: ignore[attr-defined]
+            .order_by("id", "history_id")
+            .values_list("id", "slug")
+        )
+
+    def make_change(
+        record: dict[str, Any], change_type: str, published_id: int
+    ) -> dict[str, Any]:
+        # Unpublished curations, and those unpublished since, have nothing to serialize.
+        published = published_curations.get(published_id)
+        return {
+            "cursor": record["history_id"],
+            "change_type": change_type,
+            "changed_at": record["history_date"].isoformat(),
+            # None only if the curation and its history are both gone.
+            "curation_id": (
+                published.curation.slug
+                if published
+                else slugs.get(record["curation_id"])
+            ),
+            "published_curation": (
+                serialize_published_curation(published) if published else None
+            ),
+        }
+
+    changes = []
+    for record in records:
+        change_type = HISTORY_CHANGE_TYPES[record["history_type"]]
+        changes.append(make_change(record, change_type, record["id"]))
+        if change_type == ChangeTypes.PUBLISHED:
+            changes.extend(
+                make_change(record, ChangeTypes.SUPERSEDED, ancestor_id)
+                for ancestor_id in ancestors.get(record["curation_id"], [])
+            )
+    return changes, next_cursor, has_more
+
+
+def iter_changes_ndjson(changes: list[dict[str, Any]]) -> Iterator[str]:
+    """Encodes changes as newline-delimited JSON, one change per line.
+
+    Yields:
+        Each encoded change followed by a newline.
+    """
+    encoder = DjangoJSONEncoder()
+    for change in changes:
+        yield encoder.encode(change) + "\n"
@@ -0,0 +1,33 @@
+"""Houses the repo app's tasks."""
+
+from job.models import Job
+from job.registry import register_task
+from repo.snapshots import Snapshot, build_snapshot
+
+REBUILD_SNAPSHOT_TASK = "repo.rebuild_snapshot"
+
+# The key every rebuild is queued with, so changes share one queued rebuild.
+REBUILD_SNAPSHOT_KEY = "repo"
+
+
+@register_task(REBUILD_SNAPSHOT_TASK, max_attempts=3)
+def rebuild_snapshot(job: Job) -> None:  # noqa: ARG001
+    """Rebuilds the repository snapshot after published curations change."""
+    build_snapshot()
+
+
+def is_snapshot_current(snapshot: Snapshot) -> bool:
+    """Returns whether a snapshot includes every change made to the exported data.
+
+    Each change queues a rebuild once it's committed, sharing a rebuild that hasn't
+    started yet. A rebuild queued after the snapshot's build started therefore means
+    the snapshot is missing a change, whether that rebuild is still queued, running,
+    or has failed.
+    """
+    if snapshot.built_at is None:
+        return False
+    return not Job.objects.filter(
+        task=REBUILD_SNAPSHOT_TASK,
+        key=REBUILD_SNAPSHOT_KEY,
+        added_at__gt=snapshot.built_at,
+    ).exists()
@@ -0,0 +1,18 @@
+"""Provides a command for rebuilding the repository snapshot files."""
+
+from django.core.management.base import BaseCommand
+
+from repo.snapshots import build_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports every published curation to the gzip-compressed JSON and NDJSON "
+        "snapshot files served by the repository download views."
+    )
+
+    def handle(self, *args, **options) -> None:
+        snapshots = build_snapshot()
+        for snapshot in snapshots.values():
+            self.stdout.write(f"Wrote {snapshot.path}")
+        self.stdout.write(self.style.SUCCESS("Rebuilt the repository snapshot."))
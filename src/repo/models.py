@@ -1,10 +1,97 @@
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
+from django.db.models import Exists, OuterRef, Prefetch, Subquery
 from django.urls import reverse
-from simple_history.models import HistoricalRecords
+
+from common.history import ChangedHistoricalRecords
+from common.models import SearchDocument
+from curation.constants.models.common import Status
+from curation.models import Curation, Evidence
+
+
+def get_published_descendants(lineage_path: str) -> "PublishedCurationQuerySet":
+    """Returns the published curations copied, at any remove, from a curation.
+
+    A curation's descendants are the curations whose lineage paths start with its own.
+    The lineage path may be an `OuterRef` to use this as a subquery.
+
+    Returns:
+        The published curations of the curation's published descendants.
+    """
+    return (
+        PublishedCuration.objects.filter(
+            curation__lineage_path__startswith=lineage_path,
+            curation__status=Status.PUBLISHED,
+        )
+        .exclude(curation__lineage_path=lineage_path)
+        .order_by("-published_at")
+    )
+
+
+class PublishedCurationQuerySet(models.QuerySet):
+    def with_scores(self) -> "PublishedCurationQuerySet":
+        """Prefetches each published curation's curation with its score annotations.
+
+        See `CurationQuerySet.with_scores`. The curations are fetched in one extra query
+        along with their allele, haplotype, and disease.
+
+        Returns:
+            The queryset with the prefetch added.
+        """
+        curations = Curation.objects.with_scores().select_related(
+            "allele", "haplotype", "disease"
+        )
+        return self.prefetch_related(Prefetch("curation", queryset=curations))
+
+    def with_supersession(self) -> "PublishedCurationQuerySet":
+        """Annotates whether each published curation has been superseded.
+
+        A published curation is superseded when a curation copied from it, directly or
+        transitively, has also been published. `superseded` is that flag and
+        `superseding_id` is the ID of the most recently published such copy, or None.
+        Both are computed from the lineage paths in the same query as the rows.
+
+        Returns:
+            The queryset with the `superseded` and `superseding_id` annotations.
+        """
+        descendants = get_published_descendants(OuterRef("curation__lineage_path"))
+        return self.annotate(
+            superseded=Exists(descendants),
+            superseding_id=Subquery(descendants.values("pk")[:1]),
+        )
+
+    def for_export(self) -> "PublishedCurationQuerySet":
+        """Fetches everything `serialize_published_curation` reads up front.
+
+        The curations, haplotype alleles, evidence, publications, and demographics are
+        each fetched in one query per batch of published curations, so exporting the
+        repository doesn't issue queries per curation or per evidence record.
+
+        Returns:
+            The queryset with the related objects selected and prefetched.
+        """
+        curations = Curation.objects.with_scores().select_related(
+            "allele", "haplotype", "disease", "copied_from"
+        )
+        evidence = Evidence.objects.select_related("publication").prefetch_related(
+            "demographics"
+        )
+        return self.select_related("published_by").prefetch_related(
+            Prefetch("curation", queryset=curations),
+            "curation__haplotype__alleles",
+            Prefetch("curation__evidence", queryset=evidence),
+        )
 
 
 class PublishedCuration(models.Model):
+    search_fields = [
+        "curation__slug",
+        "curation__allele__name",
+        "curation__haplotype__name",
+        "curation__disease__name",
+    ]
+
     curation = models.OneToOneField(
         "curation.Curation",
         on_delete=models.PROTECT,
@@ -33,7 +120,11 @@ class PublishedCuration(models.Model):
         verbose_name="Updated At",
         help_text="When the published curation was last updated.",
     )
-    history = HistoricalRecords()
+    # Publications are the audit trail of the HLArepo, so their history is kept whole.
+    search_documents = GenericRelation(SearchDocument)
+    history = ChangedHistoricalRecords(compact=False)
+
+    objects = PublishedCurationQuerySet.as_manager()
 
     class Meta:
         db_table = "published_curation"
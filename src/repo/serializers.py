@@ -1,5 +1,8 @@
+from collections.abc import Iterable, Iterator
 from typing import TYPE_CHECKING, Any
 
+from django.core.serializers.json import DjangoJSONEncoder
+
 if TYPE_CHECKING:
     from curation.models import Evidence
     from repo.models import PublishedCuration
@@ -120,3 +123,51 @@ def serialize_evidence(evidence: "Evidence") -> dict[str, Any]:
         "score": float(evidence.score),
         "added_at": evidence.added_at.isoformat(),
     }
+
+
+def iter_published_curations_json(
+    published_curations: Iterable["PublishedCuration"], export_date: str
+) -> Iterator[str]:
+    """Encodes published curations as one JSON document, a record at a time.
+
+    The document has the same keys as a single `JsonResponse` of all the published
+    curations would, but only one serialized record is held in memory at a time. The
+    total count is written after the records because it's only known once they've all
+    been encoded.
+
+    Args:
+        published_curations: The published curations to encode, e.g. a queryset
+            iterator.
+        export_date: The date to record as the export date.
+
+    Yields:
+        Consecutive pieces of the JSON document.
+    """
+    encoder = DjangoJSONEncoder()
+    yield '{"published_curations": ['
+    total_count = 0
+    for published in published_curations:
+        separator = ", " if total_count else ""
+        yield separator + encoder.encode(serialize_published_curation(published))
+        total_count += 1
+    yield (
+        f'], "total_count": {total_count}, '
+        f'"export_date": {encoder.encode(export_date)}}}'
+    )
+
+
+def iter_published_curations_ndjson(
+    published_curations: Iterable["PublishedCuration"],
+) -> Iterator[str]:
+    """Encodes published curations as newline-delimited JSON, one record per line.
+
+    Args:
+        published_curations: The published curations to encode, e.g. a queryset
+            iterator.
+
+    Yields:
+        Each serialized published curation followed by a newline.
+    """
+    encoder = DjangoJSONEncoder()
+    for published in published_curations:
+        yield encoder.encode(serialize_published_curation(published)) + "\n"
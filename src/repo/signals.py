@@ -0,0 +1,82 @@
+"""Houses signal receivers for the repo app."""
+
+from functools import partial
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from allele.models import Allele
+from disease.models import Disease
+from haplotype.models import Haplotype
+from job.queue import enqueue
+from publication.models import Publication
+from repo.jobs import REBUILD_SNAPSHOT_KEY, REBUILD_SNAPSHOT_TASK
+from repo.models import PublishedCuration
+
+# The lookups from a published curation to the objects of each model its export reads.
+# Curations and their evidence are locked once published, so only these can change.
+EXPORTED_RELATIONS: dict[type[models.Model], tuple[str, ...]] = {
+    Allele: ("curation__allele", "curation__haplotype__alleles"),
+    Disease: ("curation__disease",),
+    Haplotype: ("curation__haplotype",),
+    Publication: ("curation__evidence__publication",),
+}
+
+
+def queue_rebuild() -> None:
+    """Queues a rebuild of the repository snapshot once the change is committed.
+
+    Waiting for the commit means a rebuild the change shares can't start before the
+    change is visible to it. Changes made before the rebuild starts share its job.
+    """
+    transaction.on_commit(
+        partial(enqueue, REBUILD_SNAPSHOT_TASK, key=REBUILD_SNAPSHOT_KEY)
+    )
+
+
+def is_exported(instance: models.Model) -> bool:
+    """Returns whether a published curation's export reads the object."""
+    lookups = Q()
+    for lookup in EXPORTED_RELATIONS[type(instance)]:
+        lookups |= Q(**{lookup: instance.pk})
+    return PublishedCuration.objects.filter(lookups).exists()
+
+
+@receiver(post_save, sender=PublishedCuration)
+@receiver(post_delete, sender=PublishedCuration)
+def rebuild_snapshot_on_change(**kwargs) -> None:  # noqa: ARG001
+    """Queues a rebuild of the repository snapshot when a published curation changes."""
+    queue_rebuild()
+
+
+@receiver(post_save)
+@receiver(pre_delete)
+def rebuild_snapshot_on_exported_change(
+    sender: type[models.Model],
+    instance: models.Model,
+    **kwargs,  # noqa: ARG001
+) -> None:
+    """Queues a rebuild when an allele, disease, haplotype, or publication changes.
+
+    Only objects a published curation's export reads queue one. Deletions are checked
+    before the delete, while the published curations still reference the object.
+    """
+    if sender in EXPORTED_RELATIONS and is_exported(instance):
+        queue_rebuild()
+
+
+@receiver(m2m_changed, sender=Haplotype.alleles.through)
+def rebuild_snapshot_on_haplotype_alleles_change(
+    instance: models.Model,
+    action: str,
+    **kwargs,  # noqa: ARG001
+) -> None:
+    """Queues a rebuild when a published haplotype's alleles change.
+
+    The instance is the haplotype or, for changes made from the allele's side, the
+    allele, so it's checked while the two are linked: before removing, after adding.
+    """
+    if action in ("post_add", "pre_remove", "pre_clear") and is_exported(instance):
+        queue_rebuild()
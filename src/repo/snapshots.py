@@ -0,0 +1,278 @@
+"""Houses code for building and serving pre-built snapshots of the repository.
+
+A snapshot is a gzip-compressed export of every published curation, in JSON and in
+newline-delimited JSON. Each file is named after a hash of its contents, and a manifest
+records which files are current, so clients can be sent a 304 or the file on disk
+instead of an export rebuilt from the database.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import NamedTuple
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+
+from repo.models import PublishedCuration
+from repo.serializers import (
+    iter_published_curations_json,
+    iter_published_curations_ndjson,
+)
+
+logger = logging.getLogger(__name__)
+
+# The number of published curations to fetch (along with their related objects) per
+# batch when exporting the repository.
+EXPORT_CHUNK_SIZE = 200
+
+SNAPSHOT_FORMATS = ("json", "ndjson")
+
+MANIFEST_NAME = "manifest.json"
+
+FILE_PREFIX = "hla_curations_all"
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class Snapshot(NamedTuple):
+    """Describes one compressed snapshot file."""
+
+    path: Path
+    etag: str
+    export_date: str
+    # When the build started reading the database, or None for a snapshot built before
+    # the manifest recorded it.
+    built_at: datetime | None
+
+
+def get_snapshot_dir() -> Path:
+    """Returns the directory snapshots are written to."""
+    return Path(settings.REPO_SNAPSHOT_DIR)
+
+
+def _write_gzip(directory: Path, chunks: Iterator[str], snapshot_format: str) -> str:
+    """Compresses the chunks into a new file named after its hash.
+
+    The gzip header's timestamp and file name are left out so the same export always
+    compresses to the same bytes, and therefore the same hash and ETag.
+
+    Returns:
+        The name of the new file.
+    """
+    with NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as temp:
+        with gzip.GzipFile(filename="", fileobj=temp, mode="wb", mtime=0) as gz:
+            for chunk in chunks:
+                gz.write(chunk.encode())
+        temp_path = Path(temp.name)
+    with temp_path.open("rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    name = f"{FILE_PREFIX}-{digest[:16]}.{snapshot_format}.gz"
+    temp_path.replace(directory / name)
+    return name
+
+
+def build_snapshot() -> dict[str, Snapshot]:
+    """Exports every published curation to new snapshot files.
+
+    The manifest is replaced atomically once all of the files are written, and files
+    it no longer lists are removed. It records when the build started, so changes made
+    while the files are written count as newer than the snapshot.
+
+    Returns:
+        The new snapshots, keyed by format.
+    """
+    directory = get_snapshot_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    built_at = timezone.now()
+    export_date = built_at.strftime("%Y-%m-%d")
+
+    def iter_published_curations() -> Iterator[PublishedCuration]:
+        return PublishedCuration.objects.for_export().iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+
+    json_name = _write_gzip(
+        directory,
+        iter_published_curations_json(iter_published_curations(), export_date),
+        "json",
+    )
+    ndjson_name = _write_gzip(
+        directory,
+        iter_published_curations_ndjson(iter_published_curations()),
+        "ndjson",
+    )
+    manifest = {
+        snapshot_format: {
+            "name": name,
+            "export_date": export_date,
+            "built_at": built_at.isoformat(),
+        }
+        for snapshot_format, name in (("json", json_name), ("ndjson", ndjson_name))
+    }
+
+    with NamedTemporaryFile(
+        "w", dir=directory, suffix=".tmp", delete=False
+    ) as temp_manifest:
+        json.dump(manifest, temp_manifest)
+    Path(temp_manifest.name).replace(directory / MANIFEST_NAME)
+
+    current_names = {entry["name"] for entry in manifest.values()}
+    for path in directory.glob(f"{FILE_PREFIX}-*.gz"):
+        if path.name not in current_names:
+            path.unlink(missing_ok=True)
+
+    return {
+        snapshot_format: _get_snapshot(directory, entry)
+        for snapshot_format, entry in manifest.items()
+    }
+
+
+def _get_snapshot(directory: Path, entry: dict[str, str]) -> Snapshot:
+    """Returns the snapshot described by a manifest entry."""
+    name = entry["name"]
+    # The file name contains a hash of the file's bytes.
+    digest = name.removeprefix(f"{FILE_PREFIX}-").split(".", 1)[0]
+    built_at = entry.get("built_at")
+    return Snapshot(
+        path=directory / name,
+        etag=f'"{digest}"',
+        export_date=entry["export_date"],
+        built_at=datetime.fromisoformat(built_at) if built_at else None,
+    )
+
+
+def get_snapshot(snapshot_format: str) -> Snapshot | None:
+    """Returns the current snapshot in the given format, if one has been built."""
+    directory = get_snapshot_dir()
+    try:
+        with (directory / MANIFEST_NAME).open() as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    entry = manifest.get(snapshot_format)
+    if entry is None:
+        return None
+    snapshot = _get_snapshot(directory, entry)
+    if not snapshot.path.exists():
+        return None
+    return snapshot
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parses a single byte range request header.
+
+    Returns:
+        The first and last byte positions of the range, or None if the header isn't a
+        single byte range that overlaps the file.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # A suffix range, e.g. "bytes=-500" for the last 500 bytes.
+        suffix_length = int(last)
+        if suffix_length == 0:
+            return None
+        return max(size - suffix_length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end:
+        return None
+    return start, end
+
+
+def _iter_file_range(path: Path, start: int, length: int) -> Iterator[bytes]:
+    """Yields a range of bytes from a file in blocks.
+
+    Yields:
+        Consecutive blocks of the range.
+    """
+    block_size = FileResponse.block_size
+    with path.open("rb") as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(block_size, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def serve_snapshot(
+    request: HttpRequest,
+    snapshot: Snapshot,
+    *,
+    content_type: str,
+    filename: str,
+    content_encoding: str | None = None,
+) -> HttpResponse:
+    """Serves a snapshot file with support for conditional and range requests.
+
+    Args:
+        request: The request for the snapshot.
+        snapshot: The snapshot to serve.
+        content_type: The content type to send the file as.
+        filename: The file name suggested to the client.
+        content_encoding: The content encoding to declare, e.g. "gzip" when serving
+            the compressed JSON as JSON to a client that accepts gzip.
+
+    Returns:
+        A 304 if the client's copy is current, a 206 for a satisfiable single byte
+        range, or the whole file otherwise.
+    """
+    not_modified = get_conditional_response(request, etag=snapshot.etag)
+    if not_modified is not None:
+        return not_modified
+
+    size = snapshot.path.stat().st_size
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (if_range is None or if_range == snapshot.etag):
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None and RANGE_RE.match(range_header.strip()):
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(
+            snapshot.path.open("rb"),
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_file_range(snapshot.path, start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    response["ETag"] = snapshot.etag
+    response["Accept-Ranges"] = "bytes"
+    if content_encoding is not None:
+        response["Content-Encoding"] = content_encoding
+    return response
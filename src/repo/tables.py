@@ -1,6 +1,7 @@
 import django_tables2 as tables
 from django.urls import reverse
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django_tables2 import A
 
 from curation.constants.models.curation import CLASSIFICATION_CHOICES
@@ -27,6 +28,7 @@ class PublishedCurationTable(tables.Table):
         verbose_name="Classification",
         orderable=False,
     )
+    superseded = tables.Column(verbose_name="Superseded", orderable=False)
     updated_at = tables.DateColumn(
         accessor="curation.updated_at",
         verbose_name="Updated",
@@ -43,6 +45,7 @@ class PublishedCurationTable(tables.Table):
             "haplotype",
             "disease",
             "classification",
+            "superseded",
             "updated_at",
             "actions",
         )
@@ -57,6 +60,15 @@ class PublishedCurationTable(tables.Table):
             return CLASSIFICATION_CHOICES.get(sc, "------")
         return "------"
 
+    def render_superseded(self, *, value: bool) -> str:
+        if value:
+            return mark_safe(  # noqa: S308
+                '<span class="tag is-warning is-light">'
+                '<i class="bi bi-arrow-repeat"></i> Superseded'
+                "</span>"
+            )
+        return "------"
+
     def render_actions(self, record: PublishedCuration) -> str:
         url = reverse("repo-download-single", args=[record.curation.slug])
         return format_html(
@@ -1,19 +1,31 @@
+import gzip
 import json
+from tempfile import TemporaryDirectory
 from typing import override
 
 from django.contrib.auth.models import User
-from django.db import IntegrityError
-from django.test import Client, TestCase
+from django.db import IntegrityError, connection
+from django.http import HttpResponse
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from allele.models import Allele
 from auth_.models import UserProfile
-from common.tests import ProtectedViewTestMixin
+from common.results_cache import get_generation
+from common.tests import ProtectedViewTestMixin, QueryBudgetTestMixin
 from curation.constants.models.common import Status
 from curation.constants.models.curation import CurationTypes
-from curation.models import Curation
+from curation.models import Curation, Evidence
 from disease.models import Disease
+from haplotype.models import Haplotype
+from job.constants.models import JobStatus
+from job.models import Job
+from job.worker import run_worker
+from publication.models import Publication
+from repo.jobs import REBUILD_SNAPSHOT_TASK
 from repo.models import PublishedCuration
+from repo.snapshots import MANIFEST_NAME, build_snapshot, get_snapshot
 
 
 class PublishedCurationModelTest(TestCase):
@@ -156,7 +168,7 @@ class CurationPublishViewTest(ProtectedViewTestMixin, TestCase):
         self.assertEqual(PublishedCuration.objects.count(), 1)
 
 
-class RepoSearchViewTest(TestCase):
+class RepoSearchViewTest(QueryBudgetTestMixin, TestCase):
     fixtures = ["test_alleles.json", "test_diseases.json"]
 
     def setUp(self):
@@ -187,8 +199,45 @@ class RepoSearchViewTest(TestCase):
         response = self.client.get(self.url)
         self.assertContains(response, curation.slug)
 
-
-class PublishedCurationDetailViewTest(TestCase):
+    def _publish_curations(self, num_curations: int) -> None:
+        allele = Allele.objects.get(pk=1)
+        disease = Disease.objects.get(pk=1)
+        for _ in range(num_curations):
+            curation = Curation.objects.create(
+                curation_type=CurationTypes.ALLELE,
+                allele=allele,
+                disease=disease,
+                status=Status.PUBLISHED,
+            )
+            Evidence.objects.create(
+                curation=curation, is_included=True, has_association=True
+            )
+            PublishedCuration.objects.create(curation=curation)
+
+    def test_query_count_does_not_depend_on_number_of_rows(self):
+        self._publish_curations(2)
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(self.url)
+        self._publish_curations(10)
+        with CaptureQueriesContext(connection) as large_page:
+            self.client.get(self.url)
+        self.assertEqual(len(small_page), len(large_page))
+
+    def test_within_query_budget(self):
+        self._publish_curations(10)
+        self.assertWithinQueryBudget(self.url)
+        curator = User.objects.create_user(username="curator")
+        UserProfile.objects.create(user=curator, has_curation_permissions=True)
+        self.client.force_login(curator)
+        self.assertWithinQueryBudget(self.url)
+        # HTMX searches, first rendered and then served from the results cache, once
+        # the generation they're cached under has been stored.
+        get_generation()
+        for _ in range(2):
+            self.assertWithinQueryBudget(f"{self.url}?q=C0", HTTP_HX_REQUEST="true")
+
+
+class PublishedCurationDetailViewTest(QueryBudgetTestMixin, TestCase):
     fixtures = ["test_alleles.json", "test_diseases.json"]
 
     def setUp(self):
@@ -220,6 +269,25 @@ class PublishedCurationDetailViewTest(TestCase):
         self.assertContains(response, self.curation.slug)
         self.assertContains(response, "Download as JSON")
 
+    def test_within_query_budget(self):
+        for _ in range(10):
+            Evidence.objects.create(
+                curation=self.curation, is_included=True, has_association=True
+            )
+        url = reverse("repo-detail", kwargs={"curation_slug": self.curation.slug})
+        self.assertWithinQueryBudget(url)
+        curator = User.objects.create_user(username="curator")
+        UserProfile.objects.create(user=curator, has_curation_permissions=True)
+        self.client.force_login(curator)
+        self.assertWithinQueryBudget(url)
+
+    def test_history_within_query_budget(self):
+        for version in range(2, 12):
+            self.published.version = version
+            self.published.save()
+        url = reverse("repo-history", kwargs={"curation_slug": self.curation.slug})
+        self.assertWithinQueryBudget(url)
+
 
 class JSONDownloadViewTest(TestCase):
     fixtures = ["test_alleles.json", "test_diseases.json"]
@@ -263,12 +331,312 @@ class JSONDownloadViewTest(TestCase):
         self.assertEqual(response["Content-Type"], "application/json")
         self.assertIn("attachment", response["Content-Disposition"])
 
-        data = json.loads(response.content)
+        data = json.loads(b"".join(response.streaming_content))
         self.assertEqual(data["total_count"], 1)
         self.assertEqual(len(data["published_curations"]), 1)
         self.assertEqual(
             data["published_curations"][0]["curation_id"], self.curation.slug
         )
+        self.assertEqual(
+            list(data), ["published_curations", "total_count", "export_date"]
+        )
+
+    def _publish_curations(self, num_curations: int) -> None:
+        allele = Allele.objects.get(pk=1)
+        disease = Disease.objects.get(pk=1)
+        for _ in range(num_curations):
+            curation = Curation.objects.create(
+                curation_type=CurationTypes.ALLELE,
+                allele=allele,
+                disease=disease,
+                status=Status.PUBLISHED,
+            )
+            Evidence.objects.create(curation=curation, is_included=True)
+            Evidence.objects.create(curation=curation, is_included=False)
+            PublishedCuration.objects.create(curation=curation)
+
+    def test_download_all_json_query_count_does_not_depend_on_number_of_rows(self):
+        url = reverse("repo-download-all")
+        self._publish_curations(2)
+        with CaptureQueriesContext(connection) as small_export:
+            json.loads(b"".join(self.client.get(url).streaming_content))
+        self._publish_curations(10)
+        with CaptureQueriesContext(connection) as large_export:
+            data = json.loads(b"".join(self.client.get(url).streaming_content))
+        self.assertEqual(data["total_count"], 13)
+        self.assertEqual(len(small_export), len(large_export))
+
+
+class SnapshotTest(TestCase):
+    fixtures = ["test_alleles.json", "test_diseases.json"]
+
+    def setUp(self):
+        snapshot_dir = self.enterContext(TemporaryDirectory())
+        self.enterContext(override_settings(REPO_SNAPSHOT_DIR=snapshot_dir))
+        self.curation = Curation.objects.create(
+            curation_type=CurationTypes.ALLELE,
+            allele=Allele.objects.get(pk=1),
+            disease=Disease.objects.get(pk=1),
+            status=Status.PUBLISHED,
+        )
+        self.url = reverse(
+            "repo-download-snapshot", kwargs={"snapshot_format": "ndjson"}
+        )
+
+    def _publish(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            PublishedCuration.objects.create(curation=self.curation)
+        run_worker(burst=True)
+
+    def _count_rebuilds(self) -> int:
+        return Job.objects.filter(task=REBUILD_SNAPSHOT_TASK).count()
+
+    def _download_all_json(self) -> HttpResponse:
+        return self.client.get(
+            reverse("repo-download-all"), headers={"Accept-Encoding": "gzip"}
+        )
+
+    def test_publishing_builds_snapshot(self):
+        self.assertIsNone(get_snapshot("json"))
+        self._publish()
+        with gzip.open(get_snapshot("json").path) as f:
+            data = json.load(f)
+        self.assertEqual(data["total_count"], 1)
+        with gzip.open(get_snapshot("ndjson").path, "rt") as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["curation_id"], self.curation.slug)
+
+    def test_changes_share_a_queued_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            PublishedCuration.objects.create(curation=self.curation)
+        with self.captureOnCommitCallbacks(execute=True):
+            PublishedCuration.objects.get().save()
+        self.assertEqual(self._count_rebuilds(), 1)
+
+    def test_rebuild_is_queued_once_the_change_is_committed(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            PublishedCuration.objects.create(curation=self.curation)
+            self.assertEqual(self._count_rebuilds(), 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._count_rebuilds(), 1)
+
+    def test_exported_object_changes_queue_a_rebuild(self):
+        self._publish()
+        publication = Publication.objects.create(
+            slug="P999999",
+            title="T",
+            author="A",
+            publication_year=2020,
+            publication_type="PUB",
+        )
+        Evidence.objects.create(curation=self.curation, publication=publication)
+        run_worker(burst=True)
+        for obj in (self.curation.allele, self.curation.disease, publication):
+            with self.subTest(model=type(obj).__name__):
+                with self.captureOnCommitCallbacks(execute=True):
+                    obj.save()
+                self.assertTrue(Job.objects.filter(status=JobStatus.QUEUED).exists())
+                run_worker(burst=True)
+
+    def test_published_haplotype_allele_changes_queue_a_rebuild(self):
+        haplotype = Haplotype.objects.create(name="A*01:01~B*08:01")
+        haplotype.alleles.add(Allele.objects.get(pk=1))
+        Curation.objects.filter(pk=self.curation.pk).update(
+            curation_type=CurationTypes.HAPLOTYPE, allele=None, haplotype=haplotype
+        )
+        self._publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            haplotype.alleles.add(Allele.objects.get(pk=2))
+        self.assertEqual(self._count_rebuilds(), 2)
+
+    def test_unexported_object_changes_dont_queue_a_rebuild(self):
+        self._publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            Disease.objects.get(pk=2).save()
+            Allele.objects.get(pk=2).save()
+        self.assertEqual(self._count_rebuilds(), 1)
+
+    def test_unchanged_export_keeps_etag(self):
+        self._publish()
+        etag = get_snapshot("json").etag
+        build_snapshot()
+        self.assertEqual(get_snapshot("json").etag, etag)
+
+    def test_download_snapshot_not_built(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_snapshot(self):
+        self._publish()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], get_snapshot("ndjson").etag)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        content = b"".join(response.streaming_content)
+        self.assertIn(self.curation.slug.encode(), gzip.decompress(content))
+
+    def test_download_snapshot_not_modified(self):
+        self._publish()
+        etag = get_snapshot("ndjson").etag
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_download_snapshot_range(self):
+        self._publish()
+        snapshot_bytes = get_snapshot("ndjson").path.read_bytes()
+        response = self.client.get(self.url, headers={"Range": "bytes=2-9"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), snapshot_bytes[2:10])
+        self.assertEqual(response["Content-Range"], f"bytes 2-9/{len(snapshot_bytes)}")
+
+    def test_download_snapshot_unsatisfiable_range(self):
+        self._publish()
+        response = self.client.get(self.url, headers={"Range": "bytes=100000-"})
+        self.assertEqual(response.status_code, 416)
+
+    def test_download_all_json_serves_snapshot_to_gzip_clients(self):
+        self._publish()
+        response = self._download_all_json()
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], get_snapshot("json").etag)
+        content = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(json.loads(content)["total_count"], 1)
+
+    def test_download_all_json_streams_while_a_rebuild_is_queued(self):
+        self._publish()
+        disease = self.curation.disease
+        disease.name = "Renamed disease"
+        with self.captureOnCommitCallbacks(execute=True):
+            disease.save()
+        response = self._download_all_json()
+        self.assertNotIn("Content-Encoding", response)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(
+            data["published_curations"][0]["curation"]["disease"]["name"],
+            "Renamed disease",
+        )
+        run_worker(burst=True)
+        self.assertEqual(self._download_all_json()["Content-Encoding"], "gzip")
+
+    def test_download_all_json_streams_after_a_rebuild_fails(self):
+        self._publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            PublishedCuration.objects.get().save()
+        Job.objects.filter(status=JobStatus.QUEUED).update(status=JobStatus.FAILED)
+        self.assertNotIn("Content-Encoding", self._download_all_json())
+
+    def test_download_all_json_streams_without_a_build_time(self):
+        self._publish()
+        snapshot_dir = get_snapshot("json").path.parent
+        manifest = json.loads((snapshot_dir / MANIFEST_NAME).read_text())
+        for entry in manifest.values():
+            del entry["built_at"]
+        (snapshot_dir / MANIFEST_NAME).write_text(json.dumps(manifest))
+        self.assertNotIn("Content-Encoding", self._download_all_json())
+
+
+class ChangesFeedTest(TestCase):
+    fixtures = ["test_alleles.json", "test_diseases.json"]
+
+    def setUp(self):
+        self.original = self._create_curation()
+        self.published = PublishedCuration.objects.create(curation=self.original)
+        self.url = reverse("repo-changes", kwargs={"feed_format": "json"})
+
+    def _create_curation(self, copied_from: Curation | None = None) -> Curation:
+        return Curation.objects.create(
+            curation_type=CurationTypes.ALLELE,
+            allele=Allele.objects.get(pk=1),
+            disease=Disease.objects.get(pk=1),
+            status=Status.PUBLISHED,
+            copied_from=copied_from,
+        )
+
+    def test_lists_published_curations(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(len(data["changes"]), 1)
+        change = data["changes"][0]
+        self.assertEqual(change["change_type"], "published")
+        self.assertEqual(change["curation_id"], self.original.slug)
+        self.assertEqual(
+            change["published_curation"]["curation_id"], self.original.slug
+        )
+        self.assertFalse(data["has_more"])
+
+    def test_lists_only_changes_since_cursor(self):
+        cursor = self.client.get(self.url).json()["next_cursor"]
+        self.assertEqual(
+            self.client.get(self.url, {"since": cursor}).json()["changes"], []
+        )
+        self.published.version = 2
+        self.published.save()
+        data = self.client.get(self.url, {"since": cursor}).json()
+        self.assertEqual([c["change_type"] for c in data["changes"]], ["updated"])
+        self.assertEqual(data["changes"][0]["published_curation"]["version"], 2)
+
+    def test_lists_superseded_ancestors(self):
+        cursor = self.client.get(self.url).json()["next_cursor"]
+        unpublished_copy = self._create_curation(copied_from=self.original)
+        copy_of_copy = self._create_curation(copied_from=unpublished_copy)
+        PublishedCuration.objects.create(curation=copy_of_copy)
+        changes = self.client.get(self.url, {"since": cursor}).json()["changes"]
+        self.assertEqual(
+            [(c["change_type"], c["curation_id"]) for c in changes],
+            [("published", copy_of_copy.slug), ("superseded", self.original.slug)],
+        )
+        self.assertEqual(changes[0]["cursor"], changes[1]["cursor"])
+
+    def test_lists_unpublished_curations(self):
+        self.published.delete()
+        changes = self.client.get(self.url).json()["changes"]
+        self.assertEqual(
+            [c["change_type"] for c in changes], ["published", "unpublished"]
+        )
+        self.assertIsNone(changes[1]["published_curation"])
+        self.assertEqual(changes[1]["curation_id"], self.original.slug)
+
+    def test_lists_curations_deleted_after_being_unpublished(self):
+        slug = self.original.slug
+        self.published.delete()
+        self.original.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(c["change_type"], c["curation_id"]) for c in response.json()["changes"]],
+            [("published", slug), ("unpublished", slug)],
+        )
+        Curation.history.all().delete()  # type: ignore[attr-defined]
+        changes = self.client.get(self.url).json()["changes"]
+        self.assertEqual([c["curation_id"] for c in changes], [None, None])
+
+    def test_paginates(self):
+        PublishedCuration.objects.create(curation=self._create_curation())
+        response = self.client.get(self.url, {"page_size": 1})
+        data = response.json()
+        self.assertEqual(len(data["changes"]), 1)
+        self.assertTrue(data["has_more"])
+        self.assertIn(f"since={data['next_cursor']}", response["Link"])
+        data = self.client.get(
+            self.url, {"since": data["next_cursor"], "page_size": 1}
+        ).json()
+        self.assertEqual(len(data["changes"]), 1)
+        self.assertFalse(data["has_more"])
+
+    def test_ndjson(self):
+        url = reverse("repo-changes", kwargs={"feed_format": "ndjson"})
+        response = self.client.get(url)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["change_type"], "published")
+
+    def test_invalid_parameters(self):
+        for params in ({"since": "abc"}, {"since": -1}, {"page_size": 0}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
 
 
 class ReadOnlyEnforcementTest(TestCase):
@@ -371,6 +739,38 @@ class SupersessionTest(TestCase):
         result = get_superseding(original)
         self.assertEqual(result, copy_pub)
 
+    def test_with_supersession_annotates_chain(self):
+        original = self._make_published()
+        copy1 = self._make_published(copied_from=original.curation)
+        copy2 = self._make_published(copied_from=copy1.curation)
+
+        annotated = PublishedCuration.objects.with_supersession().in_bulk()
+        self.assertTrue(annotated[original.pk].superseded)
+        self.assertEqual(annotated[original.pk].superseding_id, copy2.pk)
+        self.assertTrue(annotated[copy1.pk].superseded)
+        self.assertFalse(annotated[copy2.pk].superseded)
+        self.assertIsNone(annotated[copy2.pk].superseding_id)
+
+    def test_is_superseded_query_count_does_not_grow_with_chain(self):
+        from repo.views import get_superseding, is_superseded
+
+        original = self._make_published()
+        previous = original
+        for _ in range(10):
+            previous = self._make_published(copied_from=previous.curation)
+
+        original = PublishedCuration.objects.with_supersession().get(pk=original.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(is_superseded(original))
+            self.assertEqual(get_superseding(original), previous)
+
+    def test_list_marks_superseded_rows(self):
+        original = self._make_published()
+        self._make_published(copied_from=original.curation)
+
+        response = self.client.get(reverse("repo-search"))
+        self.assertContains(response, "Superseded")
+
 
 class CopyButtonTest(TestCase):
     fixtures = ["test_alleles.json", "test_diseases.json"]
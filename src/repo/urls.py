@@ -5,6 +5,12 @@ from repo import views
 urlpatterns = [
     path("", views.PublishedCurationList.as_view(), name="repo-search"),
     path("download/all.json", views.download_all_json, name="repo-download-all"),
+    path("changes.<str:feed_format>", views.changes_feed, name="repo-changes"),
+    path(
+        "download/all.<str:snapshot_format>.gz",
+        views.download_snapshot,
+        name="repo-download-snapshot",
+    ),
     path(
         "<slug:curation_slug>/detail",
         views.PublishedCurationDetail.as_view(),
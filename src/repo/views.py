@@ -1,69 +1,78 @@
-from typing import TYPE_CHECKING, Any
-
-if TYPE_CHECKING:
-    from curation.models import Curation
-
-from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse, JsonResponse
+import re
+from typing import Any
+
+from django.db.models import Prefetch, QuerySet
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django.views.generic import DetailView
 from django_tables2 import RequestConfig
 
 from common.history import resolve_changes
 from common.tables import HistoryTable
 from common.views import SearchListView
-from curation.constants.models.common import Status
-from repo.models import PublishedCuration
-from repo.serializers import serialize_published_curation
+from curation.models import Evidence
+from repo.changes import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    get_changes,
+    iter_changes_ndjson,
+)
+from repo.jobs import is_snapshot_current
+from repo.models import PublishedCuration, get_published_descendants
+from repo.serializers import (
+    iter_published_curations_json,
+    serialize_published_curation,
+)
+from repo.snapshots import (
+    EXPORT_CHUNK_SIZE,
+    SNAPSHOT_FORMATS,
+    get_snapshot,
+    serve_snapshot,
+)
 from repo.tables import PublishedCurationTable
 
+ACCEPTS_GZIP_RE = re.compile(r"\bgzip\b")
+
 
 def is_superseded(published_curation: PublishedCuration) -> bool:
     """Returns True if a direct or transitive copy is also published."""
-
-    def _has_published_copy(curation: "Curation") -> bool:
-        for copy in curation.copies.all():  # type: ignore
-            if copy.status == Status.PUBLISHED:
-                return True
-            if _has_published_copy(copy):
-                return True
-        return False
-
-    return _has_published_copy(published_curation.curation)
+    superseded = getattr(published_curation, "superseded", None)
+    if superseded is not None:
+        return superseded
+    lineage_path = published_curation.curation.lineage_path
+    return get_published_descendants(lineage_path).exists()
 
 
 def get_superseding(published_curation: PublishedCuration) -> PublishedCuration | None:
     """Returns the most recently published descendant, or None if not superseded."""
-
-    def _find_latest(curation: "Curation") -> PublishedCuration | None:
-        result = None
-        for copy in curation.copies.all():  # type: ignore
-            if copy.status == Status.PUBLISHED:
-                candidate = copy.publication
-                if result is None or candidate.published_at > result.published_at:
-                    result = candidate
-            deeper = _find_latest(copy)
-            if deeper is not None and (
-                result is None or deeper.published_at > result.published_at
-            ):
-                result = deeper
-        return result
-
-    return _find_latest(published_curation.curation)
+    if hasattr(published_curation, "superseding_id"):
+        if published_curation.superseding_id is None:
+            return None
+        descendants = PublishedCuration.objects.filter(
+            pk=published_curation.superseding_id
+        )
+    else:
+        lineage_path = published_curation.curation.lineage_path
+        descendants = get_published_descendants(lineage_path)
+    return descendants.select_related("curation").first()
 
 
 class PublishedCurationList(SearchListView):
     model = PublishedCuration
+    queryset = PublishedCuration.objects.with_scores().with_supersession()
     template_name = "repo/list.html"
     ordering = ["-curation__updated_at"]
     table_class = PublishedCurationTable
-    search_fields = [
-        "curation__slug",
-        "curation__allele__name",
-        "curation__haplotype__name",
-        "curation__disease__name",
-    ]
     table_pagination = {"per_page": 25}
 
 
@@ -78,8 +87,11 @@ class PublishedCurationDetail(DetailView):
             PublishedCuration instance matching the slug from URL kwargs.
         """
         curation_slug = self.kwargs.get("curation_slug")
+        evidence = Evidence.objects.select_related("publication")
         return get_object_or_404(
-            PublishedCuration,
+            PublishedCuration.objects.with_scores()
+            .with_supersession()
+            .prefetch_related(Prefetch("curation__evidence", queryset=evidence)),
             curation__slug=curation_slug,
         )
 
@@ -140,32 +152,75 @@ class PublishedCurationChange(DetailView):
 def download_all_json(request: HttpRequest) -> HttpResponse:
     """Downloads all published curations as JSON.
 
+    Clients that accept gzip are sent the pre-built snapshot when there is one that
+    includes every change, which supports conditional and range requests. Otherwise,
+    including while a rebuild is queued or after one has failed, the export is streamed
+    in batches of published curations so memory use doesn't grow with the size of the
+    repository.
+
     Returns:
         JSON response with all published curations and metadata.
     """
-    published_curations = PublishedCuration.objects.all()
+    accepts_gzip = ACCEPTS_GZIP_RE.search(request.headers.get("Accept-Encoding", ""))
+    snapshot = get_snapshot("json") if accepts_gzip else None
+    if snapshot is not None and is_snapshot_current(snapshot):
+        response = serve_snapshot(
+            request,
+            snapshot,
+            content_type="application/json",
+            filename=f"hla_curations_all_{snapshot.export_date}.json",
+            content_encoding="gzip",
+        )
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+    published_curations = PublishedCuration.objects.for_export().iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
     timestamp = timezone.now().strftime("%Y-%m-%d")
-    data = {
-        "published_curations": [
-            serialize_published_curation(pc) for pc in PublishedCuration.objects.all()
-        ],
-        "total_count": published_curations.count(),
-        "export_date": timestamp,
-    }
-    response = JsonResponse(data)
+    response = StreamingHttpResponse(
+        iter_published_curations_json(published_curations, timestamp),
+        content_type="application/json",
+    )
     response["Content-Disposition"] = (
         f'attachment; filename="hla_curations_all_{timestamp}.json"'
     )
+    patch_vary_headers(response, ["Accept-Encoding"])
     return response
 
 
+def download_snapshot(request: HttpRequest, snapshot_format: str) -> HttpResponse:
+    """Downloads the pre-built, gzip-compressed snapshot of the repository.
+
+    Returns:
+        The compressed JSON or NDJSON snapshot, or a 304 if the client's copy is
+        current.
+
+    Raises:
+        Http404: If the format is unknown or no snapshot has been built yet.
+    """
+    snapshot = (
+        get_snapshot(snapshot_format) if snapshot_format in SNAPSHOT_FORMATS else None
+    )
+    if snapshot is None:
+        raise Http404
+    return serve_snapshot(
+        request,
+        snapshot,
+        content_type="application/gzip",
+        filename=f"hla_curations_all_{snapshot.export_date}.{snapshot_format}.gz",
+    )
+
+
 def download_single_json(request: HttpRequest, curation_slug: str) -> HttpResponse:
     """Downloads a single published curation as JSON.
 
     Returns:
         JSON response with the specified published curation.
     """
-    published = get_object_or_404(PublishedCuration, curation__slug=curation_slug)
+    published = get_object_or_404(
+        PublishedCuration.objects.with_scores(), curation__slug=curation_slug
+    )
     timestamp = timezone.now().strftime("%Y-%m-%d")
     data = {
         "curation": serialize_published_curation(published),
@@ -176,3 +231,46 @@ def download_single_json(request: HttpRequest, curation_slug: str) -> HttpRespon
         f'attachment; filename="hla_curation_{curation_slug}.json"'
     )
     return response
+
+
+def changes_feed(request: HttpRequest, feed_format: str) -> HttpResponse:
+    """Lists the changes to the repository after the `since` cursor.
+
+    The JSON format wraps the changes with the next cursor and whether there are more;
+    the NDJSON format sends one change per line. Both set a `Link` header pointing to
+    the next page when there is one.
+
+    Returns:
+        The page of changes, or a 400 if the query parameters are invalid.
+
+    Raises:
+        Http404: If the format is unknown.
+    """
+    if feed_format not in ("json", "ndjson"):
+        raise Http404
+    try:
+        since = int(request.GET.get("since", 0))
+        page_size = int(request.GET.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return HttpResponseBadRequest("The since and page_size must be integers.")
+    if since < 0 or not 1 <= page_size <= MAX_PAGE_SIZE:
+        return HttpResponseBadRequest(
+            f"The since must be at least 0 and the page_size from 1 to {MAX_PAGE_SIZE}."
+        )
+
+    changes, next_cursor, has_more = get_changes(since, page_size)
+    if feed_format == "ndjson":
+        response = StreamingHttpResponse(
+            iter_changes_ndjson(changes), content_type="application/x-ndjson"
+        )
+    else:
+        response = JsonResponse(
+            {"changes": changes, "next_cursor": next_cursor, "has_more": has_more}
+        )
+    if has_more:
+        next_url = reverse("repo-changes", kwargs={"feed_format": feed_format})
+        next_url = request.build_absolute_uri(
+            f"{next_url}?since={next_cursor}&page_size={page_size}"
+        )
+        response["Link"] = f'<{next_url}>; rel="next"'
+    return response